@@ -11,7 +11,12 @@ from app.core.database import Base
 from app.models.user import User
 from app.models.project import Project, Environment
 from app.models.api import Api, ApiRequestTemplate
-from app.models.test_case import TestCase
+from app.models.test_case import TestCase, TestCaseDataset
+from app.models.test_plan import TestPlan, TestReport, TestResult, TestResultDaily
+from app.models.scene import Scene, SceneStep
+from app.models.load_test import LoadTestReport
+from app.models.profile import RequestProfile
+from app.models.schedule import PlanSchedule, SchedulerLock
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
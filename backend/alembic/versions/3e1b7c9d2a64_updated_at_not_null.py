@@ -0,0 +1,36 @@
+"""updated_at_not_null
+
+Revision ID: 3e1b7c9d2a64
+Revises: fdce6dcf4ad8
+Create Date: 2026-10-17 23:12:05.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e1b7c9d2a64'
+down_revision: Union[str, Sequence[str], None] = 'fdce6dcf4ad8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 按 updated_at 游标分页的表：补齐空值后改为非空，游标中不会出现 NULL
+PAGINATED_TABLES = ('project', 'api', 'test_case')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in PAGINATED_TABLES:
+        op.execute(f"UPDATE {table} SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL")
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(PAGINATED_TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=True)
@@ -1,22 +1,22 @@
-from typing import Generator
-from fastapi import Depends, HTTPException, status
+from typing import Any, Dict, Generator, Literal, Optional, Tuple
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.core import security
+from app.core.auth_cache import auth_cache
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
 )
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> models.User:
+def _decode_token(token: str) -> Tuple[Dict[str, Any], schemas.TokenPayload]:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
@@ -27,9 +27,43 @@ def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
+    return payload, token_data
+
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
+) -> models.User:
+    """
+    校验令牌并返回当前用户
+    开启 AUTH_CACHE_ENABLED 时优先从认证缓存读取，命中时不解码令牌、不查询数据库
+    """
+    if settings.AUTH_CACHE_ENABLED:
+        cached_user = auth_cache.get(token)
+        if cached_user is not None:
+            return cached_user
+    payload, token_data = _decode_token(token)
     user = crud.crud_user.get_by_username(db, username=token_data.sub)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    if settings.AUTH_CACHE_ENABLED:
+        auth_cache.put(token, user, expires_at=payload.get("exp"))
+    return user
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(reusable_oauth2)
+) -> models.User:
+    """
+    get_current_user 的异步版本，供 async 接口使用（使用异步数据库会话，不占用线程池）
+    """
+    if settings.AUTH_CACHE_ENABLED:
+        cached_user = auth_cache.get(token)
+        if cached_user is not None:
+            return cached_user
+    payload, token_data = _decode_token(token)
+    user = await db.run_sync(crud.crud_user.get_by_username, username=token_data.sub)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if settings.AUTH_CACHE_ENABLED:
+        auth_cache.put(token, user, expires_at=payload.get("exp"))
     return user
 
 def get_current_active_user(
@@ -38,3 +72,25 @@ def get_current_active_user(
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+async def get_current_active_user_async(
+    current_user: models.User = Depends(get_current_user_async),
+) -> models.User:
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+def get_current_admin_user(
+    current_user: models.User = Depends(get_current_active_user),
+) -> models.User:
+    if current_user.role != "ADMIN":
+        raise HTTPException(status_code=403, detail="需要管理员权限")
+    return current_user
+
+def pagination_params(
+    cursor: Optional[str] = Query(None, description="分页游标，取上一页返回的 next_cursor，为空时取第一页"),
+    limit: int = Query(100, ge=1, le=settings.PAGINATION_MAX_LIMIT, description="每页条数"),
+    order_by: Literal["id", "updated_at"] = Query("id", description="排序方式：id 正序或 updated_at 倒序"),
+) -> Dict[str, Any]:
+    """列表接口的游标分页参数"""
+    return {"cursor": cursor, "limit": limit, "order_by": order_by}
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import login, users, projects, apis, debug, test_cases
+from app.api.v1.endpoints import login, users, projects, apis, debug, test_cases, test_plans, test_reports, scenes, load_tests, profiles, schedules
 
 api_router = APIRouter()
 api_router.include_router(login.router, prefix="/login", tags=["login"])
@@ -7,4 +7,10 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(projects.router, prefix="/projects", tags=["projects"])
 api_router.include_router(apis.router, prefix="/projects/{project_id}/apis", tags=["apis"])
 api_router.include_router(test_cases.router, prefix="/projects/{project_id}/test-cases", tags=["test_cases"])
+api_router.include_router(scenes.router, prefix="/projects/{project_id}/scenes", tags=["scenes"])
+api_router.include_router(test_plans.router, prefix="/projects/{project_id}/plans", tags=["test_plans"])
+api_router.include_router(schedules.router, prefix="/projects/{project_id}/plans/{plan_id}/schedules", tags=["schedules"])
+api_router.include_router(test_reports.router, prefix="/projects/{project_id}/reports", tags=["test_reports"])
+api_router.include_router(load_tests.router, prefix="/projects/{project_id}/load-tests", tags=["load_tests"])
 api_router.include_router(debug.router, prefix="/debug", tags=["debug"])
+api_router.include_router(profiles.router, prefix="/profiles", tags=["profiles"])
@@ -1,32 +1,38 @@
-from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Any, Dict, Literal, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
-from app.schemas.response import ApiResponse
+from app.core.api_import import ImportFormatError, iter_api_definitions, load_document
+from app.core.config import settings
+from app.crud.pagination import InvalidCursorError
+from app.schemas.response import ApiResponse, PaginatedResponse
 
 router = APIRouter()
 
-@router.get("/", response_model=ApiResponse[List[schemas.Api]])
-def read_apis(
+@router.get("/", response_model=ApiResponse[PaginatedResponse[schemas.Api]])
+async def read_apis(
     project_id: int,
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    db: AsyncSession = Depends(deps.get_async_db),
+    page_params: Dict[str, Any] = Depends(deps.pagination_params),
     module_name: Optional[str] = Query(None, description="按模块筛选"),
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: models.User = Depends(deps.get_current_active_user_async),
 ) -> Any:
     """
-    获取指定项目的接口列表
+    获取指定项目的接口列表（游标分页）
     """
     # Verify project exists
-    project = crud.crud_project.get_project(db=db, project_id=project_id)
+    project = await db.run_sync(crud.crud_project.get_project, project_id=project_id)
     if not project:
         raise HTTPException(status_code=404, detail="未找到该项目")
         
-    apis = crud.crud_api.get_apis(db, project_id=project_id, skip=skip, limit=limit, module_name=module_name)
-    return ApiResponse(data=apis)
+    try:
+        page = await db.run_sync(crud.crud_api.get_apis, project_id=project_id, module_name=module_name, **page_params)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ApiResponse(data=page.to_response())
 
 @router.post("/", response_model=ApiResponse[schemas.Api])
 def create_api(
@@ -49,17 +55,46 @@ def create_api(
     api = crud.crud_api.create_api(db=db, api=api_in)
     return ApiResponse(data=api)
 
-@router.get("/{api_id}", response_model=ApiResponse[schemas.Api])
-def read_api(
+@router.post("/import", response_model=ApiResponse[schemas.ApiImportResult])
+def import_apis(
     project_id: int,
-    api_id: int,
+    file: UploadFile = File(..., description="OpenAPI 3 / Swagger 2（.json / .yaml）或 HAR（.har）文件"),
+    on_conflict: Literal["update", "skip"] = Query("update", description="已存在同方法同路径的接口时覆盖或跳过"),
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    从 OpenAPI / Swagger 文档或 HAR 抓包文件批量导入接口及请求模板
+    按 (方法, 路径) 匹配项目中已有的接口，分批写入，每批一个事务
+    """
+    project = crud.crud_project.get_project(db=db, project_id=project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="未找到该项目")
+    if file.size is not None and file.size > settings.API_IMPORT_MAX_BYTES:
+        raise HTTPException(status_code=400, detail=f"文件大小超过上限 {settings.API_IMPORT_MAX_BYTES} 字节")
+
+    try:
+        document = load_document(file.file, file.filename)
+        file_format, definitions = iter_api_definitions(document)
+        result = crud.crud_api.bulk_upsert_apis(
+            db, project_id=project_id, definitions=definitions,
+            on_conflict=on_conflict, batch_size=settings.API_IMPORT_BATCH_SIZE,
+        )
+    except ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=f"导入文件格式错误: {e}")
+    return ApiResponse(data={"format": file_format, **result})
+
+@router.get("/{api_id}", response_model=ApiResponse[schemas.Api])
+async def read_api(
+    project_id: int,
+    api_id: int,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_active_user_async),
 ) -> Any:
     """
     获取接口详情
     """
-    api = crud.crud_api.get_api(db=db, api_id=api_id)
+    api = await db.run_sync(crud.crud_api.get_api, api_id=api_id)
     if not api or api.project_id != project_id:
         raise HTTPException(status_code=404, detail="未找到该接口")
     return ApiResponse(data=api)
@@ -1,29 +1,30 @@
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app import crud, models, schemas
 from app.api import deps
 from app.schemas.response import ApiResponse
-from app.core.runner import run_request
+from app.core.async_runner import execute_request
 
 router = APIRouter()
 
 @router.post("/run", response_model=ApiResponse[schemas.DebugResponse])
-def debug_run(
+async def debug_run(
     *,
     db: Session = Depends(deps.get_db),
     debug_in: schemas.DebugRequest,
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    调试执行接口
+    调试执行接口（async 接口，等待上游响应期间不占用线程池）
     """
     url = debug_in.url
     
     # Prepend Base URL if environment_id is provided
     if debug_in.environment_id:
-        env = crud.crud_project.get_environment(db=db, environment_id=debug_in.environment_id)
+        env = await run_in_threadpool(crud.crud_project.get_environment, db=db, environment_id=debug_in.environment_id)
         if not env:
             raise HTTPException(status_code=404, detail="未找到该环境")
         
@@ -51,13 +52,14 @@ def debug_run(
         else:
             data_body = debug_in.body # raw string
 
-    result = run_request(
+    result = await execute_request(
         method=debug_in.method,
         url=url,
         params=debug_in.params,
         headers=debug_in.headers,
         json_body=json_body,
-        data_body=data_body
+        data_body=data_body,
+        environment_id=debug_in.environment_id
     )
     
     return ApiResponse(data=result)
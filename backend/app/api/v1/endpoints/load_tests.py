@@ -0,0 +1,138 @@
+from typing import Any, List
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.api import deps
+from app.core.config import settings
+from app.schemas.response import ApiResponse
+from app.services.load_test import LoadTestBusyError, load_test_manager
+
+router = APIRouter()
+
+def _get_project_load_test(db: Session, project_id: int, report_id: int) -> models.LoadTestReport:
+    report = crud.crud_load_test.get_load_test(db, report_id=report_id)
+    if not report or report.project_id != project_id:
+        raise HTTPException(status_code=404, detail="未找到该压测报告")
+    return report
+
+def _check_load_config(load_in: schemas.LoadTestCreate) -> None:
+    if load_in.duration > settings.LOAD_TEST_MAX_DURATION:
+        raise HTTPException(status_code=400, detail=f"压测时长不能超过 {settings.LOAD_TEST_MAX_DURATION} 秒")
+    if load_in.mode == "closed" and not load_in.concurrency:
+        raise HTTPException(status_code=400, detail="闭环模型需要填写并发数（concurrency）")
+    if load_in.mode == "open" and not load_in.rps:
+        raise HTTPException(status_code=400, detail="开环模型需要填写目标 RPS（rps）")
+    if load_in.rps and load_in.rps > settings.LOAD_TEST_MAX_RPS:
+        raise HTTPException(status_code=400, detail=f"目标 RPS 不能超过 {settings.LOAD_TEST_MAX_RPS}")
+    if load_in.concurrency and load_in.concurrency > settings.LOAD_TEST_MAX_CONCURRENCY:
+        raise HTTPException(status_code=400, detail=f"并发数不能超过 {settings.LOAD_TEST_MAX_CONCURRENCY}")
+
+@router.get("/", response_model=ApiResponse[List[schemas.LoadTestReportSummary]])
+def read_load_tests(
+    project_id: int,
+    db: Session = Depends(deps.get_db),
+    skip: int = 0,
+    limit: int = 100,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取项目下的压测报告列表（不含直方图与时间线）
+    """
+    reports = crud.crud_load_test.get_load_tests(db, project_id=project_id, skip=skip, limit=limit)
+    return ApiResponse(data=reports)
+
+@router.post("/", response_model=ApiResponse[schemas.LoadTestReport])
+def create_load_test(
+    project_id: int,
+    load_in: schemas.LoadTestCreate,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    对接口或用例发起压测，立即返回 RUNNING 状态的报告，通过报告详情查询进度与结果
+    - mode=closed: concurrency 个虚拟用户循环请求
+    - mode=open: 按 rps 匀速发送，concurrency 为在途请求上限（缺省不限，取系统上限）
+    """
+    project = crud.crud_project.get_project(db=db, project_id=project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="未找到该项目")
+    _check_load_config(load_in)
+    env = crud.crud_project.get_environment(db=db, environment_id=load_in.environment_id)
+    if not env or env.project_id != project_id:
+        raise HTTPException(status_code=404, detail="未找到该环境")
+    if load_in.target_type == "CASE":
+        target = crud.crud_test_case.get_test_case(db=db, test_case_id=load_in.target_id)
+    else:
+        target = crud.crud_api.get_api(db=db, api_id=load_in.target_id)
+    if not target or target.project_id != project_id:
+        raise HTTPException(status_code=404, detail="未找到压测目标")
+
+    crud.crud_load_test.fail_stale_load_tests(db, settings.JOB_STALE_SECONDS)
+    if not load_test_manager.has_capacity():
+        raise HTTPException(status_code=409, detail="已有压测正在运行，请等待结束后再试")
+    if load_in.mode == "open" and not load_in.concurrency:
+        load_in = load_in.model_copy(update={"concurrency": settings.LOAD_TEST_MAX_CONCURRENCY})
+
+    report = crud.crud_load_test.create_load_test(
+        db,
+        obj_in=load_in,
+        project_id=project_id,
+        name=load_in.name or f"{target.name} 压测",
+        worker_id=load_test_manager.worker_id,
+        triggered_by=current_user.id,
+    )
+    try:
+        load_test_manager.start(report.id)
+    except LoadTestBusyError as e:
+        report.status = "ERROR"
+        report.error_message = str(e)
+        db.commit()
+        raise HTTPException(status_code=409, detail="已有压测正在运行，请等待结束后再试")
+    return ApiResponse(data=report)
+
+@router.get("/{report_id}", response_model=ApiResponse[schemas.LoadTestReport])
+def read_load_test(
+    project_id: int,
+    report_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取压测报告详情（运行中时为最近一次写入的进度）
+    """
+    report = _get_project_load_test(db, project_id, report_id)
+    return ApiResponse(data=report)
+
+@router.post("/{report_id}/stop", response_model=ApiResponse[schemas.LoadTestReportSummary])
+def stop_load_test(
+    project_id: int,
+    report_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    停止运行中的压测：不再发送新请求，在途请求完成后报告置为 STOPPED
+    """
+    report = _get_project_load_test(db, project_id, report_id)
+    if report.status != "RUNNING":
+        raise HTTPException(status_code=400, detail="压测已结束")
+    if not load_test_manager.stop(report.id):
+        raise HTTPException(status_code=409, detail="该压测不在当前服务进程中运行")
+    return ApiResponse(data=report)
+
+@router.delete("/{report_id}", response_model=ApiResponse[schemas.LoadTestReportSummary])
+def delete_load_test(
+    project_id: int,
+    report_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    删除压测报告（运行中的压测需先停止）
+    """
+    report = _get_project_load_test(db, project_id, report_id)
+    if report.status == "RUNNING":
+        raise HTTPException(status_code=400, detail="压测正在运行，请先停止")
+    report = crud.crud_load_test.delete_load_test(db, report_id=report_id)
+    return ApiResponse(data=report)
@@ -0,0 +1,83 @@
+import os
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse, PlainTextResponse
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.api import deps
+from app.core.profiling import pstats_summary
+from app.schemas.response import ApiResponse
+from app.services.request_profiling import profile_path, remove_profile_file
+
+router = APIRouter()
+
+def _get_profile(db: Session, profile_id: int) -> models.RequestProfile:
+    profile = crud.crud_profile.get_profile(db, profile_id=profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="未找到该剖析记录")
+    return profile
+
+@router.get("/", response_model=ApiResponse[List[schemas.RequestProfile]])
+def read_profiles(
+    db: Session = Depends(deps.get_db),
+    route: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    current_user: models.User = Depends(deps.get_current_admin_user),
+) -> Any:
+    """
+    获取请求剖析记录（最新的在前），可按路由模板筛选（需要管理员权限）
+    剖析方式：管理员请求时带上请求头 X-Profile: 1（或 sampling / cprofile），或查询参数 __profile=1
+    """
+    profiles = crud.crud_profile.get_profiles(db, route=route, skip=skip, limit=limit)
+    return ApiResponse(data=profiles)
+
+@router.get("/{profile_id}", response_model=ApiResponse[schemas.RequestProfile])
+def read_profile(
+    profile_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_admin_user),
+) -> Any:
+    """
+    获取剖析记录详情（需要管理员权限）
+    """
+    return ApiResponse(data=_get_profile(db, profile_id))
+
+@router.get("/{profile_id}/download")
+def download_profile(
+    profile_id: int,
+    summary: bool = False,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_admin_user),
+) -> Any:
+    """
+    下载剖析文件（需要管理员权限）
+    - sampling: speedscope JSON，可直接导入 https://www.speedscope.app
+    - cprofile: pstats 文件，可用 python -m pstats / snakeviz 打开；summary=true 时返回按累计耗时排序的文本摘要
+    """
+    profile = _get_profile(db, profile_id)
+    path = profile_path(profile.storage_path)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="剖析文件不存在")
+    if summary:
+        if profile.file_format != "pstats":
+            raise HTTPException(status_code=400, detail="只有 cprofile 剖析支持文本摘要")
+        with open(path, "rb") as f:
+            return PlainTextResponse(pstats_summary(f.read()))
+    media_type = "application/json" if profile.file_format.endswith("json") else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=f"profile_{profile.id}.{profile.file_format}")
+
+@router.delete("/{profile_id}", response_model=ApiResponse[schemas.RequestProfile])
+def delete_profile(
+    profile_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_admin_user),
+) -> Any:
+    """
+    删除剖析记录及其文件（需要管理员权限）
+    """
+    _get_profile(db, profile_id)
+    profile = crud.crud_profile.delete_profile(db, profile_id=profile_id)
+    remove_profile_file(profile.storage_path)
+    return ApiResponse(data=profile)
@@ -1,26 +1,33 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
+from app.core.config import settings
+from app.services.project_archive import ARCHIVE_MEDIA_TYPE, ArchiveFormatError, import_project_archive, iter_project_archive
 
 router = APIRouter()
 
-from app.schemas.response import ApiResponse
+from app.crud.pagination import InvalidCursorError
+from app.schemas.response import ApiResponse, PaginatedResponse
 
-@router.get("/", response_model=ApiResponse[List[schemas.Project]])
-def read_projects(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_active_user),
+@router.get("/", response_model=ApiResponse[PaginatedResponse[schemas.Project]])
+async def read_projects(
+    db: AsyncSession = Depends(deps.get_async_db),
+    page_params: Dict[str, Any] = Depends(deps.pagination_params),
+    current_user: models.User = Depends(deps.get_current_active_user_async),
 ) -> Any:
     """
-    获取项目列表
+    获取项目列表（游标分页）
     """
-    projects = crud.crud_project.get_projects(db, skip=skip, limit=limit)
-    return ApiResponse(data=projects)
+    try:
+        page = await db.run_sync(crud.crud_project.get_projects, **page_params)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ApiResponse(data=page.to_response())
 
 @router.post("/", response_model=ApiResponse[schemas.Project])
 def create_project(
@@ -35,6 +42,47 @@ def create_project(
     project = crud.crud_project.create_project(db=db, project=project_in, owner_id=current_user.id)
     return ApiResponse(data=project)
 
+@router.post("/import", response_model=ApiResponse[schemas.ProjectImportResult])
+def import_project(
+    file: UploadFile = File(..., description="GET /projects/{project_id}/export 导出的项目归档（.zip）"),
+    name: Optional[str] = Query(None, max_length=128, description="新项目名称，默认使用归档中的项目名称"),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    从项目归档创建新项目（环境、接口及请求模板、用例），归档中的 ID 重映射为新 ID
+    逐表流式读取并批量插入，在一个事务中完成
+    """
+    if file.size is not None and file.size > settings.PROJECT_ARCHIVE_MAX_BYTES:
+        raise HTTPException(status_code=400, detail=f"文件大小超过上限 {settings.PROJECT_ARCHIVE_MAX_BYTES} 字节")
+    try:
+        result = import_project_archive(
+            db, file.file, owner_id=current_user.id, name=name, batch_size=settings.PROJECT_ARCHIVE_BATCH_SIZE,
+        )
+    except ArchiveFormatError as e:
+        raise HTTPException(status_code=400, detail=f"项目归档格式错误: {e}")
+    return ApiResponse(data=result)
+
+@router.get("/{project_id}/export")
+def export_project(
+    *,
+    db: Session = Depends(deps.get_db),
+    project_id: int,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    导出项目（环境、接口及请求模板、用例）为 zip 归档，每个表一个 JSONL 文件
+    以流式响应边查询边压缩输出，可通过 POST /projects/import 导入到其他实例
+    """
+    project = crud.crud_project.get_project(db=db, project_id=project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="未找到该项目")
+    return StreamingResponse(
+        iter_project_archive(db, project, batch_size=settings.PROJECT_ARCHIVE_BATCH_SIZE),
+        media_type=ARCHIVE_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="project_{project_id}.zip"'},
+    )
+
 @router.get("/{project_id}", response_model=ApiResponse[schemas.Project])
 def read_project(
     *,
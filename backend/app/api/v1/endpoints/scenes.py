@@ -0,0 +1,145 @@
+from typing import Any, List
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app import crud, models, schemas
+from app.api import deps
+from app.core.assertions import AssertionCompileError
+from app.core.config import settings
+from app.core.extractors import ExtractorCompileError
+from app.schemas.response import ApiResponse
+from app.services.scene_runner import compile_scene, run_scene, run_scene_rows
+
+router = APIRouter()
+
+def _get_project_scene(db: Session, project_id: int, scene_id: int) -> models.Scene:
+    scene = crud.crud_scene.get_scene(db=db, scene_id=scene_id)
+    if not scene or scene.project_id != project_id:
+        raise HTTPException(status_code=404, detail="未找到该场景")
+    return scene
+
+def _raise_missing_refs(missing: List[str]) -> None:
+    if missing:
+        raise HTTPException(status_code=404, detail=f"步骤引用的接口或用例不存在: {', '.join(missing)}")
+
+def _check_step_refs(db: Session, project_id: int, steps: List[schemas.SceneStepCreate]) -> None:
+    _raise_missing_refs(crud.crud_scene.find_missing_refs(db, project_id, steps))
+
+@router.get("/", response_model=ApiResponse[List[schemas.Scene]])
+def read_scenes(
+    project_id: int,
+    db: Session = Depends(deps.get_db),
+    skip: int = 0,
+    limit: int = 100,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取项目下的场景列表
+    """
+    project = crud.crud_project.get_project(db=db, project_id=project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="未找到该项目")
+    scenes = crud.crud_scene.get_scenes(db, project_id=project_id, skip=skip, limit=limit)
+    return ApiResponse(data=scenes)
+
+@router.post("/", response_model=ApiResponse[schemas.Scene])
+def create_scene(
+    project_id: int,
+    scene_in: schemas.SceneCreate,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    创建场景（连同步骤）
+    """
+    project = crud.crud_project.get_project(db=db, project_id=project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="未找到该项目")
+    _check_step_refs(db, project_id, scene_in.steps)
+    try:
+        scene = crud.crud_scene.create_scene(db=db, scene=scene_in, project_id=project_id)
+    except (AssertionCompileError, ExtractorCompileError) as e:
+        raise HTTPException(status_code=400, detail=f"场景配置错误: {e}")
+    return ApiResponse(data=scene)
+
+@router.get("/{scene_id}", response_model=ApiResponse[schemas.Scene])
+def read_scene(
+    project_id: int,
+    scene_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取场景详情（含步骤）
+    """
+    scene = _get_project_scene(db, project_id, scene_id)
+    return ApiResponse(data=scene)
+
+@router.put("/{scene_id}", response_model=ApiResponse[schemas.Scene])
+def update_scene(
+    project_id: int,
+    scene_id: int,
+    scene_in: schemas.SceneUpdate,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    更新场景；提供 steps 时整体替换步骤
+    """
+    scene = _get_project_scene(db, project_id, scene_id)
+    if scene_in.steps is not None:
+        _check_step_refs(db, project_id, scene_in.steps)
+    try:
+        scene = crud.crud_scene.update_scene(db=db, db_obj=scene, obj_in=scene_in)
+    except (AssertionCompileError, ExtractorCompileError) as e:
+        raise HTTPException(status_code=400, detail=f"场景配置错误: {e}")
+    return ApiResponse(data=scene)
+
+@router.delete("/{scene_id}", response_model=ApiResponse[schemas.Scene])
+def delete_scene(
+    project_id: int,
+    scene_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    删除场景
+    """
+    _get_project_scene(db, project_id, scene_id)
+    scene = crud.crud_scene.delete_scene(db=db, scene_id=scene_id)
+    return ApiResponse(data=scene)
+
+@router.post("/{scene_id}/run")
+async def run_scene_endpoint(
+    project_id: int,
+    scene_id: int,
+    run_in: schemas.SceneRunRequest,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    执行场景
+    - 未提供 rows 时执行一次，返回 SceneRunResult
+    - 提供 rows 时每行执行一次（行变量覆盖 variables），返回 SceneBatchRunResult
+    场景在执行前编译一次，数据驱动的各行共享编译结果；启用的步骤引用的接口或用例已删除时返回 404
+    """
+    scene = await run_in_threadpool(_get_project_scene, db, project_id, scene_id)
+    env = await run_in_threadpool(crud.crud_project.get_environment, db=db, environment_id=run_in.environment_id)
+    if not env or env.project_id != project_id:
+        raise HTTPException(status_code=404, detail="未找到该环境")
+
+    apis, cases = await run_in_threadpool(crud.crud_scene.get_step_refs, db, project_id, scene.steps)
+    # 步骤引用没有外键约束，保存后被引用的接口或用例可能已被删除
+    _raise_missing_refs(crud.crud_scene.missing_step_refs([s for s in scene.steps if s.enabled_flag], apis, cases))
+    plan = compile_scene(scene, env, apis, cases)
+
+    if run_in.rows is None:
+        outcome = await run_scene(plan, run_in.variables, include_body=run_in.include_body)
+        return ApiResponse[schemas.SceneRunResult](data=outcome)
+
+    concurrency = min(run_in.concurrency or settings.BATCH_DEFAULT_CONCURRENCY, settings.BATCH_MAX_CONCURRENCY)
+    summary = await run_scene_rows(
+        plan, run_in.rows, concurrency=concurrency, variables=run_in.variables, include_body=run_in.include_body
+    )
+    return ApiResponse[schemas.SceneBatchRunResult](data=summary)
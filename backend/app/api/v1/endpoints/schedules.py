@@ -0,0 +1,95 @@
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.api import deps
+from app.api.v1.endpoints.test_plans import _get_project_plan
+from app.core.cron import CronError
+from app.schemas.response import ApiResponse
+
+router = APIRouter()
+
+def _get_plan_schedule(db: Session, plan: models.TestPlan, schedule_id: int) -> models.PlanSchedule:
+    schedule = crud.crud_schedule.get_schedule(db=db, schedule_id=schedule_id)
+    if not schedule or schedule.plan_id != plan.id:
+        raise HTTPException(status_code=404, detail="未找到该调度")
+    return schedule
+
+def _check_environment(db: Session, project_id: int, environment_id: Optional[int]) -> None:
+    if environment_id is None:
+        return
+    env = crud.crud_project.get_environment(db=db, environment_id=environment_id)
+    if not env or env.project_id != project_id:
+        raise HTTPException(status_code=404, detail="未找到该环境")
+
+@router.get("/", response_model=ApiResponse[List[schemas.PlanSchedule]])
+def read_schedules(
+    project_id: int,
+    plan_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取测试计划的定时调度列表
+    """
+    plan = _get_project_plan(db, project_id, plan_id)
+    return ApiResponse(data=crud.crud_schedule.get_schedules(db, plan_id=plan.id))
+
+@router.post("/", response_model=ApiResponse[schemas.PlanSchedule])
+def create_schedule(
+    project_id: int,
+    plan_id: int,
+    schedule_in: schemas.PlanScheduleCreate,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    创建定时调度：按 cron 表达式定时执行测试计划
+    实际触发时间在 cron 时间后随机延迟 0 ~ jitter_seconds 秒，避免同一时刻的调度同时执行
+    """
+    plan = _get_project_plan(db, project_id, plan_id)
+    _check_environment(db, project_id, schedule_in.environment_id)
+    try:
+        schedule = crud.crud_schedule.create_schedule(db=db, schedule=schedule_in, plan=plan)
+    except CronError as e:
+        raise HTTPException(status_code=400, detail=f"调度配置错误: {e}")
+    return ApiResponse(data=schedule)
+
+@router.put("/{schedule_id}", response_model=ApiResponse[schemas.PlanSchedule])
+def update_schedule(
+    project_id: int,
+    plan_id: int,
+    schedule_id: int,
+    schedule_in: schemas.PlanScheduleUpdate,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    更新定时调度（修改 cron、时区、随机延迟或启用状态时重新计算下一次触发时间）
+    """
+    plan = _get_project_plan(db, project_id, plan_id)
+    schedule = _get_plan_schedule(db, plan, schedule_id)
+    _check_environment(db, project_id, schedule_in.environment_id)
+    try:
+        schedule = crud.crud_schedule.update_schedule(db=db, db_obj=schedule, obj_in=schedule_in)
+    except CronError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"调度配置错误: {e}")
+    return ApiResponse(data=schedule)
+
+@router.delete("/{schedule_id}", response_model=ApiResponse[schemas.PlanSchedule])
+def delete_schedule(
+    project_id: int,
+    plan_id: int,
+    schedule_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    删除定时调度（已入队的执行任务不受影响）
+    """
+    plan = _get_project_plan(db, project_id, plan_id)
+    _get_plan_schedule(db, plan, schedule_id)
+    schedule = crud.crud_schedule.delete_schedule(db=db, schedule_id=schedule_id)
+    return ApiResponse(data=schedule)
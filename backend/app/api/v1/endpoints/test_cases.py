@@ -1,32 +1,42 @@
-from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app import crud, models, schemas
 from app.api import deps
-from app.schemas.response import ApiResponse
-from app.core.runner import run_request
-from app.core.assertions import check_assertions
+from app.crud.pagination import InvalidCursorError
+from app.schemas.response import ApiResponse, PaginatedResponse
+from app.core.assertions import AssertionCompileError
+from app.core.config import settings
+from app.core.dataset import DatasetFormatError, dataset_path, detect_format, remove_dataset_file, store_dataset
+from app.services.dataset_runner import CaseTemplate, iter_dataset_results, run_dataset
+from app.services.executor import build_case_request, iter_case_results, run_case, run_cases
+from app.utils.sse import SSE_HEADERS, format_sse
 
 router = APIRouter()
 
-@router.get("/", response_model=ApiResponse[List[schemas.TestCase]])
-def read_test_cases(
+@router.get("/", response_model=ApiResponse[PaginatedResponse[schemas.TestCase]])
+async def read_test_cases(
     project_id: int,
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(deps.get_async_db),
+    page_params: Dict[str, Any] = Depends(deps.pagination_params),
+    current_user: models.User = Depends(deps.get_current_active_user_async),
 ) -> Any:
     """
-    获取项目下的用例列表
+    获取项目下的用例列表（游标分页）
     """
-    project = crud.crud_project.get_project(db=db, project_id=project_id)
+    project = await db.run_sync(crud.crud_project.get_project, project_id=project_id)
     if not project:
         raise HTTPException(status_code=404, detail="未找到该项目")
         
-    test_cases = crud.crud_test_case.get_test_cases(db, project_id=project_id, skip=skip, limit=limit)
-    return ApiResponse(data=test_cases)
+    try:
+        page = await db.run_sync(crud.crud_test_case.get_test_cases, project_id=project_id, **page_params)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ApiResponse(data=page.to_response())
 
 @router.post("/", response_model=ApiResponse[schemas.TestCase])
 def create_test_case(
@@ -42,20 +52,149 @@ def create_test_case(
     if not project:
         raise HTTPException(status_code=404, detail="未找到该项目")
         
-    test_case = crud.crud_test_case.create_test_case(db=db, test_case=test_case_in, project_id=project_id)
+    try:
+        test_case = crud.crud_test_case.create_test_case(db=db, test_case=test_case_in, project_id=project_id)
+    except AssertionCompileError as e:
+        raise HTTPException(status_code=400, detail=f"断言配置错误: {e}")
     return ApiResponse(data=test_case)
 
-@router.get("/{test_case_id}", response_model=ApiResponse[schemas.TestCase])
-def read_test_case(
+@router.post("/bulk", response_model=ApiResponse[schemas.TestCaseBulkResult])
+def bulk_write_test_cases(
     project_id: int,
-    test_case_id: int,
+    bulk_in: schemas.TestCaseBulkRequest,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    批量创建、更新与删除用例（一个事务），返回逐项结果
+    任一项校验失败时不写入任何数据，返回 400 与逐项结果（合法项为 not_applied）
+    """
+    total = len(bulk_in.create) + len(bulk_in.update) + len(bulk_in.delete)
+    if total > settings.TEST_CASE_BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"单次批量操作最多 {settings.TEST_CASE_BULK_MAX_ITEMS} 项")
+    project = crud.crud_project.get_project(db=db, project_id=project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="未找到该项目")
+
+    committed, items, storage_paths = crud.crud_test_case.bulk_write_test_cases(
+        db, project_id=project_id, create=bulk_in.create, update_items=bulk_in.update, delete_ids=bulk_in.delete
+    )
+    for storage_path in storage_paths:
+        remove_dataset_file(storage_path)
+    result = schemas.TestCaseBulkResult(
+        committed=committed,
+        created=sum(item["status"] == "created" for item in items),
+        updated=sum(item["status"] == "updated" for item in items),
+        deleted=sum(item["status"] == "deleted" for item in items),
+        failed=sum(item["status"] == "error" for item in items),
+        items=items,
+    )
+    if not committed:
+        return JSONResponse(
+            status_code=400,
+            content=ApiResponse(code=400, message="批量操作校验失败，未写入任何数据", data=result).model_dump(mode="json"),
+        )
+    return ApiResponse(data=result)
+
+async def _load_batch_cases(db: Session, project_id: int, batch_in: schemas.BatchRunRequest):
+    """校验批量执行请求，返回 (执行环境, 待执行用例)"""
+    project = await run_in_threadpool(crud.crud_project.get_project, db=db, project_id=project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="未找到该项目")
+
+    env = await run_in_threadpool(crud.crud_project.get_environment, db=db, environment_id=batch_in.environment_id)
+    if not env or env.project_id != project_id:
+        raise HTTPException(status_code=404, detail="未找到该环境")
+
+    test_cases = await run_in_threadpool(
+        crud.crud_test_case.get_test_cases_for_run,
+        db=db,
+        project_id=project_id,
+        test_case_ids=batch_in.test_case_ids,
+        module_name=batch_in.module_name,
+    )
+    if batch_in.test_case_ids and len(test_cases) != len(set(batch_in.test_case_ids)):
+        raise HTTPException(status_code=404, detail="部分用例不存在或不属于该项目")
+    return env, test_cases
+
+def _batch_options(batch_in: schemas.BatchRunRequest) -> dict:
+    return {
+        "concurrency": min(batch_in.concurrency or settings.BATCH_DEFAULT_CONCURRENCY, settings.BATCH_MAX_CONCURRENCY),
+        "per_host_rps": batch_in.per_host_rps if batch_in.per_host_rps is not None else settings.BATCH_PER_HOST_RPS,
+        "include_body": batch_in.include_body,
+    }
+
+@router.post("/batch-run", response_model=ApiResponse[schemas.BatchRunResult])
+async def batch_run_test_cases(
+    project_id: int,
+    batch_in: schemas.BatchRunRequest,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    批量并发执行用例
+    - 指定 test_case_ids 时执行这些用例，否则执行项目（或 module_name 指定模块）下的全部用例
+    - concurrency 控制最大并发数，per_host_rps 限制单主机每秒请求数
+    """
+    env, test_cases = await _load_batch_cases(db, project_id, batch_in)
+    summary = await run_cases(test_cases, env, **_batch_options(batch_in))
+    summary["results"] = [
+        {**r, "result": r["result"].model_dump()} for r in summary["results"]
+    ]
+    return ApiResponse(data=summary)
+
+@router.post("/batch-run/stream")
+async def stream_batch_run_test_cases(
+    project_id: int,
+    batch_in: schemas.BatchRunRequest,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    批量并发执行用例，以 SSE（text/event-stream）逐条推送执行进度
+    请求参数与 /batch-run 相同，事件依次为：
+    - start: {"total"}
+    - result: 单个用例的结果（不含响应体，除非 include_body）与累计计数 counters
+    - done: 汇总结果（不含 results）
+    - error: 执行异常 {"message"}
+    """
+    env, test_cases = await _load_batch_cases(db, project_id, batch_in)
+    options = _batch_options(batch_in)
+
+    async def event_stream():
+        total = len(test_cases)
+        counters = {"completed": 0, "passed": 0, "failed": 0, "errors": 0}
+        yield format_sse("start", {"total": total})
+        try:
+            async for item in iter_case_results(test_cases, env, queue_size=settings.SSE_QUEUE_SIZE, **options):
+                if item["type"] == "summary":
+                    yield format_sse("done", item["summary"])
+                    break
+                outcome = item["outcome"]
+                counters["completed"] += 1
+                counters["passed" if outcome["passed"] else "failed"] += 1
+                counters["errors"] += 1 if outcome["result"].error else 0
+                yield format_sse(
+                    "result",
+                    {**outcome, "result": outcome["result"].model_dump(), "counters": dict(counters)},
+                    event_id=counters["completed"],
+                )
+        except Exception as e:
+            yield format_sse("error", {"message": str(e)})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@router.get("/{test_case_id}", response_model=ApiResponse[schemas.TestCase])
+async def read_test_case(
+    project_id: int,
+    test_case_id: int,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_active_user_async),
 ) -> Any:
     """
     获取用例详情
     """
-    test_case = crud.crud_test_case.get_test_case(db=db, test_case_id=test_case_id)
+    test_case = await db.run_sync(crud.crud_test_case.get_test_case, test_case_id=test_case_id)
     if not test_case or test_case.project_id != project_id:
         raise HTTPException(status_code=404, detail="未找到该用例")
     return ApiResponse(data=test_case)
@@ -75,7 +214,10 @@ def update_test_case(
     if not test_case or test_case.project_id != project_id:
         raise HTTPException(status_code=404, detail="未找到该用例")
         
-    test_case = crud.crud_test_case.update_test_case(db=db, db_obj=test_case, obj_in=test_case_in)
+    try:
+        test_case = crud.crud_test_case.update_test_case(db=db, db_obj=test_case, obj_in=test_case_in)
+    except AssertionCompileError as e:
+        raise HTTPException(status_code=400, detail=f"断言配置错误: {e}")
     return ApiResponse(data=test_case)
 
 @router.delete("/{test_case_id}", response_model=ApiResponse[schemas.TestCase])
@@ -92,11 +234,15 @@ def delete_test_case(
     if not test_case or test_case.project_id != project_id:
         raise HTTPException(status_code=404, detail="未找到该用例")
         
+    dataset = test_case.dataset
+    storage_path = dataset.storage_path if dataset else None
     test_case = crud.crud_test_case.delete_test_case(db=db, test_case_id=test_case_id)
+    if storage_path:
+        remove_dataset_file(storage_path)
     return ApiResponse(data=test_case)
 
 @router.post("/{test_case_id}/run", response_model=ApiResponse[Any])
-def run_test_case(
+async def run_test_case(
     project_id: int,
     test_case_id: int,
     environment_id: int = Query(..., description="环境ID"),
@@ -104,67 +250,173 @@ def run_test_case(
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    执行用例
+    执行用例（async 接口，等待上游响应期间不占用线程池）
     """
-    test_case = crud.crud_test_case.get_test_case(db=db, test_case_id=test_case_id)
+    test_case = await run_in_threadpool(crud.crud_test_case.get_test_case, db=db, test_case_id=test_case_id)
     if not test_case or test_case.project_id != project_id:
         raise HTTPException(status_code=404, detail="未找到该用例")
     
     # Get Environment
-    env = crud.crud_project.get_environment(db=db, environment_id=environment_id)
+    env = await run_in_threadpool(crud.crud_project.get_environment, db=db, environment_id=environment_id)
     if not env:
         raise HTTPException(status_code=404, detail="未找到该环境")
     
-    # Prepare Request
-    base_url = env.base_url.rstrip("/")
-    path = test_case.url.lstrip("/")
-    url = f"{base_url}/{path}"
-    
-    headers = env.headers.copy() if env.headers else {}
-    if test_case.headers:
-        headers.update(test_case.headers)
-    
-    # Prepare body
-    json_body = None
-    data_body = None
-    if test_case.body:
-        if test_case.body_type == "json":
-            json_body = test_case.body
-        elif test_case.body_type == "form":
-            data_body = test_case.body
-        else:
-            data_body = test_case.body
-
     # Run Request
+    request_kwargs = build_case_request(test_case, env)
     try:
-        result = run_request(
-            method=test_case.method,
-            url=url,
-            params=test_case.params,
-            headers=headers,
-            json_body=json_body,
-            data_body=data_body
-        )
+        plan = crud.crud_test_case.get_assertion_plan(test_case)
+        outcome = await run_case(test_case.id, test_case.name, request_kwargs, plan)
     except Exception as e:
         return ApiResponse(code=500, message=f"Execution failed: {str(e)}")
 
-    # Check Assertions
-    assertion_results = []
-    if test_case.assertions:
-        # Convert result to dict for checking
-        response_data = {
-            "status_code": result.status_code,
-            "headers": result.headers,
-            "body": result.body,
-            "duration": result.duration
-        }
-        assertion_results = check_assertions(response_data, test_case.assertions)
-    
-    # Determine overall status
-    passed = all(r.get("passed", False) for r in assertion_results) if assertion_results else True
-    
     return ApiResponse(data={
-        "result": result,
-        "assertions": assertion_results,
-        "passed": passed
+        "result": outcome["result"],
+        "assertions": outcome["assertions"],
+        "passed": outcome["passed"]
     })
+
+def _get_case_dataset(db: Session, project_id: int, test_case_id: int) -> models.TestCaseDataset:
+    test_case = crud.crud_test_case.get_test_case(db=db, test_case_id=test_case_id)
+    if not test_case or test_case.project_id != project_id:
+        raise HTTPException(status_code=404, detail="未找到该用例")
+    dataset = crud.crud_test_case.get_dataset(db, test_case_id=test_case_id)
+    if not dataset:
+        raise HTTPException(status_code=404, detail="该用例未上传数据集")
+    return dataset
+
+@router.post("/{test_case_id}/dataset", response_model=ApiResponse[schemas.TestCaseDataset])
+def upload_dataset(
+    project_id: int,
+    test_case_id: int,
+    file: UploadFile = File(..., description="CSV（首行为列名）或 JSONL（每行一个 JSON 对象）"),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    上传用例的数据集（已有数据集时替换）
+    数据驱动执行时，用例的请求与断言中的 {{列名}} 会被替换为每行的值
+    """
+    test_case = crud.crud_test_case.get_test_case(db=db, test_case_id=test_case_id)
+    if not test_case or test_case.project_id != project_id:
+        raise HTTPException(status_code=404, detail="未找到该用例")
+    try:
+        file_format = detect_format(file.filename)
+        info = store_dataset(file.file, file_format, test_case_id, settings.DATASET_MAX_BYTES)
+    except DatasetFormatError as e:
+        raise HTTPException(status_code=400, detail=f"数据集格式错误: {e}")
+    try:
+        dataset, old_storage_path = crud.crud_test_case.save_dataset(
+            db, test_case_id=test_case_id, file_name=file.filename, file_format=file_format, info=info
+        )
+    except Exception:
+        remove_dataset_file(info["storage_path"])
+        raise
+    if old_storage_path:
+        remove_dataset_file(old_storage_path)
+    return ApiResponse(data=dataset)
+
+@router.get("/{test_case_id}/dataset", response_model=ApiResponse[schemas.TestCaseDataset])
+def read_dataset(
+    project_id: int,
+    test_case_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取用例的数据集信息
+    """
+    return ApiResponse(data=_get_case_dataset(db, project_id, test_case_id))
+
+@router.delete("/{test_case_id}/dataset", response_model=ApiResponse[schemas.TestCaseDataset])
+def delete_dataset(
+    project_id: int,
+    test_case_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    删除用例的数据集
+    """
+    dataset = _get_case_dataset(db, project_id, test_case_id)
+    dataset = crud.crud_test_case.delete_dataset(db, db_obj=dataset)
+    remove_dataset_file(dataset.storage_path)
+    return ApiResponse(data=dataset)
+
+async def _load_dataset_run(db: Session, project_id: int, test_case_id: int, run_in: schemas.DatasetRunRequest):
+    """校验数据驱动执行请求，返回 (用例渲染计划, 数据集, 执行参数)"""
+    dataset = await run_in_threadpool(_get_case_dataset, db, project_id, test_case_id)
+    env = await run_in_threadpool(crud.crud_project.get_environment, db=db, environment_id=run_in.environment_id)
+    if not env or env.project_id != project_id:
+        raise HTTPException(status_code=404, detail="未找到该环境")
+    template = await run_in_threadpool(CaseTemplate, dataset.test_case, env)
+    options = {
+        "concurrency": min(run_in.concurrency or settings.BATCH_DEFAULT_CONCURRENCY, settings.BATCH_MAX_CONCURRENCY),
+        "per_host_rps": run_in.per_host_rps if run_in.per_host_rps is not None else settings.BATCH_PER_HOST_RPS,
+    }
+    return template, dataset, options
+
+@router.post("/{test_case_id}/dataset/run", response_model=ApiResponse[schemas.DatasetRunResult])
+async def run_dataset_test_case(
+    project_id: int,
+    test_case_id: int,
+    run_in: schemas.DatasetRunRequest,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    数据驱动执行：用例按数据集逐行执行，返回汇总与失败行明细
+    数据集从磁盘逐行读取，以 concurrency 为上限并发执行，不会整体加载到内存
+    """
+    template, dataset, options = await _load_dataset_run(db, project_id, test_case_id, run_in)
+    try:
+        summary = await run_dataset(
+            template,
+            dataset_path(dataset.storage_path),
+            dataset.file_format,
+            max_failures=settings.DATASET_MAX_FAILURE_DETAILS,
+            **options,
+        )
+    except DatasetFormatError as e:
+        raise HTTPException(status_code=400, detail=f"数据集格式错误: {e}")
+    return ApiResponse(data=summary)
+
+@router.post("/{test_case_id}/dataset/run/stream")
+async def stream_dataset_test_case(
+    project_id: int,
+    test_case_id: int,
+    run_in: schemas.DatasetRunRequest,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    数据驱动执行，以 SSE（text/event-stream）逐行推送结果
+    事件依次为：
+    - start: {"total"}（上传时统计的行数）
+    - result: 单行的结果与累计计数 counters
+    - done: 汇总结果（不含 failures）
+    - error: 执行异常 {"message"}
+    """
+    template, dataset, options = await _load_dataset_run(db, project_id, test_case_id, run_in)
+    path = dataset_path(dataset.storage_path)
+    file_format = dataset.file_format
+    total = dataset.row_count
+
+    async def event_stream():
+        counters = {"completed": 0, "passed": 0, "failed": 0, "errors": 0}
+        yield format_sse("start", {"total": total})
+        try:
+            async for item in iter_dataset_results(
+                template, path, file_format, queue_size=settings.SSE_QUEUE_SIZE, **options
+            ):
+                if item["type"] == "summary":
+                    yield format_sse("done", item["summary"])
+                    break
+                outcome = item["outcome"]
+                counters["completed"] += 1
+                counters["passed" if outcome["passed"] else "failed"] += 1
+                counters["errors"] += 1 if outcome["error"] else 0
+                yield format_sse("result", {**outcome, "counters": dict(counters)}, event_id=counters["completed"])
+        except Exception as e:
+            yield format_sse("error", {"message": str(e)})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -0,0 +1,120 @@
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.api import deps
+from app.schemas.response import ApiResponse
+from app.services.job_queue import job_worker
+
+router = APIRouter()
+
+def _get_project_plan(db: Session, project_id: int, plan_id: int) -> models.TestPlan:
+    plan = crud.crud_test_plan.get_plan(db=db, plan_id=plan_id)
+    if not plan or plan.project_id != project_id:
+        raise HTTPException(status_code=404, detail="未找到该测试计划")
+    return plan
+
+@router.get("/", response_model=ApiResponse[List[schemas.TestPlan]])
+def read_test_plans(
+    project_id: int,
+    db: Session = Depends(deps.get_db),
+    skip: int = 0,
+    limit: int = 100,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取项目下的测试计划列表
+    """
+    project = crud.crud_project.get_project(db=db, project_id=project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="未找到该项目")
+    plans = crud.crud_test_plan.get_plans(db, project_id=project_id, skip=skip, limit=limit)
+    return ApiResponse(data=plans)
+
+@router.post("/", response_model=ApiResponse[schemas.TestPlan])
+def create_test_plan(
+    project_id: int,
+    plan_in: schemas.TestPlanCreate,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    创建测试计划
+    """
+    project = crud.crud_project.get_project(db=db, project_id=project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="未找到该项目")
+    plan = crud.crud_test_plan.create_plan(db=db, plan=plan_in, project_id=project_id)
+    return ApiResponse(data=plan)
+
+@router.get("/{plan_id}", response_model=ApiResponse[schemas.TestPlan])
+def read_test_plan(
+    project_id: int,
+    plan_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取测试计划详情
+    """
+    plan = _get_project_plan(db, project_id, plan_id)
+    return ApiResponse(data=plan)
+
+@router.put("/{plan_id}", response_model=ApiResponse[schemas.TestPlan])
+def update_test_plan(
+    project_id: int,
+    plan_id: int,
+    plan_in: schemas.TestPlanUpdate,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    更新测试计划
+    """
+    plan = _get_project_plan(db, project_id, plan_id)
+    plan = crud.crud_test_plan.update_plan(db=db, db_obj=plan, obj_in=plan_in)
+    return ApiResponse(data=plan)
+
+@router.delete("/{plan_id}", response_model=ApiResponse[schemas.TestPlan])
+def delete_test_plan(
+    project_id: int,
+    plan_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    删除测试计划（同时删除其执行报告）
+    """
+    _get_project_plan(db, project_id, plan_id)
+    plan = crud.crud_test_plan.delete_plan(db=db, plan_id=plan_id)
+    return ApiResponse(data=plan)
+
+@router.post("/{plan_id}/run", response_model=ApiResponse[schemas.PlanRunResponse])
+def run_test_plan(
+    project_id: int,
+    plan_id: int,
+    environment_id: Optional[int] = Query(None, description="环境ID，缺省使用计划的默认环境"),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    执行测试计划（异步任务）
+    立即返回任务ID（即报告ID），由后台工作线程执行，通过报告接口查询进度与结果
+    """
+    plan = _get_project_plan(db, project_id, plan_id)
+    if not plan.is_active:
+        raise HTTPException(status_code=400, detail="该测试计划已停用")
+
+    environment_id = environment_id or plan.environment_id
+    if not environment_id:
+        raise HTTPException(status_code=400, detail="请指定执行环境")
+    env = crud.crud_project.get_environment(db=db, environment_id=environment_id)
+    if not env or env.project_id != project_id:
+        raise HTTPException(status_code=404, detail="未找到该环境")
+
+    report = crud.crud_test_plan.create_report(
+        db=db, plan=plan, environment_id=env.id, triggered_by=current_user.id
+    )
+    job_worker.notify()
+    return ApiResponse(data={"job_id": report.id, "status": report.status})
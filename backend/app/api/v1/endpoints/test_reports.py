@@ -0,0 +1,182 @@
+import asyncio
+import time
+from datetime import date, timedelta
+from typing import Any, List, Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app import crud, models, schemas
+from app.api import deps
+from app.core.config import settings
+from app.schemas.response import ApiResponse
+from app.utils.sse import SSE_HEADERS, format_sse, format_sse_comment
+
+router = APIRouter()
+
+# 报告的终止状态，进入这些状态后不会再有新结果
+FINISHED_STATUSES = ("SUCCESS", "FAILED", "ERROR")
+
+def _get_project_report(db: Session, project_id: int, report_id: int) -> models.TestReport:
+    report = crud.crud_test_plan.get_report(db=db, report_id=report_id)
+    if not report or report.project_id != project_id:
+        raise HTTPException(status_code=404, detail="未找到该报告")
+    return report
+
+@router.get("/", response_model=ApiResponse[List[schemas.TestReport]])
+def read_test_reports(
+    project_id: int,
+    db: Session = Depends(deps.get_db),
+    plan_id: Optional[int] = Query(None, description="按测试计划筛选"),
+    skip: int = 0,
+    limit: int = 100,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取项目下的执行报告列表（按创建时间倒序）
+    """
+    reports = crud.crud_test_plan.get_reports(db, project_id=project_id, plan_id=plan_id, skip=skip, limit=limit)
+    return ApiResponse(data=reports)
+
+def _trend_range(days: int) -> tuple:
+    end_day = date.today()
+    return end_day - timedelta(days=days - 1), end_day
+
+@router.get("/trends", response_model=ApiResponse[List[schemas.TrendPoint]])
+def read_trend(
+    project_id: int,
+    db: Session = Depends(deps.get_db),
+    scope: Literal["project", "module", "case"] = Query("project", description="统计维度"),
+    key: Optional[str] = Query(None, description="模块名（scope=module）或用例ID（scope=case）"),
+    days: int = Query(30, ge=1, le=366, description="最近天数（含今天）"),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    通过率与耗时趋势：按天返回执行次数、通过 / 失败 / 出错数、通过率、平均耗时与 p50 / p95
+    读取报告结束时增量合并的按天汇总，不扫描结果表
+    """
+    if scope != "project" and not key:
+        raise HTTPException(status_code=400, detail="请指定模块名或用例ID")
+    start_day, end_day = _trend_range(days)
+    points = crud.crud_report_stats.get_trend(
+        db, project_id=project_id, start_day=start_day, end_day=end_day,
+        scope=scope, scope_key=key if scope != "project" else "",
+    )
+    return ApiResponse(data=points)
+
+@router.get("/trends/breakdown", response_model=ApiResponse[List[schemas.TrendBreakdownItem]])
+def read_trend_breakdown(
+    project_id: int,
+    db: Session = Depends(deps.get_db),
+    scope: Literal["module", "case"] = Query("case", description="统计维度"),
+    days: int = Query(7, ge=1, le=366, description="最近天数（含今天）"),
+    order_by: Literal["failed", "pass_rate", "runs"] = Query("failed", description="排序：失败数倒序、通过率正序或执行次数倒序"),
+    limit: int = Query(20, ge=1, le=200),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    时间范围内按模块或用例的汇总排行（如失败最多、通过率最低的用例），同样只读取按天汇总
+    """
+    start_day, end_day = _trend_range(days)
+    items = crud.crud_report_stats.get_breakdown(
+        db, project_id=project_id, scope=scope, start_day=start_day, end_day=end_day, order_by=order_by, limit=limit,
+    )
+    return ApiResponse(data=items)
+
+@router.get("/{report_id}", response_model=ApiResponse[schemas.TestReport])
+def read_test_report(
+    project_id: int,
+    report_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取执行报告（任务状态与进度）
+    """
+    report = _get_project_report(db, project_id, report_id)
+    return ApiResponse(data=report)
+
+@router.get("/{report_id}/results", response_model=ApiResponse[List[schemas.TestResult]])
+def read_test_results(
+    project_id: int,
+    report_id: int,
+    db: Session = Depends(deps.get_db),
+    passed: Optional[bool] = Query(None, description="按是否通过筛选"),
+    skip: int = 0,
+    limit: int = 100,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    获取执行报告中的用例结果
+    """
+    _get_project_report(db, project_id, report_id)
+    results = crud.crud_test_plan.get_results(db, report_id=report_id, passed=passed, skip=skip, limit=limit)
+    return ApiResponse(data=results)
+
+def _report_progress(report: models.TestReport) -> dict:
+    return {
+        "status": report.status,
+        "total": report.total_count,
+        "passed": report.passed_count,
+        "failed": report.failed_count,
+        "errors": report.error_count,
+    }
+
+@router.get("/{report_id}/events")
+async def stream_test_report_events(
+    project_id: int,
+    report_id: int,
+    db: Session = Depends(deps.get_db),
+    after_id: int = Query(0, description="只推送 ID 大于该值的结果"),
+    last_event_id: Optional[str] = Header(None),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    以 SSE（text/event-stream）推送执行报告的进度
+    - result: 新写入的用例结果与报告当前进度 progress，事件ID为结果ID
+    - done: 报告进入终止状态后推送最终进度并结束
+    断线重连时浏览器会通过 Last-Event-ID 请求头带回最后收到的结果ID，从该位置继续推送
+    """
+    await run_in_threadpool(_get_project_report, db, project_id, report_id)
+    if last_event_id and last_event_id.isdigit():
+        after_id = max(after_id, int(last_event_id))
+    # 请求作用域的会话在响应开始后即被关闭（FastAPI 0.118 之前），推送期间使用绑定同一引擎的独立会话
+    bind = db.get_bind()
+
+    def poll(stream_db: Session, last_id: int):
+        # 先读取报告状态再读取结果：报告已结束时其结果一定已全部提交
+        report = crud.crud_test_plan.get_report(stream_db, report_id=report_id)
+        rows = crud.crud_test_plan.get_results_after(stream_db, report_id=report_id, after_id=last_id, limit=settings.SSE_QUEUE_SIZE)
+        results = [schemas.TestResult.model_validate(row).model_dump() for row in rows]
+        progress = _report_progress(report)
+        # 结束只读事务，下次轮询才能看到其他连接新提交的数据（MySQL 默认可重复读）
+        stream_db.rollback()
+        # 清空身份映射，下次轮询重新加载报告的最新计数
+        stream_db.expunge_all()
+        return results, progress
+
+    async def event_stream():
+        stream_db = Session(bind=bind, autoflush=False)
+        last_id = after_id
+        last_sent = time.monotonic()
+        try:
+            while True:
+                results, progress = await run_in_threadpool(poll, stream_db, last_id)
+                for result in results:
+                    last_id = result["id"]
+                    yield format_sse("result", {**result, "progress": progress}, event_id=last_id)
+                    last_sent = time.monotonic()
+                if len(results) == settings.SSE_QUEUE_SIZE:
+                    continue
+                if progress["status"] in FINISHED_STATUSES:
+                    yield format_sse("done", progress)
+                    break
+                if time.monotonic() - last_sent >= settings.SSE_KEEPALIVE_SECONDS:
+                    yield format_sse_comment()
+                    last_sent = time.monotonic()
+                await asyncio.sleep(settings.SSE_POLL_INTERVAL)
+        finally:
+            await run_in_threadpool(stream_db.close)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
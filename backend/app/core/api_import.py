@@ -0,0 +1,265 @@
+import json
+import os
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+# 支持的导入格式：OpenAPI 3 / Swagger 2（JSON 或 YAML）、HAR（浏览器或抓包工具导出的 JSON）
+IMPORT_FORMATS = ("openapi", "swagger", "har")
+
+HTTP_METHODS = ("get", "post", "put", "patch", "delete", "head", "options", "trace")
+
+# HAR 中不写入请求模板的请求头（由执行引擎或环境配置决定）
+_HAR_SKIPPED_HEADERS = {"host", "content-length", "cookie", "connection", "accept-encoding"}
+
+# 由 schema 生成示例值时的最大嵌套深度（过深的结构不再展开）
+_MAX_SCHEMA_DEPTH = 8
+
+class ImportFormatError(ValueError):
+    """导入文件格式非法（由接口层转换为 400 错误）"""
+
+def load_document(source: BinaryIO, file_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    读取导入文件：.yaml / .yml 按 YAML 解析（需要安装 PyYAML），其余按 JSON 解析
+    异常: 文件无法解析或不是对象时抛出 ImportFormatError
+    """
+    ext = os.path.splitext(file_name or "")[1].lower()
+    try:
+        if ext in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportFormatError("导入 YAML 文件需要安装 PyYAML，或改用 JSON 格式") from None
+            document = yaml.safe_load(source)
+        else:
+            document = json.load(source)
+    except ImportFormatError:
+        raise
+    except UnicodeDecodeError:
+        raise ImportFormatError("文件必须使用 UTF-8 编码") from None
+    except Exception as e:
+        raise ImportFormatError(f"文件解析失败: {e}") from None
+    if not isinstance(document, dict):
+        raise ImportFormatError("文件内容必须是 JSON / YAML 对象")
+    return document
+
+def detect_document_format(document: Dict[str, Any]) -> str:
+    if str(document.get("openapi", "")).startswith("3"):
+        return "openapi"
+    if str(document.get("swagger", "")).startswith("2"):
+        return "swagger"
+    if isinstance(document.get("log"), dict) and isinstance(document["log"].get("entries"), list):
+        return "har"
+    raise ImportFormatError("无法识别的文件格式，仅支持 OpenAPI 3、Swagger 2 与 HAR")
+
+def iter_api_definitions(document: Dict[str, Any]) -> Tuple[str, Iterator[Dict[str, Any]]]:
+    """
+    解析导入文件中的接口定义
+    返回: (格式, 接口定义迭代器)，每个定义为 {"name", "method", "url_path", "module_name", "description", "request_template"}
+    """
+    file_format = detect_document_format(document)
+    if file_format == "har":
+        return file_format, _iter_har(document)
+    return file_format, _iter_openapi(document, file_format)
+
+# ---------------------------------------------------------------------------
+# OpenAPI 3 / Swagger 2
+# ---------------------------------------------------------------------------
+
+def _resolve(document: Dict[str, Any], node: Any, seen: Tuple[str, ...] = ()) -> Any:
+    """解析文档内的 $ref（#/components/... 或 #/definitions/...），外部引用与循环引用返回空对象"""
+    while isinstance(node, dict) and "$ref" in node:
+        ref = node["$ref"]
+        if not isinstance(ref, str) or not ref.startswith("#/") or ref in seen:
+            return {}
+        seen = seen + (ref,)
+        target: Any = document
+        for part in ref[2:].split("/"):
+            part = part.replace("~1", "/").replace("~0", "~")
+            if not isinstance(target, dict) or part not in target:
+                return {}
+            target = target[part]
+        node = target
+    return node
+
+def _schema_example(document: Dict[str, Any], schema: Any, depth: int = 0, seen: Tuple[str, ...] = ()) -> Any:
+    """
+    由 JSON Schema 生成示例值：优先 example / default / enum，否则按类型生成占位值
+    - seen: 展开路径上已经过的 $ref，再次遇到时（循环引用）返回 None
+    """
+    if isinstance(schema, dict) and isinstance(schema.get("$ref"), str):
+        if schema["$ref"] in seen:
+            return None
+        seen = seen + (schema["$ref"],)
+    schema = _resolve(document, schema)
+    if not isinstance(schema, dict) or depth > _MAX_SCHEMA_DEPTH:
+        return None
+    for key in ("example", "default"):
+        if key in schema:
+            return schema[key]
+    if schema.get("enum"):
+        return schema["enum"][0]
+    for key in ("allOf", "oneOf", "anyOf"):
+        if schema.get(key):
+            if key == "allOf":
+                merged: Dict[str, Any] = {}
+                for part in schema[key]:
+                    value = _schema_example(document, part, depth + 1, seen)
+                    if isinstance(value, dict):
+                        merged.update(value)
+                return merged
+            return _schema_example(document, schema[key][0], depth + 1, seen)
+    schema_type = schema.get("type")
+    if schema_type == "object" or "properties" in schema:
+        return {
+            name: _schema_example(document, prop, depth + 1, seen)
+            for name, prop in (schema.get("properties") or {}).items()
+        }
+    if schema_type == "array":
+        item = _schema_example(document, schema.get("items"), depth + 1, seen)
+        return [] if item is None else [item]
+    return {"string": "", "integer": 0, "number": 0, "boolean": False}.get(schema_type)
+
+def _parameter_value(document: Dict[str, Any], parameter: Dict[str, Any]) -> Any:
+    if "example" in parameter:
+        return parameter["example"]
+    examples = parameter.get("examples")
+    if isinstance(examples, dict) and examples:
+        first = _resolve(document, next(iter(examples.values())))
+        if isinstance(first, dict) and "value" in first:
+            return first["value"]
+    # Swagger 2 的参数直接带 type / default / enum
+    return _schema_example(document, parameter.get("schema", parameter))
+
+def _body_type(content_type: str) -> str:
+    if "json" in content_type:
+        return "json"
+    if "x-www-form-urlencoded" in content_type or "multipart/form-data" in content_type:
+        return "form"
+    return "raw"
+
+def _request_body(document: Dict[str, Any], operation: Dict[str, Any], parameters: List[Dict[str, Any]]) -> Tuple[Any, str, Optional[str]]:
+    """请求体示例、body_type 与 Content-Type"""
+    request_body = _resolve(document, operation.get("requestBody"))
+    if isinstance(request_body, dict) and isinstance(request_body.get("content"), dict) and request_body["content"]:
+        content = request_body["content"]
+        content_type = next((t for t in content if "json" in t), next(iter(content)))
+        media = content[content_type] or {}
+        if "example" in media:
+            body = media["example"]
+        elif isinstance(media.get("examples"), dict) and media["examples"]:
+            body = (_resolve(document, next(iter(media["examples"].values()))) or {}).get("value")
+        else:
+            body = _schema_example(document, media.get("schema"))
+        return body, _body_type(content_type), content_type
+
+    # Swagger 2：in=body 的参数为请求体，in=formData 的参数为表单字段
+    for parameter in parameters:
+        if parameter.get("in") == "body":
+            return _schema_example(document, parameter.get("schema")), "json", "application/json"
+    form = {p["name"]: _parameter_value(document, p) for p in parameters if p.get("in") == "formData"}
+    if form:
+        return form, "form", None
+    return None, "json", None
+
+def _iter_openapi(document: Dict[str, Any], file_format: str) -> Iterator[Dict[str, Any]]:
+    base_path = ""
+    if file_format == "swagger":
+        base_path = (document.get("basePath") or "").rstrip("/")
+    paths = document.get("paths")
+    if not isinstance(paths, dict):
+        raise ImportFormatError("文档缺少 paths")
+
+    for path, path_item in paths.items():
+        path_item = _resolve(document, path_item)
+        if not isinstance(path_item, dict):
+            continue
+        shared = path_item.get("parameters") or []
+        for method in HTTP_METHODS:
+            operation = path_item.get(method)
+            if not isinstance(operation, dict):
+                continue
+            # 操作级参数覆盖路径级同名参数
+            merged: Dict[Tuple[str, str], Dict[str, Any]] = {}
+            for parameter in list(shared) + list(operation.get("parameters") or []):
+                parameter = _resolve(document, parameter)
+                if isinstance(parameter, dict) and parameter.get("name"):
+                    merged[(parameter.get("in", ""), parameter["name"])] = parameter
+            parameters = list(merged.values())
+
+            grouped: Dict[str, Dict[str, Any]] = {"path": {}, "query": {}, "header": {}}
+            for parameter in parameters:
+                location = parameter.get("in")
+                if location in grouped:
+                    grouped[location][parameter["name"]] = _parameter_value(document, parameter)
+            body, body_type, content_type = _request_body(document, operation, parameters)
+            if content_type and body_type != "form":
+                grouped["header"].setdefault("Content-Type", content_type)
+
+            url_path = f"{base_path}{path}"
+            tags = operation.get("tags") or []
+            yield {
+                "name": (operation.get("summary") or operation.get("operationId") or f"{method.upper()} {url_path}")[:128],
+                "method": method.upper(),
+                "url_path": url_path,
+                "module_name": str(tags[0])[:128] if tags else None,
+                "description": operation.get("description"),
+                "request_template": {
+                    "path_params": grouped["path"] or None,
+                    "query_params": grouped["query"] or None,
+                    "headers": grouped["header"] or None,
+                    "body": body,
+                    "body_type": body_type,
+                },
+            }
+
+# ---------------------------------------------------------------------------
+# HAR
+# ---------------------------------------------------------------------------
+
+def _har_body(post_data: Any) -> Tuple[Any, str]:
+    if not isinstance(post_data, dict):
+        return None, "json"
+    mime_type = post_data.get("mimeType") or ""
+    text = post_data.get("text")
+    if "json" in mime_type and text:
+        try:
+            return json.loads(text), "json"
+        except ValueError:
+            return text, "raw"
+    if post_data.get("params"):
+        return {p.get("name"): p.get("value") for p in post_data["params"] if p.get("name")}, "form"
+    if "x-www-form-urlencoded" in mime_type and text:
+        return dict(parse_qsl(text, keep_blank_values=True)), "form"
+    return (text, "raw") if text else (None, "json")
+
+def _iter_har(document: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    for entry in document["log"]["entries"]:
+        request = entry.get("request") if isinstance(entry, dict) else None
+        if not isinstance(request, dict) or not request.get("url") or not request.get("method"):
+            continue
+        url = urlsplit(request["url"])
+        method = str(request["method"]).upper()
+        url_path = url.path or "/"
+        query = {q.get("name"): q.get("value") for q in request.get("queryString") or [] if q.get("name")}
+        if not query and url.query:
+            query = dict(parse_qsl(url.query, keep_blank_values=True))
+        headers = {
+            h["name"]: h.get("value")
+            for h in request.get("headers") or []
+            if h.get("name") and not h["name"].startswith(":") and h["name"].lower() not in _HAR_SKIPPED_HEADERS
+        }
+        body, body_type = _har_body(request.get("postData"))
+        yield {
+            "name": f"{method} {url_path}"[:128],
+            "method": method,
+            "url_path": url_path,
+            "module_name": None,
+            "description": f"从 HAR 导入: {request['url']}",
+            "request_template": {
+                "path_params": None,
+                "query_params": query or None,
+                "headers": headers or None,
+                "body": body,
+                "body_type": body_type,
+            },
+        }
@@ -1,90 +1,335 @@
-from typing import Any, Dict, List
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import logging
+import threading
+import time
+
+from app.core.config import settings
+from app.core.jsonpath import compile_jsonpath
+from app.core.metrics import assertion_evaluation_duration
+from app.core.timing import TIMING_PHASES
 
 logger = logging.getLogger(__name__)
 
-def check_assertions(response_data: Dict[str, Any], assertions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+# 支持的断言来源与运算符
+ASSERTION_SOURCES = ("status_code", "response_time", "header", "body")
+ASSERTION_OPERATORS = ("eq", "gt", "lt", "contains")
+
+class AssertionCompileError(ValueError):
+    """断言配置非法（保存用例时抛出，由接口层转换为 400 错误）"""
+
+class _EvalContext:
     """
-    Evaluate assertions against response data.
-    response_data: { "status_code": 200, "headers": {}, "body": {}, "duration": 0.1 }
-    assertions: [{"source": "status_code", "operator": "eq", "value": 200}, ...]
-    
-    Returns: List of assertions with 'result': True/False
+    单次响应的求值上下文，在同一响应的多条断言之间共享
+    小写响应头字典只在首次需要时构建一次
     """
-    results = []
-    if not assertions:
-        return results
+    __slots__ = ("response_data", "_lower_headers")
+
+    def __init__(self, response_data: Dict[str, Any]):
+        self.response_data = response_data
+        self._lower_headers: Optional[Dict[str, Any]] = None
+
+    @property
+    def lower_headers(self) -> Dict[str, Any]:
+        if self._lower_headers is None:
+            headers = self.response_data.get("headers") or {}
+            self._lower_headers = {k.lower(): v for k, v in headers.items()}
+        return self._lower_headers
+
+# 取值函数：(求值上下文) -> 实际值
+Extractor = Callable[[_EvalContext], Any]
+# 比较函数：(实际值) -> (是否通过, 用于展示的实际值)
+Comparator = Callable[[Any], Tuple[bool, Any]]
+
+def _extract_none(ctx: _EvalContext) -> Any:
+    return None
+
+def _extract_status_code(ctx: _EvalContext) -> Any:
+    return ctx.response_data.get("status_code")
+
+def _extract_duration(ctx: _EvalContext) -> Any:
+    return ctx.response_data.get("duration")
+
+def _make_phase_extractor(phase: str) -> Extractor:
+    def extract(ctx: _EvalContext) -> Any:
+        return (ctx.response_data.get("timings") or {}).get(phase)
+    return extract
+
+def _make_header_extractor(name: str) -> Extractor:
+    key = name.lower()
+
+    def extract(ctx: _EvalContext) -> Any:
+        return ctx.lower_headers.get(key)
+    return extract
 
-    for assertion in assertions:
-        source = assertion.get("source")
-        expression = assertion.get("expression")
-        operator = assertion.get("operator")
-        expected_value = assertion.get("value")
-        
+def _make_body_extractor(expression: str) -> Extractor:
+    compiled = compile_jsonpath(expression)
+
+    def extract(ctx: _EvalContext) -> Any:
+        return compiled.first(ctx.response_data.get("body"))  # Take first match
+    return extract
+
+def _make_eq(expected: Any) -> Comparator:
+    expected_str = str(expected)
+    # 期望值为整数时，数字字符串形式的实际值按整数比较
+    coerce_digits = isinstance(expected, int)
+
+    def compare(actual: Any) -> Tuple[bool, Any]:
+        if coerce_digits and isinstance(actual, str) and actual.isdigit():
+            actual = int(actual)
+        return str(actual) == expected_str, actual
+    return compare
+
+def _make_gt(expected: Any) -> Comparator:
+    expected_num = float(expected)
+
+    def compare(actual: Any) -> Tuple[bool, Any]:
+        return float(actual) > expected_num, actual
+    return compare
+
+def _make_lt(expected: Any) -> Comparator:
+    expected_num = float(expected)
+
+    def compare(actual: Any) -> Tuple[bool, Any]:
+        return float(actual) < expected_num, actual
+    return compare
+
+def _make_contains(expected: Any) -> Comparator:
+    expected_str = str(expected)
+
+    def compare(actual: Any) -> Tuple[bool, Any]:
+        return expected_str in str(actual), actual
+    return compare
+
+_COMPARATOR_FACTORIES: Dict[str, Callable[[Any], Comparator]] = {
+    "eq": _make_eq,
+    "gt": _make_gt,
+    "lt": _make_lt,
+    "contains": _make_contains,
+}
+
+class CompiledAssertion:
+    """
+    编译后的单条断言
+    - raw: 原始断言配置，原样带入结果
+    - extract: 取值函数
+    - compare: 比较函数
+    - error: 编译期发现的错误（仅非严格模式下出现），求值时直接判定为失败
+    """
+    __slots__ = ("raw", "extract", "compare", "error")
+
+    def __init__(
+        self,
+        raw: Dict[str, Any],
+        extract: Extractor,
+        compare: Optional[Comparator],
+        error: Optional[str] = None,
+    ):
+        self.raw = raw
+        self.extract = extract
+        self.compare = compare
+        self.error = error
+
+    def evaluate(self, ctx: _EvalContext) -> Dict[str, Any]:
         actual_value = None
-        error_msg = None
-        
+        passed = False
+        error_msg = self.error
         try:
-            # Extract value
-            if source == "status_code":
-                actual_value = response_data.get("status_code")
-            elif source == "response_time":
-                actual_value = response_data.get("duration")
-            elif source == "header":
-                headers = response_data.get("headers", {})
-                # Headers are usually case-insensitive, but here we assume dictionary access
-                # Convert headers to lower case keys for robust check
-                lower_headers = {k.lower(): v for k, v in headers.items()}
-                actual_value = lower_headers.get(expression.lower())
-            elif source == "body":
-                body = response_data.get("body")
-                if expression and expression.startswith("$"):
-                    # Use JSONPath
-                    try:
-                        from jsonpath_ng import parse
-                        jsonpath_expr = parse(expression)
-                        matches = [match.value for match in jsonpath_expr.find(body)]
-                        if matches:
-                            actual_value = matches[0] # Take first match
-                        else:
-                            actual_value = None
-                    except ImportError:
-                        error_msg = "JSONPath library not installed"
-                        logger.error(error_msg)
-                    except Exception as e:
-                        error_msg = str(e)
-                        logger.error(f"JSONPath error: {e}")
-                else:
-                    actual_value = None # Invalid expression
-            
-            # Compare
-            passed = False
-            if error_msg:
-                passed = False
-            else:
-                if operator == "eq":
-                    # Handle type conversion for comparison
-                    if isinstance(expected_value, int) and isinstance(actual_value, str) and actual_value.isdigit():
-                        actual_value = int(actual_value)
-                    passed = str(actual_value) == str(expected_value)
-                elif operator == "gt":
-                    passed = float(actual_value) > float(expected_value)
-                elif operator == "lt":
-                    passed = float(actual_value) < float(expected_value)
-                elif operator == "contains":
-                    passed = str(expected_value) in str(actual_value)
-                else:
-                    error_msg = f"Unknown operator: {operator}"
-
+            if self.extract is not None:
+                actual_value = self.extract(ctx)
+            if error_msg is None:
+                passed, actual_value = self.compare(actual_value)
         except Exception as e:
             passed = False
             error_msg = str(e)
-
-        results.append({
-            **assertion,
+        return {
+            **self.raw,
             "actual_value": actual_value,
             "passed": passed,
             "error": error_msg
-        })
-        
-    return results
+        }
+
+class AssertionPlan:
+    """
+    编译后的断言计划：保存用例时编译一次，执行时只需逐条求值
+    - needs_body: 是否有断言需要读取响应体（响应体断言，或针对 json_decode 耗时的响应时间断言）
+    """
+    __slots__ = ("assertions", "needs_body")
+
+    def __init__(self, assertions: List[CompiledAssertion]):
+        self.assertions = assertions
+        self.needs_body = any(
+            a.raw.get("source") == "body"
+            or (a.raw.get("source") == "response_time" and a.raw.get("expression") == "json_decode")
+            for a in assertions
+        )
+
+    def __len__(self) -> int:
+        return len(self.assertions)
+
+    def evaluate(self, response_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        对响应数据求值
+        response_data: { "status_code": 200, "headers": {}, "body": {}, "duration": 0.1, "timings": {} }
+        返回: 每条断言的结果，格式与 check_assertions 相同
+        """
+        started = time.perf_counter()
+        ctx = _EvalContext(response_data)
+        results = [assertion.evaluate(ctx) for assertion in self.assertions]
+        assertion_evaluation_duration.observe(time.perf_counter() - started)
+        return results
+
+def _compile_one(assertion: Any, strict: bool) -> CompiledAssertion:
+    """
+    编译单条断言
+    - strict=True: 配置非法时抛出 AssertionCompileError（保存用例时使用）
+    - strict=False: 兼容历史数据，保持旧版运行期行为，错误在求值时体现
+    """
+    if not isinstance(assertion, dict):
+        raise AssertionCompileError("断言必须是对象")
+    source = assertion.get("source")
+    expression = assertion.get("expression")
+    operator = assertion.get("operator")
+    expected_value = assertion.get("value")
+
+    def fail(message: str) -> CompiledAssertion:
+        if strict:
+            raise AssertionCompileError(message)
+        return CompiledAssertion(assertion, _extract_none, None, message)
+
+    # Extract value
+    if source == "status_code":
+        extract = _extract_status_code
+    elif source == "response_time":
+        # expression 为空时断言总耗时，否则断言指定阶段的耗时（见 TIMING_PHASES）
+        if not expression or expression == "total":
+            extract = _extract_duration
+        elif expression in TIMING_PHASES:
+            extract = _make_phase_extractor(expression)
+        elif strict:
+            raise AssertionCompileError(f"不支持的响应时间阶段: {expression}，可选: {', '.join(TIMING_PHASES)}")
+        else:
+            extract = _extract_duration  # 历史数据中 expression 未被使用，仍按总耗时断言
+    elif source == "header":
+        if not isinstance(expression, str) or not expression:
+            return fail("响应头断言需要填写响应头名称（expression）")
+        extract = _make_header_extractor(expression)
+    elif source == "body":
+        if isinstance(expression, str) and expression.startswith("$"):
+            try:
+                extract = _make_body_extractor(expression)
+            except ImportError:
+                error_msg = "JSONPath library not installed"
+                logger.error(error_msg)
+                return fail(error_msg)
+            except Exception as e:
+                logger.error(f"JSONPath error: {e}")
+                return fail(f"JSONPath 表达式解析失败: {e}")
+        else:
+            if strict:
+                raise AssertionCompileError("响应体断言的 expression 必须是以 $ 开头的 JSONPath 表达式")
+            extract = _extract_none  # Invalid expression
+    else:
+        if strict:
+            raise AssertionCompileError(f"不支持的断言来源: {source}")
+        extract = _extract_none
+
+    # Compare
+    factory = _COMPARATOR_FACTORIES.get(operator)
+    if factory is None:
+        if strict:
+            raise AssertionCompileError(f"不支持的断言运算符: {operator}")
+        return CompiledAssertion(assertion, extract, None, f"Unknown operator: {operator}")
+    try:
+        compare = factory(expected_value)
+    except (TypeError, ValueError) as e:
+        if strict:
+            raise AssertionCompileError(f"运算符 {operator} 的期望值必须是数字: {expected_value!r}")
+        return CompiledAssertion(assertion, extract, None, str(e))
+    return CompiledAssertion(assertion, extract, compare)
+
+def compile_assertions(assertions: Optional[List[Dict[str, Any]]], strict: bool = True) -> AssertionPlan:
+    """
+    将用例的断言配置编译为断言计划
+    - assertions: [{"source": "status_code", "operator": "eq", "value": 200}, ...]
+    - strict: 是否校验配置合法性，非法时抛出 AssertionCompileError（错误信息带断言序号）
+    """
+    compiled = []
+    for index, assertion in enumerate(assertions or []):
+        try:
+            compiled.append(_compile_one(assertion, strict))
+        except AssertionCompileError as e:
+            raise AssertionCompileError(f"第 {index + 1} 条断言: {e}") from None
+    return AssertionPlan(compiled)
+
+class AssertionPlanCache:
+    """
+    用例断言计划缓存：test_case_id -> (updated_at, 断言计划)
+    用例的 updated_at 变化后缓存自动失效；容量超过 maxsize 时淘汰最久未使用的计划
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._plans: "OrderedDict[int, Tuple[Optional[datetime], AssertionPlan]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def put(self, test_case_id: int, updated_at: Optional[datetime], plan: AssertionPlan) -> None:
+        with self._lock:
+            self._plans[test_case_id] = (updated_at, plan)
+            self._plans.move_to_end(test_case_id)
+            while len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+
+    def discard(self, test_case_id: int) -> None:
+        with self._lock:
+            self._plans.pop(test_case_id, None)
+
+    def get(
+        self,
+        test_case_id: int,
+        updated_at: Optional[datetime],
+        assertions: Optional[List[Dict[str, Any]]],
+    ) -> AssertionPlan:
+        """
+        获取用例的断言计划，未命中或已过期时以非严格模式重新编译（兼容历史数据）
+        """
+        with self._lock:
+            cached = self._plans.get(test_case_id)
+            if cached is not None and cached[0] == updated_at:
+                self.hits += 1
+                self._plans.move_to_end(test_case_id)
+                return cached[1]
+            self.misses += 1
+        plan = compile_assertions(assertions, strict=False)
+        self.put(test_case_id, updated_at, plan)
+        return plan
+
+    def stats(self) -> Dict[str, Any]:
+        """返回缓存统计：计划数、命中数、未命中数、命中率"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._plans),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+# 全局断言计划缓存
+plan_cache = AssertionPlanCache(maxsize=settings.ASSERTION_PLAN_CACHE_SIZE)
+
+def check_assertions(response_data: Dict[str, Any], assertions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Evaluate assertions against response data.
+    response_data: { "status_code": 200, "headers": {}, "body": {}, "duration": 0.1 }
+    assertions: [{"source": "status_code", "operator": "eq", "value": 200}, ...]
+
+    Returns: List of assertions with 'result': True/False
+    未预编译的断言在此临时以非严格模式编译；用例执行应优先使用缓存的断言计划
+    """
+    if not assertions:
+        return []
+    return compile_assertions(assertions, strict=False).evaluate(response_data)
@@ -0,0 +1,261 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager, nullcontext
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Optional
+
+import httpx
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import observe_outbound
+from app.core.runner import BodyCapture, PoolKey, RequestResult, make_pool_key, run_request
+from app.core.timing import track_phases
+
+def create_async_client(max_connections: int, keepalive_expiry: float) -> httpx.AsyncClient:
+    """
+    创建执行引擎使用的 httpx.AsyncClient
+    - max_connections: 单个主机的最大连接数（同时也是保持的空闲连接数）
+    - keepalive_expiry: 空闲连接保活秒数
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+    # 禁止客户端保存响应 Cookie，保证用例之间相互隔离
+    cookies = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+    return httpx.AsyncClient(limits=limits, cookies=cookies, follow_redirects=True)
+
+class AsyncClientPool:
+    """
+    异步执行引擎的 HTTP 客户端池
+
+    与同步引擎的 SessionPool 相同，按 (环境, 协议, 主机, 端口) 维护一个 httpx.AsyncClient，
+    等待上游响应时不占用线程池中的工作线程。
+
+    - max_clients: 每个事件循环最多保留的客户端数，超出时淘汰最久未使用且空闲的客户端
+    - pool_maxsize: 单个主机保持的最大连接数
+    - idle_timeout: 空闲连接保活秒数
+
+    注意：httpx.AsyncClient 与创建它的事件循环绑定，因此客户端按事件循环分别维护
+    （应用主循环、任务执行线程中的循环各自独立），循环结束前应调用 aclose() 释放连接；
+    未调用时，由 asyncio.run 关闭循环前的 shutdown_asyncgens 在该循环上关闭其客户端。
+    """
+
+    def __init__(self, max_clients: int = 64, pool_maxsize: int = 10, idle_timeout: float = 300.0):
+        self.max_clients = max_clients
+        self.pool_maxsize = pool_maxsize
+        self.idle_timeout = idle_timeout
+        # 事件循环 -> 该循环上的客户端（按最近使用排序）
+        self._clients_by_loop: Dict[asyncio.AbstractEventLoop, "OrderedDict[PoolKey, httpx.AsyncClient]"] = {}
+        # 事件循环 -> 守卫异步生成器：循环关闭前（asyncio.run 的 shutdown_asyncgens）在该循环上关闭其客户端
+        self._guards: Dict[asyncio.AbstractEventLoop, AsyncGenerator[None, None]] = {}
+        self._lock = threading.Lock()
+        # 客户端 -> 进行中的请求数，有进行中请求的客户端不会被淘汰
+        self._in_flight: Dict[httpx.AsyncClient, int] = {}
+        # 命中/未命中计数，供监控使用
+        self.hits = 0
+        self.misses = 0
+
+    def _new_client(self) -> httpx.AsyncClient:
+        return create_async_client(self.pool_maxsize, self.idle_timeout)
+
+    async def _loop_guard(self, loop: asyncio.AbstractEventLoop) -> AsyncGenerator[None, None]:
+        try:
+            yield
+        finally:
+            await self._close_loop(loop)
+
+    async def _loop_clients(self, loop: asyncio.AbstractEventLoop) -> "OrderedDict[PoolKey, httpx.AsyncClient]":
+        with self._lock:
+            clients = self._clients_by_loop.get(loop)
+            if clients is not None:
+                return clients
+            # 丢弃未经 shutdown_asyncgens 就关闭的循环（其客户端已无法在原循环上关闭）
+            for closed in [l for l in self._clients_by_loop if l.is_closed()]:
+                self._clients_by_loop.pop(closed)
+                self._guards.pop(closed, None)
+            clients = self._clients_by_loop[loop] = OrderedDict()
+            guard = self._guards[loop] = self._loop_guard(loop)
+        # 启动守卫使其登记到循环的异步生成器集合中
+        await guard.__anext__()
+        return clients
+
+    @asynccontextmanager
+    async def acquire(self, url: str, environment_id: Optional[int] = None) -> AsyncIterator[httpx.AsyncClient]:
+        """
+        取出目标地址对应的客户端，使用完毕后自动归还（需在事件循环中调用）
+        - url: 完整请求地址
+        - environment_id: 环境ID
+        """
+        loop = asyncio.get_running_loop()
+        clients = await self._loop_clients(loop)
+        key = make_pool_key(url, environment_id)
+        with self._lock:
+            client = clients.get(key)
+            if client is None:
+                self.misses += 1
+                client = self._new_client()
+                clients[key] = client
+                self._in_flight[client] = 1
+                for evicted in self._evict_overflow(clients):
+                    loop.create_task(evicted.aclose())
+            else:
+                self.hits += 1
+                clients.move_to_end(key)
+                self._in_flight[client] = self._in_flight.get(client, 0) + 1
+        try:
+            yield client
+        finally:
+            with self._lock:
+                remaining = self._in_flight[client] - 1
+                if remaining:
+                    self._in_flight[client] = remaining
+                else:
+                    del self._in_flight[client]
+
+    def _evict_overflow(self, clients: "OrderedDict[PoolKey, httpx.AsyncClient]") -> List[httpx.AsyncClient]:
+        """客户端数超过上限时淘汰最久未使用且没有进行中请求的客户端，返回待关闭的客户端（调用方需持有锁）"""
+        evicted: List[httpx.AsyncClient] = []
+        for key in list(clients.keys()):
+            if len(clients) <= self.max_clients:
+                break
+            if not self._in_flight.get(clients[key]):
+                evicted.append(clients.pop(key))
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        """返回客户端池统计信息：客户端数、命中数、未命中数、命中率"""
+        with self._lock:
+            size = sum(len(clients) for clients in self._clients_by_loop.values())
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "clients": size,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+        }
+
+    async def _close_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        with self._lock:
+            clients = self._clients_by_loop.pop(loop, {})
+            self._guards.pop(loop, None)
+        for client in clients.values():
+            await client.aclose()
+
+    async def aclose(self) -> None:
+        """关闭当前事件循环上的全部客户端并释放连接"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            guard = self._guards.get(loop)
+        if guard is not None:
+            await guard.aclose()
+        else:
+            await self._close_loop(loop)
+
+# 全局异步客户端池，由执行引擎统一持有
+client_pool = AsyncClientPool(
+    max_clients=settings.RUNNER_POOL_MAX_SESSIONS,
+    pool_maxsize=settings.RUNNER_POOL_MAXSIZE,
+    idle_timeout=settings.RUNNER_POOL_IDLE_TIMEOUT,
+)
+
+def _response_headers(response: httpx.Response) -> Dict[str, Any]:
+    """保留上游响应头的原始大小写，重复的响应头按逗号合并（与 requests 行为一致）"""
+    headers: Dict[str, Any] = {}
+    for raw_key, raw_value in response.headers.raw:
+        key = raw_key.decode("latin-1")
+        value = raw_value.decode("latin-1")
+        headers[key] = f"{headers[key]}, {value}" if key in headers else value
+    return headers
+
+async def run_request_async(
+    method: str,
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, Any]] = None,
+    json_body: Optional[Any] = None,
+    data_body: Optional[Any] = None,
+    timeout: float = 10.0,
+    environment_id: Optional[int] = None,
+    load_body: bool = True,
+    client: Optional[httpx.AsyncClient] = None
+) -> RequestResult:
+    """
+    异步执行 HTTP 请求，参数与返回值与 run_request 保持一致
+    响应体同样以流式读取并受 RUNNER_MAX_CAPTURE_BYTES 限制
+    - client: 使用指定的客户端（如压测专用客户端），为空时从全局客户端池中取出
+    """
+    with track_phases() as timer:
+        try:
+            # requests 会忽略值为 None 的查询参数，这里保持一致
+            if params:
+                params = {k: v for k, v in params.items() if v is not None}
+            request_kwargs: Dict[str, Any] = {}
+            # 与 requests 一致：同时提供时 data 优先于 json
+            if isinstance(data_body, (str, bytes)) and data_body:
+                request_kwargs["content"] = data_body
+            elif data_body:
+                request_kwargs["data"] = data_body
+            elif json_body is not None:
+                request_kwargs["json"] = json_body
+            acquired = nullcontext(client) if client is not None else client_pool.acquire(url, environment_id)
+            async with acquired as http_client:
+                request = http_client.build_request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    headers=headers,
+                    timeout=timeout,
+                    # 通过 httpcore 的 trace 事件统计建连与 TLS 握手耗时（代理与自定义传输同样生效）
+                    extensions={"trace": timer.trace},
+                    **request_kwargs
+                )
+                response = await http_client.send(request, stream=True)
+                timer.mark_headers()
+                try:
+                    capture = BodyCapture(settings.RUNNER_MAX_CAPTURE_BYTES, settings.RUNNER_SPOOL_MEMORY_BYTES)
+                    async for chunk in response.aiter_bytes(chunk_size=settings.RUNNER_READ_CHUNK_BYTES):
+                        if not capture.write(chunk):
+                            break
+                finally:
+                    await response.aclose()
+            duration = timer.finish()
+
+            result = RequestResult.from_capture(
+                status_code=response.status_code,
+                headers=_response_headers(response),
+                duration=duration,
+                capture=capture,
+                encoding=response.charset_encoding,
+                timings=timer.timings(),
+            )
+            observe_outbound("async", make_pool_key(url), duration, None)
+            if load_body:
+                result.load_body()
+            return result
+        except Exception as e:
+            duration = timer.finish()
+            observe_outbound("async", make_pool_key(url), duration, "error")
+            return RequestResult(
+                status_code=0,
+                headers={},
+                body=None,
+                duration=duration,
+                error=str(e) or e.__class__.__name__,
+                timings=timer.timings(),
+            )
+
+async def execute_request(**kwargs: Any) -> RequestResult:
+    """
+    按 RUNNER_MODE 选择执行引擎，供 async 接口调用
+    - async: 直接在事件循环中执行 run_request_async
+    - sync: 在线程池中执行同步的 run_request
+    参数与 run_request 相同
+    """
+    if settings.RUNNER_MODE == "sync":
+        return await run_in_threadpool(run_request, **kwargs)
+    return await run_request_async(**kwargs)
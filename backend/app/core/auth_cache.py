@@ -0,0 +1,99 @@
+import threading
+import time
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.models.user import User
+from app.utils.cache import TTLCache
+
+# 缓存的用户字段（User 表的全部列）
+_USER_COLUMNS = tuple(column.key for column in User.__table__.columns)
+
+class AuthCache:
+    """
+    已校验令牌 -> 用户快照 的缓存，避免每个请求都解码 JWT 并查询用户表
+
+    - 条目在 ttl 秒后过期，且不会晚于令牌自身的过期时间
+    - 通过 ORM 修改或删除用户时（见下方的 after_update / after_delete 监听），在 flush 与提交后各清除一次该用户的全部令牌
+    - 缓存保存在进程内：其他进程修改用户、或绕过 ORM 直接执行 UPDATE 时，最长 ttl 秒后生效
+
+    命中时返回新建的瞬态 User 对象（未关联数据库会话），只能读取列属性，不能访问关系属性。
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 30.0):
+        self._tokens: TTLCache[Dict[str, Any]] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.invalidations = 0
+
+    def get(self, token: str) -> Optional[User]:
+        snapshot = self._tokens.get(token)
+        if snapshot is None:
+            return None
+        return User(**snapshot)
+
+    def put(self, token: str, user: User, expires_at: Optional[float] = None) -> None:
+        """
+        缓存令牌对应的用户快照
+        - expires_at: 令牌过期时间（Unix 时间戳）
+        """
+        ttl = None
+        if expires_at is not None:
+            ttl = expires_at - time.time()
+            if ttl <= 0:
+                return
+        snapshot = {key: getattr(user, key) for key in _USER_COLUMNS}
+        self._tokens.set(token, snapshot, ttl=ttl)
+        with self._lock:
+            tokens = self._tokens_by_user.setdefault(user.id, set())
+            # 顺带清理已过期或被淘汰的令牌，避免索引无限增长
+            tokens.intersection_update([t for t in tokens if t in self._tokens])
+            tokens.add(token)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """清除该用户的全部缓存令牌"""
+        with self._lock:
+            tokens = self._tokens_by_user.pop(user_id, set())
+            self.invalidations += 1
+        for token in tokens:
+            self._tokens.pop(token)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens_by_user.clear()
+        self._tokens.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """返回缓存统计：条目数、命中/未命中/淘汰数、命中率、失效次数、是否启用"""
+        return {
+            **self._tokens.stats(),
+            "invalidations": self.invalidations,
+            "enabled": settings.AUTH_CACHE_ENABLED,
+        }
+
+# 全局认证缓存
+auth_cache = AuthCache(maxsize=settings.AUTH_CACHE_MAXSIZE, ttl=settings.AUTH_CACHE_TTL)
+
+# 会话中已刷新、待提交时需要再次清除的用户ID
+_PENDING_KEY = "auth_cache_user_ids"
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target: User) -> None:
+    # flush 时先清除一次；提交前其他请求仍可能读到旧行并重新写入缓存，因此记录下来在提交后再清除
+    auth_cache.invalidate_user(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        auth_cache.invalidate_user(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_users(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
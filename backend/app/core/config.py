@@ -1,12 +1,171 @@
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Slow Platform"
     API_V1_STR: str = "/api/v1"
     DATABASE_URL: str
+    # 异步数据库连接串（async 接口使用），为空时按 DATABASE_URL 推导，如 mysql+pymysql -> mysql+aiomysql
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # 数据库连接池：常驻连接数（同步与异步引擎各一个连接池）
+    DB_POOL_SIZE: int = 10
+    # 数据库连接池：常驻连接用尽时最多额外新建的连接数（归还后关闭）
+    DB_MAX_OVERFLOW: int = 20
+    # 数据库连接池：连接存活超过该秒数后在下次取用时替换，应小于 MySQL 的 wait_timeout
+    DB_POOL_RECYCLE: int = 3600
+    # 数据库连接池：连接用尽时取用连接的最长等待秒数，超时返回错误
+    DB_POOL_TIMEOUT: float = 30.0
+    # 数据库连接池：取用连接前的探活策略，always 每次探活，idle 只探活空闲较久的连接，never 不探活
+    DB_POOL_PRE_PING: Literal["always", "idle", "never"] = "idle"
+    # 数据库连接池：idle 策略下连接空闲超过该秒数才探活
+    DB_POOL_PRE_PING_IDLE: float = 60.0
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
 
+    # 认证缓存：是否缓存已校验的令牌与用户信息（关闭后每个请求都会解码令牌并查询用户）
+    AUTH_CACHE_ENABLED: bool = True
+    # 认证缓存：条目存活秒数，也是其他进程修改用户后本进程生效的最长延迟
+    AUTH_CACHE_TTL: float = 30.0
+    # 认证缓存：最多缓存的令牌数
+    AUTH_CACHE_MAXSIZE: int = 10000
+
+    # 执行引擎连接池：最多保留的会话数（每个 环境+协议+主机+端口 一个会话）
+    RUNNER_POOL_MAX_SESSIONS: int = 64
+    # 执行引擎连接池：单个主机保持的最大连接数
+    RUNNER_POOL_MAXSIZE: int = 10
+    # 执行引擎连接池：单主机连接数达到上限时是否阻塞等待（True 时严格限制并发连接数）
+    RUNNER_POOL_BLOCK: bool = False
+    # 执行引擎连接池：会话空闲超过该秒数后被回收
+    RUNNER_POOL_IDLE_TIMEOUT: float = 300.0
+    # 执行引擎：单个响应体最多捕获的字节数，超出部分丢弃并标记截断
+    RUNNER_MAX_CAPTURE_BYTES: int = 10 * 1024 * 1024
+    # 执行引擎：响应体超过该字节数后转存到临时文件，不再占用内存
+    RUNNER_SPOOL_MEMORY_BYTES: int = 1024 * 1024
+    # 执行引擎：流式读取响应体的分块大小
+    RUNNER_READ_CHUNK_BYTES: int = 64 * 1024
+
+    # 执行引擎模式：async 使用非阻塞 HTTP 客户端（httpx），sync 使用线程池中的同步 requests 引擎
+    RUNNER_MODE: Literal["async", "sync"] = "async"
+
+    # 批量执行：默认并发数与允许的最大并发数
+    BATCH_DEFAULT_CONCURRENCY: int = 10
+    BATCH_MAX_CONCURRENCY: int = 50
+    # 批量执行：单主机每秒请求数上限，0 表示不限速
+    BATCH_PER_HOST_RPS: float = 0.0
+
+    # 压力测试：同一进程内同时运行的压测数上限
+    LOAD_TEST_MAX_RUNNING: int = 1
+    # 压力测试：单次压测最长持续秒数
+    LOAD_TEST_MAX_DURATION: float = 3600.0
+    # 压力测试：最大并发数（闭环模型的虚拟用户数 / 开环模型的在途请求上限）
+    LOAD_TEST_MAX_CONCURRENCY: int = 1000
+    # 压力测试：开环模型的最大目标 RPS
+    LOAD_TEST_MAX_RPS: float = 10000.0
+    # 压力测试：进度写入数据库的间隔秒数
+    LOAD_TEST_PROGRESS_INTERVAL: float = 2.0
+    # 压力测试：延迟直方图精度（子桶二进制位数，相对误差约 2^-(bits-1)）
+    LOAD_TEST_HISTOGRAM_BITS: int = 7
+
+    # 执行进度推送（SSE）：批量执行时等待推送的结果队列长度，客户端读取变慢时执行会被暂停
+    SSE_QUEUE_SIZE: int = 100
+    # 执行进度推送（SSE）：跟踪计划报告时轮询新结果的间隔秒数
+    SSE_POLL_INTERVAL: float = 1.0
+    # 执行进度推送（SSE）：没有新事件时发送保活注释的间隔秒数
+    SSE_KEEPALIVE_SECONDS: float = 15.0
+
+    # 数据驱动执行：数据集文件存放目录
+    DATASET_DIR: str = "data/datasets"
+    # 数据驱动执行：上传数据集的最大字节数
+    DATASET_MAX_BYTES: int = 200 * 1024 * 1024
+    # 数据驱动执行：每次从文件读取的行数（在线程池中读取，避免阻塞事件循环）
+    DATASET_READ_BATCH_SIZE: int = 500
+    # 数据驱动执行：汇总结果中最多返回的失败行明细数
+    DATASET_MAX_FAILURE_DETAILS: int = 100
+
+    # 批量写入用例：一次请求中创建、更新与删除的用例总数上限
+    TEST_CASE_BULK_MAX_ITEMS: int = 5000
+
+    # 接口导入：上传的 OpenAPI / Swagger / HAR 文件的最大字节数
+    API_IMPORT_MAX_BYTES: int = 50 * 1024 * 1024
+    # 接口导入：每个事务写入的接口数
+    API_IMPORT_BATCH_SIZE: int = 500
+
+    # 项目导入：上传的项目归档（zip）的最大字节数
+    PROJECT_ARCHIVE_MAX_BYTES: int = 500 * 1024 * 1024
+    # 项目导出 / 导入：服务端游标每次读取的行数与每条批量插入语句的行数
+    PROJECT_ARCHIVE_BATCH_SIZE: int = 1000
+
+    # 运行指标：是否开启 /metrics 接口（Prometheus 文本格式）及接口延迟、数据库事件的采集
+    METRICS_ENABLED: bool = True
+
+    # SQL 统计：是否按请求统计 SQL 语句数与耗时（响应头 X-Query-Count / X-Query-Time）
+    QUERY_STATS_ENABLED: bool = True
+    # SQL 统计：同一语句在一个请求内执行达到该次数时记录疑似 N+1 查询的警告
+    QUERY_STATS_REPEAT_THRESHOLD: int = 5
+    # SQL 统计：一个请求执行的语句数超过该值时记录警告
+    QUERY_STATS_WARN_COUNT: int = 50
+
+    # 请求剖析：是否允许管理员通过请求头 X-Profile 或查询参数 __profile 剖析单个请求（关闭时不安装中间件）
+    PROFILING_ENABLED: bool = True
+    # 请求剖析：随机抽样剖析的请求比例（0~1），0 表示只剖析管理员显式要求的请求
+    PROFILING_SAMPLE_RATE: float = 0.0
+    # 请求剖析：默认剖析方式，sampling 为采样（speedscope JSON），cprofile 为确定性剖析（pstats）
+    PROFILING_DEFAULT_MODE: Literal["sampling", "cprofile"] = "sampling"
+    # 请求剖析：采样间隔秒数
+    PROFILING_SAMPLE_INTERVAL: float = 0.001
+    # 请求剖析：剖析文件存放目录
+    PROFILING_DIR: str = "data/profiles"
+    # 请求剖析：最多保留的剖析记录数，超出时删除最早的记录与文件
+    PROFILING_MAX_PROFILES: int = 200
+
+    # 列表分页：单页最大条数
+    PAGINATION_MAX_LIMIT: int = 500
+    # 列表分页：总数缓存的存活秒数（新增/删除数据时立即失效）
+    PAGINATION_COUNT_CACHE_TTL: float = 30.0
+    # 列表分页：总数缓存最多保存的筛选条件数
+    PAGINATION_COUNT_CACHE_SIZE: int = 1024
+
+    # JSONPath 编译缓存容量（按表达式字符串缓存）
+    JSONPATH_CACHE_SIZE: int = 1024
+    # 简单路径（如 $.data.items[0].id）是否跳过完整解析器直接求值
+    JSONPATH_FAST_PATH: bool = True
+
+    # 变量模板（{{var}}）编译缓存容量（按模板字符串缓存）
+    TEMPLATE_CACHE_SIZE: int = 4096
+
+    # 断言计划缓存容量（按用例缓存编译后的断言）
+    ASSERTION_PLAN_CACHE_SIZE: int = 4096
+
+    # 计划执行任务队列：是否在应用进程内启动工作线程
+    JOB_WORKER_ENABLED: bool = True
+    # 计划执行任务队列：同时执行的任务数
+    JOB_MAX_WORKERS: int = 2
+    # 计划执行任务队列：轮询待执行任务的间隔秒数
+    JOB_POLL_INTERVAL: float = 2.0
+    # 计划执行任务队列：任务心跳超过该秒数视为执行进程已退出，重新入队
+    JOB_STALE_SECONDS: float = 300.0
+
+    # 计划执行结果写入：缓冲多少条结果后批量写入数据库
+    RESULT_WRITER_BATCH_SIZE: int = 200
+    # 计划执行结果写入：结果最长缓冲秒数（同时也是任务心跳的刷新间隔）
+    RESULT_WRITER_FLUSH_INTERVAL: float = 1.0
+
+    # 定时调度：是否在应用进程内启动调度线程（多个进程同时启动时，通过数据库租约只有一个进程负责触发）
+    SCHEDULER_ENABLED: bool = True
+    # 定时调度：检查到期调度的间隔秒数（cron 精确到分钟）
+    SCHEDULER_POLL_INTERVAL: float = 5.0
+    # 定时调度：领导者租约的秒数，领导者进程退出后其他进程最迟在该时间后接管
+    SCHEDULER_LOCK_TTL: float = 30.0
+    # 定时调度：默认随机延迟的最大秒数，避免同一时刻的调度同时触发（调度未设置 jitter_seconds 时使用）
+    SCHEDULER_JITTER_SECONDS: int = 30
+    # 定时调度：默认错过触发时间的容忍秒数，超过则视为错过（misfire）不再执行
+    SCHEDULER_MISFIRE_GRACE_SECONDS: int = 300
+    # 定时调度：不合并（coalesce=false）时，一次补跑的最大次数
+    SCHEDULER_MAX_CATCHUP_RUNS: int = 10
+    # 定时调度：每轮最多处理的到期调度数
+    SCHEDULER_BATCH_SIZE: int = 100
+
     model_config = SettingsConfigDict(env_file=".env", env_ignore_empty=True)
 
 settings = Settings()
@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta
+from typing import FrozenSet, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# 标准 5 段 cron 表达式：分 时 日 月 周（周日为 0 或 7）
+# 支持 *、列表（1,15）、范围（1-5）、步长（*/10、8-18/2）、月份与星期的英文缩写，以及 @hourly 等简写
+_MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+_MONTH_NAMES = {name: i for i, name in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1)}
+_DAY_NAMES = {name: i for i, name in enumerate(("sun", "mon", "tue", "wed", "thu", "fri", "sat"))}
+
+# (字段名, 最小值, 最大值, 名称表)
+_FIELDS = (
+    ("minute", 0, 59, None),
+    ("hour", 0, 23, None),
+    ("day", 1, 31, None),
+    ("month", 1, 12, _MONTH_NAMES),
+    ("weekday", 0, 7, _DAY_NAMES),
+)
+
+# 查找下一次触发时间的最大跨度（如 2 月 30 日这类永不触发的表达式）
+_MAX_SEARCH_YEARS = 5
+
+class CronError(ValueError):
+    """cron 表达式或时区非法"""
+
+def _parse_value(text: str, low: int, high: int, names: Optional[dict]) -> int:
+    value = names.get(text.lower()) if names else None
+    if value is None:
+        if not text.isdigit():
+            raise CronError(f"无法解析的取值: {text}")
+        value = int(text)
+    if not low <= value <= high:
+        raise CronError(f"取值 {value} 超出范围 {low}-{high}")
+    return value
+
+def _parse_field(text: str, name: str, low: int, high: int, names: Optional[dict]) -> FrozenSet[int]:
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            if not step_text.isdigit() or int(step_text) == 0:
+                raise CronError(f"{name} 字段的步长非法: {step_text}")
+            step = int(step_text)
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_text, end_text = part.split("-", 1)
+            start, end = _parse_value(start_text, low, high, names), _parse_value(end_text, low, high, names)
+            if start > end:
+                raise CronError(f"{name} 字段的范围非法: {part}")
+        else:
+            start = _parse_value(part, low, high, names)
+            # 单个值带步长（如 5/15）表示从该值开始到最大值
+            end = high if step > 1 else start
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+def get_timezone(name: Optional[str]) -> Optional[ZoneInfo]:
+    """时区名称（如 Asia/Shanghai）转为 ZoneInfo，None 表示服务器本地时间"""
+    if not name:
+        return None
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise CronError(f"未知的时区: {name}") from None
+
+class CronExpression:
+    """
+    解析后的 cron 表达式
+    日与周同时限定时（均不以 * 开头），满足其一即触发，否则需同时满足（与 crontab 一致）
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression.strip()
+        text = _MACROS.get(self.expression.lower(), self.expression)
+        parts = text.split()
+        if len(parts) != 5:
+            raise CronError("cron 表达式必须为 5 段：分 时 日 月 周")
+        fields = [_parse_field(part, *spec) for part, spec in zip(parts, _FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = fields
+        # 7 与 0 均表示周日；转换为 datetime.weekday() 的编号（周一为 0）
+        self.weekdays = frozenset((day - 1) % 7 for day in weekdays)
+        self._day_any = parts[2].startswith("*")
+        self._weekday_any = parts[4].startswith("*")
+
+    def __repr__(self) -> str:
+        return f"CronExpression({self.expression!r})"
+
+    def _day_matches(self, value: datetime) -> bool:
+        in_days = value.day in self.days
+        in_weekdays = value.weekday() in self.weekdays
+        if self._day_any or self._weekday_any:
+            return in_days and in_weekdays
+        return in_days or in_weekdays
+
+    def next_after(self, after: datetime) -> datetime:
+        """
+        严格晚于 after 的下一次触发时间（精确到分钟，不含时区信息的墙上时间）
+        异常: 表达式在 5 年内不会触发时抛出 CronError
+        """
+        value = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = after + timedelta(days=366 * _MAX_SEARCH_YEARS)
+        while value <= limit:
+            if value.month not in self.months:
+                year, month = (value.year + 1, 1) if value.month == 12 else (value.year, value.month + 1)
+                value = value.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(value):
+                value = value.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if value.hour not in self.hours:
+                value = value.replace(minute=0) + timedelta(hours=1)
+                continue
+            if value.minute not in self.minutes:
+                value += timedelta(minutes=1)
+                continue
+            return value
+        raise CronError(f"cron 表达式 {self.expression} 在 {_MAX_SEARCH_YEARS} 年内不会触发")
+
+def next_fire_time(expression: CronExpression, after: datetime, timezone: Optional[ZoneInfo] = None) -> datetime:
+    """
+    下一次触发时间，返回服务器本地时间（不含时区信息，与数据库中的其他时间字段一致）
+    - after: 服务器本地时间
+    - timezone: 表达式所在的时区，None 表示服务器本地时间
+    """
+    if timezone is None:
+        return expression.next_after(after)
+    wall = after.astimezone(timezone).replace(tzinfo=None)
+    fire = expression.next_after(wall).replace(tzinfo=timezone)
+    return fire.astimezone().replace(tzinfo=None)
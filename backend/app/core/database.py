@@ -1,17 +1,61 @@
-from sqlalchemy import create_engine
+from datetime import datetime
+from typing import AsyncGenerator
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from app.core.config import settings
+from app.core.db_pool import create_pooled_engine
 
-# SQLAlchemy 2.0 style
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+# SQLAlchemy 2.0 style；连接池大小、超时与探活策略见 Settings 中的 DB_POOL_* 配置
+engine = create_pooled_engine(settings.DATABASE_URL, "sync")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 同步驱动 -> 对应的异步驱动（未配置 ASYNC_DATABASE_URL 时按 DATABASE_URL 推导）
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+def async_database_url(url: str) -> str:
+    """同步数据库连接串对应的异步连接串，已是异步驱动或无法识别时原样返回"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername)
+    if driver is None:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+# 异步引擎：async 接口通过 AsyncSession 访问数据库，不占用线程池
+# expire_on_commit=False：提交后不过期已加载的属性，返回给接口序列化时不会触发（异步下不允许的）隐式查询
+async_engine = create_pooled_engine(
+    settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL), "async", asyncio=True
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 class Base(DeclarativeBase):
     pass
 
+def now_seconds() -> datetime:
+    """
+    当前时间（截断到秒），用作按时间分页的列的默认值
+    在应用内生成而不是由数据库 now() 生成，所有数据库中保存的精度一致，
+    分页游标中的时间可以与列直接比较（SQLite 以文本保存时间，精度不同时比较结果错误）
+    """
+    return datetime.now().replace(microsecond=0)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    异步数据库会话，供 async 接口使用
+    CRUD 模块的同步函数通过 await db.run_sync(crud_func, ...) 调用，在同一事件循环中执行，无需切换到线程池
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,109 @@
+import csv
+import json
+import os
+import uuid
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterator, List
+
+from app.core.config import settings
+
+# 支持的数据集格式：CSV（首行为列名，值均为字符串）；JSONL（每行一个 JSON 对象，保留值类型）
+DATASET_FORMATS = ("csv", "jsonl")
+
+_EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+# 复制上传文件时每次读取的字节数
+_COPY_CHUNK_BYTES = 1024 * 1024
+
+class DatasetFormatError(ValueError):
+    """数据集文件格式非法（上传时抛出，由接口层转换为 400 错误）"""
+
+def detect_format(file_name: str) -> str:
+    """根据文件扩展名判断数据集格式"""
+    ext = os.path.splitext(file_name or "")[1].lower()
+    if ext not in _EXTENSIONS:
+        raise DatasetFormatError(f"不支持的文件类型: {ext or file_name}，仅支持 .csv / .jsonl")
+    return _EXTENSIONS[ext]
+
+def dataset_path(storage_path: str) -> str:
+    """数据集的存储路径（相对 DATASET_DIR）转换为文件路径"""
+    return os.path.join(settings.DATASET_DIR, storage_path)
+
+def iter_dataset_rows(path: str, file_format: str) -> Iterator[Dict[str, Any]]:
+    """
+    逐行读取数据集，每次只在内存中保留当前行
+    - CSV: 首行为列名，每行产出 {列名: 字符串值}
+    - JSONL: 跳过空行，每行必须是 JSON 对象
+    异常: 行格式非法时抛出 DatasetFormatError（错误信息带行号）
+    """
+    if file_format == "csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            if not reader.fieldnames:
+                return
+            for row in reader:
+                if None in row:
+                    raise DatasetFormatError(f"第 {reader.line_num} 行的列数多于表头")
+                yield row
+        return
+
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                raise DatasetFormatError(f"第 {line_no} 行不是合法的 JSON: {e}") from None
+            if not isinstance(row, dict):
+                raise DatasetFormatError(f"第 {line_no} 行必须是 JSON 对象")
+            yield row
+
+def read_batch(rows: Iterator[Dict[str, Any]], size: int) -> List[Dict[str, Any]]:
+    """从行迭代器中读取至多 size 行（供 asyncio.to_thread 调用，文件读取不阻塞事件循环）"""
+    return list(islice(rows, size))
+
+def store_dataset(source: BinaryIO, file_format: str, test_case_id: int, max_bytes: int) -> Dict[str, Any]:
+    """
+    将上传的数据集分块复制到 DATASET_DIR，并逐行扫描校验格式、统计行数
+    - source: 上传文件对象
+    - max_bytes: 文件大小上限
+    返回: {"storage_path", "size_bytes", "row_count", "columns"}
+    异常: 文件过大或格式非法时抛出 DatasetFormatError，已写入的文件会被删除
+    """
+    os.makedirs(settings.DATASET_DIR, exist_ok=True)
+    storage_path = f"case_{test_case_id}_{uuid.uuid4().hex}.{file_format}"
+    path = dataset_path(storage_path)
+    size = 0
+    try:
+        with open(path, "wb") as out:
+            while True:
+                chunk = source.read(_COPY_CHUNK_BYTES)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise DatasetFormatError(f"文件大小超过上限 {max_bytes} 字节")
+                out.write(chunk)
+
+        row_count = 0
+        columns: List[str] = []
+        try:
+            for row in iter_dataset_rows(path, file_format):
+                if row_count == 0:
+                    columns = list(row.keys())
+                row_count += 1
+        except UnicodeDecodeError:
+            raise DatasetFormatError("文件必须使用 UTF-8 编码") from None
+        if row_count == 0:
+            raise DatasetFormatError("数据集没有数据行")
+    except BaseException:
+        remove_dataset_file(storage_path)
+        raise
+    return {"storage_path": storage_path, "size_bytes": size, "row_count": row_count, "columns": columns}
+
+def remove_dataset_file(storage_path: str) -> None:
+    try:
+        os.remove(dataset_path(storage_path))
+    except FileNotFoundError:
+        pass
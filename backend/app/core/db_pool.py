@@ -0,0 +1,190 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Type
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 取用连接前的探活策略：
+# - always: 每次取用都先执行一次探活（SQLAlchemy pool_pre_ping），多一次往返
+# - idle: 只对空闲超过 DB_POOL_PRE_PING_IDLE 秒的连接探活，刚归还的连接直接使用
+# - never: 不探活，依赖 pool_recycle 在服务端断开前替换连接
+PRE_PING_STRATEGIES = ("always", "idle", "never")
+
+db_pool_wait_duration = metrics.registry.register(metrics.Histogram(
+    "slow_db_pool_wait_seconds",
+    "Time spent obtaining a connection from the pool (queue wait plus new connection)",
+    ("engine",),
+    metrics.DB_BUCKETS,
+))
+db_pool_timeouts = metrics.registry.register(metrics.Counter(
+    "slow_db_pool_timeouts_total",
+    "Checkouts that gave up after pool_timeout because the pool was exhausted",
+    ("engine",),
+))
+
+class PoolWaitStats:
+    """连接池取用连接的等待统计（取用次数、累计/最长等待秒数、超时次数）"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def record(self, wait: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            if wait > self.max_wait:
+                self.max_wait = wait
+        db_pool_wait_duration.observe(wait, self.name)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+        db_pool_timeouts.inc(self.name)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "total_wait": self.total_wait,
+                "avg_wait": self.total_wait / self.checkouts if self.checkouts else 0.0,
+                "max_wait": self.max_wait,
+                "timeouts": self.timeouts,
+            }
+
+class _TimedPoolMixin:
+    """
+    计量 QueuePool 取用连接的耗时：排队等待空闲连接，或在 max_overflow 内新建连接
+    统计对象作为类属性，连接池重建（engine.dispose / recreate）后继续累计
+    """
+
+    wait_stats: PoolWaitStats
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.wait_stats.record_timeout()
+            logger.warning(
+                "Database pool %s exhausted: no connection within %ss (size=%s, overflow=%s)",
+                self.wait_stats.name, self._timeout, self.size(), self.overflow(),
+            )
+            raise
+        self.wait_stats.record(time.perf_counter() - started)
+        return record
+
+# 引擎名 -> 引擎，供 pool_report 汇总
+_pools: Dict[str, Any] = {}
+_pools_lock = threading.Lock()
+
+def _timed_pool_class(base: Type[Pool], stats: PoolWaitStats) -> Type[Pool]:
+    return type(base.__name__, (_TimedPoolMixin, base), {"wait_stats": stats})
+
+def _is_sqlite_memory(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and (
+        parsed.database in (None, "", ":memory:") or parsed.query.get("mode") == "memory"
+    )
+
+def _install_idle_pre_ping(engine: Engine, idle: float) -> None:
+    """
+    空闲探活：连接归还时记录时间，取用时空闲超过 idle 秒才执行 SELECT 1
+    探活失败时抛出 DisconnectionError，连接池丢弃该连接并重新取用（SQLAlchemy 的悲观断线处理方式）
+    """
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record) -> None:
+        connection_record.info["last_checkin"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        last_checkin = connection_record.info.get("last_checkin")
+        if last_checkin is None or time.monotonic() - last_checkin < idle:
+            return
+        try:
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+        except Exception as e:
+            raise exc.DisconnectionError(f"idle connection failed pre-ping: {e}") from e
+
+def create_pooled_engine(
+    url: str,
+    name: str,
+    asyncio: bool = False,
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+    pool_recycle: Optional[int] = None,
+    pool_timeout: Optional[float] = None,
+    pre_ping: Optional[str] = None,
+    pre_ping_idle: Optional[float] = None,
+    **kwargs: Any,
+) -> Any:
+    """
+    按配置创建数据库引擎（未传入的连接池参数取 Settings 中的 DB_POOL_* 配置）
+    - name: 引擎名，用于连接池统计与指标标签
+    - asyncio: 是否创建 AsyncEngine
+    SQLite 内存数据库使用单连接池，不支持连接池大小等参数，只应用探活策略
+    """
+    pre_ping = pre_ping or settings.DB_POOL_PRE_PING
+    if pre_ping not in PRE_PING_STRATEGIES:
+        raise ValueError(f"不支持的探活策略: {pre_ping}")
+    options: Dict[str, Any] = {"pool_pre_ping": pre_ping == "always", **kwargs}
+    if not _is_sqlite_memory(url) and "poolclass" not in kwargs:
+        options.update(
+            poolclass=_timed_pool_class(AsyncAdaptedQueuePool if asyncio else QueuePool, PoolWaitStats(name)),
+            pool_size=settings.DB_POOL_SIZE if pool_size is None else pool_size,
+            max_overflow=settings.DB_MAX_OVERFLOW if max_overflow is None else max_overflow,
+            pool_recycle=settings.DB_POOL_RECYCLE if pool_recycle is None else pool_recycle,
+            pool_timeout=settings.DB_POOL_TIMEOUT if pool_timeout is None else pool_timeout,
+        )
+    engine = create_async_engine(url, **options) if asyncio else create_engine(url, **options)
+    if pre_ping == "idle":
+        idle = settings.DB_POOL_PRE_PING_IDLE if pre_ping_idle is None else pre_ping_idle
+        _install_idle_pre_ping(engine.sync_engine if asyncio else engine, idle)
+    with _pools_lock:
+        _pools[name] = engine
+    return engine
+
+def pool_status(engine: Any) -> Dict[str, Any]:
+    """
+    连接池状态：池大小、已取用（checked_out）、空闲（checked_in）、溢出连接数，以及取用等待统计
+    overflow 为当前超出 pool_size 的连接数（连接池尚未建满时为 0）
+    """
+    pool = engine.sync_engine.pool if isinstance(engine, AsyncEngine) else engine.pool
+    status: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    stats: Optional[PoolWaitStats] = getattr(pool, "wait_stats", None)
+    if stats is not None:
+        status.update(stats.stats())
+    return status
+
+def pool_report() -> List[Dict[str, Any]]:
+    """已创建的全部引擎的连接池状态"""
+    with _pools_lock:
+        pools = list(_pools.items())
+    return [{"engine": name, **pool_status(engine)} for name, engine in pools]
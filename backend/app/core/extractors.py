@@ -0,0 +1,87 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.jsonpath import compile_jsonpath
+
+# 支持的变量提取来源（与断言来源保持一致）
+EXTRACT_SOURCES = ("status_code", "header", "body")
+
+class ExtractorCompileError(ValueError):
+    """变量提取配置非法（保存场景时抛出，由接口层转换为 400 错误）"""
+
+# 提取函数：(状态码, 小写响应头, 响应体) -> 变量值
+ExtractFunc = Callable[[int, Dict[str, Any], Any], Any]
+
+class CompiledExtractor:
+    """
+    编译后的变量提取规则
+    - variable_name: 写入场景上下文的变量名
+    - source: 提取来源
+    - extract: 提取函数，JSONPath 已预编译
+    """
+    __slots__ = ("variable_name", "source", "extract")
+
+    def __init__(self, variable_name: str, source: str, extract: ExtractFunc):
+        self.variable_name = variable_name
+        self.source = source
+        self.extract = extract
+
+def _compile_one(rule: Any) -> CompiledExtractor:
+    if not isinstance(rule, dict):
+        raise ExtractorCompileError("提取规则必须是对象")
+    name = rule.get("variable_name")
+    source = rule.get("source")
+    expression = rule.get("expression")
+    if not isinstance(name, str) or not name.isidentifier():
+        raise ExtractorCompileError(f"变量名必须是合法的标识符: {name!r}")
+
+    if source == "status_code":
+        return CompiledExtractor(name, source, lambda status, headers, body: status)
+    if source == "header":
+        if not isinstance(expression, str) or not expression:
+            raise ExtractorCompileError("响应头提取需要填写响应头名称（expression）")
+        key = expression.lower()
+        return CompiledExtractor(name, source, lambda status, headers, body: headers.get(key))
+    if source == "body":
+        if not isinstance(expression, str) or not expression.startswith("$"):
+            raise ExtractorCompileError("响应体提取的 expression 必须是以 $ 开头的 JSONPath 表达式")
+        try:
+            compiled = compile_jsonpath(expression)
+        except Exception as e:
+            raise ExtractorCompileError(f"JSONPath 表达式解析失败: {e}")
+        return CompiledExtractor(name, source, lambda status, headers, body: compiled.first(body))
+    raise ExtractorCompileError(f"不支持的提取来源: {source}")
+
+def compile_extractors(rules: Optional[List[Dict[str, Any]]]) -> List[CompiledExtractor]:
+    """
+    编译变量提取规则
+    - rules: [{"variable_name": "token", "source": "body", "expression": "$.data.token"}, ...]
+    异常: 配置非法时抛出 ExtractorCompileError（错误信息带规则序号）
+    """
+    compiled = []
+    for index, rule in enumerate(rules or []):
+        try:
+            compiled.append(_compile_one(rule))
+        except ExtractorCompileError as e:
+            raise ExtractorCompileError(f"第 {index + 1} 条提取规则: {e}") from None
+    return compiled
+
+def run_extractors(
+    extractors: List[CompiledExtractor],
+    status_code: int,
+    headers: Dict[str, Any],
+    body: Any,
+) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    对响应执行提取规则
+    返回: (提取到的变量, 未提取到值的变量名列表)
+    """
+    lower_headers = {k.lower(): v for k, v in headers.items()} if any(e.source == "header" for e in extractors) else {}
+    values: Dict[str, Any] = {}
+    missing: List[str] = []
+    for extractor in extractors:
+        value = extractor.extract(status_code, lower_headers, body)
+        if value is None:
+            missing.append(extractor.variable_name)
+        else:
+            values[extractor.variable_name] = value
+    return values, missing
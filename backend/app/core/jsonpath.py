@@ -0,0 +1,110 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from app.core.config import settings
+
+# 简单路径的语法：$ 后跟若干 .name、['name'] 或 [数字] 片段，例如 $.data.items[0].id
+_SIMPLE_PATH_RE = re.compile(
+    r"""^\$(?:\.[A-Za-z_][A-Za-z0-9_\-]*|\[\d+\]|\['[^'"\\*,.]*'\]|\["[^'"\\*,.]*"\])*$"""
+)
+_SEGMENT_RE = re.compile(
+    r"""\.([A-Za-z_][A-Za-z0-9_\-]*)|\[(\d+)\]|\['([^'"\\*,.]*)'\]|\["([^'"\\*,.]*)"\]"""
+)
+
+class FastPath:
+    """
+    简单路径的快速求值器，跳过完整的 JSONPath 解析器
+
+    只支持字段访问与非负下标，求值结果与 jsonpath_ng 取第一个匹配值一致：
+    字段只能从对象中读取，下标只能作用于数组或字符串，路径不存在时返回 None。
+    """
+    __slots__ = ("expression", "steps")
+
+    def __init__(self, expression: str, steps: Tuple[Union[str, int], ...]):
+        self.expression = expression
+        self.steps = steps
+
+    def first(self, data: Any) -> Any:
+        current = data
+        for step in self.steps:
+            if isinstance(step, int):
+                if isinstance(current, (list, str)) and step < len(current):
+                    current = current[step]
+                else:
+                    return None
+            else:
+                if isinstance(current, dict) and step in current:
+                    current = current[step]
+                else:
+                    return None
+        return current
+
+class ParsedPath:
+    """由 jsonpath_ng 解析得到的完整 JSONPath 表达式"""
+    __slots__ = ("expression", "compiled")
+
+    def __init__(self, expression: str, compiled: Any):
+        self.expression = expression
+        self.compiled = compiled
+
+    def first(self, data: Any) -> Any:
+        matches = self.compiled.find(data)
+        return matches[0].value if matches else None
+
+    def all(self, data: Any) -> List[Any]:
+        return [match.value for match in self.compiled.find(data)]
+
+CompiledPath = Union[FastPath, ParsedPath]
+
+# jsonpath_ng 的保留字，出现在点号字段中时交给完整解析器处理（与其报错行为保持一致）
+_RESERVED_WORDS = {"where", "wherenot"}
+
+def _parse_simple_path(expression: str) -> Optional[Tuple[Union[str, int], ...]]:
+    """将简单路径拆分为字段/下标序列，包含保留字时返回 None"""
+    steps: List[Union[str, int]] = []
+    for field, index, single_quoted, double_quoted in _SEGMENT_RE.findall(expression[1:]):
+        if index:
+            steps.append(int(index))
+        elif field:
+            if field in _RESERVED_WORDS:
+                return None
+            steps.append(field)
+        else:
+            steps.append(single_quoted or double_quoted)
+    return tuple(steps)
+
+# 编译方式统计：快速路径 / 完整解析器
+_compile_counts: Dict[str, int] = {"fast_path": 0, "parser": 0}
+
+@lru_cache(maxsize=settings.JSONPATH_CACHE_SIZE)
+def compile_jsonpath(expression: str) -> CompiledPath:
+    """
+    编译 JSONPath 表达式，结果按表达式字符串缓存（LRU，容量由 JSONPATH_CACHE_SIZE 配置）
+    - 开启 JSONPATH_FAST_PATH 且表达式为简单路径时返回 FastPath，不经过 jsonpath_ng
+    - 其他表达式使用 jsonpath_ng 解析
+    异常: 未安装 jsonpath_ng 时抛出 ImportError；表达式非法时抛出解析异常（异常不会被缓存）
+    """
+    if settings.JSONPATH_FAST_PATH and _SIMPLE_PATH_RE.match(expression):
+        steps = _parse_simple_path(expression)
+        if steps is not None:
+            _compile_counts["fast_path"] += 1
+            return FastPath(expression, steps)
+
+    from jsonpath_ng import parse
+    compiled = ParsedPath(expression, parse(expression))
+    _compile_counts["parser"] += 1
+    return compiled
+
+def jsonpath_cache_stats() -> Dict[str, Any]:
+    """返回 JSONPath 编译缓存统计：命中数、未命中数、当前大小、容量、命中率，以及两种编译方式的次数"""
+    info = compile_jsonpath.cache_info()
+    total = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "hit_rate": info.hits / total if total else 0.0,
+        **_compile_counts,
+    }
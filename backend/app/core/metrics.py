@@ -0,0 +1,337 @@
+import bisect
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import Pool
+
+# 常用的延迟分桶（秒）
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 数据库查询与断言求值耗时更短，分桶更细
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+FAST_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05)
+
+Labels = Tuple[str, ...]
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class Counter:
+    """只增计数器，按标签值分别计数"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labelvalues, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+class Histogram:
+    """
+    固定分桶的直方图，按标签值分别统计（与 Prometheus histogram 格式一致）
+    observe 只做一次二分查找与几次加法，适合在请求路径上调用
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 每组标签: [各桶计数（非累计，末尾为 +Inf）, 总和, 次数]
+        self._series: Dict[Labels, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labelvalues: str) -> int:
+        series = self._series.get(labelvalues)
+        return series[2] if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = [(labels, list(s[0]), s[1], s[2]) for labels, s in self._series.items()]
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        bucket_names = self.labelnames + ("le",)
+        for labelvalues, counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(bucket_names, labelvalues + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+class GaugeFunc:
+    """
+    在导出时才取值的指标：collect 返回 [(标签值元组, 数值), ...]
+    用于连接池、缓存等已有 stats() 的组件，平时不产生任何开销
+    - metric_type: gauge，或取值只增时为 counter
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        collect: Callable[[], Iterable[Tuple[Labels, float]]],
+        metric_type: str = "gauge",
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+        self.metric_type = metric_type
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        for labelvalues, value in self.collect():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+class MetricsRegistry:
+    """进程内指标注册表，render() 输出 Prometheus 文本格式（text/plain; version=0.0.4）"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Any) -> Any:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"指标已注册: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+# 全局指标注册表
+registry = MetricsRegistry()
+
+http_request_duration = registry.register(Histogram(
+    "slow_http_request_duration_seconds",
+    "Platform API request latency by route template",
+    ("method", "route", "status"),
+))
+_http_requests_in_progress = 0
+
+db_query_duration = registry.register(Histogram(
+    "slow_db_query_duration_seconds",
+    "Database statement execution time by statement type",
+    ("operation",),
+    DB_BUCKETS,
+))
+db_transaction_duration = registry.register(Histogram(
+    "slow_db_transaction_duration_seconds",
+    "ORM session transaction time from begin to commit or rollback",
+    ("outcome",),
+    DB_BUCKETS,
+))
+db_connection_checkouts = registry.register(Counter(
+    "slow_db_connection_checkouts_total",
+    "Connections checked out of the database pool",
+))
+
+runner_request_duration = registry.register(Histogram(
+    "slow_runner_request_duration_seconds",
+    "Outbound request latency of the execution engine by environment",
+    ("engine", "environment", "outcome"),
+))
+
+assertion_evaluation_duration = registry.register(Histogram(
+    "slow_assertion_evaluation_seconds",
+    "Time spent evaluating a compiled assertion plan against one response",
+    (),
+    FAST_BUCKETS,
+))
+
+def observe_outbound(engine: str, pool_key: Tuple[Any, str, str, int], duration: float, error: Optional[str]) -> None:
+    """
+    记录执行引擎一次上游请求的耗时
+    - pool_key: make_pool_key 的结果，按环境ID 区分；未选择环境的调试请求统一记为 none
+      （请求地址由用户输入，按主机区分会使标签数量无限增长）
+    """
+    environment_id = pool_key[0]
+    environment = "none" if environment_id is None else str(environment_id)
+    runner_request_duration.observe(duration, engine, environment, "error" if error else "ok")
+
+# ---------------------------------------------------------------------------
+# 平台接口：ASGI 中间件按路由模板统计请求延迟
+# ---------------------------------------------------------------------------
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """
+    请求匹配到的路由模板；路由本身的 path 可能不含所属路由器的前缀（取决于 FastAPI 版本），
+    此时由实际路径减去按路径参数还原的路由路径得到前缀，前缀中的路径参数值再替换回 {参数名}
+    """
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if not path_format:
+        return "unmatched"
+    path = scope.get("path", "")
+    path_params = scope.get("path_params", {})
+    try:
+        rendered = path_format.format(**path_params)
+    except (KeyError, IndexError, ValueError):
+        return path_format
+    if not rendered or not path.endswith(rendered) or len(rendered) == len(path):
+        return path_format
+    prefix_params = {str(v): k for k, v in path_params.items() if "{" + k not in path_format}
+    prefix = "/".join(
+        "{" + prefix_params[segment] + "}" if segment in prefix_params else segment
+        for segment in path[:len(path) - len(rendered)].split("/")
+    )
+    return prefix + path_format
+
+class MetricsMiddleware:
+    """
+    记录每个 HTTP 请求的耗时，标签为方法、路由模板（如 /api/v1/projects/{project_id}）与状态码
+    未匹配到路由的请求（404）统一记为 unmatched，避免任意路径导致标签数量膨胀
+    使用纯 ASGI 实现，不缓冲响应体，对 SSE 等流式响应同样适用（耗时为整个流的时长）
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        global _http_requests_in_progress
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        _http_requests_in_progress += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _http_requests_in_progress -= 1
+            http_request_duration.observe(
+                time.perf_counter() - started, scope["method"], route_template(scope), str(status_code)
+            )
+
+# ---------------------------------------------------------------------------
+# 数据库：监听 SQLAlchemy 事件（对全部 Engine / Session 生效）
+# ---------------------------------------------------------------------------
+
+# 连接在多个线程中取用与归还，计数需要加锁
+_db_connections_in_use = 0
+_db_connections_lock = threading.Lock()
+_sqlalchemy_instrumented = False
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["query_start"].pop()
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+    db_query_duration.observe(time.perf_counter() - started, operation)
+
+def _handle_error(exception_context) -> None:
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    global _db_connections_in_use
+    with _db_connections_lock:
+        _db_connections_in_use += 1
+    db_connection_checkouts.inc()
+
+def _on_checkin(dbapi_connection, connection_record) -> None:
+    global _db_connections_in_use
+    with _db_connections_lock:
+        _db_connections_in_use -= 1
+
+def _after_begin(session, transaction, connection) -> None:
+    session.info["transaction_start"] = time.perf_counter()
+
+def _make_transaction_end(outcome: str) -> Callable:
+    def handler(session) -> None:
+        started = session.info.pop("transaction_start", None)
+        if started is not None:
+            db_transaction_duration.observe(time.perf_counter() - started, outcome)
+    return handler
+
+def instrument_sqlalchemy() -> None:
+    """注册数据库事件监听（只注册一次）：语句耗时、连接取用与会话事务耗时"""
+    global _sqlalchemy_instrumented
+    if _sqlalchemy_instrumented:
+        return
+    _sqlalchemy_instrumented = True
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+    event.listen(Pool, "checkout", _on_checkout)
+    event.listen(Pool, "checkin", _on_checkin)
+    event.listen(Session, "after_begin", _after_begin)
+    event.listen(Session, "after_commit", _make_transaction_end("commit"))
+    event.listen(Session, "after_rollback", _make_transaction_end("rollback"))
+
+def http_requests_in_progress() -> int:
+    return _http_requests_in_progress
+
+def db_connections_in_use() -> int:
+    return _db_connections_in_use
@@ -0,0 +1,182 @@
+import cProfile
+import io
+import json
+import marshal
+import pstats
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# 支持的剖析方式：
+# - sampling: 定时采样调用栈，输出 speedscope JSON；同时采样事件循环线程与线程池（同步接口在线程池中执行）
+# - cprofile: cProfile 确定性剖析，输出 pstats；只记录事件循环线程，耗时包含同一时间段内其他请求的协程
+PROFILE_MODES = ("sampling", "cprofile")
+
+# 线程池工作线程的名称（anyio 默认线程池，同步接口与 run_in_threadpool 在其中执行）
+_WORKER_THREAD_PREFIX = "AnyIO worker thread"
+
+_SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+# 栈帧标识: (函数名, 文件, 函数首行)
+FrameKey = Tuple[str, str, int]
+
+class SamplingProfiler:
+    """
+    采样剖析器：后台线程每隔 interval 秒读取一次目标线程的调用栈（sys._current_frames）
+
+    - 目标线程：启动剖析的线程与线程池工作线程
+    - 每个样本的权重为距上一次采样的实际间隔，总和接近剖析时长；stop() 时补采一次，短请求也至少有一个样本
+    - 开销只在剖析期间产生，与被剖析代码的调用次数无关
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self._owner = threading.get_ident()
+        self._frames: Dict[FrameKey, int] = {}
+        self._frame_list: List[FrameKey] = []
+        # 线程ID -> (线程名, 样本列表, 权重列表)
+        self._samples: Dict[int, Tuple[str, List[List[int]], List[float]]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.started_at = 0.0
+        self.duration = 0.0
+        self._last = 0.0
+
+    def start(self) -> None:
+        self._owner = threading.get_ident()
+        self.started_at = self._last = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        now = time.perf_counter()
+        self.duration = now - self.started_at
+        # 停止时再采样一次：短于采样间隔的请求也至少有一个样本，且样本权重之和等于剖析时长
+        frames = sys._current_frames()
+        if threading.get_ident() == self._owner:
+            # 由目标线程自身停止时，记录调用 stop() 处的调用栈
+            frames[self._owner] = sys._getframe(1)
+        self._sample(self._targets(), frames, now)
+        del frames
+
+    def _targets(self) -> Dict[int, str]:
+        targets = {self._owner: "event loop"}
+        for thread in threading.enumerate():
+            if thread.name.startswith(_WORKER_THREAD_PREFIX) and thread.ident is not None:
+                targets[thread.ident] = f"{thread.name} {thread.ident}"
+        return targets
+
+    def _frame_index(self, key: FrameKey) -> int:
+        index = self._frames.get(key)
+        if index is None:
+            index = self._frames[key] = len(self._frame_list)
+            self._frame_list.append(key)
+        return index
+
+    def _sample(self, targets: Dict[int, str], frames: Dict[int, Any], now: float) -> None:
+        """记录目标线程的一次调用栈样本，权重为距上一次采样的间隔"""
+        weight = now - self._last
+        self._last = now
+        for ident, name in targets.items():
+            frame = frames.get(ident)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(self._frame_index((code.co_name, code.co_filename, code.co_firstlineno)))
+                frame = frame.f_back
+            stack.reverse()
+            _, samples, weights = self._samples.setdefault(ident, (name, [], []))
+            samples.append(stack)
+            weights.append(weight)
+
+    def _run(self) -> None:
+        targets = self._targets()
+        refresh = self._last
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            # 线程池会按需创建新线程，定期刷新目标线程列表
+            if now - refresh > 0.1:
+                targets = self._targets()
+                refresh = now
+            frames = sys._current_frames()
+            self._sample(targets, frames, now)
+            del frames
+
+    def to_speedscope(self, name: str) -> Dict[str, Any]:
+        """导出为 speedscope 文件格式（每个线程一个 sampled 类型的 profile）"""
+        profiles = []
+        for thread_name, samples, weights in self._samples.values():
+            profiles.append({
+                "type": "sampled",
+                "name": thread_name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            })
+        return {
+            "$schema": _SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "slow-platform",
+            "activeProfileIndex": 0,
+            "shared": {
+                "frames": [{"name": n, "file": f, "line": line} for n, f, line in self._frame_list],
+            },
+            "profiles": profiles,
+        }
+
+class RequestProfiler:
+    """
+    单个请求的剖析过程：start() / stop() 之间的执行被记录，dump() 返回 (文件扩展名, 文件内容)
+    - mode: sampling 或 cprofile
+    """
+
+    def __init__(self, mode: str, interval: float = 0.001):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"不支持的剖析方式: {mode}")
+        self.mode = mode
+        self._sampler = SamplingProfiler(interval) if mode == "sampling" else None
+        self._profile = cProfile.Profile() if mode == "cprofile" else None
+        self._started = 0.0
+        self.duration = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        if self._sampler is not None:
+            self._sampler.start()
+        else:
+            self._profile.enable()
+
+    def stop(self) -> None:
+        if self._sampler is not None:
+            self._sampler.stop()
+        else:
+            self._profile.disable()
+        self.duration = time.perf_counter() - self._started
+
+    def dump(self, name: str) -> Tuple[str, bytes]:
+        if self._sampler is not None:
+            content = json.dumps(self._sampler.to_speedscope(name), separators=(",", ":"))
+            return "speedscope.json", content.encode("utf-8")
+        # pstats 使用 marshal 序列化，与 cProfile.Profile.dump_stats 的输出一致
+        self._profile.create_stats()
+        return "pstats", marshal.dumps(self._profile.stats)
+
+def pstats_summary(content: bytes, limit: int = 30) -> str:
+    """pstats 文件的文本摘要（按累计耗时排序的前 limit 项）"""
+    class _Loaded:
+        def create_stats(self) -> None:
+            pass
+
+    loaded = _Loaded()
+    loaded.stats = marshal.loads(content)
+    out = io.StringIO()
+    pstats.Stats(loaded, stream=out).sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
@@ -0,0 +1,134 @@
+import logging
+import time
+from collections import Counter as StatementCounter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+# 响应头：本次请求执行的 SQL 语句数与累计耗时（毫秒）
+QUERY_COUNT_HEADER = b"x-query-count"
+QUERY_TIME_HEADER = b"x-query-time"
+
+class QueryStats:
+    """
+    一次 HTTP 请求内执行的 SQL 语句统计
+    - count / duration: 语句数与累计耗时（秒），executemany 计为一次
+    - statements: 语句文本 -> 执行次数；相同文本（参数不同）多次执行通常是逐行懒加载关联导致的 N+1 查询
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.statements: StatementCounter = StatementCounter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """执行次数不少于 threshold 的语句，按次数从多到少排列"""
+        return [(statement, n) for statement, n in self.statements.most_common() if n >= threshold]
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("request_query_stats", default=None)
+
+def current_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    在当前上下文中统计 SQL 语句
+    同步接口在线程池中执行时复制当前上下文，统计对象是同一个，线程池中执行的语句同样计入
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+# ---------------------------------------------------------------------------
+# 数据库事件：只在有统计上下文时记录（后台任务、压测等不受影响）
+# ---------------------------------------------------------------------------
+
+_engine_instrumented = False
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current_stats.get()
+    starts = conn.info.get("query_stats_start")
+    if stats is not None and starts:
+        stats.record(statement, time.perf_counter() - starts.pop())
+
+def _handle_error(exception_context) -> None:
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_stats_start"):
+        conn.info["query_stats_start"].pop()
+
+def instrument_engine() -> None:
+    """注册语句统计的数据库事件监听（对全部 Engine 生效，只注册一次）"""
+    global _engine_instrumented
+    if _engine_instrumented:
+        return
+    _engine_instrumented = True
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+
+class QueryStatsMiddleware:
+    """
+    按 HTTP 请求统计 SQL 语句数与耗时（纯 ASGI 实现）
+    - 响应头 X-Query-Count / X-Query-Time 返回截至响应开始时的统计（流式响应不含之后执行的语句）
+    - 同一语句执行次数达到 repeat_threshold 时记录疑似 N+1 的警告
+    - 语句总数超过 warn_count 时记录警告
+    """
+
+    def __init__(self, app: Any, repeat_threshold: int = 5, warn_count: int = 50):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+        self.warn_count = warn_count
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_wrapper(message: Dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers") or [])
+                    headers.append((QUERY_COUNT_HEADER, str(stats.count).encode("latin-1")))
+                    headers.append((QUERY_TIME_HEADER, f"{stats.duration * 1000:.2f}".encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                self._report(scope, stats)
+
+    def _report(self, scope: Dict[str, Any], stats: QueryStats) -> None:
+        if not stats.count:
+            return
+        route = route_template(scope)
+        for statement, n in stats.repeated(self.repeat_threshold):
+            logger.warning(
+                "Possible N+1 query: statement executed %d times in %s %s: %s",
+                n, scope["method"], route, " ".join(statement.split())[:500],
+            )
+        if stats.count > self.warn_count:
+            logger.warning(
+                "%s %s executed %d SQL statements (%.1f ms)",
+                scope["method"], route, stats.count, stats.duration * 1000,
+            )
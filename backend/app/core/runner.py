@@ -1,7 +1,48 @@
+import json
 import requests
+import tempfile
+import threading
 import time
-from typing import Any, Dict, Optional, Tuple, Union
-from pydantic import BaseModel
+from collections import OrderedDict
+from contextlib import contextmanager
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+from urllib.parse import urlsplit
+from pydantic import BaseModel, PrivateAttr
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+from app.core.metrics import observe_outbound
+from app.core.timing import TIMED_POOL_CLASSES, track_phases
+
+class BodyCapture:
+    """
+    流式读取响应体，并限制捕获大小
+
+    - 响应体写入 SpooledTemporaryFile：不超过 spool_bytes 时保存在内存中，超过后自动转存到临时文件
+    - 累计超过 max_bytes 后停止读取，剩余部分丢弃并标记 truncated
+    """
+    __slots__ = ("max_bytes", "spool", "size", "truncated")
+
+    def __init__(self, max_bytes: int, spool_bytes: int):
+        self.max_bytes = max_bytes
+        self.spool = tempfile.SpooledTemporaryFile(max_size=spool_bytes)
+        self.size = 0
+        self.truncated = False
+
+    def write(self, chunk: bytes) -> bool:
+        """
+        写入一段响应体
+        返回: 是否继续读取（达到上限后返回 False）
+        """
+        remaining = self.max_bytes - self.size
+        if len(chunk) > remaining:
+            chunk = chunk[:remaining]
+            self.truncated = True
+        if chunk:
+            self.spool.write(chunk)
+            self.size += len(chunk)
+        return not self.truncated
 
 class RequestResult(BaseModel):
     status_code: int
@@ -9,6 +50,235 @@ class RequestResult(BaseModel):
     body: Any
     duration: float  # seconds
     error: Optional[str] = None
+    body_size: int = 0  # 捕获到的响应体字节数（解压后）
+    truncated: bool = False  # 响应体超过 RUNNER_MAX_CAPTURE_BYTES 被截断
+    # 分段耗时（秒）：total, dns, connect, tls, ttfb, download，解码响应体后增加 json_decode
+    timings: Optional[Dict[str, float]] = None
+
+    # 未解码的响应体缓冲区及其字符集，按需解码
+    _spool: Any = PrivateAttr(default=None)
+    _encoding: Optional[str] = PrivateAttr(default=None)
+
+    @classmethod
+    def from_capture(
+        cls,
+        status_code: int,
+        headers: Dict[str, Any],
+        duration: float,
+        capture: BodyCapture,
+        encoding: Optional[str],
+        timings: Optional[Dict[str, float]] = None,
+    ) -> "RequestResult":
+        """由流式捕获的响应体构造结果，body 暂不解码"""
+        result = cls(
+            status_code=status_code,
+            headers=headers,
+            body=None,
+            duration=duration,
+            body_size=capture.size,
+            truncated=capture.truncated,
+            timings=timings,
+        )
+        result._spool = capture.spool
+        result._encoding = encoding
+        return result
+
+    def load_body(self) -> Any:
+        """
+        解码响应体并写入 body 字段（只解码一次）
+        优先按 JSON 解析，失败时按响应字符集（缺省 UTF-8）解码为文本
+        解码耗时记入 timings["json_decode"]
+        """
+        spool = self._spool
+        if spool is None:
+            return self.body
+        self._spool = None
+        spool.seek(0)
+        content = spool.read()
+        spool.close()
+        started = time.perf_counter_ns()
+        # Try to parse JSON response
+        try:
+            self.body = json.loads(content)
+        except ValueError:
+            self.body = content.decode(self._encoding or "utf-8", errors="replace")
+        if self.timings is not None:
+            self.timings["json_decode"] = (time.perf_counter_ns() - started) / 1e9
+        return self.body
+
+    def release(self) -> None:
+        """丢弃未解码的响应体缓冲区（不需要响应体时调用，尽早释放内存或临时文件）"""
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+
+# 连接池键：(环境ID, 协议, 主机, 端口)
+PoolKey = Tuple[Optional[int], str, str, int]
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+def make_pool_key(url: str, environment_id: Optional[int] = None) -> PoolKey:
+    """
+    根据请求 URL 与环境ID 计算连接池键
+    - url: 完整请求地址
+    - environment_id: 环境ID，调试时未选择环境则为 None
+    返回: (环境ID, 协议, 主机, 端口)，主机统一小写，端口缺省时取协议默认端口
+    """
+    parts = urlsplit(url)
+    scheme = (parts.scheme or "http").lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port or _DEFAULT_PORTS.get(scheme, 0)
+    return (environment_id, scheme, host, port)
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    """连接池使用带分段计时的连接类（见 app.core.timing），用于统计域名解析、建连与 TLS 握手耗时"""
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = TIMED_POOL_CLASSES
+
+class _PooledSession:
+    """
+    连接池中的单个会话条目
+    - session: 复用 TCP/TLS 连接的 requests.Session
+    - last_used: 最近一次被取用的时间（单调时钟），用于空闲回收
+    - in_flight: 正在使用该会话的请求数，大于 0 时不会被回收
+    """
+    __slots__ = ("session", "last_used", "in_flight")
+
+    def __init__(self, session: requests.Session):
+        self.session = session
+        self.last_used = time.monotonic()
+        self.in_flight = 0
+
+class SessionPool:
+    """
+    执行引擎持有的 HTTP 连接池管理器
+
+    每个 (环境, 协议, 主机, 端口) 维护一个带连接池的 requests.Session，
+    同一环境的重复执行可以复用已建立的 TCP 连接与 TLS 会话，避免每次请求重新握手。
+
+    - max_sessions: 最多保留的会话数，超出时按最近最少使用淘汰
+    - pool_maxsize: 单个主机保持的最大连接数
+    - pool_block: 单主机连接数达到上限时是否阻塞等待空闲连接
+    - idle_timeout: 会话空闲超过该秒数后被回收
+
+    注意：会话禁用了 Cookie 持久化，不同用例之间不会互相携带服务端下发的 Cookie。
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 64,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        idle_timeout: float = 300.0,
+    ):
+        self.max_sessions = max_sessions
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.idle_timeout = idle_timeout
+        self._sessions: "OrderedDict[PoolKey, _PooledSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+        # 命中/未命中/回收计数，供监控使用
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        # 每个会话只服务一个主机，因此 pool_connections 取 1 即可
+        adapter = _TimedHTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        # 禁止会话保存响应 Cookie，保证用例之间相互隔离
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        return session
+
+    def _sweep_idle(self, now: float) -> None:
+        """回收空闲超时的会话（调用方需持有锁）"""
+        if now - self._last_sweep < min(self.idle_timeout, 30.0):
+            return
+        self._last_sweep = now
+        expired = [
+            key for key, entry in self._sessions.items()
+            if entry.in_flight == 0 and now - entry.last_used > self.idle_timeout
+        ]
+        for key in expired:
+            self._sessions.pop(key).session.close()
+            self.evictions += 1
+
+    def _evict_overflow(self) -> None:
+        """会话数超过上限时淘汰最久未使用且空闲的会话（调用方需持有锁）"""
+        if len(self._sessions) <= self.max_sessions:
+            return
+        for key in list(self._sessions.keys()):
+            if len(self._sessions) <= self.max_sessions:
+                break
+            entry = self._sessions[key]
+            if entry.in_flight == 0:
+                self._sessions.pop(key).session.close()
+                self.evictions += 1
+
+    @contextmanager
+    def acquire(self, url: str, environment_id: Optional[int] = None) -> Iterator[requests.Session]:
+        """
+        取出目标地址对应的会话，使用完毕后自动归还
+        - url: 完整请求地址
+        - environment_id: 环境ID
+        """
+        key = make_pool_key(url, environment_id)
+        now = time.monotonic()
+        with self._lock:
+            self._sweep_idle(now)
+            entry = self._sessions.get(key)
+            if entry is None:
+                self.misses += 1
+                entry = _PooledSession(self._new_session())
+                self._sessions[key] = entry
+                self._evict_overflow()
+            else:
+                self.hits += 1
+                self._sessions.move_to_end(key)
+            entry.in_flight += 1
+            entry.last_used = now
+        try:
+            yield entry.session
+        finally:
+            with self._lock:
+                entry.in_flight -= 1
+                entry.last_used = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """返回连接池统计信息：会话数、命中数、未命中数、回收数、命中率"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "sessions": len(self._sessions),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def close(self) -> None:
+        """关闭全部会话并释放连接"""
+        with self._lock:
+            for entry in self._sessions.values():
+                entry.session.close()
+            self._sessions.clear()
+
+# 全局连接池，由执行引擎统一持有
+session_pool = SessionPool(
+    max_sessions=settings.RUNNER_POOL_MAX_SESSIONS,
+    pool_maxsize=settings.RUNNER_POOL_MAXSIZE,
+    pool_block=settings.RUNNER_POOL_BLOCK,
+    idle_timeout=settings.RUNNER_POOL_IDLE_TIMEOUT,
+)
 
 def run_request(
     method: str,
@@ -17,42 +287,61 @@ def run_request(
     headers: Optional[Dict[str, Any]] = None,
     json_body: Optional[Any] = None,
     data_body: Optional[Any] = None,
-    timeout: float = 10.0
+    timeout: float = 10.0,
+    environment_id: Optional[int] = None,
+    load_body: bool = True
 ) -> RequestResult:
     """
     Core function to execute HTTP requests
+    - environment_id: 所属环境ID，用于选择连接池中的会话，同一环境的请求复用连接
+    - load_body: 是否立即解码响应体；为 False 时由调用方在需要时调用 RequestResult.load_body()
+    响应体以流式读取，最多捕获 RUNNER_MAX_CAPTURE_BYTES 字节，超出部分丢弃并标记 truncated
+    耗时使用单调时钟（perf_counter_ns）计量，分段耗时见 RequestResult.timings
     """
-    start_time = time.time()
-    try:
-        response = requests.request(
-            method=method,
-            url=url,
-            params=params,
-            headers=headers,
-            json=json_body,
-            data=data_body,
-            timeout=timeout
-        )
-        duration = time.time() - start_time
-        
-        # Try to parse JSON response
+    with track_phases() as timer:
         try:
-            body = response.json()
-        except ValueError:
-            body = response.text
+            with session_pool.acquire(url, environment_id) as session:
+                response = session.request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    headers=headers,
+                    json=json_body,
+                    data=data_body,
+                    timeout=timeout,
+                    stream=True
+                )
+                timer.mark_headers()
+                try:
+                    capture = BodyCapture(settings.RUNNER_MAX_CAPTURE_BYTES, settings.RUNNER_SPOOL_MEMORY_BYTES)
+                    for chunk in response.iter_content(chunk_size=settings.RUNNER_READ_CHUNK_BYTES):
+                        if not capture.write(chunk):
+                            break
+                finally:
+                    # 完整读取时连接归还连接池；被截断时关闭连接
+                    response.close()
+            duration = timer.finish()
 
-        return RequestResult(
-            status_code=response.status_code,
-            headers=dict(response.headers),
-            body=body,
-            duration=duration
-        )
-    except Exception as e:
-        duration = time.time() - start_time
-        return RequestResult(
-            status_code=0,
-            headers={},
-            body=None,
-            duration=duration,
-            error=str(e)
-        )
+            result = RequestResult.from_capture(
+                status_code=response.status_code,
+                headers=dict(response.headers),
+                duration=duration,
+                capture=capture,
+                encoding=response.encoding,
+                timings=timer.timings(),
+            )
+            observe_outbound("sync", make_pool_key(url), duration, None)
+            if load_body:
+                result.load_body()
+            return result
+        except Exception as e:
+            duration = timer.finish()
+            observe_outbound("sync", make_pool_key(url), duration, "error")
+            return RequestResult(
+                status_code=0,
+                headers={},
+                body=None,
+                duration=duration,
+                error=str(e),
+                timings=timer.timings(),
+            )
@@ -0,0 +1,136 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Tuple, Union
+
+from app.core.config import settings
+
+# 变量占位符：{{ name }}，支持点号访问嵌套字段或下标，例如 {{ user.id }}、{{ items.0.name }}
+_PLACEHOLDER_RE = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z0-9_]+)*)\s*\}\}")
+
+class TemplateRenderError(ValueError):
+    """渲染时变量未定义或路径不存在"""
+
+def _lookup(context: Mapping[str, Any], path: Tuple[str, ...]) -> Any:
+    name = path[0]
+    if name not in context:
+        raise TemplateRenderError(f"未定义的变量: {name}")
+    value = context[name]
+    for key in path[1:]:
+        if isinstance(value, dict) and key in value:
+            value = value[key]
+        elif isinstance(value, (list, tuple)) and key.isdigit() and int(key) < len(value):
+            value = value[int(key)]
+        else:
+            raise TemplateRenderError(f"变量 {'.'.join(path)} 不存在")
+    return value
+
+class Constant:
+    """不含占位符的值，渲染时原样返回（不复制，调用方不得修改）"""
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def render(self, context: Mapping[str, Any]) -> Any:
+        return self.value
+
+class Variable:
+    """整个字符串就是一个占位符（如 "{{ user_id }}"），渲染结果保留变量原始类型"""
+    __slots__ = ("path",)
+
+    def __init__(self, path: Tuple[str, ...]):
+        self.path = path
+
+    def render(self, context: Mapping[str, Any]) -> Any:
+        return _lookup(context, self.path)
+
+class Template:
+    """
+    含占位符的字符串，编译为 字面量/变量路径 交替的片段序列
+    渲染时按顺序拼接，不再扫描原始字符串
+    """
+    __slots__ = ("parts",)
+
+    def __init__(self, parts: Tuple[Union[str, Tuple[str, ...]], ...]):
+        self.parts = parts
+
+    def render(self, context: Mapping[str, Any]) -> str:
+        return "".join(
+            part if isinstance(part, str) else str(_lookup(context, part))
+            for part in self.parts
+        )
+
+class DictRenderer:
+    """字典中只有含占位符的键/值会在渲染时求值，其余保持编译期的值"""
+    __slots__ = ("items",)
+
+    def __init__(self, items: List[Tuple[Any, Any]]):
+        self.items = items
+
+    def render(self, context: Mapping[str, Any]) -> Dict[Any, Any]:
+        return {key.render(context): value.render(context) for key, value in self.items}
+
+class ListRenderer:
+    __slots__ = ("items",)
+
+    def __init__(self, items: List[Any]):
+        self.items = items
+
+    def render(self, context: Mapping[str, Any]) -> List[Any]:
+        return [item.render(context) for item in self.items]
+
+Renderer = Union[Constant, Variable, Template, DictRenderer, ListRenderer]
+
+@lru_cache(maxsize=settings.TEMPLATE_CACHE_SIZE)
+def compile_template(text: str) -> Renderer:
+    """
+    编译单个字符串模板（按字符串缓存）
+    - 不含占位符：Constant
+    - 整个字符串是一个占位符：Variable（保留变量类型，例如数字不会被转成字符串）
+    - 其他：Template
+    """
+    parts: List[Union[str, Tuple[str, ...]]] = []
+    position = 0
+    for match in _PLACEHOLDER_RE.finditer(text):
+        if match.start() > position:
+            parts.append(text[position:match.start()])
+        parts.append(tuple(match.group(1).split(".")))
+        position = match.end()
+    if not parts:
+        return Constant(text)
+    if position < len(text):
+        parts.append(text[position:])
+    if len(parts) == 1:
+        return Variable(parts[0])
+    return Template(tuple(parts))
+
+def compile_value(value: Any) -> Renderer:
+    """
+    递归编译任意 JSON 值（字符串、字典、列表、数字等）为渲染计划
+    不含占位符的子树整体编译为 Constant，渲染时不再遍历
+    """
+    if isinstance(value, str):
+        return compile_template(value)
+    if isinstance(value, dict):
+        items = [(compile_template(k) if isinstance(k, str) else Constant(k), compile_value(v)) for k, v in value.items()]
+        if all(isinstance(k, Constant) and isinstance(v, Constant) for k, v in items):
+            return Constant(value)
+        return DictRenderer(items)
+    if isinstance(value, list):
+        items = [compile_value(v) for v in value]
+        if all(isinstance(v, Constant) for v in items):
+            return Constant(value)
+        return ListRenderer(items)
+    return Constant(value)
+
+def template_cache_stats() -> Dict[str, Any]:
+    """返回字符串模板编译缓存统计"""
+    info = compile_template.cache_info()
+    total = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "hit_rate": info.hits / total if total else 0.0,
+    }
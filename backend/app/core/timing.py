@@ -0,0 +1,157 @@
+import socket
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3 import connectionpool
+from urllib3.exceptions import ConnectTimeoutError
+
+# 请求耗时分段（秒）：
+# - dns: 域名解析；connect: TCP 建连；tls: TLS 握手（复用连接时三者均为 0）
+#   异步引擎通过 httpcore 的 trace 事件计时，域名解析包含在 connect 中，dns 始终为 0
+# - ttfb: 连接就绪后到收到响应头（发送请求 + 服务端处理）
+# - download: 收到响应头后读取响应体
+# - total: 请求总耗时；json_decode: 本地解码响应体（解码后才有）
+TIMING_PHASES = ("total", "dns", "connect", "tls", "ttfb", "download", "json_decode")
+
+# httpcore trace 事件 -> 计时阶段（事件名去掉 .started / .complete / .failed 后缀）
+_TRACE_PHASES = {
+    "connection.connect_tcp": "connect",
+    "connection.start_tls": "tls",
+}
+
+class PhaseTimer:
+    """
+    单个请求的分段计时器，全部使用 perf_counter_ns（单调时钟，纳秒精度）
+    dns/connect/tls 为累计耗时（跟随重定向时可能建立多个连接），headers/end 为时间点
+    """
+    __slots__ = ("start", "dns", "connect", "tls", "headers", "end", "_trace_started")
+
+    def __init__(self):
+        self.start = time.perf_counter_ns()
+        self.dns = 0
+        self.connect = 0
+        self.tls = 0
+        self.headers: Optional[int] = None
+        self.end: Optional[int] = None
+        self._trace_started: Optional[int] = None
+
+    async def trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        """
+        httpx 请求扩展的 trace 回调（extensions={"trace": timer.trace}），
+        按 httpcore 的 started / complete / failed 事件累计建连与 TLS 握手耗时
+        """
+        phase = _TRACE_PHASES.get(event_name.rpartition(".")[0])
+        if phase is None:
+            return
+        now = time.perf_counter_ns()
+        if event_name.endswith(".started"):
+            self._trace_started = now
+        elif self._trace_started is not None:
+            setattr(self, phase, getattr(self, phase) + now - self._trace_started)
+            self._trace_started = None
+
+    def mark_headers(self) -> None:
+        self.headers = time.perf_counter_ns()
+
+    def finish(self) -> float:
+        """结束计时，返回总耗时（秒）"""
+        self.end = time.perf_counter_ns()
+        return (self.end - self.start) / 1e9
+
+    def timings(self) -> Dict[str, float]:
+        """
+        各阶段耗时（秒）
+        未收到响应头（请求失败）时不包含 ttfb 与 download
+        """
+        end = self.end if self.end is not None else time.perf_counter_ns()
+        result = {
+            "total": (end - self.start) / 1e9,
+            "dns": self.dns / 1e9,
+            "connect": self.connect / 1e9,
+            "tls": self.tls / 1e9,
+        }
+        if self.headers is not None:
+            setup = self.dns + self.connect + self.tls
+            result["ttfb"] = max(self.headers - self.start - setup, 0) / 1e9
+            result["download"] = (end - self.headers) / 1e9
+        return result
+
+# 当前请求的计时器：同步引擎的连接类（连接建立、TLS 握手）在同一上下文中执行，据此把耗时记到对应请求上
+_current_timer: ContextVar[Optional[PhaseTimer]] = ContextVar("request_phase_timer", default=None)
+
+def current_timer() -> Optional[PhaseTimer]:
+    return _current_timer.get()
+
+@contextmanager
+def track_phases() -> Iterator[PhaseTimer]:
+    """在当前上下文中开始一个请求的分段计时"""
+    timer = PhaseTimer()
+    token = _current_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _current_timer.reset(token)
+
+# ---------------------------------------------------------------------------
+# 同步引擎（requests / urllib3）：替换连接池使用的连接类
+# ---------------------------------------------------------------------------
+
+class _TimedConnectionMixin:
+    """存在当前计时器时先单独解析域名，再依次尝试解析出的地址建立连接"""
+
+    def _new_conn(self) -> socket.socket:
+        timer = current_timer()
+        if timer is None:
+            return super()._new_conn()
+        host = self._dns_host
+        started = time.perf_counter_ns()
+        try:
+            addresses = socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)
+        except OSError:
+            # 交给 urllib3 重新解析，以抛出其标准的 NameResolutionError
+            return super()._new_conn()
+        resolved = time.perf_counter_ns()
+        timer.dns += resolved - started
+        try:
+            last_error: Optional[Exception] = None
+            for address in dict.fromkeys(info[4][0] for info in addresses):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except ConnectTimeoutError as e:  # 包括 NewConnectionError
+                    last_error = e
+                finally:
+                    self._dns_host = host
+            if last_error is None:
+                return super()._new_conn()
+            raise last_error
+        finally:
+            timer.connect += time.perf_counter_ns() - resolved
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self) -> None:
+        timer = current_timer()
+        if timer is None:
+            return super().connect()
+        started = time.perf_counter_ns()
+        setup_before = timer.dns + timer.connect
+        super().connect()
+        # connect() 先建立 TCP 连接再握手，握手耗时 = 总耗时 - 本次解析与建连耗时
+        elapsed = time.perf_counter_ns() - started
+        timer.tls += max(elapsed - (timer.dns + timer.connect - setup_before), 0)
+
+# 连接池类与 urllib3 同名：类名会出现在请求错误信息中，保持与原来一致
+class HTTPConnectionPool(connectionpool.HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class HTTPSConnectionPool(connectionpool.HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+# 供 PoolManager.pool_classes_by_scheme 使用
+TIMED_POOL_CLASSES = {"http": HTTPConnectionPool, "https": HTTPSConnectionPool}
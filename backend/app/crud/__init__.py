@@ -1 +1 @@
-from . import crud_user, crud_project, crud_api, crud_test_case
+from . import crud_user, crud_project, crud_api, crud_test_case, crud_test_plan, crud_scene, crud_load_test, crud_profile, crud_schedule, crud_report_stats
@@ -1,25 +1,32 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session, selectinload
+from app.crud.pagination import Page, count_cache, keyset_paginate
 from app.models.api import Api, ApiRequestTemplate
 from app.schemas.interface import ApiCreate, ApiUpdate, ApiRequestTemplateCreate, ApiRequestTemplateUpdate
 
 def get_api(db: Session, api_id: int) -> Optional[Api]:
-    return db.query(Api).filter(Api.id == api_id).first()
+    return db.query(Api).options(selectinload(Api.request_template)).filter(Api.id == api_id).first()
 
 def get_apis(
     db: Session, 
     project_id: int, 
-    skip: int = 0, 
+    cursor: Optional[str] = None, 
     limit: int = 100, 
-    module_name: Optional[str] = None
-) -> List[Api]:
-    query = db.query(Api).filter(Api.project_id == project_id)
+    module_name: Optional[str] = None,
+    order_by: str = "id"
+) -> Page:
+    """游标分页查询项目下的接口，见 pagination.keyset_paginate（请求模板随列表一次查出，避免逐行懒加载）"""
+    query = db.query(Api).options(selectinload(Api.request_template)).filter(Api.project_id == project_id)
     if module_name:
         query = query.filter(Api.module_name == module_name)
-    return query.offset(skip).limit(limit).all()
+    return keyset_paginate(
+        query, Api, count_key=(project_id, module_name), cursor=cursor, limit=limit, order_by=order_by
+    )
 
 def create_api(db: Session, api: ApiCreate) -> Api:
-    # 1. Create API
+    # 接口与请求模板在同一个事务中写入
     db_api = Api(
         project_id=api.project_id,
         name=api.name,
@@ -28,20 +35,13 @@ def create_api(db: Session, api: ApiCreate) -> Api:
         module_name=api.module_name,
         description=api.description
     )
+    if api.request_template:
+        db_api.request_template = ApiRequestTemplate(**api.request_template.model_dump())
     db.add(db_api)
     db.commit()
     db.refresh(db_api)
 
-    # 2. Create Request Template if provided
-    if api.request_template:
-        db_template = ApiRequestTemplate(
-            api_id=db_api.id,
-            **api.request_template.model_dump()
-        )
-        db.add(db_template)
-        db.commit()
-        db.refresh(db_api) # Refresh to load relationship
-    
+    count_cache.invalidate(Api.__tablename__)
     return db_api
 
 def update_api(db: Session, db_api: Api, api_update: ApiUpdate) -> Api:
@@ -68,10 +68,119 @@ def update_api(db: Session, db_api: Api, api_update: ApiUpdate) -> Api:
     db.add(db_api)
     db.commit()
     db.refresh(db_api)
+    # 模块可能变化，按模块筛选的总数随之失效
+    count_cache.invalidate(Api.__tablename__)
     return db_api
 
 def delete_api(db: Session, api_id: int) -> Api:
     db_api = db.query(Api).get(api_id)
     db.delete(db_api)
     db.commit()
+    count_cache.invalidate(Api.__tablename__)
     return db_api
+
+# 批量导入时写入请求模板的字段
+_TEMPLATE_FIELDS = ("path_params", "query_params", "headers", "body", "body_type")
+
+def bulk_upsert_apis(
+    db: Session,
+    project_id: int,
+    definitions: Iterable[Dict[str, Any]],
+    on_conflict: str = "update",
+    batch_size: int = 500,
+) -> Dict[str, int]:
+    """
+    批量导入接口：按 (项目, 方法, 路径) 匹配已有接口，每批一次查询、一次提交
+    - definitions: 接口定义，见 core.api_import.iter_api_definitions
+    - on_conflict: 已存在同方法同路径的接口时，update 覆盖名称、模块、描述与请求模板，skip 保持不变
+    - 同一文件中重复的 (方法, 路径) 以后出现的为准；路径超过 512 个字符的定义计入 invalid
+    返回: {"total", "created", "updated", "skipped", "invalid"}
+    """
+    counts = {"total": 0, "created": 0, "updated": 0, "skipped": 0, "invalid": 0}
+    iterator = iter(definitions)
+    while True:
+        chunk = list(islice(iterator, batch_size))
+        if not chunk:
+            break
+        batch: Dict[tuple, Dict[str, Any]] = {}
+        for definition in chunk:
+            counts["total"] += 1
+            method = str(definition.get("method") or "").upper()
+            url_path = definition.get("url_path") or ""
+            if not method or not url_path or len(url_path) > 512 or len(method) > 16:
+                counts["invalid"] += 1
+                continue
+            key = (method, url_path)
+            if key in batch:
+                counts["skipped"] += 1
+            batch[key] = definition
+        if not batch:
+            continue
+
+        existing = {
+            (api.method.upper(), api.url_path): api
+            for api in (
+                db.query(Api)
+                .options(selectinload(Api.request_template))
+                .filter(Api.project_id == project_id, Api.url_path.in_({path for _, path in batch}))
+            )
+        }
+        new_apis: List[Dict[str, Any]] = []
+        new_api_templates: Dict[tuple, Dict[str, Any]] = {}
+        api_updates: List[Dict[str, Any]] = []
+        new_templates: List[Dict[str, Any]] = []
+        template_updates: List[Dict[str, Any]] = []
+        for (method, url_path), definition in batch.items():
+            template = definition.get("request_template") or {}
+            template = {field: template.get(field) for field in _TEMPLATE_FIELDS}
+            template["body_type"] = template["body_type"] or "json"
+            db_api = existing.get((method, url_path))
+            if db_api is None:
+                new_apis.append({
+                    "project_id": project_id,
+                    "name": definition.get("name") or f"{method} {url_path}",
+                    "method": method,
+                    "url_path": url_path,
+                    "module_name": definition.get("module_name"),
+                    "description": definition.get("description"),
+                })
+                new_api_templates[(method, url_path)] = template
+                counts["created"] += 1
+            elif on_conflict == "skip":
+                counts["skipped"] += 1
+            else:
+                api_updates.append({
+                    "id": db_api.id,
+                    "name": definition.get("name") or db_api.name,
+                    "module_name": definition.get("module_name"),
+                    "description": definition.get("description"),
+                })
+                if db_api.request_template is None:
+                    new_templates.append({"api_id": db_api.id, **template})
+                else:
+                    template_updates.append({"id": db_api.request_template.id, **template})
+                counts["updated"] += 1
+
+        # 每批按表各执行一次批量语句（executemany），新接口的ID在插入后按路径查回
+        if new_apis:
+            db.execute(insert(Api), new_apis)
+            created = (
+                db.query(Api.id, Api.method, Api.url_path)
+                .filter(Api.project_id == project_id, Api.url_path.in_({api["url_path"] for api in new_apis}))
+            )
+            for api_id, method, url_path in created:
+                template = new_api_templates.pop((method.upper(), url_path), None)
+                if template is not None:
+                    new_templates.append({"api_id": api_id, **template})
+        if api_updates:
+            db.execute(update(Api), api_updates)
+        if template_updates:
+            db.execute(update(ApiRequestTemplate), template_updates)
+        if new_templates:
+            db.execute(insert(ApiRequestTemplate), new_templates)
+        db.commit()
+        # 提交后释放本批查询出的对象，导入大文件时会话中不累积已写入的接口
+        db.expunge_all()
+
+    count_cache.invalidate(Api.__tablename__)
+    return counts
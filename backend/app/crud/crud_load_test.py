@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy import update
+from sqlalchemy.orm import Session, defer
+from app.models.load_test import LoadTestReport
+from app.schemas.load_test import LoadTestCreate
+
+def get_load_test(db: Session, report_id: int) -> Optional[LoadTestReport]:
+    return db.query(LoadTestReport).filter(LoadTestReport.id == report_id).first()
+
+def get_load_tests(db: Session, project_id: int, skip: int = 0, limit: int = 100) -> List[LoadTestReport]:
+    """列表不返回直方图与时间线，延迟加载这两列"""
+    return (
+        db.query(LoadTestReport)
+        .options(defer(LoadTestReport.histogram), defer(LoadTestReport.timeline))
+        .filter(LoadTestReport.project_id == project_id)
+        .order_by(LoadTestReport.id.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+def create_load_test(
+    db: Session,
+    obj_in: LoadTestCreate,
+    project_id: int,
+    name: str,
+    worker_id: str,
+    triggered_by: Optional[int] = None,
+) -> LoadTestReport:
+    """创建压测报告，状态直接为 RUNNING（由当前进程立即执行）"""
+    now = datetime.now()
+    db_obj = LoadTestReport(
+        project_id=project_id,
+        name=name,
+        target_type=obj_in.target_type,
+        target_id=obj_in.target_id,
+        environment_id=obj_in.environment_id,
+        triggered_by=triggered_by,
+        config=obj_in.model_dump(exclude={"name", "target_type", "target_id", "environment_id"}),
+        status="RUNNING",
+        worker_id=worker_id,
+        started_at=now,
+        heartbeat_at=now,
+    )
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+    return db_obj
+
+def save_load_test_stats(db: Session, report: LoadTestReport, stats: Dict[str, Any]) -> None:
+    """写入压测统计（LoadStats.snapshot 的结果）并刷新心跳"""
+    for field, value in stats.items():
+        setattr(report, field, value)
+    report.heartbeat_at = datetime.now()
+    db.add(report)
+    db.commit()
+
+def fail_stale_load_tests(db: Session, stale_seconds: float) -> int:
+    """
+    将心跳超时的 RUNNING 压测置为 ERROR（执行该压测的进程已退出）
+    压测结果与时间相关，不会像计划任务那样重新入队
+    返回: 处理的压测数
+    """
+    deadline = datetime.now() - timedelta(seconds=stale_seconds)
+    result = db.execute(
+        update(LoadTestReport)
+        .where(LoadTestReport.status == "RUNNING", LoadTestReport.heartbeat_at < deadline)
+        .values(status="ERROR", error_message="执行压测的进程已退出", finished_at=datetime.now())
+    )
+    db.commit()
+    return result.rowcount
+
+def delete_load_test(db: Session, report_id: int) -> LoadTestReport:
+    obj = db.query(LoadTestReport).get(report_id)
+    db.delete(obj)
+    db.commit()
+    return obj
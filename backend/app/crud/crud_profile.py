@@ -0,0 +1,44 @@
+from typing import Any, Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.models.profile import RequestProfile
+
+def get_profile(db: Session, profile_id: int) -> Optional[RequestProfile]:
+    return db.query(RequestProfile).filter(RequestProfile.id == profile_id).first()
+
+def get_profiles(
+    db: Session, route: Optional[str] = None, skip: int = 0, limit: int = 100
+) -> List[RequestProfile]:
+    query = db.query(RequestProfile)
+    if route:
+        query = query.filter(RequestProfile.route == route)
+    return query.order_by(RequestProfile.id.desc()).offset(skip).limit(limit).all()
+
+def create_profile(db: Session, obj_in: Dict[str, Any]) -> RequestProfile:
+    db_obj = RequestProfile(**obj_in)
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+    return db_obj
+
+def prune_profiles(db: Session, keep: int) -> List[str]:
+    """
+    只保留最新的 keep 条剖析记录，删除更早的记录
+    返回: 被删除记录的文件存储路径（由调用方删除文件）
+    """
+    stale = (
+        db.query(RequestProfile.id, RequestProfile.storage_path)
+        .order_by(RequestProfile.id.desc())
+        .offset(keep)
+        .all()
+    )
+    if not stale:
+        return []
+    db.query(RequestProfile).filter(RequestProfile.id.in_([row.id for row in stale])).delete(synchronize_session=False)
+    db.commit()
+    return [row.storage_path for row in stale]
+
+def delete_profile(db: Session, profile_id: int) -> RequestProfile:
+    obj = db.query(RequestProfile).get(profile_id)
+    db.delete(obj)
+    db.commit()
+    return obj
@@ -1,14 +1,17 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from app.models.project import Project, Environment
+from app.crud.pagination import Page, count_cache, keyset_paginate
 from app.schemas.project import ProjectCreate, ProjectUpdate, EnvironmentCreate, EnvironmentUpdate
 
 # Project CRUD
 def get_project(db: Session, project_id: int) -> Optional[Project]:
     return db.query(Project).filter(Project.id == project_id).first()
 
-def get_projects(db: Session, skip: int = 0, limit: int = 100) -> List[Project]:
-    return db.query(Project).offset(skip).limit(limit).all()
+def get_projects(db: Session, cursor: Optional[str] = None, limit: int = 100, order_by: str = "id") -> Page:
+    """游标分页查询项目列表，见 pagination.keyset_paginate（环境随列表一次查出，避免逐行懒加载）"""
+    query = db.query(Project).options(selectinload(Project.environments))
+    return keyset_paginate(query, Project, count_key=None, cursor=cursor, limit=limit, order_by=order_by)
 
 def create_project(db: Session, project: ProjectCreate, owner_id: int) -> Project:
     db_project = Project(
@@ -20,6 +23,7 @@ def create_project(db: Session, project: ProjectCreate, owner_id: int) -> Projec
     db.add(db_project)
     db.commit()
     db.refresh(db_project)
+    count_cache.invalidate(Project.__tablename__)
     return db_project
 
 def update_project(db: Session, db_project: Project, project_update: ProjectUpdate) -> Project:
@@ -35,6 +39,7 @@ def delete_project(db: Session, project_id: int) -> Project:
     db_project = db.query(Project).get(project_id)
     db.delete(db_project)
     db.commit()
+    count_cache.invalidate(Project.__tablename__)
     return db_project
 
 # Environment CRUD
@@ -0,0 +1,271 @@
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.orm import Session
+from app.models.api import Api
+from app.models.test_case import TestCase
+from app.models.test_plan import TestReport, TestResult, TestResultDaily
+from app.utils.histogram import LatencyHistogram
+
+# 预聚合的维度
+ROLLUP_SCOPES = ("project", "module", "case")
+
+# 读取结果与查询已有汇总行时每批的行数
+_BATCH_SIZE = 1000
+
+class _Bucket:
+    """一个维度键在一天内的累计值"""
+
+    __slots__ = ("name", "runs", "passed", "errors", "duration_sum", "histogram")
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name
+        self.runs = 0
+        self.passed = 0
+        self.errors = 0
+        self.duration_sum = 0.0
+        self.histogram = LatencyHistogram()
+
+    def add(self, passed: bool, error: bool, duration: float) -> None:
+        self.runs += 1
+        self.passed += 1 if passed else 0
+        self.errors += 1 if error else 0
+        self.duration_sum += duration
+        self.histogram.record(duration)
+
+def _case_modules(db: Session, case_ids: List[int]) -> Dict[int, str]:
+    """用例ID -> 关联接口的模块名（用例未关联接口或接口无模块时不在结果中）"""
+    modules: Dict[int, str] = {}
+    for start in range(0, len(case_ids), _BATCH_SIZE):
+        chunk = case_ids[start:start + _BATCH_SIZE]
+        rows = (
+            db.query(TestCase.id, Api.module_name)
+            .join(Api, TestCase.api_id == Api.id)
+            .filter(TestCase.id.in_(chunk), Api.module_name.isnot(None))
+        )
+        modules.update({case_id: module for case_id, module in rows})
+    return modules
+
+def _collect(db: Session, report: TestReport) -> Dict[Tuple[str, str], _Bucket]:
+    """流式读取报告的结果，返回各维度（scope, key）的累计值"""
+    buckets: Dict[Tuple[str, str], _Bucket] = {("project", ""): _Bucket()}
+    result = db.execute(
+        select(TestResult.test_case_id, TestResult.name, TestResult.passed, TestResult.error.isnot(None), TestResult.duration)
+        .where(TestResult.report_id == report.id)
+        .execution_options(yield_per=_BATCH_SIZE)
+    )
+    for case_id, name, passed, error, duration in result:
+        duration = duration or 0.0
+        buckets[("project", "")].add(passed, error, duration)
+        key = ("case", str(case_id))
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = _Bucket(name)
+        bucket.add(passed, error, duration)
+    result.close()
+
+    case_buckets = {int(key): bucket for (scope, key), bucket in buckets.items() if scope == "case"}
+    for case_id, module in _case_modules(db, list(case_buckets)).items():
+        key = ("module", module[:128])
+        module_bucket = buckets.get(key)
+        if module_bucket is None:
+            module_bucket = buckets[key] = _Bucket(module[:128])
+        bucket = case_buckets[case_id]
+        module_bucket.runs += bucket.runs
+        module_bucket.passed += bucket.passed
+        module_bucket.errors += bucket.errors
+        module_bucket.duration_sum += bucket.duration_sum
+        module_bucket.histogram.merge(bucket.histogram)
+    return buckets
+
+def _percentile(histogram: LatencyHistogram, percent: float) -> Optional[float]:
+    return histogram.percentile(percent) if histogram.count else None
+
+def _merge_rollups(db: Session, project_id: int, day: date, buckets: Dict[Tuple[str, str], _Bucket]) -> None:
+    """
+    将一个报告的累计值合并到当天的汇总行：已有行加行锁后相加并批量更新，其余批量插入
+    行锁持有到调用方提交，同一天并发结束的报告依次合并；按 (scope, key) 顺序加锁避免死锁
+    """
+    items = sorted(buckets.items())
+    for start in range(0, len(items), _BATCH_SIZE):
+        chunk = dict(items[start:start + _BATCH_SIZE])
+        existing: Dict[Tuple[str, str], TestResultDaily] = {}
+        for scope in ROLLUP_SCOPES:
+            keys = [key for s, key in chunk if s == scope]
+            if not keys:
+                continue
+            rows = (
+                db.query(TestResultDaily)
+                .filter(
+                    TestResultDaily.project_id == project_id,
+                    TestResultDaily.day == day,
+                    TestResultDaily.scope == scope,
+                    TestResultDaily.scope_key.in_(keys),
+                )
+                .order_by(TestResultDaily.scope_key)
+                .with_for_update()
+                .populate_existing()
+            )
+            existing.update({(row.scope, row.scope_key): row for row in rows})
+
+        inserts: List[Dict[str, Any]] = []
+        updates: List[Dict[str, Any]] = []
+        for (scope, key), bucket in chunk.items():
+            row = existing.get((scope, key))
+            histogram = LatencyHistogram()
+            if row is not None and row.duration_histogram:
+                histogram = LatencyHistogram.from_dict(row.duration_histogram)
+            histogram.merge(bucket.histogram)
+            values = {
+                "name": bucket.name or (row.name if row is not None else None),
+                "report_count": (row.report_count if row is not None else 0) + 1,
+                "runs": (row.runs if row is not None else 0) + bucket.runs,
+                "passed": (row.passed if row is not None else 0) + bucket.passed,
+                "failed": (row.failed if row is not None else 0) + bucket.runs - bucket.passed,
+                "errors": (row.errors if row is not None else 0) + bucket.errors,
+                "duration_sum": (row.duration_sum if row is not None else 0.0) + bucket.duration_sum,
+                "p50_duration": _percentile(histogram, 50),
+                "p95_duration": _percentile(histogram, 95),
+                "duration_histogram": histogram.to_dict(),
+            }
+            if row is not None:
+                updates.append({"id": row.id, **values})
+            else:
+                inserts.append({"project_id": project_id, "day": day, "scope": scope, "scope_key": key, **values})
+        if updates:
+            db.execute(update(TestResultDaily), updates)
+        if inserts:
+            db.execute(insert(TestResultDaily), inserts)
+
+def summarize_report(db: Session, report: TestReport) -> bool:
+    """
+    物化报告汇总：报告的通过率与用例耗时 p50 / p95，并增量合并到按天的项目 / 模块 / 用例汇总
+    不提交：由调用方与报告的最终状态在同一事务中提交（见 plan_runner._finish），轮询到结束状态时汇总已可读
+    以 rolled_up_at 的条件更新认领报告，保证同一报告只合并一次；与其他报告并发创建同一汇总行时，
+    提交或 flush 会抛出 IntegrityError（MySQL 下也可能因间隙锁死锁抛出 OperationalError），由调用方回滚后重试
+    返回: 是否执行了合并
+    """
+    rolled_up_at = datetime.now()
+    claimed = db.execute(
+        update(TestReport)
+        .where(TestReport.id == report.id, TestReport.rolled_up_at.is_(None))
+        .values(rolled_up_at=rolled_up_at)
+        .execution_options(synchronize_session=False)
+    ).rowcount == 1
+    if not claimed:
+        return False
+    buckets = _collect(db, report)
+    overall = buckets[("project", "")]
+    if overall.runs:
+        _merge_rollups(db, report.project_id, (report.finished_at or rolled_up_at).date(), buckets)
+    report.rolled_up_at = rolled_up_at
+    report.pass_rate = overall.passed / overall.runs if overall.runs else None
+    report.p50_duration = _percentile(overall.histogram, 50)
+    report.p95_duration = _percentile(overall.histogram, 95)
+    db.add(report)
+    return True
+
+def _point(row: Any) -> Dict[str, Any]:
+    runs = row.runs or 0
+    return {
+        "runs": runs,
+        "passed": row.passed or 0,
+        "failed": row.failed or 0,
+        "errors": row.errors or 0,
+        "pass_rate": (row.passed or 0) / runs if runs else None,
+        "avg_duration": (row.duration_sum or 0.0) / runs if runs else None,
+    }
+
+def get_trend(
+    db: Session,
+    project_id: int,
+    start_day: date,
+    end_day: date,
+    scope: str = "project",
+    scope_key: str = "",
+) -> List[Dict[str, Any]]:
+    """按天的趋势（只读取汇总行），没有执行记录的日期不返回"""
+    rows = (
+        db.query(TestResultDaily)
+        .filter(
+            TestResultDaily.project_id == project_id,
+            TestResultDaily.scope == scope,
+            TestResultDaily.scope_key == scope_key,
+            TestResultDaily.day >= start_day,
+            TestResultDaily.day <= end_day,
+        )
+        .order_by(TestResultDaily.day)
+        .all()
+    )
+    return [
+        {"day": row.day, "report_count": row.report_count, "p50_duration": row.p50_duration,
+         "p95_duration": row.p95_duration, **_point(row)}
+        for row in rows
+    ]
+
+# 分维度排行的排序方式
+BREAKDOWN_ORDERS = ("failed", "pass_rate", "runs")
+
+def get_breakdown(
+    db: Session,
+    project_id: int,
+    scope: str,
+    start_day: date,
+    end_day: date,
+    order_by: str = "failed",
+    limit: int = 20,
+) -> List[Dict[str, Any]]:
+    """
+    时间范围内按模块或用例汇总的排行（如失败最多、通过率最低的用例）
+    计数在数据库中按键求和；分位数只对返回的键合并直方图
+    """
+    filters = (
+        TestResultDaily.project_id == project_id,
+        TestResultDaily.scope == scope,
+        TestResultDaily.day >= start_day,
+        TestResultDaily.day <= end_day,
+    )
+    runs = func.sum(TestResultDaily.runs)
+    passed = func.sum(TestResultDaily.passed)
+    pass_rate = case((runs > 0, passed * 1.0 / runs), else_=None)
+    ordering = {
+        "failed": (func.sum(TestResultDaily.failed).desc(), TestResultDaily.scope_key),
+        "pass_rate": (pass_rate.asc(), runs.desc(), TestResultDaily.scope_key),
+        "runs": (runs.desc(), TestResultDaily.scope_key),
+    }[order_by]
+    rows = (
+        db.query(
+            TestResultDaily.scope_key,
+            func.max(TestResultDaily.name).label("name"),
+            func.sum(TestResultDaily.report_count).label("report_count"),
+            runs.label("runs"),
+            passed.label("passed"),
+            func.sum(TestResultDaily.failed).label("failed"),
+            func.sum(TestResultDaily.errors).label("errors"),
+            func.sum(TestResultDaily.duration_sum).label("duration_sum"),
+        )
+        .filter(*filters)
+        .group_by(TestResultDaily.scope_key)
+        .order_by(*ordering)
+        .limit(limit)
+        .all()
+    )
+    if not rows:
+        return []
+    histograms: Dict[str, LatencyHistogram] = {row.scope_key: LatencyHistogram() for row in rows}
+    for key, data in db.query(TestResultDaily.scope_key, TestResultDaily.duration_histogram).filter(
+        *filters, TestResultDaily.scope_key.in_(list(histograms))
+    ):
+        if data:
+            histograms[key].merge(LatencyHistogram.from_dict(data))
+    return [
+        {
+            "scope_key": row.scope_key,
+            "name": row.name,
+            "report_count": row.report_count,
+            "p50_duration": _percentile(histograms[row.scope_key], 50),
+            "p95_duration": _percentile(histograms[row.scope_key], 95),
+            **_point(row),
+        }
+        for row in rows
+    ]
@@ -0,0 +1,94 @@
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session, selectinload
+from app.core.assertions import compile_assertions
+from app.core.extractors import compile_extractors
+from app.models.api import Api
+from app.models.scene import Scene, SceneStep
+from app.models.test_case import TestCase
+from app.schemas.scene import SceneCreate, SceneUpdate, SceneStepCreate
+
+def get_scene(db: Session, scene_id: int) -> Optional[Scene]:
+    return db.query(Scene).options(selectinload(Scene.steps)).filter(Scene.id == scene_id).first()
+
+def get_scenes(db: Session, project_id: int, skip: int = 0, limit: int = 100) -> List[Scene]:
+    return (
+        db.query(Scene)
+        .options(selectinload(Scene.steps))
+        .filter(Scene.project_id == project_id)
+        .order_by(Scene.id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+def _build_steps(steps: List[SceneStepCreate]) -> List[SceneStep]:
+    # 保存前编译断言与提取规则，配置非法时抛出 AssertionCompileError / ExtractorCompileError
+    db_steps = []
+    for step in steps:
+        try:
+            compile_assertions(step.assertions)
+            compile_extractors(step.extracts)
+        except ValueError as e:
+            raise type(e)(f"步骤「{step.step_name}」{e}") from None
+        db_steps.append(SceneStep(**step.model_dump()))
+    return db_steps
+
+def create_scene(db: Session, scene: SceneCreate, project_id: int) -> Scene:
+    db_obj = Scene(**scene.model_dump(exclude={"steps"}), project_id=project_id)
+    db_obj.steps = _build_steps(scene.steps)
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+    return db_obj
+
+def update_scene(db: Session, db_obj: Scene, obj_in: SceneUpdate) -> Scene:
+    update_data = obj_in.model_dump(exclude={"steps"}, exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_obj, field, value)
+    if obj_in.steps is not None:
+        db_obj.steps = _build_steps(obj_in.steps)
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+    return db_obj
+
+def delete_scene(db: Session, scene_id: int) -> Scene:
+    obj = db.query(Scene).get(scene_id)
+    db.delete(obj)
+    db.commit()
+    return obj
+
+def get_step_refs(db: Session, project_id: int, steps: List) -> Tuple[Dict[int, Api], Dict[int, TestCase]]:
+    """
+    批量查询步骤引用的接口与用例（每种引用类型一次查询）
+    返回: (接口ID -> 接口, 用例ID -> 用例)，只包含属于该项目的记录
+    """
+    api_ids = {s.ref_id for s in steps if s.ref_type == "API"}
+    case_ids = {s.ref_id for s in steps if s.ref_type == "CASE"}
+    apis = {}
+    cases = {}
+    if api_ids:
+        apis = {
+            api.id: api
+            for api in db.query(Api)
+            .options(selectinload(Api.request_template))
+            .filter(Api.project_id == project_id, Api.id.in_(api_ids))
+        }
+    if case_ids:
+        cases = {
+            case.id: case
+            for case in db.query(TestCase).filter(TestCase.project_id == project_id, TestCase.id.in_(case_ids))
+        }
+    return apis, cases
+
+def missing_step_refs(steps: List, apis: Dict[int, Api], cases: Dict[int, TestCase]) -> List[str]:
+    """返回在 get_step_refs 的结果中找不到引用的步骤名称"""
+    return [
+        s.step_name for s in steps
+        if (s.ref_type == "API" and s.ref_id not in apis) or (s.ref_type == "CASE" and s.ref_id not in cases)
+    ]
+
+def find_missing_refs(db: Session, project_id: int, steps: List) -> List[str]:
+    """返回引用不存在（或不属于该项目）的步骤名称"""
+    apis, cases = get_step_refs(db, project_id, steps)
+    return missing_step_refs(steps, apis, cases)
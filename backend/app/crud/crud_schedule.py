@@ -0,0 +1,243 @@
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import exc, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.cron import CronExpression, get_timezone, next_fire_time
+from app.models.schedule import PlanSchedule, SchedulerLock
+from app.models.test_plan import TestPlan, TestReport
+from app.schemas.schedule import PlanScheduleCreate, PlanScheduleUpdate
+
+# 错过触发时最多逐个检查的 cron 时间数（停机很久后不逐分钟回溯）
+_MAX_MISSED_SCAN = 1000
+
+# 修改后需要重新计算下一次触发时间的字段
+_TIMING_FIELDS = {"cron", "timezone", "jitter_seconds", "is_active"}
+
+def _jitter(schedule: PlanSchedule) -> timedelta:
+    limit = settings.SCHEDULER_JITTER_SECONDS if schedule.jitter_seconds is None else schedule.jitter_seconds
+    return timedelta(seconds=random.uniform(0, limit)) if limit > 0 else timedelta(0)
+
+def _next_run(schedule: PlanSchedule, after: datetime) -> Tuple[datetime, datetime]:
+    """下一次 cron 时间与加上随机延迟后的触发时间（异常: CronError）"""
+    next_run_at = next_fire_time(CronExpression(schedule.cron), after, get_timezone(schedule.timezone))
+    return next_run_at, next_run_at + _jitter(schedule)
+
+def _reschedule(schedule: PlanSchedule, now: datetime) -> None:
+    if schedule.is_active:
+        schedule.next_run_at, schedule.fire_at = _next_run(schedule, now)
+    else:
+        schedule.next_run_at = schedule.fire_at = None
+
+# Plan Schedule CRUD
+def get_schedule(db: Session, schedule_id: int) -> Optional[PlanSchedule]:
+    return db.query(PlanSchedule).filter(PlanSchedule.id == schedule_id).first()
+
+def get_schedules(db: Session, plan_id: int) -> List[PlanSchedule]:
+    return db.query(PlanSchedule).filter(PlanSchedule.plan_id == plan_id).order_by(PlanSchedule.id).all()
+
+def get_upcoming_schedules(db: Session, limit: int = 20) -> List[PlanSchedule]:
+    """按触发时间排列的启用中的调度"""
+    return (
+        db.query(PlanSchedule)
+        .filter(PlanSchedule.is_active.is_(True), PlanSchedule.fire_at.isnot(None))
+        .order_by(PlanSchedule.fire_at)
+        .limit(limit)
+        .all()
+    )
+
+def create_schedule(db: Session, schedule: PlanScheduleCreate, plan: TestPlan, now: Optional[datetime] = None) -> PlanSchedule:
+    """创建调度并计算下一次触发时间（异常: cron 表达式或时区非法时抛出 CronError）"""
+    db_obj = PlanSchedule(**schedule.model_dump(), project_id=plan.project_id, plan_id=plan.id)
+    _reschedule(db_obj, now or datetime.now())
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+    return db_obj
+
+def update_schedule(db: Session, db_obj: PlanSchedule, obj_in: PlanScheduleUpdate, now: Optional[datetime] = None) -> PlanSchedule:
+    """更新调度，修改 cron、时区、随机延迟或启用状态时重新计算下一次触发时间（异常: CronError）"""
+    update_data = obj_in.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_obj, field, value)
+    if _TIMING_FIELDS & update_data.keys():
+        _reschedule(db_obj, now or datetime.now())
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+    return db_obj
+
+def delete_schedule(db: Session, schedule_id: int) -> PlanSchedule:
+    obj = db.query(PlanSchedule).get(schedule_id)
+    db.delete(obj)
+    db.commit()
+    return obj
+
+# Scheduler
+def get_due_schedule_ids(db: Session, now: datetime, limit: int) -> List[int]:
+    """触发时间已到的启用中的调度ID，按触发时间排列"""
+    rows = (
+        db.query(PlanSchedule.id)
+        .filter(PlanSchedule.is_active.is_(True), PlanSchedule.fire_at <= now)
+        .order_by(PlanSchedule.fire_at)
+        .limit(limit)
+        .all()
+    )
+    return [row.id for row in rows]
+
+def acquire_lock(db: Session, name: str, owner: str, ttl: float, now: Optional[datetime] = None) -> bool:
+    """
+    获取或续期租约：仅当租约属于 owner 或已过期时，条件更新才会命中该行
+    多个进程同时获取时数据库行锁保证只有一个成功
+    返回: 是否持有租约
+    """
+    now = now or datetime.now()
+    values = {"owner": owner, "expires_at": now + timedelta(seconds=ttl)}
+    result = db.execute(
+        update(SchedulerLock)
+        .where(
+            SchedulerLock.name == name,
+            (SchedulerLock.owner == owner) | SchedulerLock.expires_at.is_(None) | (SchedulerLock.expires_at < now),
+        )
+        .values(**values)
+    )
+    if result.rowcount == 1:
+        db.commit()
+        return True
+    db.rollback()
+    if db.get(SchedulerLock, name) is not None:
+        return False
+    # 首次运行：创建租约行，并发创建时主键冲突的一方失败
+    try:
+        db.add(SchedulerLock(name=name, **values))
+        db.commit()
+    except exc.IntegrityError:
+        db.rollback()
+        return False
+    return True
+
+def release_lock(db: Session, name: str, owner: str) -> None:
+    """释放租约（仅当仍由 owner 持有），其他进程下一轮即可接管"""
+    db.execute(
+        update(SchedulerLock)
+        .where(SchedulerLock.name == name, SchedulerLock.owner == owner)
+        .values(expires_at=None)
+    )
+    db.commit()
+
+def get_lock(db: Session, name: str) -> Optional[SchedulerLock]:
+    return db.get(SchedulerLock, name)
+
+def _has_active_scheduled_run(db: Session, plan_id: int) -> bool:
+    return db.query(TestReport.id).filter(
+        TestReport.plan_id == plan_id,
+        TestReport.trigger_type == "SCHEDULE",
+        TestReport.status.in_(("PENDING", "RUNNING")),
+    ).first() is not None
+
+def fire_schedule(db: Session, schedule_id: int, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    触发一个到期的调度：按错过触发与合并策略入队计划执行任务（SCHEDULE 报告），并推进到下一次触发时间
+    - 晚于 cron 时间（扣除随机延迟）超过 misfire_grace_seconds 的触发视为错过，不再执行
+    - coalesce=True 时错过的多次触发只执行一次，否则逐次执行（最多 SCHEDULER_MAX_CATCHUP_RUNS 次）
+    - 该计划上一次定时执行尚未结束时跳过本次触发，避免任务堆积
+    推进触发时间使用条件更新（fire_at 未被其他进程修改），同一次触发不会被重复执行
+    返回: {"status": DISPATCHED / SKIPPED / MISFIRED / ERROR / None（未到期或已被处理）, "report_ids", "misfired"}
+    """
+    now = now or datetime.now()
+    outcome: Dict[str, Any] = {"status": None, "report_ids": [], "misfired": 0}
+    schedule = get_schedule(db, schedule_id)
+    if schedule is None or not schedule.is_active or schedule.fire_at is None or schedule.fire_at > now:
+        return outcome
+
+    claimed_fire_at = schedule.fire_at
+    plan = schedule.plan
+    try:
+        expression, timezone = CronExpression(schedule.cron), get_timezone(schedule.timezone)
+    except ValueError as e:
+        return _finish(db, schedule, claimed_fire_at, None, None, outcome, "ERROR", now, str(e))
+
+    # 到期的 cron 时间：当前这一次以及停机或阻塞期间错过的后续时间
+    due = [schedule.next_run_at or claimed_fire_at]
+    while len(due) < _MAX_MISSED_SCAN:
+        value = next_fire_time(expression, due[-1], timezone)
+        if value > now:
+            break
+        due.append(value)
+    offset = claimed_fire_at - due[0]
+    grace = timedelta(seconds=settings.SCHEDULER_MISFIRE_GRACE_SECONDS if schedule.misfire_grace_seconds is None
+                      else schedule.misfire_grace_seconds)
+    on_time = [value for value in due if now - value - offset <= grace]
+    outcome["misfired"] = len(due) - len(on_time)
+    runs = min(len(on_time), 1 if schedule.coalesce else settings.SCHEDULER_MAX_CATCHUP_RUNS)
+    next_run_at, fire_at = _next_run(schedule, max(now, due[-1]))
+
+    if not runs:
+        return _finish(db, schedule, claimed_fire_at, next_run_at, fire_at, outcome, "MISFIRED", now)
+    environment_id = schedule.environment_id or (plan.environment_id if plan else None)
+    if plan is None or not plan.is_active or not environment_id:
+        return _finish(db, schedule, claimed_fire_at, next_run_at, fire_at, outcome, "ERROR", now,
+                       "计划已停用或未指定执行环境")
+    if _has_active_scheduled_run(db, plan.id):
+        return _finish(db, schedule, claimed_fire_at, next_run_at, fire_at, outcome, "SKIPPED", now)
+
+    reports = [
+        TestReport(
+            project_id=plan.project_id,
+            plan_id=plan.id,
+            environment_id=environment_id,
+            trigger_type="SCHEDULE",
+            status="PENDING",
+        )
+        for _ in range(runs)
+    ]
+    return _finish(db, schedule, claimed_fire_at, next_run_at, fire_at, outcome, "DISPATCHED", now, reports=reports)
+
+def _finish(
+    db: Session,
+    schedule: PlanSchedule,
+    claimed_fire_at: datetime,
+    next_run_at: Optional[datetime],
+    fire_at: Optional[datetime],
+    outcome: Dict[str, Any],
+    status: str,
+    now: datetime,
+    error: Optional[str] = None,
+    reports: Optional[List[TestReport]] = None,
+) -> Dict[str, Any]:
+    """条件推进调度并在同一事务中写入报告；调度已被其他进程推进时放弃本次触发"""
+    values: Dict[str, Any] = {
+        "next_run_at": next_run_at,
+        "fire_at": fire_at,
+        "last_run_at": now,
+        "last_status": status,
+        "misfire_count": PlanSchedule.misfire_count + outcome["misfired"],
+    }
+    if next_run_at is None:
+        # cron 表达式已无法解析：停用调度，避免每轮重复报错
+        values["is_active"] = False
+    result = db.execute(
+        update(PlanSchedule)
+        .where(PlanSchedule.id == schedule.id, PlanSchedule.fire_at == claimed_fire_at)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        db.rollback()
+        return outcome
+    if reports:
+        db.add_all(reports)
+        db.flush()
+        db.execute(
+            update(PlanSchedule)
+            .where(PlanSchedule.id == schedule.id)
+            .values(last_report_id=reports[-1].id, run_count=PlanSchedule.run_count + len(reports))
+            .execution_options(synchronize_session=False)
+        )
+        outcome["report_ids"] = [report.id for report in reports]
+    db.commit()
+    outcome["status"] = status
+    if error:
+        outcome["error"] = error
+    return outcome
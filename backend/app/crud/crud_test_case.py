@@ -1,15 +1,53 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import delete, update
 from sqlalchemy.orm import Session
-from app.models.test_case import TestCase
-from app.schemas.test_case import TestCaseCreate, TestCaseUpdate
+from app.core.assertions import AssertionCompileError, AssertionPlan, compile_assertions, plan_cache
+from app.crud.pagination import Page, count_cache, keyset_paginate
+from app.models.api import Api
+from app.models.test_case import TestCase, TestCaseDataset
+from app.schemas.test_case import TestCaseBulkUpdateItem, TestCaseCreate, TestCaseUpdate
 
 def get_test_case(db: Session, test_case_id: int) -> Optional[TestCase]:
     return db.query(TestCase).filter(TestCase.id == test_case_id).first()
 
-def get_test_cases(db: Session, project_id: int, skip: int = 0, limit: int = 100) -> List[TestCase]:
-    return db.query(TestCase).filter(TestCase.project_id == project_id).offset(skip).limit(limit).all()
+def get_test_cases(
+    db: Session,
+    project_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    order_by: str = "id"
+) -> Page:
+    """游标分页查询项目下的用例，见 pagination.keyset_paginate"""
+    query = db.query(TestCase).filter(TestCase.project_id == project_id)
+    return keyset_paginate(query, TestCase, count_key=project_id, cursor=cursor, limit=limit, order_by=order_by)
+
+def get_test_cases_for_run(
+    db: Session,
+    project_id: int,
+    test_case_ids: Optional[List[int]] = None,
+    module_name: Optional[str] = None
+) -> List[TestCase]:
+    """
+    查询批量执行的用例
+    - test_case_ids: 指定用例ID，为空时取项目下全部用例
+    - module_name: 按关联接口的模块筛选
+    """
+    query = db.query(TestCase).filter(TestCase.project_id == project_id)
+    if test_case_ids:
+        query = query.filter(TestCase.id.in_(test_case_ids))
+    if module_name:
+        query = query.join(Api, TestCase.api_id == Api.id).filter(Api.module_name == module_name)
+    return query.order_by(TestCase.id).all()
+
+def get_assertion_plan(test_case: TestCase) -> AssertionPlan:
+    """
+    获取用例编译后的断言计划（按 updated_at 缓存）
+    """
+    return plan_cache.get(test_case.id, test_case.updated_at, test_case.assertions)
 
 def create_test_case(db: Session, test_case: TestCaseCreate, project_id: int) -> TestCase:
+    # 保存前编译断言，配置非法时抛出 AssertionCompileError
+    plan = compile_assertions(test_case.assertions)
     db_obj = TestCase(
         project_id=project_id,
         api_id=test_case.api_id,
@@ -26,19 +64,175 @@ def create_test_case(db: Session, test_case: TestCaseCreate, project_id: int) ->
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    plan_cache.put(db_obj.id, db_obj.updated_at, plan)
+    count_cache.invalidate(TestCase.__tablename__)
     return db_obj
 
 def update_test_case(db: Session, db_obj: TestCase, obj_in: TestCaseUpdate) -> TestCase:
     update_data = obj_in.model_dump(exclude_unset=True)
+    # 保存前编译断言，配置非法时抛出 AssertionCompileError
+    plan = compile_assertions(update_data["assertions"]) if "assertions" in update_data else None
     for field, value in update_data.items():
         setattr(db_obj, field, value)
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    if plan is not None:
+        plan_cache.put(db_obj.id, db_obj.updated_at, plan)
     return db_obj
 
 def delete_test_case(db: Session, test_case_id: int) -> TestCase:
     obj = db.query(TestCase).get(test_case_id)
     db.delete(obj)
     db.commit()
+    plan_cache.discard(test_case_id)
+    count_cache.invalidate(TestCase.__tablename__)
     return obj
+
+# 不允许为空的用例字段（更新项中显式传入 null 时在校验阶段报错，而不是提交时违反约束）
+_NOT_NULL_FIELDS = tuple(
+    column.key for column in TestCase.__table__.columns
+    if not column.nullable and column.key in TestCaseUpdate.model_fields
+)
+
+def bulk_write_test_cases(
+    db: Session,
+    project_id: int,
+    create: List[TestCaseCreate],
+    update_items: List[TestCaseBulkUpdateItem],
+    delete_ids: List[int],
+) -> Tuple[bool, List[Dict[str, Any]], List[str]]:
+    """
+    批量创建、更新与删除用例（一个事务）
+    - 先整体校验：必填字段不为空、断言可编译、关联接口属于该项目、更新/删除的用例存在于该项目且不重复
+    - 任一项校验失败时不写入任何数据，合法项标记为 not_applied
+    - 校验通过后创建一次 flush（支持 RETURNING 的数据库合并为批量插入），更新按主键 executemany，
+      删除为一条 DELETE，最后一次提交
+    返回: (是否已提交, 逐项结果, 被删除用例的数据集文件存储路径)，文件由调用方在提交后删除
+    """
+    referenced_api_ids = {item.api_id for item in list(create) + list(update_items) if item.api_id is not None}
+    valid_api_ids = set()
+    if referenced_api_ids:
+        valid_api_ids = {
+            api_id for (api_id,) in
+            db.query(Api.id).filter(Api.project_id == project_id, Api.id.in_(referenced_api_ids))
+        }
+    target_ids = {item.id for item in update_items} | set(delete_ids)
+    existing_ids = set()
+    if target_ids:
+        existing_ids = {
+            case_id for (case_id,) in
+            db.query(TestCase.id).filter(TestCase.project_id == project_id, TestCase.id.in_(target_ids))
+        }
+
+    def check(data: Dict[str, Any]) -> Optional[str]:
+        null_fields = [field for field in _NOT_NULL_FIELDS if field in data and data[field] is None]
+        if null_fields:
+            return f"字段不能为空: {', '.join(null_fields)}"
+        if data.get("api_id") is not None and data["api_id"] not in valid_api_ids:
+            return f"接口 {data['api_id']} 不存在或不属于该项目"
+        if "assertions" in data:
+            try:
+                compile_assertions(data["assertions"])
+            except AssertionCompileError as e:
+                return f"断言配置错误: {e}"
+        return None
+
+    items: List[Dict[str, Any]] = []
+    for index, item in enumerate(create):
+        error = check(item.model_dump())
+        items.append({"op": "create", "index": index, "id": None, "error": error})
+    seen_ids = set()
+    for index, item in enumerate(update_items):
+        error = None
+        if item.id not in existing_ids:
+            error = "未找到该用例"
+        elif item.id in seen_ids:
+            error = "同一用例在批量操作中重复出现"
+        else:
+            error = check(item.model_dump(exclude_unset=True, exclude={"id"}))
+        seen_ids.add(item.id)
+        items.append({"op": "update", "index": index, "id": item.id, "error": error})
+    for index, case_id in enumerate(delete_ids):
+        error = None
+        if case_id not in existing_ids:
+            error = "未找到该用例"
+        elif case_id in seen_ids:
+            error = "同一用例在批量操作中重复出现"
+        seen_ids.add(case_id)
+        items.append({"op": "delete", "index": index, "id": case_id, "error": error})
+
+    if any(item["error"] for item in items):
+        for item in items:
+            item["status"] = "error" if item["error"] else "not_applied"
+        return False, items, []
+
+    created = [TestCase(project_id=project_id, **item.model_dump()) for item in create]
+    db.add_all(created)
+    db.flush()
+
+    updates = [item.model_dump(exclude_unset=True) for item in update_items]
+    updates = [row for row in updates if len(row) > 1]
+    if updates:
+        db.execute(update(TestCase), updates)
+
+    storage_paths: List[str] = []
+    if delete_ids:
+        storage_paths = [
+            path for (path,) in
+            db.query(TestCaseDataset.storage_path).filter(TestCaseDataset.test_case_id.in_(delete_ids))
+        ]
+        db.execute(delete(TestCaseDataset).where(TestCaseDataset.test_case_id.in_(delete_ids)))
+        db.execute(delete(TestCase).where(TestCase.id.in_(delete_ids)), execution_options={"synchronize_session": False})
+    created_ids = [obj.id for obj in created]
+    db.commit()
+
+    # 断言计划按 updated_at 缓存，创建与更新的用例在下次执行时重新编译
+    for case_id in [item.id for item in update_items] + list(delete_ids):
+        plan_cache.discard(case_id)
+    if create or delete_ids:
+        count_cache.invalidate(TestCase.__tablename__)
+
+    statuses = {"create": "created", "update": "updated", "delete": "deleted"}
+    for item in items:
+        item["status"] = statuses[item["op"]]
+        if item["op"] == "create":
+            item["id"] = created_ids[item["index"]]
+    return True, items, storage_paths
+
+def get_dataset(db: Session, test_case_id: int) -> Optional[TestCaseDataset]:
+    return db.query(TestCaseDataset).filter(TestCaseDataset.test_case_id == test_case_id).first()
+
+def save_dataset(
+    db: Session,
+    test_case_id: int,
+    file_name: str,
+    file_format: str,
+    info: Dict[str, Any],
+) -> Tuple[TestCaseDataset, Optional[str]]:
+    """
+    保存用例的数据集信息（每个用例一个数据集，重复上传时替换）
+    - info: core.dataset.store_dataset 的返回值
+    返回: (数据集, 被替换的旧文件存储路径)，旧文件由调用方在提交成功后删除
+    """
+    db_obj = get_dataset(db, test_case_id)
+    old_storage_path = None
+    if db_obj is None:
+        db_obj = TestCaseDataset(test_case_id=test_case_id)
+    else:
+        old_storage_path = db_obj.storage_path
+    db_obj.file_name = file_name
+    db_obj.file_format = file_format
+    db_obj.storage_path = info["storage_path"]
+    db_obj.size_bytes = info["size_bytes"]
+    db_obj.row_count = info["row_count"]
+    db_obj.columns = info["columns"]
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+    return db_obj, old_storage_path
+
+def delete_dataset(db: Session, db_obj: TestCaseDataset) -> TestCaseDataset:
+    db.delete(db_obj)
+    db.commit()
+    return db_obj
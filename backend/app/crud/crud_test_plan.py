@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set
+from sqlalchemy import case, func, update
+from sqlalchemy.orm import Session
+from app.models.test_plan import TestPlan, TestReport, TestResult
+from app.schemas.test_plan import TestPlanCreate, TestPlanUpdate
+
+# Test Plan CRUD
+def get_plan(db: Session, plan_id: int) -> Optional[TestPlan]:
+    return db.query(TestPlan).filter(TestPlan.id == plan_id).first()
+
+def get_plans(db: Session, project_id: int, skip: int = 0, limit: int = 100) -> List[TestPlan]:
+    return db.query(TestPlan).filter(TestPlan.project_id == project_id).offset(skip).limit(limit).all()
+
+def create_plan(db: Session, plan: TestPlanCreate, project_id: int) -> TestPlan:
+    db_obj = TestPlan(**plan.model_dump(), project_id=project_id)
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+    return db_obj
+
+def update_plan(db: Session, db_obj: TestPlan, obj_in: TestPlanUpdate) -> TestPlan:
+    update_data = obj_in.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_obj, field, value)
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+    return db_obj
+
+def delete_plan(db: Session, plan_id: int) -> TestPlan:
+    obj = db.query(TestPlan).get(plan_id)
+    db.delete(obj)
+    db.commit()
+    return obj
+
+# Test Report (Job) CRUD
+def get_report(db: Session, report_id: int) -> Optional[TestReport]:
+    return db.query(TestReport).filter(TestReport.id == report_id).first()
+
+def get_reports(
+    db: Session,
+    project_id: int,
+    plan_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> List[TestReport]:
+    query = db.query(TestReport).filter(TestReport.project_id == project_id)
+    if plan_id:
+        query = query.filter(TestReport.plan_id == plan_id)
+    return query.order_by(TestReport.id.desc()).offset(skip).limit(limit).all()
+
+def create_report(
+    db: Session,
+    plan: TestPlan,
+    environment_id: int,
+    triggered_by: Optional[int] = None,
+    trigger_type: str = "MANUAL"
+) -> TestReport:
+    """
+    创建一条待执行的报告（即入队一个计划执行任务），状态为 PENDING
+    """
+    db_obj = TestReport(
+        project_id=plan.project_id,
+        plan_id=plan.id,
+        environment_id=environment_id,
+        trigger_type=trigger_type,
+        triggered_by=triggered_by,
+        status="PENDING",
+    )
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+    return db_obj
+
+def get_pending_report_ids(db: Session, limit: int) -> List[int]:
+    """按入队顺序取出待执行任务ID"""
+    rows = (
+        db.query(TestReport.id)
+        .filter(TestReport.status == "PENDING")
+        .order_by(TestReport.id)
+        .limit(limit)
+        .all()
+    )
+    return [row.id for row in rows]
+
+def claim_report(db: Session, report_id: int, worker_id: str) -> bool:
+    """
+    领取任务：仅当任务仍为 PENDING 时原子地改为 RUNNING
+    多个进程同时领取同一任务时只有一个会成功
+    返回: 是否领取成功
+    """
+    now = datetime.now()
+    result = db.execute(
+        update(TestReport)
+        .where(TestReport.id == report_id, TestReport.status == "PENDING")
+        .values(status="RUNNING", worker_id=worker_id, started_at=now, heartbeat_at=now)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+def heartbeat_report(db: Session, report_id: int, worker_id: Optional[str], **values: Any) -> bool:
+    """
+    刷新任务心跳（并更新 values 中的字段），仅当任务仍由 worker_id 持有时生效；不提交
+    任务心跳超时被重新入队、由其他进程领取后返回 False，原进程应放弃执行
+    返回: 是否仍持有该任务
+    """
+    result = db.execute(
+        update(TestReport)
+        .where(TestReport.id == report_id, TestReport.worker_id == worker_id)
+        .values(heartbeat_at=datetime.now(), **values)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+def requeue_stale_reports(db: Session, stale_seconds: float) -> int:
+    """
+    将心跳超时的 RUNNING 任务重新置为 PENDING（执行该任务的进程已退出或卡死）
+    返回: 重新入队的任务数
+    """
+    deadline = datetime.now() - timedelta(seconds=stale_seconds)
+    result = db.execute(
+        update(TestReport)
+        .where(TestReport.status == "RUNNING", TestReport.heartbeat_at < deadline)
+        .values(status="PENDING", worker_id=None)
+    )
+    db.commit()
+    return result.rowcount
+
+# Test Result CRUD
+def get_results(
+    db: Session,
+    report_id: int,
+    passed: Optional[bool] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> List[TestResult]:
+    query = db.query(TestResult).filter(TestResult.report_id == report_id)
+    if passed is not None:
+        query = query.filter(TestResult.passed == passed)
+    return query.order_by(TestResult.id).offset(skip).limit(limit).all()
+
+def get_results_after(db: Session, report_id: int, after_id: int, limit: int = 100) -> List[TestResult]:
+    """按写入顺序取出 ID 大于 after_id 的结果（基于主键的增量读取，用于推送执行进度）"""
+    return (
+        db.query(TestResult)
+        .filter(TestResult.report_id == report_id, TestResult.id > after_id)
+        .order_by(TestResult.id)
+        .limit(limit)
+        .all()
+    )
+
+def get_finished_case_ids(db: Session, report_id: int) -> Set[int]:
+    """已写入结果的用例ID（任务续跑时跳过这些用例）"""
+    rows = db.query(TestResult.test_case_id).filter(TestResult.report_id == report_id).all()
+    return {row.test_case_id for row in rows}
+
+def count_results(db: Session, report_id: int) -> Dict[str, int]:
+    """按已写入的结果统计通过、失败、出错数"""
+    row = db.query(
+        func.count(TestResult.id),
+        func.sum(case((TestResult.passed.is_(True), 1), else_=0)),
+        func.sum(case((TestResult.error.isnot(None), 1), else_=0)),
+    ).filter(TestResult.report_id == report_id).one()
+    total, passed, errors = row[0] or 0, row[1] or 0, row[2] or 0
+    return {"passed": passed, "failed": total - passed, "errors": errors}
@@ -0,0 +1,146 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Generic, Hashable, List, Optional, TypeVar
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Query
+
+from app.core.config import settings
+from app.utils.cache import TTLCache
+
+T = TypeVar("T")
+
+# 支持的排序方式：id 正序（默认）；updated_at 倒序（最近修改在前，相同时间按 id 倒序）
+ORDER_BY_OPTIONS = ("id", "updated_at")
+
+class InvalidCursorError(ValueError):
+    """分页游标无法解析，或与当前排序方式不匹配（由接口层转换为 400 错误）"""
+
+def encode_cursor(order_by: str, row: Any) -> str:
+    """根据当前页最后一行生成下一页游标（URL 安全的 base64 JSON）"""
+    payload: Dict[str, Any] = {"o": order_by, "id": row.id}
+    if order_by == "updated_at":
+        payload["u"] = row.updated_at.isoformat()
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, order_by: str) -> Dict[str, Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, dict) or payload.get("o") != order_by or not isinstance(payload.get("id"), int):
+            raise ValueError(cursor)
+        if order_by == "updated_at":
+            if not isinstance(payload.get("u"), str):
+                raise ValueError(cursor)
+            payload["u"] = datetime.fromisoformat(payload["u"])
+    except ValueError:
+        raise InvalidCursorError("无效的分页游标") from None
+    return payload
+
+class Page(Generic[T]):
+    """
+    一页查询结果
+    - items: 本页数据
+    - total: 满足筛选条件的总数
+    - next_cursor: 下一页游标，没有下一页时为 None
+    - has_prev: 是否存在上一页（即本页是否由游标定位）
+    """
+    __slots__ = ("items", "total", "page_size", "next_cursor", "has_prev")
+
+    def __init__(self, items: List[T], total: int, page_size: int, next_cursor: Optional[str], has_prev: bool):
+        self.items = items
+        self.total = total
+        self.page_size = page_size
+        self.next_cursor = next_cursor
+        self.has_prev = has_prev
+
+    def to_response(self) -> Dict[str, Any]:
+        """转换为 PaginatedResponse 的字段"""
+        return {
+            "items": self.items,
+            "total": self.total,
+            "page_size": self.page_size,
+            "has_next": self.next_cursor is not None,
+            "has_prev": self.has_prev,
+            "next_cursor": self.next_cursor,
+        }
+
+class CountCache:
+    """
+    列表总数缓存：COUNT(*) 在大表上需要扫描索引，分页时短时间复用同一筛选条件的计数
+
+    每张表维护一个版本号，写入在缓存键中；该表新增或删除数据时调用 invalidate 使版本号加一，
+    旧版本的缓存不再被读取，随后按 LRU / TTL 自然淘汰。修改数据不影响总数，无需失效。
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0):
+        self._cache: TTLCache[int] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._versions: Dict[str, int] = {}
+
+    def count(self, query: Query, model: Any, key: Hashable) -> int:
+        """
+        返回 query 的总行数
+        - model: 查询的模型，按其表名失效
+        - key: 筛选条件，同一表下相同 key 视为同一计数
+        """
+        table = model.__tablename__
+        cache_key = (table, self._versions.get(table, 0), key)
+        total = self._cache.get(cache_key)
+        if total is None:
+            total = query.order_by(None).with_entities(func.count(model.id)).scalar() or 0
+            self._cache.set(cache_key, total)
+        return total
+
+    def invalidate(self, table: str) -> None:
+        self._versions[table] = self._versions.get(table, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+# 全局列表总数缓存
+count_cache = CountCache(maxsize=settings.PAGINATION_COUNT_CACHE_SIZE, ttl=settings.PAGINATION_COUNT_CACHE_TTL)
+
+def keyset_paginate(
+    query: Query,
+    model: Any,
+    count_key: Hashable,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    order_by: str = "id",
+) -> Page:
+    """
+    基于游标（keyset）的分页：按上一页最后一行的排序键定位，而不是 OFFSET 跳过前面的行，
+    翻到任意深度的页面都只需读取 limit + 1 行
+    - query: 已加好筛选条件的查询
+    - model: 查询的模型，需要有 id 列（按 updated_at 排序时还需要非空的 updated_at 列，默认值为 now_seconds）
+    - count_key: 筛选条件，用于缓存总数
+    - cursor: 上一页返回的 next_cursor，为空时取第一页
+    - order_by: 排序方式，见 ORDER_BY_OPTIONS
+    异常: 游标非法时抛出 InvalidCursorError
+    """
+    total = count_cache.count(query, model, count_key)
+
+    if order_by == "updated_at":
+        ordering = (model.updated_at.desc(), model.id.desc())
+    else:
+        ordering = (model.id.asc(),)
+
+    if cursor:
+        position = decode_cursor(cursor, order_by)
+        if order_by == "updated_at":
+            # updated_at 非空且由应用按秒写入（见 now_seconds），游标中的时间与列精度一致，可直接比较
+            updated_at = position["u"]
+            query = query.filter(or_(
+                model.updated_at < updated_at,
+                and_(model.updated_at == updated_at, model.id < position["id"]),
+            ))
+        else:
+            query = query.filter(model.id > position["id"])
+
+    # 多取一行判断是否还有下一页
+    rows = query.order_by(*ordering).limit(limit + 1).all()
+    items = rows[:limit]
+    next_cursor = encode_cursor(order_by, items[-1]) if len(rows) > limit else None
+    return Page(items, total=total, page_size=limit, next_cursor=next_cursor, has_prev=bool(cursor))
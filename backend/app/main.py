@@ -1,15 +1,47 @@
+from contextlib import asynccontextmanager
 from fastapi.exceptions import RequestValidationError
 from fastapi import FastAPI, HTTPException
 from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import PlainTextResponse
 
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.core.database import async_engine
 from app.core.exceptions import validation_exception_handler, http_exception_handler
+from app.core.metrics import MetricsMiddleware, instrument_sqlalchemy
+from app.core.query_stats import QueryStatsMiddleware, instrument_engine
+from app.core.runner import session_pool
+from app.core.async_runner import client_pool
+from app.services.job_queue import job_worker
+from app.services.load_test import load_test_manager
+from app.services.metrics import render_metrics
+from app.services.request_profiling import ProfilingMiddleware
+from app.services.scheduler import plan_scheduler
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    应用生命周期：
+    - 启动时按配置启动计划执行任务队列的工作线程与定时调度线程
+    - 关闭时停止调度、任务队列与运行中的压测，并释放执行引擎持有的上游连接与异步数据库连接池
+    """
+    if settings.JOB_WORKER_ENABLED:
+        job_worker.start()
+    if settings.SCHEDULER_ENABLED:
+        plan_scheduler.start()
+    yield
+    plan_scheduler.stop()
+    job_worker.stop()
+    load_test_manager.stop_all()
+    await client_pool.aclose()
+    session_pool.close()
+    await async_engine.dispose()
 
 app = FastAPI(
     title=settings.PROJECT_NAME, 
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Exception Handlers
@@ -25,6 +57,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Metrics: route latency middleware and database event listeners
+if settings.METRICS_ENABLED:
+    instrument_sqlalchemy()
+    app.add_middleware(MetricsMiddleware)
+
+# Query stats: per-request SQL statement count / time and repeated statement (N+1) warnings
+if settings.QUERY_STATS_ENABLED:
+    instrument_engine()
+    app.add_middleware(
+        QueryStatsMiddleware,
+        repeat_threshold=settings.QUERY_STATS_REPEAT_THRESHOLD,
+        warn_count=settings.QUERY_STATS_WARN_COUNT,
+    )
+
+# Profiling: per-request profiles on demand (admin flag) or by sampling
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.get("/")
@@ -34,3 +84,10 @@ def read_root():
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """运行指标（Prometheus 文本格式）：接口延迟、数据库查询、执行引擎上游延迟、断言耗时、线程池与缓存"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -1,11 +1,17 @@
 from datetime import datetime
 from typing import Optional, Any
-from sqlalchemy import String, Boolean, DateTime, ForeignKey, JSON, Text, func
+from sqlalchemy import String, Boolean, DateTime, ForeignKey, Index, JSON, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from app.core.database import Base
+from app.core.database import Base, now_seconds
 
 class Api(Base):
     __tablename__ = "api"
+    __table_args__ = (
+        # Keyset pagination ordered by updated_at within a project
+        Index("ix_api_project_id_updated_at", "project_id", "updated_at"),
+        # Bulk import upserts by (project, method, url_path)
+        Index("ix_api_project_id_url_path_method", "project_id", "url_path", "method"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("project.id"), nullable=False, index=True)
@@ -15,7 +21,7 @@ class Api(Base):
     url_path: Mapped[str] = mapped_column(String(512), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=now_seconds, onupdate=now_seconds, nullable=False)
 
     # Relationships
     project = relationship("Project", backref="apis")
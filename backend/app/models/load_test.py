@@ -0,0 +1,57 @@
+from datetime import datetime
+from typing import Optional, Any, List, Dict
+from sqlalchemy import String, Integer, Float, DateTime, ForeignKey, JSON, Text, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from app.core.database import Base
+
+class LoadTestReport(Base):
+    """
+    One load/throughput test run against a single API or test case.
+    RUNNING -> SUCCESS / STOPPED / ERROR; progress columns are refreshed while running.
+    """
+    __tablename__ = "load_test_report"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("project.id"), nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(128), nullable=False)
+    target_type: Mapped[str] = mapped_column(String(16), nullable=False)  # API, CASE
+    target_id: Mapped[int] = mapped_column(Integer, nullable=False)  # No FK: reports outlive deleted targets
+    environment_id: Mapped[int] = mapped_column(ForeignKey("environment.id"), nullable=False)
+    triggered_by: Mapped[Optional[int]] = mapped_column(ForeignKey("user.id"), nullable=True)
+
+    # Load Model
+    # {"mode": "closed"|"open", "concurrency", "rps", "duration", "ramp_up", "think_time", "timeout"}
+    config: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+
+    # Run State
+    status: Mapped[str] = mapped_column(String(16), default="RUNNING", index=True)
+    worker_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # Summary (latencies in seconds)
+    total_requests: Mapped[int] = mapped_column(Integer, default=0)
+    error_count: Mapped[int] = mapped_column(Integer, default=0)  # Transport errors, HTTP >= 400 or failed assertions
+    dropped_count: Mapped[int] = mapped_column(Integer, default=0)  # Open model: arrivals skipped at the in-flight cap
+    throughput: Mapped[float] = mapped_column(Float, default=0.0)  # Completed requests per second
+    error_rate: Mapped[float] = mapped_column(Float, default=0.0)
+    latency_min: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    latency_mean: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    latency_p50: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    latency_p90: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    latency_p99: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    latency_max: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
+    # Compact Details
+    status_codes: Mapped[Optional[Dict[str, int]]] = mapped_column(JSON, nullable=True)  # {"200": 9800, "0": 3}
+    errors: Mapped[Optional[Dict[str, int]]] = mapped_column(JSON, nullable=True)  # Most frequent error messages
+    histogram: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)  # LatencyHistogram.to_dict()
+    timeline: Mapped[Optional[List[Dict[str, Any]]]] = mapped_column(JSON, nullable=True)  # Per-second buckets
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    duration: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # seconds
+
+    # Relationships
+    project = relationship("Project", backref="load_test_reports")
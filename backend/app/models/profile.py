@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, Integer, Float, DateTime, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+
+class RequestProfile(Base):
+    """
+    Profile of a single platform API request, captured on demand by an admin or by sampling.
+    The profile file lives under PROFILING_DIR; this row holds its metadata.
+    """
+    __tablename__ = "request_profile"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    method: Mapped[str] = mapped_column(String(16), nullable=False)
+    path: Mapped[str] = mapped_column(String(512), nullable=False)
+    route: Mapped[str] = mapped_column(String(255), nullable=False, index=True)  # Route template
+    status_code: Mapped[int] = mapped_column(Integer, nullable=False)
+    duration: Mapped[float] = mapped_column(Float, nullable=False)  # seconds
+    mode: Mapped[str] = mapped_column(String(16), nullable=False)  # sampling, cprofile
+    trigger: Mapped[str] = mapped_column(String(16), nullable=False)  # REQUESTED, SAMPLED
+    user_id: Mapped[Optional[int]] = mapped_column(ForeignKey("user.id", ondelete="SET NULL"), nullable=True)
+
+    # Profile File
+    storage_path: Mapped[str] = mapped_column(String(255), nullable=False)  # Relative to PROFILING_DIR
+    file_format: Mapped[str] = mapped_column(String(32), nullable=False)  # speedscope.json, pstats
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), index=True)
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional, Any
 from sqlalchemy import String, Boolean, DateTime, ForeignKey, JSON, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from app.core.database import Base
+from app.core.database import Base, now_seconds
 
 class Project(Base):
     __tablename__ = "project"
@@ -13,7 +13,7 @@ class Project(Base):
     owner_id: Mapped[Optional[int]] = mapped_column(ForeignKey("user.id"), nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=now_seconds, onupdate=now_seconds, nullable=False, index=True)
 
     # Relationships
     environments = relationship("Environment", back_populates="project", cascade="all, delete-orphan")
@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import Optional, Any, List, Dict
+from sqlalchemy import String, Boolean, Integer, DateTime, ForeignKey, Index, JSON, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from app.core.database import Base
+
+class Scene(Base):
+    __tablename__ = "scene"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("project.id"), nullable=False, index=True)
+    module_name: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    name: Mapped[str] = mapped_column(String(128), index=True, nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    tags: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    variables: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)  # Initial scene variables
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+
+    # Relationships
+    project = relationship("Project", backref="scenes")
+    steps = relationship(
+        "SceneStep",
+        back_populates="scene",
+        order_by="SceneStep.order_index",
+        cascade="all, delete-orphan",
+    )
+
+class SceneStep(Base):
+    __tablename__ = "scene_step"
+    __table_args__ = (
+        Index("ix_scene_step_scene_id_order_index", "scene_id", "order_index"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    scene_id: Mapped[int] = mapped_column(ForeignKey("scene.id"), nullable=False)
+    order_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    step_name: Mapped[str] = mapped_column(String(128), nullable=False)
+    ref_type: Mapped[str] = mapped_column(String(16), nullable=False)  # API, CASE
+    ref_id: Mapped[int] = mapped_column(Integer, nullable=False)  # api.id or test_case.id depending on ref_type
+    request_override: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)  # method / url / headers / params / body / body_type
+    extracts: Mapped[Optional[List[Dict[str, Any]]]] = mapped_column(JSON, nullable=True)  # [{"variable_name", "source", "expression"}]
+    assertions: Mapped[Optional[List[Dict[str, Any]]]] = mapped_column(JSON, nullable=True)  # Overrides the referenced case's assertions
+    parallel: Mapped[bool] = mapped_column(Boolean, default=False)  # Runs concurrently with adjacent parallel steps
+    enabled_flag: Mapped[bool] = mapped_column(Boolean, default=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+
+    # Relationships
+    scene = relationship("Scene", back_populates="steps")
@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, Boolean, Integer, DateTime, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from app.core.database import Base
+
+class PlanSchedule(Base):
+    """
+    Cron schedule of a test plan. The scheduler leader enqueues a SCHEDULE report when fire_at is due.
+    next_run_at is the nominal cron time; fire_at adds the random jitter and is what the scheduler polls.
+    """
+    __tablename__ = "plan_schedule"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("project.id"), nullable=False, index=True)
+    plan_id: Mapped[int] = mapped_column(ForeignKey("test_plan.id"), nullable=False, index=True)
+    environment_id: Mapped[Optional[int]] = mapped_column(ForeignKey("environment.id"), nullable=True)  # NULL: plan default
+    name: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    cron: Mapped[str] = mapped_column(String(128), nullable=False)
+    timezone: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # NULL: server local time
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+
+    # Dispatch policies (NULL: settings defaults)
+    jitter_seconds: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    misfire_grace_seconds: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    coalesce: Mapped[bool] = mapped_column(Boolean, default=True)  # Run missed fire times once instead of each
+
+    # Scheduler state
+    next_run_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    fire_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, index=True)
+    last_run_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    last_report_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # No FK: reports may be deleted with the plan
+    last_status: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)  # DISPATCHED, SKIPPED, MISFIRED, ERROR
+    run_count: Mapped[int] = mapped_column(Integer, default=0)
+    misfire_count: Mapped[int] = mapped_column(Integer, default=0)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+
+    # Relationships
+    plan = relationship("TestPlan", back_populates="schedules")
+
+class SchedulerLock(Base):
+    """
+    Lease row electing a single scheduler leader across processes.
+    A process becomes (or stays) leader by a conditional UPDATE of the row while the lease is its own or expired.
+    """
+    __tablename__ = "scheduler_lock"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    owner: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
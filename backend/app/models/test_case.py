@@ -1,11 +1,15 @@
 from datetime import datetime
 from typing import Optional, Any, List, Dict
-from sqlalchemy import String, Integer, DateTime, ForeignKey, JSON, Text, func
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Index, JSON, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from app.core.database import Base
+from app.core.database import Base, now_seconds
 
 class TestCase(Base):
     __tablename__ = "test_case"
+    __table_args__ = (
+        # Keyset pagination ordered by updated_at within a project
+        Index("ix_test_case_project_id_updated_at", "project_id", "updated_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("project.id"), nullable=False, index=True)
@@ -25,11 +29,35 @@ class TestCase(Base):
     
     # Assertions
     # List of rules: [{"source": "status_code", "operator": "eq", "value": 200}, ...]
+    # response_time rules may set "expression" to a phase: dns, connect, tls, ttfb, download, json_decode (default total)
     assertions: Mapped[Optional[List[Dict[str, Any]]]] = mapped_column(JSON, nullable=True)
     
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=now_seconds, onupdate=now_seconds, nullable=False)
 
     # Relationships
     project = relationship("Project", backref="test_cases")
     api = relationship("Api", backref="test_cases")
+    dataset = relationship("TestCaseDataset", back_populates="test_case", uselist=False, cascade="all, delete-orphan")
+
+class TestCaseDataset(Base):
+    """
+    Parameter rows for data-driven runs of a test case. The rows live in a CSV/JSONL file
+    under settings.DATASET_DIR and are streamed at run time; only metadata is stored here.
+    """
+    __tablename__ = "test_case_dataset"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    test_case_id: Mapped[int] = mapped_column(ForeignKey("test_case.id"), nullable=False, unique=True)
+
+    file_name: Mapped[str] = mapped_column(String(255), nullable=False)  # Original upload name
+    file_format: Mapped[str] = mapped_column(String(16), nullable=False)  # csv, jsonl
+    storage_path: Mapped[str] = mapped_column(String(512), nullable=False)  # Relative to DATASET_DIR
+    size_bytes: Mapped[int] = mapped_column(Integer, default=0)
+    row_count: Mapped[int] = mapped_column(Integer, default=0)
+    columns: Mapped[Optional[List[str]]] = mapped_column(JSON, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+
+    test_case = relationship("TestCase", back_populates="dataset")
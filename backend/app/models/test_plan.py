@@ -0,0 +1,124 @@
+from datetime import date, datetime
+from typing import Optional, Any, List, Dict
+from sqlalchemy import String, Boolean, Integer, Float, Date, DateTime, ForeignKey, JSON, Text, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from app.core.database import Base
+
+class TestPlan(Base):
+    __tablename__ = "test_plan"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("project.id"), nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(128), index=True, nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+
+    # Plan Content
+    # Explicit case list; NULL means every case of the project (optionally filtered by module)
+    test_case_ids: Mapped[Optional[List[int]]] = mapped_column(JSON, nullable=True)
+    module_name: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    environment_id: Mapped[Optional[int]] = mapped_column(ForeignKey("environment.id"), nullable=True)  # Default environment
+    concurrency: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+
+    # Relationships
+    project = relationship("Project", backref="test_plans")
+    reports = relationship("TestReport", back_populates="plan", cascade="all, delete-orphan")
+    schedules = relationship("PlanSchedule", back_populates="plan", cascade="all, delete-orphan")
+
+class TestReport(Base):
+    """
+    One execution of a test plan. Doubles as the job record of the DB-backed job queue:
+    PENDING -> RUNNING -> SUCCESS / FAILED / ERROR
+    """
+    __tablename__ = "test_report"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("project.id"), nullable=False, index=True)
+    plan_id: Mapped[int] = mapped_column(ForeignKey("test_plan.id"), nullable=False, index=True)
+    environment_id: Mapped[int] = mapped_column(ForeignKey("environment.id"), nullable=False)
+    trigger_type: Mapped[str] = mapped_column(String(16), default="MANUAL")  # MANUAL, SCHEDULE
+    triggered_by: Mapped[Optional[int]] = mapped_column(ForeignKey("user.id"), nullable=True)
+
+    # Job State
+    status: Mapped[str] = mapped_column(String(16), default="PENDING", index=True)
+    worker_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # Progress / Summary
+    total_count: Mapped[int] = mapped_column(Integer, default=0)
+    passed_count: Mapped[int] = mapped_column(Integer, default=0)
+    failed_count: Mapped[int] = mapped_column(Integer, default=0)
+    error_count: Mapped[int] = mapped_column(Integer, default=0)
+    duration: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # seconds
+
+    # Summary materialized when the report finishes (see crud_report_stats.summarize_report)
+    pass_rate: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # 0..1
+    p50_duration: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # Per-case duration percentiles, seconds
+    p95_duration: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    rolled_up_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)  # Merged into test_result_daily
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    # Relationships
+    plan = relationship("TestPlan", back_populates="reports")
+    results = relationship("TestResult", back_populates="report", cascade="all, delete-orphan")
+
+class TestResult(Base):
+    __tablename__ = "test_result"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    report_id: Mapped[int] = mapped_column(ForeignKey("test_report.id"), nullable=False, index=True)
+    test_case_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)  # No FK: results outlive deleted cases
+    name: Mapped[str] = mapped_column(String(128), nullable=False)
+
+    passed: Mapped[bool] = mapped_column(Boolean, default=False)
+    status_code: Mapped[int] = mapped_column(Integer, default=0)
+    duration: Mapped[float] = mapped_column(Float, default=0.0)  # seconds
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # Snapshots
+    request_snapshot: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)  # method / url
+    response_snapshot: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)  # headers / body_size / truncated
+    assertions: Mapped[Optional[List[Dict[str, Any]]]] = mapped_column(JSON, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+
+    # Relationships
+    report = relationship("TestReport", back_populates="results")
+
+class TestResultDaily(Base):
+    """
+    Daily rollup of test results per project, module or case, merged incrementally as reports finish.
+    Trend endpoints read these rows instead of scanning test_result.
+    - scope: project (scope_key ""), module (scope_key = module name), case (scope_key = test case id)
+    - duration_histogram: LatencyHistogram.to_dict() (utils.histogram), merged across reports and days for p50 / p95
+    """
+    __tablename__ = "test_result_daily"
+    __table_args__ = (
+        UniqueConstraint("project_id", "scope", "scope_key", "day", name="uq_test_result_daily_scope_day"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("project.id"), nullable=False)
+    scope: Mapped[str] = mapped_column(String(16), nullable=False)
+    scope_key: Mapped[str] = mapped_column(String(128), nullable=False, default="")
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    name: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)  # Case name at the latest rollup
+
+    report_count: Mapped[int] = mapped_column(Integer, default=0)
+    runs: Mapped[int] = mapped_column(Integer, default=0)
+    passed: Mapped[int] = mapped_column(Integer, default=0)
+    failed: Mapped[int] = mapped_column(Integer, default=0)
+    errors: Mapped[int] = mapped_column(Integer, default=0)
+    duration_sum: Mapped[float] = mapped_column(Float, default=0.0)  # seconds
+    p50_duration: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    p95_duration: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    duration_histogram: Mapped[Optional[Dict[str, int]]] = mapped_column(JSON, nullable=True)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
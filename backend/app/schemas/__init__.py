@@ -1,7 +1,13 @@
 from app.schemas.token import Token, TokenPayload
 from app.schemas.user import User, UserCreate, UserUpdate, UserRegister
-from app.schemas.project import Project, ProjectCreate, ProjectUpdate, Environment, EnvironmentCreate, EnvironmentUpdate
-from app.schemas.interface import Api, ApiCreate, ApiUpdate, ApiRequestTemplate
+from app.schemas.project import Project, ProjectCreate, ProjectUpdate, Environment, EnvironmentCreate, EnvironmentUpdate, ProjectImportResult
+from app.schemas.interface import Api, ApiCreate, ApiUpdate, ApiRequestTemplate, ApiImportResult
 from app.schemas.debug import DebugRequest, DebugResponse
-from app.schemas.test_case import TestCase, TestCaseCreate, TestCaseUpdate
+from app.schemas.test_case import TestCase, TestCaseCreate, TestCaseUpdate, TestCaseDataset, TestCaseBulkRequest, TestCaseBulkResult
 from app.schemas.response import ApiResponse, PaginatedResponse, ErrorCode
+from app.schemas.execution import BatchRunRequest, BatchRunResult, CaseRunResult, DatasetRunRequest, DatasetRowResult, DatasetRunResult
+from app.schemas.test_plan import TestPlan, TestPlanCreate, TestPlanUpdate, TestReport, TestResult, PlanRunResponse, TrendPoint, TrendBreakdownItem
+from app.schemas.scene import Scene, SceneCreate, SceneUpdate, SceneStep, SceneStepCreate, SceneRunRequest, SceneRunResult, SceneBatchRunResult
+from app.schemas.load_test import LoadTestCreate, LoadTestReport, LoadTestReportSummary
+from app.schemas.profile import RequestProfile
+from app.schemas.schedule import PlanSchedule, PlanScheduleCreate, PlanScheduleUpdate
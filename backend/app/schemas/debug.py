@@ -16,3 +16,5 @@ class DebugResponse(BaseModel):
     body: Any
     duration: float
     error: Optional[str] = None
+    body_size: int = 0  # 捕获到的响应体字节数
+    truncated: bool = False  # 响应体是否因超过捕获上限被截断
@@ -0,0 +1,58 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+# --- Batch Run Schemas ---
+class BatchRunRequest(BaseModel):
+    """批量执行请求：指定用例ID列表，或按模块/整个项目执行"""
+    environment_id: int
+    test_case_ids: Optional[List[int]] = None  # 为空时执行项目（或模块）下的全部用例
+    module_name: Optional[str] = None  # 按接口所属模块筛选用例
+    concurrency: Optional[int] = Field(None, ge=1)  # 最大并发数，缺省取系统配置
+    per_host_rps: Optional[float] = Field(None, ge=0)  # 单主机每秒请求数上限，0 表示不限速
+    include_body: bool = False  # 结果中是否返回响应体
+
+class CaseRunResult(BaseModel):
+    """单个用例的执行结果"""
+    test_case_id: int
+    name: str
+    passed: bool
+    result: Dict[str, Any]
+    assertions: List[Dict[str, Any]] = []
+
+class BatchRunResult(BaseModel):
+    """批量执行汇总结果"""
+    total: int
+    passed: int
+    failed: int
+    errors: int  # 请求本身失败（连接错误、超时等）的用例数
+    duration: float  # seconds
+    results: List[CaseRunResult] = []
+
+# --- Dataset Run Schemas ---
+class DatasetRunRequest(BaseModel):
+    """数据驱动执行请求：用例按数据集逐行执行，行中的列通过 {{列名}} 代入请求与断言"""
+    environment_id: int
+    concurrency: Optional[int] = Field(None, ge=1)  # 最大并发数，缺省取系统配置
+    per_host_rps: Optional[float] = Field(None, ge=0)  # 单主机每秒请求数上限，0 表示不限速
+
+class DatasetRowResult(BaseModel):
+    """数据集单行的执行结果"""
+    index: int  # 行号，从 0 开始（不含表头）
+    row: Dict[str, Any]
+    passed: bool
+    status_code: int
+    duration: float  # seconds
+    error: Optional[str] = None
+    request: Optional[Dict[str, Any]] = None
+    assertions: List[Dict[str, Any]] = []
+
+class DatasetRunResult(BaseModel):
+    """数据驱动执行汇总结果"""
+    total: int
+    passed: int
+    failed: int
+    errors: int  # 请求本身失败（渲染失败、连接错误、超时等）的行数
+    duration: float  # seconds
+    avg_response_time: float  # seconds
+    max_response_time: float  # seconds
+    failures: List[DatasetRowResult] = []  # 行号最小的前 DATASET_MAX_FAILURE_DETAILS 个失败行
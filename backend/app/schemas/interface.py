@@ -50,3 +50,12 @@ class Api(ApiBase):
 
     class Config:
         from_attributes = True
+
+# --- Import Schemas ---
+class ApiImportResult(BaseModel):
+    format: str  # openapi / swagger / har
+    total: int = 0  # 文件中的接口定义数
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0  # 已存在且 on_conflict=skip，或文件中重复的定义
+    invalid: int = 0  # 缺少方法/路径或路径过长的定义
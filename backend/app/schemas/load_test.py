@@ -0,0 +1,59 @@
+from typing import Optional, Dict, Any, List, Literal
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+# --- Load Test Schemas ---
+class LoadTestCreate(BaseModel):
+    """
+    压测请求
+    - closed（闭环）: concurrency 个虚拟用户各自循环发送请求，收到响应（并等待 think_time）后再发下一个
+    - open（开环）: 按目标 rps 发送请求，不等待上一个响应；在途请求达到 concurrency 上限时丢弃本次请求并计入 dropped
+    - ramp_up: 启动阶段秒数，闭环模型逐步启动虚拟用户，开环模型的发送速率从 0 线性增长到 rps
+    """
+    name: Optional[str] = None
+    target_type: Literal["API", "CASE"]
+    target_id: int
+    environment_id: int
+    mode: Literal["closed", "open"] = "closed"
+    concurrency: Optional[int] = Field(None, ge=1)
+    rps: Optional[float] = Field(None, gt=0)
+    duration: float = Field(..., gt=0)  # seconds
+    ramp_up: float = Field(0.0, ge=0)  # seconds
+    think_time: float = Field(0.0, ge=0)  # seconds, closed model only
+    timeout: float = Field(10.0, gt=0)  # 单个请求超时秒数
+
+class LoadTestReportSummary(BaseModel):
+    id: int
+    project_id: int
+    name: str
+    target_type: str
+    target_id: int
+    environment_id: int
+    triggered_by: Optional[int] = None
+    config: Dict[str, Any]
+    status: str  # RUNNING, SUCCESS, STOPPED, ERROR
+    error_message: Optional[str] = None
+    total_requests: int
+    error_count: int
+    dropped_count: int
+    throughput: float  # requests per second
+    error_rate: float
+    latency_min: Optional[float] = None  # seconds
+    latency_mean: Optional[float] = None
+    latency_p50: Optional[float] = None
+    latency_p90: Optional[float] = None
+    latency_p99: Optional[float] = None
+    latency_max: Optional[float] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+class LoadTestReport(LoadTestReportSummary):
+    status_codes: Optional[Dict[str, int]] = None
+    errors: Optional[Dict[str, int]] = None
+    histogram: Optional[Dict[str, Any]] = None  # 见 utils.histogram.LatencyHistogram.to_dict
+    timeline: Optional[List[Dict[str, Any]]] = None  # 每秒一项: {"second", "requests", "errors", "mean", "max"}
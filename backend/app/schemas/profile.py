@@ -0,0 +1,21 @@
+from typing import Optional
+from pydantic import BaseModel
+from datetime import datetime
+
+# --- Request Profile Schemas ---
+class RequestProfile(BaseModel):
+    id: int
+    method: str
+    path: str
+    route: str
+    status_code: int
+    duration: float  # seconds
+    mode: str  # sampling, cprofile
+    trigger: str  # REQUESTED, SAMPLED
+    user_id: Optional[int] = None
+    file_format: str  # speedscope.json, pstats
+    size_bytes: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -52,3 +52,7 @@ class ProjectInDBBase(ProjectBase):
 
 class Project(ProjectInDBBase):
     environments: List[Environment] = []
+
+class ProjectImportResult(BaseModel):
+    project: Project
+    counts: Dict[str, int] = {}  # 各表导入的行数（environment / api / api_request_template / test_case）
@@ -29,11 +29,10 @@ class ApiResponse(BaseModel, Generic[T]):
     timestamp: datetime = datetime.now()
 
 class PaginatedResponse(BaseModel, Generic[T]):
-    """分页数据响应"""
+    """分页数据响应（游标分页：请求下一页时把 next_cursor 作为 cursor 参数传回）"""
     items: List[T]
     total: int
-    page: int
     page_size: int
-    total_pages: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
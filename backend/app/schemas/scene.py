@@ -0,0 +1,93 @@
+from typing import Optional, Dict, Any, List, Literal
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+# --- Scene Step Schemas ---
+class SceneStepBase(BaseModel):
+    step_name: str
+    order_index: int
+    ref_type: Literal["API", "CASE"]  # 基于接口或基于用例
+    ref_id: int
+    request_override: Optional[Dict[str, Any]] = None  # 覆盖 method / url / headers / params / body / body_type，支持 {{变量}}
+    extracts: Optional[List[Dict[str, Any]]] = None  # [{"variable_name": "token", "source": "body", "expression": "$.data.token"}]
+    assertions: Optional[List[Dict[str, Any]]] = None  # 为空时使用引用用例的断言
+    parallel: bool = False  # 与相邻的并行步骤同时执行
+    enabled_flag: bool = True
+
+class SceneStepCreate(SceneStepBase):
+    pass
+
+class SceneStep(SceneStepBase):
+    id: int
+    scene_id: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+# --- Scene Schemas ---
+class SceneBase(BaseModel):
+    name: str
+    module_name: Optional[str] = None
+    description: Optional[str] = None
+    tags: Optional[str] = None
+    is_active: Optional[bool] = True
+    variables: Optional[Dict[str, Any]] = None  # 场景初始变量
+
+class SceneCreate(SceneBase):
+    steps: List[SceneStepCreate] = []
+
+class SceneUpdate(BaseModel):
+    name: Optional[str] = None
+    module_name: Optional[str] = None
+    description: Optional[str] = None
+    tags: Optional[str] = None
+    is_active: Optional[bool] = None
+    variables: Optional[Dict[str, Any]] = None
+    steps: Optional[List[SceneStepCreate]] = None  # 提供时整体替换全部步骤
+
+class Scene(SceneBase):
+    id: int
+    project_id: int
+    steps: List[SceneStep] = []
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+# --- Scene Run Schemas ---
+class SceneRunRequest(BaseModel):
+    """场景执行请求：提供 rows 时按行数据驱动执行，每行的变量覆盖 variables"""
+    environment_id: int
+    variables: Dict[str, Any] = {}
+    rows: Optional[List[Dict[str, Any]]] = None
+    concurrency: Optional[int] = Field(None, ge=1)  # 数据驱动时同时执行的行数
+    include_body: bool = False  # 结果中是否返回响应体
+
+class SceneStepResult(BaseModel):
+    step_id: int
+    name: str
+    status: str  # PASSED, FAILED, SKIPPED
+    request: Optional[Dict[str, Any]] = None
+    result: Optional[Dict[str, Any]] = None
+    assertions: List[Dict[str, Any]] = []
+    extracted: Dict[str, Any] = {}
+    error: Optional[str] = None
+
+class SceneRunResult(BaseModel):
+    passed: bool
+    duration: float  # seconds
+    steps: List[SceneStepResult] = []
+    variables: Dict[str, Any] = {}
+
+class SceneRowResult(SceneRunResult):
+    index: int  # 行号，从 0 开始
+
+class SceneBatchRunResult(BaseModel):
+    total: int
+    passed: int
+    failed: int
+    duration: float  # seconds
+    rows: List[SceneRowResult] = []
@@ -0,0 +1,44 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+# --- Plan Schedule Schemas ---
+class PlanScheduleBase(BaseModel):
+    name: Optional[str] = Field(None, max_length=128)
+    cron: str = Field(..., max_length=128)  # 5 段 cron 表达式（分 时 日 月 周）或 @daily 等简写
+    timezone: Optional[str] = Field(None, max_length=64)  # 如 Asia/Shanghai，为空时使用服务器本地时间
+    environment_id: Optional[int] = None  # 为空时使用计划的默认环境
+    is_active: Optional[bool] = True
+    jitter_seconds: Optional[int] = Field(None, ge=0, le=3600)  # 为空时使用 SCHEDULER_JITTER_SECONDS
+    misfire_grace_seconds: Optional[int] = Field(None, ge=0)  # 为空时使用 SCHEDULER_MISFIRE_GRACE_SECONDS
+    coalesce: bool = True  # 错过多次触发时只补跑一次
+
+class PlanScheduleCreate(PlanScheduleBase):
+    pass
+
+class PlanScheduleUpdate(BaseModel):
+    name: Optional[str] = Field(None, max_length=128)
+    cron: Optional[str] = Field(None, max_length=128)
+    timezone: Optional[str] = Field(None, max_length=64)
+    environment_id: Optional[int] = None
+    is_active: Optional[bool] = None
+    jitter_seconds: Optional[int] = Field(None, ge=0, le=3600)
+    misfire_grace_seconds: Optional[int] = Field(None, ge=0)
+    coalesce: Optional[bool] = None
+
+class PlanSchedule(PlanScheduleBase):
+    id: int
+    project_id: int
+    plan_id: int
+    next_run_at: Optional[datetime] = None  # 下一次 cron 触发时间（服务器本地时间）
+    fire_at: Optional[datetime] = None  # 加上随机延迟后的实际触发时间
+    last_run_at: Optional[datetime] = None
+    last_report_id: Optional[int] = None
+    last_status: Optional[str] = None  # DISPATCHED / SKIPPED / MISFIRED / ERROR
+    run_count: int = 0
+    misfire_count: int = 0
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
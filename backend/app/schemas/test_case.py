@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Literal
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -45,3 +45,44 @@ class TestCaseInDBBase(TestCaseBase):
 # Properties to return to client
 class TestCase(TestCaseInDBBase):
     pass
+
+# --- Bulk Schemas ---
+class TestCaseBulkUpdateItem(TestCaseUpdate):
+    id: int
+
+class TestCaseBulkRequest(BaseModel):
+    """批量写入用例：创建、更新与删除在同一个事务中执行，任一项校验失败时不写入任何数据"""
+    create: List[TestCaseCreate] = []
+    update: List[TestCaseBulkUpdateItem] = []
+    delete: List[int] = []
+
+class TestCaseBulkItemResult(BaseModel):
+    op: Literal["create", "update", "delete"]
+    index: int  # 在请求中对应数组的位置
+    id: Optional[int] = None  # 用例ID（创建成功后为新用例ID）
+    status: Literal["created", "updated", "deleted", "not_applied", "error"]  # not_applied: 本项合法但因其他项校验失败未写入
+    error: Optional[str] = None
+
+class TestCaseBulkResult(BaseModel):
+    committed: bool
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    failed: int = 0
+    items: List[TestCaseBulkItemResult] = []
+
+# --- Dataset Schemas ---
+class TestCaseDataset(BaseModel):
+    """用例的数据驱动数据集（文件本身不返回）"""
+    id: int
+    test_case_id: int
+    file_name: str
+    file_format: str  # csv, jsonl
+    size_bytes: int
+    row_count: int
+    columns: Optional[List[str]] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
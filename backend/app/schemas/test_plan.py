@@ -0,0 +1,109 @@
+from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, Field
+from datetime import date, datetime
+
+# --- Test Plan Schemas ---
+class TestPlanBase(BaseModel):
+    name: str
+    description: Optional[str] = None
+    is_active: Optional[bool] = True
+    test_case_ids: Optional[List[int]] = None  # 为空时执行项目（或模块）下的全部用例
+    module_name: Optional[str] = None
+    environment_id: Optional[int] = None  # 默认执行环境
+    concurrency: Optional[int] = Field(None, ge=1)
+
+class TestPlanCreate(TestPlanBase):
+    pass
+
+class TestPlanUpdate(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    is_active: Optional[bool] = None
+    test_case_ids: Optional[List[int]] = None
+    module_name: Optional[str] = None
+    environment_id: Optional[int] = None
+    concurrency: Optional[int] = Field(None, ge=1)
+
+class TestPlan(TestPlanBase):
+    id: int
+    project_id: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+# --- Test Report Schemas ---
+class TestReport(BaseModel):
+    id: int
+    project_id: int
+    plan_id: int
+    environment_id: int
+    trigger_type: str
+    triggered_by: Optional[int] = None
+    status: str
+    error_message: Optional[str] = None
+    total_count: int
+    passed_count: int
+    failed_count: int
+    error_count: int
+    duration: Optional[float] = None
+    pass_rate: Optional[float] = None  # 结束后物化：通过率（0 ~ 1）
+    p50_duration: Optional[float] = None  # 结束后物化：用例耗时分位数（秒）
+    p95_duration: Optional[float] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class TestResult(BaseModel):
+    id: int
+    report_id: int
+    test_case_id: int
+    name: str
+    passed: bool
+    status_code: int
+    duration: float
+    error: Optional[str] = None
+    request_snapshot: Optional[Dict[str, Any]] = None
+    response_snapshot: Optional[Dict[str, Any]] = None
+    assertions: Optional[List[Dict[str, Any]]] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class PlanRunResponse(BaseModel):
+    """计划执行已入队：返回任务ID（即报告ID），通过报告接口查询进度"""
+    job_id: int
+    status: str
+
+# --- Trend Schemas ---
+class TrendPoint(BaseModel):
+    """某一天的执行汇总（来自按天预聚合的结果）"""
+    day: date
+    report_count: int
+    runs: int
+    passed: int
+    failed: int
+    errors: int
+    pass_rate: Optional[float] = None
+    avg_duration: Optional[float] = None
+    p50_duration: Optional[float] = None  # 由直方图估算，相对误差不超过 10%
+    p95_duration: Optional[float] = None
+
+class TrendBreakdownItem(BaseModel):
+    """时间范围内某个模块或用例的执行汇总"""
+    scope_key: str  # 模块名或用例ID
+    name: Optional[str] = None
+    report_count: int
+    runs: int
+    passed: int
+    failed: int
+    errors: int
+    pass_rate: Optional[float] = None
+    avg_duration: Optional[float] = None
+    p50_duration: Optional[float] = None
+    p95_duration: Optional[float] = None
@@ -0,0 +1,186 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from app.core.assertions import AssertionPlan, compile_assertions
+from app.core.async_runner import execute_request
+from app.core.config import settings
+from app.core.dataset import iter_dataset_rows, read_batch
+from app.core.runner import make_pool_key
+from app.core.template import Constant, TemplateRenderError, compile_value
+from app.crud.crud_test_case import get_assertion_plan
+from app.models.project import Environment
+from app.models.test_case import TestCase
+from app.services.executor import HostRateLimiter, build_case_request, drain_queue, evaluate_case
+
+class CaseTemplate:
+    """
+    用例的渲染计划：请求参数与断言在执行前编译一次，每行数据只做 {{变量}} 代入
+    断言不含占位符时直接复用用例缓存的断言计划；含占位符时（例如期望值来自数据列）按行渲染后编译
+    """
+    __slots__ = ("request", "assertions", "plan")
+
+    def __init__(self, test_case: TestCase, env: Environment):
+        self.request = compile_value(build_case_request(test_case, env))
+        assertions = compile_value(test_case.assertions or [])
+        if isinstance(assertions, Constant):
+            self.assertions = None
+            self.plan: Optional[AssertionPlan] = get_assertion_plan(test_case)
+        else:
+            self.assertions = assertions
+            self.plan = None
+
+    def render(self, row: Dict[str, Any]) -> Tuple[Dict[str, Any], AssertionPlan]:
+        """
+        代入一行数据
+        返回: (execute_request 的请求参数, 断言计划)
+        异常: 变量未定义时抛出 TemplateRenderError
+        """
+        request_kwargs = self.request.render(row)
+        if self.assertions is None:
+            return request_kwargs, self.plan
+        return request_kwargs, compile_assertions(self.assertions.render(row), strict=False)
+
+async def run_row(
+    template: CaseTemplate,
+    index: int,
+    row: Dict[str, Any],
+    rate_limiter: Optional[HostRateLimiter] = None,
+) -> Dict[str, Any]:
+    """
+    使用一行数据执行用例，响应体只在断言需要时解码，随后丢弃
+    返回: {"index", "row", "passed", "status_code", "duration", "error", "request", "assertions"}
+    """
+    try:
+        request_kwargs, plan = template.render(row)
+    except TemplateRenderError as e:
+        return {
+            "index": index, "row": row, "passed": False, "status_code": 0, "duration": 0.0,
+            "error": f"请求渲染失败: {e}", "request": None, "assertions": [],
+        }
+
+    if rate_limiter is not None:
+        _, _, host, port = make_pool_key(request_kwargs["url"])
+        await rate_limiter.acquire(f"{host}:{port}")
+    result = await execute_request(**request_kwargs, load_body=False)
+    outcome = evaluate_case(result, plan)
+    result.release()
+    return {
+        "index": index,
+        "row": row,
+        "passed": outcome["passed"] and result.error is None,
+        "status_code": result.status_code,
+        "duration": result.duration,
+        "error": result.error,
+        "request": {"method": request_kwargs["method"], "url": request_kwargs["url"]},
+        "assertions": outcome["assertions"],
+    }
+
+async def iter_dataset_results(
+    template: CaseTemplate,
+    path: str,
+    file_format: str,
+    concurrency: int,
+    per_host_rps: float = 0.0,
+    queue_size: int = 100,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    按数据集逐行执行用例，按完成顺序逐个产出结果，最后产出汇总
+    - 产出 {"type": "result", "outcome": run_row 的结果}，全部完成后产出 {"type": "summary", "summary": 汇总}
+    - 数据集在独立线程中分批读取，读取队列只缓冲 2 * concurrency 行；结果队列容量为 queue_size，
+      调用方消费变慢时读取与执行都会被反压暂停，内存占用与数据集行数无关
+    - 调用方提前结束迭代时，未完成的行会被取消
+    异常: 数据集行格式非法时抛出 DatasetFormatError（此前已执行的行结果已产出）
+    """
+    workers = max(1, concurrency)
+    queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max(1, queue_size))
+    pending: "asyncio.Queue[Optional[Tuple[int, Dict[str, Any]]]]" = asyncio.Queue(maxsize=workers * 2)
+    rate_limiter = HostRateLimiter(per_host_rps)
+    counters = {"total": 0, "passed": 0, "errors": 0, "duration_sum": 0.0, "duration_max": 0.0}
+    # 单线程读取：行迭代器不能被多个线程同时推进，关闭也必须等待正在进行的读取结束
+    reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dataset-reader")
+    rows = iter_dataset_rows(path, file_format)
+    loop = asyncio.get_running_loop()
+
+    async def feed() -> None:
+        index = 0
+        while True:
+            batch = await loop.run_in_executor(reader, read_batch, rows, settings.DATASET_READ_BATCH_SIZE)
+            if not batch:
+                break
+            for row in batch:
+                await pending.put((index, row))
+                index += 1
+        for _ in range(workers):
+            await pending.put(None)
+
+    async def work() -> None:
+        while True:
+            job = await pending.get()
+            if job is None:
+                return
+            outcome = await run_row(template, *job, rate_limiter=rate_limiter)
+            counters["total"] += 1
+            counters["passed"] += 1 if outcome["passed"] else 0
+            counters["errors"] += 1 if outcome["error"] else 0
+            counters["duration_sum"] += outcome["duration"]
+            counters["duration_max"] = max(counters["duration_max"], outcome["duration"])
+            await queue.put({"type": "result", "outcome": outcome})
+
+    async def produce() -> None:
+        start_time = time.perf_counter()
+        tasks = [asyncio.ensure_future(feed())] + [asyncio.ensure_future(work()) for _ in range(workers)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        total = counters["total"]
+        await queue.put({"type": "summary", "summary": {
+            "total": total,
+            "passed": counters["passed"],
+            "failed": total - counters["passed"],
+            "errors": counters["errors"],
+            "duration": time.perf_counter() - start_time,
+            "avg_response_time": counters["duration_sum"] / total if total else 0.0,
+            "max_response_time": counters["duration_max"],
+        }})
+
+    items = drain_queue(queue, asyncio.ensure_future(produce()))
+    try:
+        async for item in items:
+            yield item
+    finally:
+        await items.aclose()
+        reader.submit(rows.close)
+        reader.shutdown(wait=False)
+
+async def run_dataset(
+    template: CaseTemplate,
+    path: str,
+    file_format: str,
+    concurrency: int,
+    per_host_rps: float = 0.0,
+    max_failures: int = 100,
+) -> Dict[str, Any]:
+    """
+    按数据集逐行执行用例并汇总
+    返回: iter_dataset_results 的汇总，另加 failures（按行号排序的前 max_failures 个失败行）
+    """
+    failures = []
+    summary: Dict[str, Any] = {}
+    async for item in iter_dataset_results(template, path, file_format, concurrency, per_host_rps):
+        if item["type"] == "summary":
+            summary = item["summary"]
+            break
+        outcome = item["outcome"]
+        if not outcome["passed"]:
+            failures.append(outcome)
+            # 只保留行号最小的失败行，避免失败明细随行数增长
+            if len(failures) > max_failures * 2:
+                failures.sort(key=lambda r: r["index"])
+                del failures[max_failures:]
+    failures.sort(key=lambda r: r["index"])
+    summary["failures"] = failures[:max_failures]
+    return summary
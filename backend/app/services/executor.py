@@ -0,0 +1,285 @@
+import asyncio
+import inspect
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from app.core.assertions import AssertionPlan
+from app.core.async_runner import execute_request
+from app.core.runner import RequestResult, make_pool_key
+from app.crud.crud_test_case import get_assertion_plan
+from app.models.api import Api
+from app.models.project import Environment
+from app.models.test_case import TestCase
+
+def build_case_request(test_case: TestCase, env: Environment) -> Dict[str, Any]:
+    """
+    根据用例与环境组装执行引擎的请求参数
+    - test_case: 用例
+    - env: 执行环境，提供 base_url 与公共请求头
+    返回: 可直接传给 run_request / execute_request 的关键字参数
+    """
+    base_url = env.base_url.rstrip("/")
+    path = test_case.url.lstrip("/")
+    url = f"{base_url}/{path}"
+
+    # 用例请求头覆盖环境请求头
+    headers = env.headers.copy() if env.headers else {}
+    if test_case.headers:
+        headers.update(test_case.headers)
+
+    json_body = None
+    data_body = None
+    if test_case.body:
+        if test_case.body_type == "json":
+            json_body = test_case.body
+        else:
+            data_body = test_case.body
+
+    return {
+        "method": test_case.method,
+        "url": url,
+        "params": test_case.params,
+        "headers": headers,
+        "json_body": json_body,
+        "data_body": data_body,
+        "environment_id": env.id,
+    }
+
+def fill_path_params(url_path: str, path_params: Optional[Dict[str, Any]]) -> str:
+    """将接口路径中的 {name} 替换为路径参数的值"""
+    for key, value in (path_params or {}).items():
+        url_path = url_path.replace(f"{{{key}}}", str(value))
+    return url_path
+
+def build_api_request(api: Api, env: Environment) -> Dict[str, Any]:
+    """
+    根据接口定义及其请求模板组装执行引擎的请求参数，规则与 build_case_request 相同
+    """
+    template = api.request_template
+    path = fill_path_params(api.url_path, template.path_params if template else None)
+    url = f"{env.base_url.rstrip('/')}/{path.lstrip('/')}"
+    headers = env.headers.copy() if env.headers else {}
+    if template and template.headers:
+        headers.update(template.headers)
+
+    json_body = None
+    data_body = None
+    if template and template.body:
+        if template.body_type == "json":
+            json_body = template.body
+        else:
+            data_body = template.body
+
+    return {
+        "method": api.method,
+        "url": url,
+        "params": template.query_params if template else None,
+        "headers": headers,
+        "json_body": json_body,
+        "data_body": data_body,
+        "environment_id": env.id,
+    }
+
+def evaluate_case(result: RequestResult, plan: Optional[AssertionPlan]) -> Dict[str, Any]:
+    """
+    使用编译后的断言计划校验执行结果
+    返回: {"assertions": 断言结果列表, "passed": 是否全部通过}
+    未配置断言时视为通过
+    """
+    assertion_results = []
+    if plan:
+        response_data = {
+            "status_code": result.status_code,
+            "headers": result.headers,
+            # 只有存在响应体断言时才解码响应体
+            "body": result.load_body() if plan.needs_body else None,
+            "duration": result.duration,
+            "timings": result.timings,
+        }
+        assertion_results = plan.evaluate(response_data)
+    passed = all(r.get("passed", False) for r in assertion_results) if assertion_results else True
+    return {"assertions": assertion_results, "passed": passed}
+
+class HostRateLimiter:
+    """
+    按主机限制请求速率（每秒请求数）
+
+    为每个主机维护下一个可用的发送时间点，请求按 1/rate 的间隔依次放行，
+    避免并发执行时瞬间压垮同一个上游服务。rate <= 0 表示不限速。
+    仅在单个事件循环内使用，无需加锁。
+    """
+
+    def __init__(self, rate: float = 0.0):
+        self.rate = rate
+        self._next_slot: Dict[str, float] = {}
+
+    async def acquire(self, host: str) -> None:
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + 1.0 / self.rate
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+async def run_case(
+    case_id: int,
+    case_name: str,
+    request_kwargs: Dict[str, Any],
+    plan: Optional[AssertionPlan],
+    rate_limiter: Optional[HostRateLimiter] = None,
+    include_body: bool = True,
+) -> Dict[str, Any]:
+    """
+    执行单个用例并校验断言
+    - case_id / case_name: 用例ID与名称，原样写入结果
+    - request_kwargs: build_case_request 生成的请求参数
+    - plan: 用例的断言计划（见 crud_test_case.get_assertion_plan）
+    - rate_limiter: 可选的按主机限速器
+    - include_body: 结果中是否保留响应体；为 False 时响应体只在断言需要时解码，随后丢弃
+    返回: {"test_case_id", "name", "request", "result", "assertions", "passed"}
+    """
+    if rate_limiter is not None:
+        _, _, host, port = make_pool_key(request_kwargs["url"])
+        await rate_limiter.acquire(f"{host}:{port}")
+    result = await execute_request(**request_kwargs, load_body=False)
+    outcome = evaluate_case(result, plan)
+    if include_body:
+        result.load_body()
+    else:
+        result.release()
+        result.body = None
+    return {
+        "test_case_id": case_id,
+        "name": case_name,
+        "request": {"method": request_kwargs["method"], "url": request_kwargs["url"]},
+        "result": result,
+        "assertions": outcome["assertions"],
+        "passed": outcome["passed"],
+    }
+
+async def run_cases(
+    test_cases: List[TestCase],
+    env: Environment,
+    concurrency: int,
+    per_host_rps: float = 0.0,
+    include_body: bool = False,
+    on_result: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    keep_results: bool = True,
+) -> Dict[str, Any]:
+    """
+    并发执行一批用例并汇总结果
+    - test_cases: 待执行用例
+    - env: 执行环境
+    - concurrency: 最大并发数
+    - per_host_rps: 单主机每秒请求数上限，0 表示不限速
+    - include_body: 结果中是否保留响应体，批量执行默认丢弃以减少返回数据量
+    - on_result: 每个用例完成时的回调（按完成顺序调用），可以是普通函数或协程函数
+    - keep_results: 是否在返回值中保留全部结果；结果已通过 on_result 逐条处理时可设为 False 以节省内存
+    返回: {"total", "passed", "failed", "errors", "duration", "results"}，results 保持输入顺序
+    """
+    # 在进入并发阶段前读取 ORM 属性，避免在事件循环中触发延迟加载
+    jobs = [
+        (tc.id, tc.name, build_case_request(tc, env), get_assertion_plan(tc))
+        for tc in test_cases
+    ]
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    rate_limiter = HostRateLimiter(per_host_rps)
+    counters = {"passed": 0, "errors": 0}
+
+    async def worker(job) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            outcome = await run_case(*job, rate_limiter=rate_limiter, include_body=include_body)
+        counters["passed"] += 1 if outcome["passed"] else 0
+        counters["errors"] += 1 if outcome["result"].error else 0
+        if on_result is not None:
+            ret = on_result(outcome)
+            if inspect.isawaitable(ret):
+                await ret
+        return outcome if keep_results else None
+
+    start_time = time.perf_counter()
+    results = await asyncio.gather(*(worker(job) for job in jobs))
+    duration = time.perf_counter() - start_time
+
+    return {
+        "total": len(jobs),
+        "passed": counters["passed"],
+        "failed": len(jobs) - counters["passed"],
+        "errors": counters["errors"],
+        "duration": duration,
+        "results": results if keep_results else [],
+    }
+
+async def iter_case_results(
+    test_cases: List[TestCase],
+    env: Environment,
+    concurrency: int,
+    per_host_rps: float = 0.0,
+    include_body: bool = False,
+    queue_size: int = 100,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    并发执行一批用例，按完成顺序逐个产出结果，最后产出汇总
+    - 产出 {"type": "result", "outcome": run_case 的结果}，全部完成后产出 {"type": "summary", "summary": 汇总（不含 results）}
+    - 结果经过容量为 queue_size 的队列交给调用方，调用方消费变慢时执行会被反压暂停，内存占用不随用例数增长
+    - 调用方提前结束迭代（例如客户端断开连接）时，未完成的用例会被取消
+    """
+    queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max(1, queue_size))
+
+    async def on_result(outcome: Dict[str, Any]) -> None:
+        await queue.put({"type": "result", "outcome": outcome})
+
+    async def produce() -> None:
+        summary = await run_cases(
+            test_cases,
+            env,
+            concurrency=concurrency,
+            per_host_rps=per_host_rps,
+            include_body=include_body,
+            on_result=on_result,
+            keep_results=False,
+        )
+        summary.pop("results")
+        await queue.put({"type": "summary", "summary": summary})
+
+    items = drain_queue(queue, asyncio.create_task(produce()))
+    try:
+        async for item in items:
+            yield item
+    finally:
+        await items.aclose()
+
+async def drain_queue(
+    queue: "asyncio.Queue[Dict[str, Any]]",
+    producer: "asyncio.Task[None]",
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    逐个产出 producer 放入队列的条目，直到产出 type 为 "summary" 的条目
+    - producer 异常时立即抛出，而不是一直等待队列
+    - 调用方提前结束迭代时取消 producer
+    """
+    try:
+        while True:
+            if producer.done():
+                producer.result()  # 执行异常时在此抛出
+                item = await queue.get()
+            else:
+                getter = asyncio.ensure_future(queue.get())
+                # 同时等待下一条结果与执行任务本身，执行异常时立即抛出而不是一直等待
+                done, _ = await asyncio.wait({getter, producer}, return_when=asyncio.FIRST_COMPLETED)
+                if getter not in done:
+                    getter.cancel()
+                    continue
+                item = getter.result()
+            yield item
+            if item["type"] == "summary":
+                break
+    finally:
+        if not producer.done():
+            producer.cancel()
+            try:
+                await producer
+            except (asyncio.CancelledError, Exception):
+                pass
@@ -0,0 +1,137 @@
+import logging
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.plan_runner import execute_report
+
+logger = logging.getLogger(__name__)
+
+class JobWorkerPool:
+    """
+    基于数据库的计划执行任务队列 + 进程内工作线程池
+
+    - 任务即 test_report 表中状态为 PENDING 的记录，无需 Redis 等外部队列
+    - 调度线程定期（或被 notify 唤醒后）领取 PENDING 任务，通过条件更新保证多个进程不会重复领取
+    - 领取的任务交给线程池执行，同时执行的任务数不超过 max_workers，其余任务留在队列中
+    - 心跳超过 stale_seconds 未更新的 RUNNING 任务会被重新入队
+
+    - session_factory: 数据库会话工厂
+    - max_workers: 同时执行的任务数
+    - poll_interval: 轮询队列的间隔秒数
+    - stale_seconds: 任务心跳超时秒数
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_workers: int = 2,
+        poll_interval: float = 2.0,
+        stale_seconds: float = 300.0,
+    ):
+        self.session_factory = session_factory
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.stale_seconds = stale_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._active: Set[int] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._dispatcher is not None and self._dispatcher.is_alive()
+
+    def start(self) -> None:
+        """启动调度线程与工作线程池"""
+        if self.running:
+            return
+        self._stopping.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="plan-job")
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="plan-job-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+    def stop(self, wait: bool = True) -> None:
+        """停止领取新任务；wait=True 时等待正在执行的任务结束"""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._dispatcher is not None:
+            self._dispatcher.join()
+            self._dispatcher = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def notify(self) -> None:
+        """有新任务入队时调用，立即唤醒调度线程"""
+        self._wakeup.set()
+
+    def active_jobs(self) -> Set[int]:
+        with self._lock:
+            return set(self._active)
+
+    def _dispatch_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self.dispatch_once()
+            except Exception:
+                logger.exception("Job dispatcher iteration failed")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def dispatch_once(self) -> int:
+        """
+        领取并提交一轮任务
+        返回: 本轮领取的任务数
+        """
+        with self._lock:
+            free_slots = self.max_workers - len(self._active)
+        if free_slots <= 0 or self._executor is None:
+            return 0
+        db = self.session_factory()
+        try:
+            crud.crud_test_plan.requeue_stale_reports(db, self.stale_seconds)
+            pending_ids = crud.crud_test_plan.get_pending_report_ids(db, limit=free_slots)
+            claimed = [
+                report_id for report_id in pending_ids
+                if crud.crud_test_plan.claim_report(db, report_id, self.worker_id)
+            ]
+        finally:
+            db.close()
+        for report_id in claimed:
+            with self._lock:
+                self._active.add(report_id)
+            self._executor.submit(self._run_job, report_id)
+        return len(claimed)
+
+    def _run_job(self, report_id: int) -> None:
+        db = self.session_factory()
+        try:
+            execute_report(db, report_id)
+        except Exception:
+            logger.exception("Plan job %s crashed", report_id)
+        finally:
+            db.close()
+            with self._lock:
+                self._active.discard(report_id)
+            # 空出执行槽位后立即尝试领取下一个任务
+            self._wakeup.set()
+
+# 全局任务队列，由应用生命周期启动与停止
+job_worker = JobWorkerPool(
+    session_factory=SessionLocal,
+    max_workers=settings.JOB_MAX_WORKERS,
+    poll_interval=settings.JOB_POLL_INTERVAL,
+    stale_seconds=settings.JOB_STALE_SECONDS,
+)
@@ -0,0 +1,346 @@
+import asyncio
+import logging
+import math
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import httpx
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.assertions import AssertionPlan
+from app.core.async_runner import create_async_client, run_request_async
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.load_test import LoadTestReport
+from app.models.project import Environment
+from app.services.executor import build_api_request, build_case_request, evaluate_case
+from app.utils.histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# 报告中保留的错误信息种类数（按出现次数取前 N 种）
+_MAX_ERROR_KINDS = 20
+# 统计过程中最多区分的错误信息种类数，超出的计入“其他错误”
+_MAX_TRACKED_ERRORS = 1000
+
+class LoadTestBusyError(RuntimeError):
+    """同时运行的压测数已达上限（由接口层转换为 409 错误）"""
+
+class LoadStats:
+    """
+    压测统计：延迟直方图、状态码与错误计数、按秒的时间线
+    只在压测所在的事件循环内更新，无需加锁；内存占用与请求数无关
+    """
+
+    def __init__(self, histogram_bits: int = 7):
+        self.histogram = LatencyHistogram(histogram_bits)
+        self.error_count = 0
+        self.dropped_count = 0
+        self.status_codes: Counter = Counter()
+        self.errors: Counter = Counter()
+        # 每秒一项: [请求数, 错误数, 延迟之和, 最大延迟]
+        self.timeline: List[List[float]] = []
+        self.start_time = time.perf_counter()
+        self.end_time: Optional[float] = None
+
+    def record(self, latency: float, status_code: int, error: Optional[str]) -> None:
+        self.histogram.record(latency)
+        self.status_codes[str(status_code)] += 1
+        if error:
+            self.error_count += 1
+            if error not in self.errors and len(self.errors) >= _MAX_TRACKED_ERRORS:
+                error = "其他错误"
+            self.errors[error] += 1
+        second = int(time.perf_counter() - self.start_time)
+        while len(self.timeline) <= second:
+            self.timeline.append([0, 0, 0.0, 0.0])
+        bucket = self.timeline[second]
+        bucket[0] += 1
+        bucket[1] += 1 if error else 0
+        bucket[2] += latency
+        bucket[3] = max(bucket[3], latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """当前统计，字段与 load_test_report 表的汇总列一致"""
+        elapsed = (self.end_time or time.perf_counter()) - self.start_time
+        total = self.histogram.count
+        latency = self.histogram.summary() if total else {}
+        return {
+            "total_requests": total,
+            "error_count": self.error_count,
+            "dropped_count": self.dropped_count,
+            "throughput": total / elapsed if elapsed > 0 else 0.0,
+            "error_rate": self.error_count / total if total else 0.0,
+            "latency_min": latency.get("min"),
+            "latency_mean": latency.get("mean"),
+            "latency_p50": latency.get("p50"),
+            "latency_p90": latency.get("p90"),
+            "latency_p99": latency.get("p99"),
+            "latency_max": latency.get("max"),
+            "status_codes": dict(self.status_codes),
+            "errors": dict(self.errors.most_common(_MAX_ERROR_KINDS)),
+            "histogram": self.histogram.to_dict(),
+            "timeline": [
+                {"second": i, "requests": n, "errors": e, "mean": s / n if n else 0.0, "max": m}
+                for i, (n, e, s, m) in enumerate(self.timeline)
+            ],
+        }
+
+def arrival_offset(n: int, rps: float, ramp_up: float) -> float:
+    """
+    开环模型中第 n 个请求（从 0 开始）相对压测开始的发送时刻（秒）
+    发送速率在 ramp_up 秒内从 0 线性增长到 rps，之后保持 rps
+    """
+    ramp_requests = rps * ramp_up / 2
+    if n < ramp_requests:
+        return math.sqrt(2 * ramp_up * n / rps)
+    return ramp_up + (n - ramp_requests) / rps
+
+async def run_load(
+    request_kwargs: Dict[str, Any],
+    plan: Optional[AssertionPlan],
+    config: Dict[str, Any],
+    stats: LoadStats,
+    stop_event: threading.Event,
+    client: httpx.AsyncClient,
+) -> None:
+    """
+    按压测配置持续发送请求并记录统计，持续 duration 秒或直到 stop_event 被设置
+    - client: 压测专用客户端（见 create_load_client），连接数不受全局客户端池的单主机连接数限制
+    - 延迟从计划发送时刻算起：开环模型下请求因本地排队而延后发送时，排队时间也计入延迟（避免协同遗漏）
+    - 传输错误、HTTP >= 400（用例配置了断言时以断言结果为准）计为错误
+    - 到达时间后不再发送新请求，等待在途请求完成（受单个请求超时限制）
+    """
+    duration = config["duration"]
+    ramp_up = min(config.get("ramp_up") or 0.0, duration)
+    concurrency = config.get("concurrency") or 1
+    timeout = config.get("timeout") or 10.0
+    start = stats.start_time = time.perf_counter()
+    deadline = start + duration
+
+    def stopping() -> bool:
+        return stop_event.is_set() or time.perf_counter() >= deadline
+
+    async def send(scheduled: float) -> None:
+        result = await run_request_async(**request_kwargs, timeout=timeout, load_body=False, client=client)
+        latency = time.perf_counter() - scheduled
+        error = result.error
+        if error is None:
+            if plan:
+                if not evaluate_case(result, plan)["passed"]:
+                    error = "断言失败"
+            elif result.status_code >= 400:
+                error = f"HTTP {result.status_code}"
+        result.release()
+        stats.record(latency, result.status_code, error)
+
+    if config["mode"] == "open":
+        rps = config["rps"]
+        in_flight: Set["asyncio.Task[None]"] = set()
+        n = 0
+        while not stop_event.is_set():
+            offset = arrival_offset(n, rps, ramp_up)
+            if offset >= duration:
+                break
+            scheduled = start + offset
+            # delay <= 0 时说明发送落后于计划，sleep(0) 仅让出事件循环
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            if len(in_flight) >= concurrency:
+                stats.dropped_count += 1
+            else:
+                task = asyncio.ensure_future(send(scheduled))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            n += 1
+        if in_flight:
+            await asyncio.gather(*in_flight)
+    else:
+        think_time = config.get("think_time") or 0.0
+
+        async def virtual_user(index: int) -> None:
+            if ramp_up:
+                await asyncio.sleep(min(ramp_up * index / concurrency, duration))
+            while not stopping():
+                await send(time.perf_counter())
+                if think_time:
+                    await asyncio.sleep(think_time)
+
+        await asyncio.gather(*(virtual_user(i) for i in range(concurrency)))
+    stats.end_time = time.perf_counter()
+
+def create_load_client(config: Dict[str, Any]) -> httpx.AsyncClient:
+    """
+    压测专用客户端：连接数上限等于压测并发数（闭环的虚拟用户数 / 开环的在途请求上限），
+    压测结束后随事件循环关闭；使用全局客户端池时并发会被 RUNNER_POOL_MAXSIZE 限制，等待连接的时间也会计入延迟
+    """
+    return create_async_client(config.get("concurrency") or 1, settings.RUNNER_POOL_IDLE_TIMEOUT)
+
+def build_target_request(
+    db: Session,
+    report: LoadTestReport,
+    env: Environment,
+) -> Optional[Tuple[Dict[str, Any], Optional[AssertionPlan]]]:
+    """
+    组装压测目标的请求参数与断言计划（接口不做断言）
+    返回: (请求参数, 断言计划)；目标不存在或不属于该项目时返回 None
+    """
+    if report.target_type == "CASE":
+        test_case = crud.crud_test_case.get_test_case(db, report.target_id)
+        if test_case is None or test_case.project_id != report.project_id:
+            return None
+        return build_case_request(test_case, env), crud.crud_test_case.get_assertion_plan(test_case)
+    api = crud.crud_api.get_api(db, report.target_id)
+    if api is None or api.project_id != report.project_id:
+        return None
+    return build_api_request(api, env), None
+
+def _finish(db: Session, report: LoadTestReport, status: str, error_message: str = None) -> None:
+    report.status = status
+    report.error_message = error_message
+    report.finished_at = datetime.now()
+    if report.started_at:
+        report.duration = (report.finished_at - report.started_at).total_seconds()
+    db.add(report)
+    db.commit()
+
+def execute_load_test(db: Session, report_id: int, stop_event: threading.Event) -> None:
+    """
+    执行一次压测（在压测线程内调用）
+    - 请求在本线程的独立事件循环中经压测专用客户端发送，不占用 Web 服务的事件循环与全局客户端池
+    - 每 LOAD_TEST_PROGRESS_INTERVAL 秒写入一次当前统计，最终写入完整报告
+    - 正常结束置为 SUCCESS，被手动停止置为 STOPPED，执行异常置为 ERROR
+    """
+    report = crud.crud_load_test.get_load_test(db, report_id)
+    if report is None:
+        return
+    try:
+        env = crud.crud_project.get_environment(db=db, environment_id=report.environment_id)
+        target = build_target_request(db, report, env) if env is not None else None
+        if target is None:
+            _finish(db, report, "ERROR", "压测目标或执行环境不存在")
+            return
+        request_kwargs, plan = target
+        stats = LoadStats(settings.LOAD_TEST_HISTOGRAM_BITS)
+        # 进度在线程池中使用独立会话写入，数据库读写不阻塞发送请求的事件循环
+        progress_db = Session(bind=db.get_bind(), autoflush=False)
+
+        def save_progress(snapshot: Dict[str, Any]) -> None:
+            try:
+                progress_report = crud.crud_load_test.get_load_test(progress_db, report.id)
+                crud.crud_load_test.save_load_test_stats(progress_db, progress_report, snapshot)
+            except Exception:
+                progress_db.rollback()
+                logger.exception("Saving progress failed for load test %s", report.id)
+
+        async def report_progress() -> None:
+            while True:
+                await asyncio.sleep(settings.LOAD_TEST_PROGRESS_INTERVAL)
+                # 在事件循环中取快照（统计只在该循环内更新），写入交给线程池
+                await asyncio.to_thread(save_progress, stats.snapshot())
+
+        async def main() -> None:
+            ticker = asyncio.create_task(report_progress())
+            try:
+                async with create_load_client(report.config) as client:
+                    await run_load(request_kwargs, plan, report.config, stats, stop_event, client)
+            finally:
+                ticker.cancel()
+
+        try:
+            asyncio.run(main())
+        finally:
+            # asyncio.run 返回前会等待线程池中正在进行的写入结束（shutdown_default_executor）
+            progress_db.close()
+        # 进度会话已更新过该行，重新加载后写入最终统计
+        db.expire(report)
+        crud.crud_load_test.save_load_test_stats(db, report, stats.snapshot())
+        _finish(db, report, "STOPPED" if stop_event.is_set() else "SUCCESS")
+    except Exception as e:
+        logger.exception("Load test %s failed", report_id)
+        db.rollback()
+        _finish(db, report, "ERROR", str(e))
+
+class LoadTestManager:
+    """
+    进程内的压测执行器：每个压测在独立线程中运行，同时运行的压测数不超过 max_running
+
+    压测的吞吐取决于本进程的 CPU，同时运行多个压测会相互干扰结果，因此默认只允许一个。
+    压测只能由启动它的进程停止；进程退出后其 RUNNING 压测的心跳不再更新，
+    在下次创建压测时被 fail_stale_load_tests 置为 ERROR。
+
+    - session_factory: 数据库会话工厂
+    - max_running: 同时运行的压测数上限
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], max_running: int = 1):
+        self.session_factory = session_factory
+        self.max_running = max_running
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._runs: Dict[int, Tuple[threading.Thread, threading.Event]] = {}
+        self._lock = threading.Lock()
+
+    def has_capacity(self) -> bool:
+        with self._lock:
+            return len(self._runs) < self.max_running
+
+    def start(self, report_id: int) -> None:
+        """
+        在新线程中执行压测
+        异常: 同时运行的压测数已达上限时抛出 LoadTestBusyError
+        """
+        stop_event = threading.Event()
+        thread = threading.Thread(
+            target=self._run, args=(report_id, stop_event), name=f"load-test-{report_id}", daemon=True
+        )
+        with self._lock:
+            if len(self._runs) >= self.max_running:
+                raise LoadTestBusyError(f"同时运行的压测数已达上限 {self.max_running}")
+            self._runs[report_id] = (thread, stop_event)
+        thread.start()
+
+    def stop(self, report_id: int) -> bool:
+        """
+        请求停止压测（不等待结束）
+        返回: 压测是否在本进程中运行
+        """
+        with self._lock:
+            run = self._runs.get(report_id)
+        if run is None:
+            return False
+        run[1].set()
+        return True
+
+    def stop_all(self, wait: bool = True) -> None:
+        """停止全部压测；wait=True 时等待压测线程写完报告"""
+        with self._lock:
+            runs = list(self._runs.values())
+        for _, stop_event in runs:
+            stop_event.set()
+        if wait:
+            for thread, _ in runs:
+                thread.join()
+
+    def active(self) -> Set[int]:
+        with self._lock:
+            return set(self._runs)
+
+    def _run(self, report_id: int, stop_event: threading.Event) -> None:
+        db = self.session_factory()
+        try:
+            execute_load_test(db, report_id, stop_event)
+        except Exception:
+            logger.exception("Load test %s crashed", report_id)
+        finally:
+            db.close()
+            with self._lock:
+                self._runs.pop(report_id, None)
+
+# 全局压测执行器，应用关闭时停止全部压测
+load_test_manager = LoadTestManager(session_factory=SessionLocal, max_running=settings.LOAD_TEST_MAX_RUNNING)
@@ -0,0 +1,118 @@
+from typing import Any, Dict, Iterable, List, Tuple
+
+import anyio.to_thread
+
+from app.core import metrics
+from app.core.assertions import plan_cache
+from app.core.async_runner import client_pool
+from app.core.auth_cache import auth_cache
+from app.core.db_pool import pool_report
+from app.core.jsonpath import jsonpath_cache_stats
+from app.core.runner import session_pool
+from app.core.template import template_cache_stats
+from app.crud.pagination import count_cache
+from app.services.job_queue import job_worker
+from app.services.load_test import load_test_manager
+from app.services.result_writer import result_writer_stats
+from app.services.scheduler import plan_scheduler
+
+# 导出时采集的指标：各组件已有的 stats()，平时没有额外开销
+_CACHES = {
+    "auth": auth_cache.stats,
+    "assertion_plan": plan_cache.stats,
+    "jsonpath": jsonpath_cache_stats,
+    "template": template_cache_stats,
+    "pagination_count": count_cache.stats,
+    "runner_session": session_pool.stats,
+    "runner_async_client": client_pool.stats,
+}
+
+def _cache_stats() -> List[Tuple[str, Dict[str, Any]]]:
+    return [(name, stats()) for name, stats in _CACHES.items()]
+
+def _cache_field(field: str) -> Iterable[Tuple[Tuple[str, ...], float]]:
+    return [((name,), stats.get(field, 0)) for name, stats in _cache_stats()]
+
+def _threadpool() -> Iterable[Tuple[Tuple[str, ...], float]]:
+    """
+    同步接口与同步执行引擎使用的 anyio 默认线程池（需在事件循环中采集）
+    in_use 达到 total 时新的同步接口请求需排队，waiting 为排队数
+    """
+    try:
+        limiter = anyio.to_thread.current_default_thread_limiter()
+    except RuntimeError:  # 不在事件循环中
+        return []
+    statistics = limiter.statistics()
+    return [
+        (("total",), limiter.total_tokens),
+        (("in_use",), statistics.borrowed_tokens),
+        (("waiting",), statistics.tasks_waiting),
+    ]
+
+def _db_pools() -> Iterable[Tuple[Tuple[str, ...], float]]:
+    """数据库连接池：常驻大小、已取用、空闲与溢出连接数（SQLite 内存库等非 QueuePool 连接池不输出）"""
+    return [
+        ((pool["engine"], state), pool[state])
+        for pool in pool_report()
+        for state in ("size", "checked_out", "checked_in", "overflow")
+        if state in pool
+    ]
+
+def _result_writer() -> Iterable[Tuple[Tuple[str, ...], float]]:
+    stats = result_writer_stats.stats()
+    return [((field,), stats[field]) for field in ("flushes", "rows", "failures")]
+
+# 注册导出时采集的运行时指标（模块导入时注册一次）
+metrics.registry.register(metrics.GaugeFunc(
+    "slow_http_requests_in_progress", "Platform API requests currently being served", (),
+    lambda: [((), metrics.http_requests_in_progress())],
+))
+metrics.registry.register(metrics.GaugeFunc(
+    "slow_db_connections_in_use", "Database connections currently checked out of the pool", (),
+    lambda: [((), metrics.db_connections_in_use())],
+))
+metrics.registry.register(metrics.GaugeFunc(
+    "slow_db_pool_connections", "Database pool connections by state (size, checked_out, checked_in, overflow)",
+    ("engine", "state"), _db_pools,
+))
+metrics.registry.register(metrics.GaugeFunc(
+    "slow_threadpool_tokens", "Worker thread limiter usage (total, in_use, waiting)", ("state",),
+    _threadpool,
+))
+metrics.registry.register(metrics.GaugeFunc(
+    "slow_cache_hits_total", "Cache hits since process start", ("cache",),
+    lambda: _cache_field("hits"), metric_type="counter",
+))
+metrics.registry.register(metrics.GaugeFunc(
+    "slow_cache_misses_total", "Cache misses since process start", ("cache",),
+    lambda: _cache_field("misses"), metric_type="counter",
+))
+metrics.registry.register(metrics.GaugeFunc(
+    "slow_cache_hit_ratio", "Cache hit ratio since process start", ("cache",), lambda: _cache_field("hit_rate"),
+))
+metrics.registry.register(metrics.GaugeFunc(
+    "slow_cache_entries", "Current cache entries (clients / sessions for connection pools)", ("cache",),
+    lambda: [((name,), stats.get("size", stats.get("sessions", stats.get("clients", 0)))) for name, stats in _cache_stats()],
+))
+metrics.registry.register(metrics.GaugeFunc(
+    "slow_result_writer_total", "Batched test result writes (flushes, rows, failures)", ("field",),
+    _result_writer, metric_type="counter",
+))
+metrics.registry.register(metrics.GaugeFunc(
+    "slow_background_jobs", "Plan jobs and load tests running in this process", ("kind",),
+    lambda: [(("plan_job",), len(job_worker.active_jobs())), (("load_test",), len(load_test_manager.active()))],
+))
+metrics.registry.register(metrics.GaugeFunc(
+    "slow_scheduler_events_total", "Scheduler outcomes in this process (dispatched runs, skipped, misfired, errors)",
+    ("event",), lambda: [((event,), value) for event, value in plan_scheduler.stats().items()
+                         if event in ("dispatched", "skipped", "misfired", "errors")],
+    metric_type="counter",
+))
+metrics.registry.register(metrics.GaugeFunc(
+    "slow_scheduler_leader", "Whether this process holds the scheduler lease (1) or not (0)", (),
+    lambda: [((), 1 if plan_scheduler.is_leader else 0)],
+))
+
+def render_metrics() -> str:
+    """导出全部指标（Prometheus 文本格式），需在事件循环中调用以采集线程池状态"""
+    return metrics.registry.render()
@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.async_runner import client_pool
+from app.core.config import settings
+from app.models.test_plan import TestReport
+from app.services.executor import run_cases
+from app.services.result_writer import ReportOwnershipLost, ResultWriter
+
+logger = logging.getLogger(__name__)
+
+# 报告汇总遇到并发冲突（唯一键冲突、死锁）时的最多尝试次数
+_ROLLUP_ATTEMPTS = 3
+
+def build_result_row(report_id: int, outcome: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    将 run_case 的执行结果转换为 test_result 表的一行数据
+    只保存响应头、响应体大小等摘要，不保存响应体
+    """
+    result = outcome["result"]
+    return {
+        "report_id": report_id,
+        "test_case_id": outcome["test_case_id"],
+        "name": outcome["name"],
+        "passed": outcome["passed"],
+        "status_code": result.status_code,
+        "duration": result.duration,
+        "error": result.error,
+        "request_snapshot": outcome.get("request"),
+        "response_snapshot": {
+            "headers": result.headers,
+            "body_size": result.body_size,
+            "truncated": result.truncated,
+            "timings": result.timings,
+        },
+        "assertions": outcome["assertions"],
+    }
+
+def _finish(db: Session, report: TestReport, status: str, error_message: str = None, worker_id: str = None) -> None:
+    finished_at = datetime.now()
+
+    def set_status() -> bool:
+        # 任务已被重新入队并由其他进程领取时不写入最终状态
+        if not crud.crud_test_plan.heartbeat_report(db, report.id, worker_id):
+            db.rollback()
+            logger.warning("Report %s is held by another worker, discarding status %s", report.id, status)
+            return False
+        report.status = status
+        report.error_message = error_message
+        report.finished_at = finished_at
+        if report.started_at:
+            report.duration = (report.finished_at - report.started_at).total_seconds()
+        db.add(report)
+        return True
+
+    # 报告汇总与最终状态在同一事务中提交，轮询到结束状态时通过率与分位数已可读
+    for attempt in range(_ROLLUP_ATTEMPTS):
+        if not set_status():
+            return
+        try:
+            crud.crud_report_stats.summarize_report(db, report)
+            db.commit()
+            return
+        except (exc.IntegrityError, exc.OperationalError) as e:
+            # 与同时结束的其他报告并发创建同一汇总行（唯一键冲突），或加锁时死锁 / 锁等待超时
+            # （MySQL 可重复读下锁定尚不存在的汇总行会加间隙锁，1213 以 OperationalError 抛出），回滚后重试
+            db.rollback()
+            logger.info("Rollup conflict for report %s (attempt %d): %s", report.id, attempt + 1, e.orig)
+            time.sleep(random.uniform(0, 0.1 * 2 ** attempt))
+        except Exception:
+            db.rollback()
+            logger.exception("Failed to summarize report %s", report.id)
+            break
+    # 汇总失败不影响报告状态；rolled_up_at 保持为空，可对该报告重新执行 summarize_report 补合并
+    logger.error("Summary of report %s dropped, rolled_up_at left empty for re-run", report.id)
+    if set_status():
+        db.commit()
+
+def execute_report(db: Session, report_id: int) -> None:
+    """
+    执行一条已领取（RUNNING）的计划报告任务
+    - 用例在任务线程内的独立事件循环中并发执行
+    - 结果经 ResultWriter 缓冲后批量写入 test_result，同一事务内更新报告进度与心跳
+    - 任务被重新入队后续跑时，跳过已写入结果的用例，计数从已写入的结果恢复
+    - 任务被重新入队并由其他进程领取后，原进程写入进度时发现 worker_id 已变化，放弃执行且不再写入
+    - 全部完成后报告状态置为 SUCCESS（全部通过）或 FAILED；执行异常时置为 ERROR
+    - 报告汇总（通过率、用例耗时 p50 / p95）与最终状态在同一事务中写入，并增量合并到按天的项目 / 模块 / 用例趋势汇总
+    """
+    report = crud.crud_test_plan.get_report(db, report_id)
+    if report is None:
+        return
+    # 领取任务时写入的 worker_id；进度、心跳与最终状态只在仍持有任务时写入
+    worker_id = report.worker_id
+    try:
+        plan = report.plan
+        env = crud.crud_project.get_environment(db=db, environment_id=report.environment_id)
+        if plan is None or env is None:
+            _finish(db, report, "ERROR", "测试计划或执行环境不存在", worker_id=worker_id)
+            return
+
+        test_cases = crud.crud_test_case.get_test_cases_for_run(
+            db,
+            project_id=plan.project_id,
+            test_case_ids=plan.test_case_ids,
+            module_name=plan.module_name,
+        )
+        finished_ids = crud.crud_test_plan.get_finished_case_ids(db, report.id)
+        if finished_ids:
+            logger.info("Resuming report %s, %d cases already finished", report.id, len(finished_ids))
+            test_cases = [tc for tc in test_cases if tc.id not in finished_ids]
+        counts = crud.crud_test_plan.count_results(db, report.id)
+        if not crud.crud_test_plan.heartbeat_report(
+            db, report.id, worker_id,
+            passed_count=counts["passed"],
+            failed_count=counts["failed"],
+            error_count=counts["errors"],
+            total_count=len(test_cases) + len(finished_ids),
+        ):
+            raise ReportOwnershipLost(report.id)
+        db.commit()
+
+        writer = ResultWriter(
+            db,
+            report,
+            batch_size=settings.RESULT_WRITER_BATCH_SIZE,
+            flush_interval=settings.RESULT_WRITER_FLUSH_INTERVAL,
+        )
+        concurrency = min(plan.concurrency or settings.BATCH_DEFAULT_CONCURRENCY, settings.BATCH_MAX_CONCURRENCY)
+
+        async def flush_periodically(run: asyncio.Task) -> None:
+            # 没有新结果时也按间隔刷写缓冲区并刷新心跳，避免长耗时用例导致任务被判定为超时
+            while True:
+                await asyncio.sleep(writer.flush_interval)
+                if writer.due():
+                    try:
+                        writer.flush()
+                    except ReportOwnershipLost:
+                        # 任务已由其他进程领取：停止执行剩余用例
+                        run.cancel()
+                        return
+                    except Exception:
+                        # 缓冲区保留，下一次写入时重试
+                        logger.exception("Periodic flush failed for report %s", report.id)
+
+        async def main() -> None:
+            run = asyncio.create_task(run_cases(
+                test_cases,
+                env,
+                concurrency=concurrency,
+                per_host_rps=settings.BATCH_PER_HOST_RPS,
+                on_result=lambda outcome: writer.add(build_result_row(report.id, outcome)),
+                keep_results=False,
+            ))
+            ticker = asyncio.create_task(flush_periodically(run))
+            try:
+                await run
+            except asyncio.CancelledError:
+                if writer.lost:
+                    raise ReportOwnershipLost(report.id)
+                raise
+            finally:
+                ticker.cancel()
+                await client_pool.aclose()
+
+        asyncio.run(main())
+        writer.flush()
+        _finish(db, report, "SUCCESS" if report.failed_count == 0 else "FAILED", worker_id=worker_id)
+    except ReportOwnershipLost:
+        db.rollback()
+        logger.warning("Report %s was claimed by another worker, abandoning run", report_id)
+    except Exception as e:
+        logger.exception("Plan report %s failed", report_id)
+        db.rollback()
+        _finish(db, report, "ERROR", str(e), worker_id=worker_id)
@@ -0,0 +1,225 @@
+import io
+import json
+import zipfile
+from datetime import datetime
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+from sqlalchemy import exc, insert, select
+from sqlalchemy.orm import Session
+
+from app.crud.pagination import count_cache
+from app.models.api import Api, ApiRequestTemplate
+from app.models.project import Environment, Project
+from app.models.test_case import TestCase
+
+# 归档格式版本，导入时校验
+ARCHIVE_VERSION = 1
+ARCHIVE_MEDIA_TYPE = "application/zip"
+MANIFEST_NAME = "manifest.json"
+
+# 归档中的表（按写入与导入顺序，被引用的表在前），每个表一个 JSONL 文件
+# 数据集文件（test_case_dataset）存放在 DATASET_DIR 中，不随项目归档
+ARCHIVE_TABLES = (
+    ("environment", Environment),
+    ("api", Api),
+    ("api_request_template", ApiRequestTemplate),
+    ("test_case", TestCase),
+)
+
+# 不写入归档的列：导入时由目标库重新生成
+_SKIPPED_COLUMNS = {"created_at", "updated_at"}
+
+# 压缩数据累积到该字节数后输出一块
+_CHUNK_BYTES = 64 * 1024
+
+class ArchiveFormatError(ValueError):
+    """项目归档格式非法（由接口层转换为 400 错误）"""
+
+def _archive_columns(model: Any) -> List[Any]:
+    return [column for column in model.__table__.columns if column.name not in _SKIPPED_COLUMNS]
+
+def _table_query(model: Any, project_id: int) -> Any:
+    query = select(*_archive_columns(model))
+    if model is ApiRequestTemplate:
+        return query.join(Api, Api.id == ApiRequestTemplate.api_id).where(Api.project_id == project_id).order_by(ApiRequestTemplate.id)
+    return query.where(model.project_id == project_id).order_by(model.id)
+
+class _StreamBuffer:
+    """zipfile 的输出目标：不可 seek，写入的数据由导出生成器按块取走"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self.size = 0
+        return data
+
+def iter_project_archive(db: Session, project: Project, batch_size: int = 1000) -> Iterator[bytes]:
+    """
+    以 zip 流的形式导出项目：manifest.json 与每个表一个 JSONL 文件（每行一条记录，保留原 ID 供导入时重映射）
+    各表通过服务端游标（yield_per）分批读取，边读边压缩输出，内存占用与项目大小无关
+    """
+    buffer = _StreamBuffer()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        manifest = {
+            "version": ARCHIVE_VERSION,
+            "exported_at": datetime.now().isoformat(timespec="seconds"),
+            "project": {"id": project.id, "name": project.name, "description": project.description},
+            "tables": [name for name, _ in ARCHIVE_TABLES],
+        }
+        archive.writestr(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2))
+
+        for name, model in ARCHIVE_TABLES:
+            result = db.execute(_table_query(model, project.id).execution_options(yield_per=batch_size))
+            # 大小未知的流式成员需要 zip64 头，单表超过 2GB 时仍可写入
+            with archive.open(f"{name}.jsonl", "w", force_zip64=True) as member:
+                for row in result.mappings():
+                    member.write(json.dumps(dict(row), ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8"))
+                    member.write(b"\n")
+                    if buffer.size >= _CHUNK_BYTES:
+                        yield buffer.drain()
+            result.close()
+            if buffer.size:
+                yield buffer.drain()
+    # 中央目录在关闭归档时写入
+    yield buffer.drain()
+
+def _iter_rows(archive: zipfile.ZipFile, name: str) -> Iterator[Dict[str, Any]]:
+    """逐行读取归档中的 JSONL 文件（不存在时视为空表）"""
+    try:
+        member = archive.open(f"{name}.jsonl")
+    except KeyError:
+        return
+    with member, io.TextIOWrapper(member, encoding="utf-8") as lines:
+        for line_no, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                raise ArchiveFormatError(f"{name}.jsonl 第 {line_no} 行不是合法的 JSON") from None
+            if not isinstance(row, dict):
+                raise ArchiveFormatError(f"{name}.jsonl 第 {line_no} 行必须是 JSON 对象")
+            yield row
+
+def _insert_apis(db: Session, project_id: int, rows: List[Dict[str, Any]], after_id: int) -> List[int]:
+    """
+    以一条多行 INSERT 写入一批接口，再按 ID 顺序查回新 ID（与 rows 顺序一致）
+    MySQL 不支持按参数顺序返回 executemany 的自增 ID，逐行插入又需要每行一次往返；
+    同一条语句插入的行按顺序分配递增的自增 ID，而导入中的新项目在提交前对其他连接不可见，
+    项目下 ID 大于 after_id（上一批最后一个新 ID）的接口即为本批插入的行
+    """
+    db.execute(insert(Api).values(rows))
+    return list(db.scalars(
+        select(Api.id).where(Api.project_id == project_id, Api.id > after_id).order_by(Api.id)
+    ))
+
+def import_project_archive(
+    db: Session,
+    source: BinaryIO,
+    owner_id: int,
+    name: Optional[str] = None,
+    batch_size: int = 1000,
+) -> Dict[str, Any]:
+    """
+    从项目归档创建新项目：逐表流式读取 JSONL，分批批量插入，并将归档中的 ID 重映射为新 ID
+    - name: 新项目名称，默认使用归档中的项目名称
+    - 接口 ID 重映射后写入请求模板与用例；用例引用的接口不在归档中时置空
+    整个导入在一个事务中完成，失败时不留下部分数据
+    返回: {"project": 新项目, "counts": {表名: 导入行数}}
+    异常: 归档格式非法时抛出 ArchiveFormatError
+    """
+    try:
+        archive = zipfile.ZipFile(source)
+    except zipfile.BadZipFile:
+        raise ArchiveFormatError("文件不是有效的 zip 归档") from None
+
+    with archive:
+        try:
+            manifest = json.loads(archive.read(MANIFEST_NAME))
+        except KeyError:
+            raise ArchiveFormatError(f"归档缺少 {MANIFEST_NAME}") from None
+        except ValueError:
+            raise ArchiveFormatError(f"{MANIFEST_NAME} 不是合法的 JSON") from None
+        if not isinstance(manifest, dict) or manifest.get("version") != ARCHIVE_VERSION:
+            raise ArchiveFormatError(f"不支持的归档版本: {manifest.get('version') if isinstance(manifest, dict) else None}")
+        source_project = manifest.get("project") or {}
+        project_name = name or source_project.get("name")
+        if not project_name:
+            raise ArchiveFormatError("归档缺少项目名称")
+
+        try:
+            project = Project(
+                name=project_name[:128],
+                description=source_project.get("description"),
+                is_active=True,
+                owner_id=owner_id,
+            )
+            db.add(project)
+            db.flush()
+
+            # 原接口 ID -> 新接口 ID
+            api_ids: Dict[int, int] = {}
+            last_api_id = 0
+            counts: Dict[str, int] = {}
+            for table, model in ARCHIVE_TABLES:
+                # 归档中缺少的列取模型默认值，批量插入要求每行的列相同
+                columns = {
+                    column.name: column.default.arg if column.default is not None and column.default.is_scalar else None
+                    for column in _archive_columns(model)
+                    if column.name != "id"
+                }
+                counts[table] = 0
+                rows = _iter_rows(archive, table)
+                while True:
+                    chunk = list(islice(rows, batch_size))
+                    if not chunk:
+                        break
+                    values = []
+                    old_ids = []
+                    for row in chunk:
+                        value = {key: row.get(key, default) for key, default in columns.items()}
+                        if "project_id" in columns:
+                            value["project_id"] = project.id
+                        if model is ApiRequestTemplate:
+                            value["api_id"] = api_ids.get(row.get("api_id"))
+                            if value["api_id"] is None:
+                                continue
+                        elif model is TestCase:
+                            value["api_id"] = api_ids.get(row.get("api_id"))
+                        values.append(value)
+                        old_ids.append(row.get("id"))
+                    if not values:
+                        continue
+                    if model is Api:
+                        new_ids = _insert_apis(db, project.id, values, last_api_id)
+                        api_ids.update(zip(old_ids, new_ids))
+                        last_api_id = new_ids[-1]
+                    else:
+                        db.execute(insert(model), values)
+                    counts[table] += len(values)
+            db.commit()
+        except (exc.IntegrityError, exc.DataError) as e:
+            db.rollback()
+            # 缺少必填字段、字段超长等数据错误
+            raise ArchiveFormatError(f"归档数据写入失败: {e.orig}") from e
+        except Exception:
+            db.rollback()
+            raise
+
+    db.refresh(project)
+    for table in (Project.__tablename__, Api.__tablename__, TestCase.__tablename__):
+        count_cache.invalidate(table)
+    return {"project": project, "counts": counts}
@@ -0,0 +1,217 @@
+import logging
+import os
+import random
+import threading
+import uuid
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import parse_qs
+
+from jose import JWTError, jwt
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app import crud
+from app.core import security
+from app.core.auth_cache import auth_cache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import route_template
+from app.core.profiling import PROFILE_MODES, RequestProfiler
+from app.models.profile import RequestProfile
+
+logger = logging.getLogger(__name__)
+
+# 触发剖析的请求头与查询参数，值为 1/true 时使用默认剖析方式，也可直接指定 sampling / cprofile
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY_PARAM = "__profile"
+
+def profile_path(storage_path: str) -> str:
+    """剖析文件的存储路径（相对 PROFILING_DIR）转换为文件路径"""
+    return os.path.join(settings.PROFILING_DIR, storage_path)
+
+def remove_profile_file(storage_path: str) -> None:
+    try:
+        os.remove(profile_path(storage_path))
+    except FileNotFoundError:
+        pass
+
+def _requested_value(scope: Dict[str, Any]) -> Optional[str]:
+    """请求中的剖析标记（请求头优先），没有时返回 None"""
+    for name, value in scope.get("headers") or ():
+        if name == PROFILE_HEADER:
+            return value.decode("latin-1").strip().lower()
+    query = scope.get("query_string") or b""
+    if PROFILE_QUERY_PARAM.encode() in query:
+        values = parse_qs(query.decode("latin-1")).get(PROFILE_QUERY_PARAM)
+        if values:
+            return values[0].strip().lower()
+    return None
+
+class RequestProfilingManager:
+    """
+    按需剖析平台接口请求
+
+    - 请求带有 X-Profile 请求头或 __profile 查询参数，且令牌属于启用的管理员（role=ADMIN）时剖析该请求
+    - sample_rate > 0 时另按比例随机剖析请求（不要求管理员）
+    - 同一时间只剖析一个请求（cProfile 与采样器都是进程级的），其余请求照常执行不剖析
+    - 剖析文件写入 PROFILING_DIR，元数据写入 request_profile 表，只保留最新的 max_profiles 条
+
+    - session_factory: 数据库会话工厂（校验管理员、保存记录）
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        sample_rate: float = 0.0,
+        default_mode: str = "sampling",
+        interval: float = 0.001,
+        max_profiles: int = 200,
+    ):
+        self.session_factory = session_factory
+        self.sample_rate = sample_rate
+        self.default_mode = default_mode
+        self.interval = interval
+        self.max_profiles = max_profiles
+        self._active = threading.Lock()
+
+    def mode_for(self, value: str) -> str:
+        """剖析标记的值对应的剖析方式"""
+        return value if value in PROFILE_MODES else self.default_mode
+
+    def try_acquire(self) -> bool:
+        """占用剖析槽位；已有请求正在剖析时返回 False"""
+        return self._active.acquire(blocking=False)
+
+    def release(self) -> None:
+        self._active.release()
+
+    def resolve_admin(self, scope: Dict[str, Any]) -> Optional[int]:
+        """
+        校验请求令牌是否属于启用的管理员
+        返回: 管理员用户ID；令牌缺失、无效或不是管理员时返回 None
+        """
+        token = None
+        for name, value in scope.get("headers") or ():
+            if name == b"authorization":
+                scheme, _, credentials = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer":
+                    token = credentials.strip()
+                break
+        if not token:
+            return None
+        user = auth_cache.get(token) if settings.AUTH_CACHE_ENABLED else None
+        if user is None:
+            try:
+                payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[security.ALGORITHM])
+            except JWTError:
+                return None
+            db = self.session_factory()
+            try:
+                user = crud.crud_user.get_by_username(db, username=payload.get("sub"))
+            finally:
+                db.close()
+        if user is None or not user.is_active or user.role != "ADMIN":
+            return None
+        return user.id
+
+    def save(
+        self,
+        profiler: RequestProfiler,
+        scope: Dict[str, Any],
+        status_code: int,
+        trigger: str,
+        user_id: Optional[int],
+    ) -> RequestProfile:
+        """写入剖析文件与记录，并删除超出保留数的旧记录"""
+        method = scope["method"]
+        path = scope.get("path", "")
+        extension, content = profiler.dump(f"{method} {path}")
+        os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+        storage_path = f"profile_{uuid.uuid4().hex}.{extension}"
+        with open(profile_path(storage_path), "wb") as f:
+            f.write(content)
+
+        db = self.session_factory()
+        try:
+            profile = crud.crud_profile.create_profile(db, {
+                "method": method,
+                "path": path[:512],
+                "route": route_template(scope)[:255],
+                "status_code": status_code,
+                "duration": profiler.duration,
+                "mode": profiler.mode,
+                "trigger": trigger,
+                "user_id": user_id,
+                "storage_path": storage_path,
+                "file_format": extension,
+                "size_bytes": len(content),
+            })
+            for stale_path in crud.crud_profile.prune_profiles(db, self.max_profiles):
+                remove_profile_file(stale_path)
+        except Exception:
+            remove_profile_file(storage_path)
+            raise
+        finally:
+            db.close()
+        return profile
+
+class ProfilingMiddleware:
+    """
+    请求剖析中间件（纯 ASGI 实现）
+    未带剖析标记且未被抽样的请求只检查一次请求头与查询字符串，不产生其他开销
+    """
+
+    def __init__(self, app: Any, manager: Optional[RequestProfilingManager] = None):
+        self.app = app
+        self.manager = manager
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        manager = self.manager or profiling_manager
+        requested = _requested_value(scope)
+        user_id = None
+        if requested is not None and requested not in ("0", "false"):
+            user_id = await run_in_threadpool(manager.resolve_admin, scope)
+        if user_id is not None:
+            trigger, mode = "REQUESTED", manager.mode_for(requested)
+        elif manager.sample_rate > 0 and random.random() < manager.sample_rate:
+            trigger, mode = "SAMPLED", manager.default_mode
+        else:
+            await self.app(scope, receive, send)
+            return
+        if not manager.try_acquire():
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        profiler = RequestProfiler(mode, manager.interval)
+        try:
+            profiler.start()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                profiler.stop()
+        finally:
+            manager.release()
+        try:
+            await run_in_threadpool(manager.save, profiler, scope, status_code, trigger, user_id)
+        except Exception:
+            logger.exception("Saving request profile failed for %s %s", scope["method"], scope.get("path"))
+
+# 全局请求剖析管理器
+profiling_manager = RequestProfilingManager(
+    session_factory=SessionLocal,
+    sample_rate=settings.PROFILING_SAMPLE_RATE,
+    default_mode=settings.PROFILING_DEFAULT_MODE,
+    interval=settings.PROFILING_SAMPLE_INTERVAL,
+    max_profiles=settings.PROFILING_MAX_PROFILES,
+)
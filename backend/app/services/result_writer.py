@@ -0,0 +1,149 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app import crud
+from app.models.test_plan import TestReport, TestResult
+
+logger = logging.getLogger(__name__)
+
+class ResultWriterStats:
+    """
+    结果写入的全局统计（所有任务共享），供监控使用
+    - flushes: 刷写次数
+    - rows: 已写入的结果行数
+    - failures: 刷写失败次数
+    - flush_seconds_total / flush_seconds_max: 刷写耗时合计与最大值
+    - max_batch_size: 单次刷写的最大行数
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.flushes = 0
+        self.rows = 0
+        self.failures = 0
+        self.flush_seconds_total = 0.0
+        self.flush_seconds_max = 0.0
+        self.max_batch_size = 0
+
+    def record(self, batch_size: int, seconds: float) -> None:
+        with self._lock:
+            self.flushes += 1
+            self.rows += batch_size
+            self.flush_seconds_total += seconds
+            self.flush_seconds_max = max(self.flush_seconds_max, seconds)
+            self.max_batch_size = max(self.max_batch_size, batch_size)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """返回刷写次数、行数、失败次数、平均/最大批大小与平均/最大刷写耗时"""
+        with self._lock:
+            return {
+                "flushes": self.flushes,
+                "rows": self.rows,
+                "failures": self.failures,
+                "avg_batch_size": self.rows / self.flushes if self.flushes else 0.0,
+                "max_batch_size": self.max_batch_size,
+                "avg_flush_seconds": self.flush_seconds_total / self.flushes if self.flushes else 0.0,
+                "max_flush_seconds": self.flush_seconds_max,
+            }
+
+# 全局写入统计
+result_writer_stats = ResultWriterStats()
+
+class ReportOwnershipLost(Exception):
+    """任务已被重新入队并由其他进程领取，当前进程应放弃执行且不再写入"""
+
+    def __init__(self, report_id: int):
+        super().__init__(f"report {report_id} is no longer held by this worker")
+        self.report_id = report_id
+
+class ResultWriter:
+    """
+    计划执行结果的缓冲写入器
+
+    用例结果先进入内存缓冲区，行数达到 batch_size 或距上次刷写超过 flush_interval 秒时，
+    以一条批量 INSERT 写入 test_result，并在同一事务内更新报告的进度计数与心跳。
+    事务提交即为确认：已提交的结果与计数始终一致，任务进程崩溃后只会丢失未提交的缓冲行，
+    任务重新入队后由 plan_runner 跳过已写入结果的用例继续执行。
+    进度与心跳只在任务仍由领取时的 worker_id 持有时更新；任务已被其他进程领取时不写入结果，
+    抛出 ReportOwnershipLost（lost 置为 True），避免两个进程向同一报告写入重复结果。
+
+    - db: 任务专用的数据库会话（仅在执行任务的线程中使用）
+    - report: 正在执行的报告，计数从报告的当前值开始累加（续跑时已包含历史结果）
+    - batch_size: 缓冲行数上限
+    - flush_interval: 最长缓冲秒数
+    """
+
+    def __init__(self, db: Session, report: TestReport, batch_size: int = 200, flush_interval: float = 1.0):
+        self.db = db
+        self.report = report
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.worker_id = report.worker_id
+        self.lost = False
+        self._buffer: List[Dict[str, Any]] = []
+        self._last_flush = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def add(self, row: Dict[str, Any]) -> None:
+        """缓冲一行结果（字段同 test_result 表），达到阈值时自动刷写"""
+        self._buffer.append(row)
+        if len(self._buffer) >= self.batch_size or self.due():
+            self.flush()
+
+    def due(self) -> bool:
+        """距上次刷写是否已超过 flush_interval"""
+        return time.monotonic() - self._last_flush >= self.flush_interval
+
+    def flush(self) -> int:
+        """
+        将缓冲区写入数据库并更新报告进度与心跳（同一事务）
+        缓冲区为空时仅刷新心跳
+        返回: 本次写入的行数
+        异常: 写入失败时回滚事务、保留缓冲区并重新抛出；任务已被其他进程领取时抛出 ReportOwnershipLost
+        """
+        rows = self._buffer
+        start = time.perf_counter()
+        report = self.report
+        counts = {
+            "passed_count": report.passed_count + sum(1 for row in rows if row["passed"]),
+            "failed_count": report.failed_count + sum(1 for row in rows if not row["passed"]),
+            "error_count": report.error_count + sum(1 for row in rows if row["error"]),
+        }
+        try:
+            # 先按 worker_id 条件更新进度与心跳（行锁持有到提交），确认仍持有任务后再写入结果
+            if not crud.crud_test_plan.heartbeat_report(self.db, report.id, self.worker_id, **counts):
+                self.db.rollback()
+                self.lost = True
+                raise ReportOwnershipLost(report.id)
+            if rows:
+                self.db.execute(insert(TestResult), rows)
+            self.db.commit()
+        except ReportOwnershipLost:
+            raise
+        except Exception:
+            self.db.rollback()
+            result_writer_stats.record_failure()
+            raise
+        # 同步内存中的计数，不标记为待写入（报告的其他字段由 plan_runner 提交时不会覆盖计数）
+        for key, value in counts.items():
+            set_committed_value(report, key, value)
+        elapsed = time.perf_counter() - start
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        if rows:
+            result_writer_stats.record(len(rows), elapsed)
+            logger.debug("Flushed %d results for report %s in %.4fs", len(rows), self.report.id, elapsed)
+        return len(rows)
@@ -0,0 +1,289 @@
+import asyncio
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core.assertions import AssertionPlan, compile_assertions
+from app.core.async_runner import execute_request
+from app.core.extractors import CompiledExtractor, compile_extractors, run_extractors
+from app.core.template import Renderer, TemplateRenderError, compile_value
+from app.crud.crud_test_case import get_assertion_plan
+from app.models.api import Api
+from app.models.project import Environment
+from app.models.scene import Scene, SceneStep
+from app.models.test_case import TestCase
+from app.services.executor import evaluate_case, fill_path_params
+
+class CompiledStep:
+    """
+    编译后的场景步骤：请求的各部分在编译时解析为渲染计划，执行时只需代入上下文变量
+    """
+    __slots__ = (
+        "step_id", "name", "method", "url", "headers", "params", "body", "body_type",
+        "extractors", "plan", "parallel",
+    )
+
+    def __init__(
+        self,
+        step_id: int,
+        name: str,
+        method: Renderer,
+        url: Renderer,
+        headers: Renderer,
+        params: Renderer,
+        body: Renderer,
+        body_type: str,
+        extractors: List[CompiledExtractor],
+        plan: Optional[AssertionPlan],
+        parallel: bool,
+    ):
+        self.step_id = step_id
+        self.name = name
+        self.method = method
+        self.url = url
+        self.headers = headers
+        self.params = params
+        self.body = body
+        self.body_type = body_type
+        self.extractors = extractors
+        self.plan = plan
+        self.parallel = parallel
+
+    @property
+    def needs_body(self) -> bool:
+        return any(e.source == "body" for e in self.extractors)
+
+    def render(self, context: Dict[str, Any], base_url: str, environment_id: int) -> Dict[str, Any]:
+        """
+        代入上下文变量，生成 execute_request 的请求参数
+        异常: 变量未定义时抛出 TemplateRenderError
+        """
+        url = str(self.url.render(context))
+        if not url.startswith(("http://", "https://")):
+            url = f"{base_url}/{url.lstrip('/')}"
+        body = self.body.render(context)
+        json_body = None
+        data_body = None
+        if body:
+            if self.body_type == "json":
+                json_body = body
+            else:
+                data_body = body
+        return {
+            "method": str(self.method.render(context)),
+            "url": url,
+            "params": self.params.render(context),
+            "headers": self.headers.render(context),
+            "json_body": json_body,
+            "data_body": data_body,
+            "environment_id": environment_id,
+        }
+
+class ScenePlan:
+    """
+    编译后的场景
+    - steps: 启用的步骤（按 order_index 排序）
+    - groups: 执行分组，相邻的并行步骤为一组同时执行，其余步骤各自一组
+    - variables: 场景初始变量
+    """
+    __slots__ = ("scene_id", "steps", "groups", "variables", "base_url", "environment_id")
+
+    def __init__(self, scene_id: int, steps: List[CompiledStep], variables: Dict[str, Any], env: Environment):
+        self.scene_id = scene_id
+        self.steps = steps
+        self.variables = variables
+        self.base_url = env.base_url.rstrip("/")
+        self.environment_id = env.id
+        groups: List[List[CompiledStep]] = []
+        for step in steps:
+            if step.parallel and groups and groups[-1][-1].parallel:
+                groups[-1].append(step)
+            else:
+                groups.append([step])
+        self.groups = groups
+
+def _base_request(step: SceneStep, api: Optional[Api], case: Optional[TestCase]) -> Dict[str, Any]:
+    if case is not None:
+        return {
+            "method": case.method,
+            "url": case.url,
+            "headers": case.headers or {},
+            "params": case.params or {},
+            "body": case.body,
+            "body_type": case.body_type,
+        }
+    template = api.request_template
+    return {
+        "method": api.method,
+        "url": fill_path_params(api.url_path, template.path_params if template else None),
+        "headers": (template.headers if template else None) or {},
+        "params": (template.query_params if template else None) or {},
+        "body": template.body if template else None,
+        "body_type": template.body_type if template else "json",
+    }
+
+def compile_step(
+    step: SceneStep,
+    env: Environment,
+    api: Optional[Api] = None,
+    case: Optional[TestCase] = None,
+) -> CompiledStep:
+    """
+    编译单个步骤：合并 环境请求头 / 引用的接口或用例 / 步骤覆盖配置，再编译为渲染计划
+    断言优先使用步骤自身配置，否则沿用引用用例的断言计划
+    """
+    request = _base_request(step, api, case)
+    override = step.request_override or {}
+    headers = {**(env.headers or {}), **request["headers"], **(override.get("headers") or {})}
+    params = {**request["params"], **(override.get("params") or {})}
+
+    if step.assertions:
+        plan = compile_assertions(step.assertions, strict=False)
+    elif case is not None:
+        plan = get_assertion_plan(case)
+    else:
+        plan = None
+
+    return CompiledStep(
+        step_id=step.id,
+        name=step.step_name,
+        method=compile_value(override.get("method") or request["method"]),
+        url=compile_value(override.get("url") or request["url"]),
+        headers=compile_value(headers),
+        params=compile_value(params),
+        body=compile_value(override["body"] if "body" in override else request["body"]),
+        body_type=override.get("body_type") or request["body_type"],
+        extractors=compile_extractors(step.extracts),
+        plan=plan,
+        parallel=step.parallel,
+    )
+
+def compile_scene(
+    scene: Scene,
+    env: Environment,
+    apis: Dict[int, Api],
+    cases: Dict[int, TestCase],
+) -> ScenePlan:
+    """
+    编译整个场景（见 crud_scene.get_step_refs 获取 apis / cases）
+    同一次执行（包括数据驱动的全部行）只编译一次
+    """
+    steps = [
+        compile_step(step, env, api=apis.get(step.ref_id) if step.ref_type == "API" else None,
+                     case=cases.get(step.ref_id) if step.ref_type == "CASE" else None)
+        for step in scene.steps
+        if step.enabled_flag
+    ]
+    return ScenePlan(scene.id, steps, dict(scene.variables or {}), env)
+
+def _step_result(step: CompiledStep, status: str, **fields: Any) -> Dict[str, Any]:
+    return {"step_id": step.step_id, "name": step.name, "status": status, **fields}
+
+async def run_step(
+    step: CompiledStep,
+    plan: ScenePlan,
+    context: Dict[str, Any],
+    include_body: bool = False,
+) -> Dict[str, Any]:
+    """
+    执行单个步骤：渲染请求 -> 发送 -> 断言 -> 提取变量
+    返回: 步骤结果，extracted 为提取到的变量（由调用方合并进上下文）
+    """
+    try:
+        request_kwargs = step.render(context, plan.base_url, plan.environment_id)
+    except TemplateRenderError as e:
+        return _step_result(step, "FAILED", error=f"请求渲染失败: {e}")
+
+    result = await execute_request(**request_kwargs, load_body=False)
+    outcome = evaluate_case(result, step.plan)
+    extracted: Dict[str, Any] = {}
+    error = result.error
+    if not error and step.extractors:
+        body = result.load_body() if step.needs_body else None
+        extracted, missing = run_extractors(step.extractors, result.status_code, result.headers, body)
+        if missing:
+            error = f"未提取到变量: {', '.join(missing)}"
+    if include_body:
+        result.load_body()
+    else:
+        result.release()
+        result.body = None
+
+    passed = outcome["passed"] and error is None
+    return _step_result(
+        step,
+        "PASSED" if passed else "FAILED",
+        request={"method": request_kwargs["method"], "url": request_kwargs["url"]},
+        result=result.model_dump(),
+        assertions=outcome["assertions"],
+        extracted=extracted,
+        error=error,
+    )
+
+async def run_scene(
+    plan: ScenePlan,
+    variables: Optional[Dict[str, Any]] = None,
+    include_body: bool = False,
+) -> Dict[str, Any]:
+    """
+    执行一次场景
+    - variables: 本次执行的变量，覆盖场景初始变量
+    - 分组依次执行，组内步骤并发；并发步骤看到的是该组开始前的上下文，提取的变量在整组完成后按步骤顺序合并
+    - 某组出现失败步骤后，后续步骤全部跳过
+    返回: {"passed", "duration", "steps", "variables"}
+    """
+    context = {**plan.variables, **(variables or {})}
+    results: List[Dict[str, Any]] = []
+    failed = False
+    start_time = time.perf_counter()
+    for group in plan.groups:
+        if failed:
+            results.extend(_step_result(step, "SKIPPED") for step in group)
+            continue
+        if len(group) == 1:
+            group_results = [await run_step(group[0], plan, context, include_body)]
+        else:
+            snapshot = dict(context)
+            group_results = await asyncio.gather(
+                *(run_step(step, plan, snapshot, include_body) for step in group)
+            )
+        for step_result in group_results:
+            context.update(step_result.get("extracted") or {})
+            failed = failed or step_result["status"] != "PASSED"
+        results.extend(group_results)
+    return {
+        "passed": not failed,
+        "duration": time.perf_counter() - start_time,
+        "steps": results,
+        "variables": context,
+    }
+
+async def run_scene_rows(
+    plan: ScenePlan,
+    rows: Iterable[Dict[str, Any]],
+    concurrency: int,
+    variables: Optional[Dict[str, Any]] = None,
+    include_body: bool = False,
+) -> Dict[str, Any]:
+    """
+    数据驱动执行：每行数据执行一次场景，行变量覆盖 variables
+    场景只编译一次，各行共享渲染计划；同时执行的行数不超过 concurrency
+    返回: {"total", "passed", "failed", "duration", "rows"}，rows 保持输入顺序
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    base = variables or {}
+
+    async def run_row(index: int, row: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            outcome = await run_scene(plan, {**base, **row}, include_body)
+        return {"index": index, **outcome}
+
+    start_time = time.perf_counter()
+    results = await asyncio.gather(*(run_row(i, row) for i, row in enumerate(rows)))
+    passed = sum(1 for r in results if r["passed"])
+    return {
+        "total": len(results),
+        "passed": passed,
+        "failed": len(results) - passed,
+        "duration": time.perf_counter() - start_time,
+        "rows": results,
+    }
@@ -0,0 +1,147 @@
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.job_queue import job_worker
+
+logger = logging.getLogger(__name__)
+
+# 调度器租约行的名称
+SCHEDULER_LOCK_NAME = "plan-scheduler"
+
+class PlanScheduler:
+    """
+    测试计划的定时调度器（cron）
+
+    - 调度持久化在 plan_schedule 表中，服务重启后按 fire_at 继续触发，错过的触发按 misfire / coalesce 策略处理
+    - 每个进程都运行调度线程，但只有持有 scheduler_lock 租约的领导者触发调度；
+      领导者每轮续期，退出或卡死后租约过期，由其他进程接管
+    - 触发即入队 SCHEDULE 类型的计划执行任务，由 JobWorkerPool 的有界线程池执行（同时执行数为 JOB_MAX_WORKERS）
+
+    - session_factory: 数据库会话工厂
+    - poll_interval: 检查到期调度的间隔秒数
+    - lock_ttl: 领导者租约秒数
+    - batch_size: 每轮最多处理的到期调度数
+    - on_dispatch: 入队任务后的回调（唤醒任务队列）
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        poll_interval: float = 5.0,
+        lock_ttl: float = 30.0,
+        batch_size: int = 100,
+        on_dispatch: Optional[Callable[[], None]] = None,
+    ):
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+        self.lock_ttl = lock_ttl
+        self.batch_size = batch_size
+        self.on_dispatch = on_dispatch
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._counters = {"ticks": 0, "dispatched": 0, "skipped": 0, "misfired": 0, "errors": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """启动调度线程"""
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._loop, name="plan-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """停止调度线程，并释放租约以便其他进程立即接管"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.is_leader:
+            db = self.session_factory()
+            try:
+                crud.crud_schedule.release_lock(db, SCHEDULER_LOCK_NAME, self.owner)
+            except Exception:
+                logger.exception("Failed to release scheduler lock")
+            finally:
+                db.close()
+            self.is_leader = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._counters, "is_leader": self.is_leader}
+
+    def _loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("Scheduler iteration failed")
+            self._stopping.wait(self.poll_interval)
+
+    def tick(self, now: Optional[datetime] = None) -> int:
+        """
+        执行一轮调度：获取或续期租约，领导者触发全部到期的调度
+        返回: 本轮入队的计划执行任务数
+        """
+        now = now or datetime.now()
+        dispatched = 0
+        db = self.session_factory()
+        try:
+            leader = crud.crud_schedule.acquire_lock(db, SCHEDULER_LOCK_NAME, self.owner, self.lock_ttl, now=now)
+            if leader != self.is_leader:
+                logger.info("Scheduler %s %s leadership", self.owner, "acquired" if leader else "lost")
+            self.is_leader = leader
+            if not leader:
+                return 0
+            for schedule_id in crud.crud_schedule.get_due_schedule_ids(db, now, self.batch_size):
+                try:
+                    outcome = crud.crud_schedule.fire_schedule(db, schedule_id, now=now)
+                except Exception:
+                    db.rollback()
+                    logger.exception("Schedule %s failed to fire", schedule_id)
+                    outcome = {"status": "ERROR", "report_ids": [], "misfired": 0}
+                if outcome.get("error"):
+                    logger.warning("Schedule %s not run: %s", schedule_id, outcome.get("error"))
+                dispatched += len(outcome["report_ids"])
+                self._record(outcome)
+        finally:
+            db.close()
+            with self._lock:
+                self._counters["ticks"] += 1
+        if dispatched and self.on_dispatch is not None:
+            self.on_dispatch()
+        return dispatched
+
+    def _record(self, outcome: Dict[str, Any]) -> None:
+        with self._lock:
+            self._counters["dispatched"] += len(outcome["report_ids"])
+            self._counters["misfired"] += outcome["misfired"]
+            if outcome["status"] == "SKIPPED":
+                self._counters["skipped"] += 1
+            elif outcome["status"] == "ERROR":
+                self._counters["errors"] += 1
+
+# 全局调度器，由应用生命周期启动与停止
+plan_scheduler = PlanScheduler(
+    session_factory=SessionLocal,
+    poll_interval=settings.SCHEDULER_POLL_INTERVAL,
+    lock_ttl=settings.SCHEDULER_LOCK_TTL,
+    batch_size=settings.SCHEDULER_BATCH_SIZE,
+    on_dispatch=job_worker.notify,
+)
@@ -0,0 +1,151 @@
+import json
+import time
+from typing import Callable
+
+from fastapi.testclient import TestClient
+from app.core.config import settings
+
+def _openapi_document(count: int, summary_prefix: str = "查询") -> dict:
+    paths = {
+        "/users/{user_id}": {
+            "parameters": [{"name": "user_id", "in": "path", "required": True, "schema": {"type": "integer", "example": 7}}],
+            "get": {
+                "summary": "获取用户",
+                "tags": ["用户"],
+                "parameters": [
+                    {"name": "verbose", "in": "query", "schema": {"type": "boolean", "default": True}},
+                    {"$ref": "#/components/parameters/TraceId"},
+                ],
+            },
+            "put": {
+                "operationId": "updateUser",
+                "tags": ["用户"],
+                "requestBody": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/User"}}}},
+            },
+        },
+    }
+    for i in range(count):
+        paths[f"/items/{i}"] = {"get": {"summary": f"{summary_prefix}{i}", "tags": ["物品"]}}
+    return {
+        "openapi": "3.0.3",
+        "info": {"title": "Demo", "version": "1.0"},
+        "paths": paths,
+        "components": {
+            "parameters": {"TraceId": {"name": "X-Trace-Id", "in": "header", "schema": {"type": "string", "example": "t-1"}}},
+            "schemas": {
+                "User": {
+                    "type": "object",
+                    "properties": {
+                        "name": {"type": "string", "example": "alice"},
+                        "tags": {"type": "array", "items": {"type": "string", "enum": ["a", "b"]}},
+                        "manager": {"$ref": "#/components/schemas/User"},
+                    },
+                },
+            },
+        },
+    }
+
+def _import(client: TestClient, headers: dict, project_id: int, name: str, content: bytes, **params) -> dict:
+    res = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/apis/import",
+        headers=headers,
+        params=params,
+        files={"file": (name, content, "application/octet-stream")},
+    )
+    assert res.status_code == 200, res.text
+    return res.json()["data"]
+
+def _list_apis(client: TestClient, headers: dict, project_id: int) -> dict:
+    res = client.get(f"{settings.API_V1_STR}/projects/{project_id}/apis/", headers=headers, params={"limit": 500})
+    return res.json()["data"]
+
+def test_import_openapi_upserts_by_method_and_path(client: TestClient, auth_headers: dict, create_project: Callable) -> None:
+    project_id, _ = create_project("OpenAPI Import")
+
+    started = time.perf_counter()
+    result = _import(client, auth_headers, project_id, "openapi.json", json.dumps(_openapi_document(1200)).encode())
+    assert time.perf_counter() - started < 10
+    assert result == {"format": "openapi", "total": 1202, "created": 1202, "updated": 0, "skipped": 0, "invalid": 0}
+
+    page = _list_apis(client, auth_headers, project_id)
+    assert page["total"] == 1202
+    apis = {(a["method"], a["url_path"]): a for a in page["items"]}
+    get_user = apis[("GET", "/users/{user_id}")]
+    assert get_user["name"] == "获取用户"
+    assert get_user["module_name"] == "用户"
+    assert get_user["request_template"]["path_params"] == {"user_id": 7}
+    assert get_user["request_template"]["query_params"] == {"verbose": True}
+    assert get_user["request_template"]["headers"] == {"X-Trace-Id": "t-1"}
+    put_user = apis[("PUT", "/users/{user_id}")]
+    assert put_user["name"] == "updateUser"
+    # 循环引用的 schema 在引用处停止展开
+    assert put_user["request_template"]["body"] == {"name": "alice", "tags": ["a"], "manager": None}
+    assert put_user["request_template"]["headers"] == {"Content-Type": "application/json"}
+
+    # 再次导入：已有接口按方法与路径更新，不重复创建
+    result = _import(client, auth_headers, project_id, "openapi.json", json.dumps(_openapi_document(1210, "列出")).encode())
+    assert (result["created"], result["updated"]) == (10, 1202)
+    page = _list_apis(client, auth_headers, project_id)
+    assert page["total"] == 1212
+    names = {a["url_path"]: a["name"] for a in page["items"] if a["method"] == "GET"}
+    assert names["/items/3"] == "列出3"
+
+    # skip：已有接口保持不变
+    result = _import(client, auth_headers, project_id, "openapi.json", json.dumps(_openapi_document(2, "跳过")).encode(),
+                     on_conflict="skip")
+    assert (result["created"], result["updated"], result["skipped"]) == (0, 0, 4)
+
+def test_import_swagger_yaml_and_har(client: TestClient, auth_headers: dict, create_project: Callable) -> None:
+    project_id, _ = create_project("HAR Import")
+
+    swagger = b"""
+swagger: "2.0"
+basePath: /v1
+paths:
+  /login:
+    post:
+      summary: Login
+      parameters:
+        - {name: username, in: formData, type: string, default: admin}
+        - {name: password, in: formData, type: string}
+"""
+    result = _import(client, auth_headers, project_id, "swagger.yaml", swagger)
+    assert (result["format"], result["created"]) == ("swagger", 1)
+
+    har = {"log": {"entries": [
+        {"request": {
+            "method": "POST", "url": "https://example.com/v1/orders?source=web",
+            "headers": [{"name": "Content-Type", "value": "application/json"}, {"name": "Cookie", "value": "sid=1"}],
+            "queryString": [{"name": "source", "value": "web"}],
+            "postData": {"mimeType": "application/json", "text": "{\"sku\": \"A1\", \"qty\": 2}"},
+        }},
+        {"request": {"method": "GET", "url": "https://example.com/v1/orders/1", "headers": []}},
+        {"request": {"method": "GET", "url": "https://example.com/v1/orders/1", "headers": []}},
+    ]}}
+    result = _import(client, auth_headers, project_id, "capture.har", json.dumps(har).encode())
+    assert result == {"format": "har", "total": 3, "created": 2, "updated": 0, "skipped": 1, "invalid": 0}
+
+    apis = {(a["method"], a["url_path"]): a for a in _list_apis(client, auth_headers, project_id)["items"]}
+    login = apis[("POST", "/v1/login")]["request_template"]
+    assert (login["body"], login["body_type"]) == ({"username": "admin", "password": ""}, "form")
+    order = apis[("POST", "/v1/orders")]["request_template"]
+    assert order["body"] == {"sku": "A1", "qty": 2}
+    assert order["query_params"] == {"source": "web"}
+    assert order["headers"] == {"Content-Type": "application/json"}
+
+def test_import_rejects_unknown_format(client: TestClient, auth_headers: dict, create_project: Callable) -> None:
+    project_id, _ = create_project("Bad Import")
+    res = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/apis/import",
+        headers=auth_headers,
+        files={"file": ("notes.json", b'{"hello": "world"}', "application/json")},
+    )
+    assert res.status_code == 400
+    assert "无法识别的文件格式" in res.json()["message"]
+
+    res = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/apis/import",
+        headers=auth_headers,
+        files={"file": ("broken.json", b"{not json", "application/json")},
+    )
+    assert res.status_code == 400
@@ -1,4 +1,7 @@
 from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app import crud
+from app.core.auth_cache import auth_cache
 from app.core.config import settings
 
 def test_create_user(client: TestClient) -> None:
@@ -45,3 +48,31 @@ def test_read_user_me(client: TestClient) -> None:
     content = response.json()
     assert content["code"] == 200
     assert content["data"]["username"] == "testuser"
+
+def test_cached_user_invalidated_on_update(client: TestClient, db: Session) -> None:
+    data = {
+        "username": "cacheuser",
+        "email": "cache@example.com",
+        "password": "cachepassword",
+        "display_name": "Cache User"
+    }
+    client.post(f"{settings.API_V1_STR}/login/register", json=data)
+    login_response = client.post(
+        f"{settings.API_V1_STR}/login/access-token",
+        data={"username": "cacheuser", "password": "cachepassword"},
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['data']['access_token']}"}
+
+    # 第二次请求命中认证缓存
+    hits_before = auth_cache.stats()["hits"]
+    for _ in range(2):
+        response = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+        assert response.json()["data"]["username"] == "cacheuser"
+    assert auth_cache.stats()["hits"] == hits_before + 1
+
+    # 停用用户后缓存立即失效
+    user = crud.crud_user.get_by_username(db, username="cacheuser")
+    user.is_active = False
+    db.commit()
+    response = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert response.status_code == 400
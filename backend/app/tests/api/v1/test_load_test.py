@@ -0,0 +1,166 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from app.core.config import settings
+
+@pytest.fixture
+def load_project(client: TestClient, auth_headers: dict, create_project: Callable) -> tuple:
+    """项目、环境，以及一个用例与一个接口: (项目ID, 环境ID, 用例ID, 接口ID)"""
+    project_id, env_id = create_project("Load Project")
+    case_id = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/test-cases/",
+        headers=auth_headers,
+        json={
+            "name": "压测用例",
+            "method": "GET",
+            "url": "/load",
+            "assertions": [{"source": "status_code", "operator": "eq", "value": 200}],
+        },
+    ).json()["data"]["id"]
+    api_id = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/apis/",
+        headers=auth_headers,
+        json={"project_id": project_id, "name": "压测接口", "method": "GET", "url_path": "/load/{id}",
+              "request_template": {"path_params": {"id": 7}}},
+    ).json()["data"]["id"]
+    return project_id, env_id, case_id, api_id
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    """每个请求耗时 0.2 秒的上游服务，记录同时处理的最大请求数"""
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(0.2)
+        with cls.lock:
+            cls.active -= 1
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def slow_upstream_url() -> Generator:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler, bind_and_activate=False)
+    # 默认的监听队列长度为 5，并发建连时会被拒绝后重试
+    server.request_queue_size = 64
+    server.server_bind()
+    server.server_activate()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _SlowHandler.peak = 0
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def _wait_for_load_test(client: TestClient, headers: dict, project_id: int, report_id: int, timeout: float = 15.0) -> dict:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        report = client.get(
+            f"{settings.API_V1_STR}/projects/{project_id}/load-tests/{report_id}", headers=headers
+        ).json()["data"]
+        if report["status"] != "RUNNING":
+            return report
+        time.sleep(0.1)
+    raise AssertionError(f"load test {report_id} did not finish in {timeout}s")
+
+def test_closed_and_open_load_tests(client: TestClient, auth_headers: dict, load_project: tuple) -> None:
+    project_id, env_id, case_id, api_id = load_project
+    url = f"{settings.API_V1_STR}/projects/{project_id}/load-tests/"
+
+    res = client.post(url, headers=auth_headers, json={
+        "target_type": "CASE", "target_id": case_id, "environment_id": env_id,
+        "mode": "closed", "concurrency": 2, "duration": 0.5,
+    })
+    assert res.status_code == 200
+    started = res.json()["data"]
+    assert started["status"] == "RUNNING"
+    assert started["name"] == "压测用例 压测"
+
+    report = _wait_for_load_test(client, auth_headers, project_id, started["id"])
+    assert report["status"] == "SUCCESS", report
+    assert report["total_requests"] > 0
+    assert report["error_count"] == 0
+    assert report["status_codes"] == {"200": report["total_requests"]}
+    assert report["histogram"]["count"] == report["total_requests"]
+    assert 0 < report["latency_p50"] <= report["latency_p99"] <= report["latency_max"]
+    assert report["throughput"] > 0
+    assert sum(bucket["requests"] for bucket in report["timeline"]) == report["total_requests"]
+
+    # 开环：1 秒内从 0 线性增长到 40 rps，共发送 20 个请求
+    res = client.post(url, headers=auth_headers, json={
+        "target_type": "API", "target_id": api_id, "environment_id": env_id,
+        "mode": "open", "rps": 40, "duration": 1, "ramp_up": 1,
+    })
+    report = _wait_for_load_test(client, auth_headers, project_id, res.json()["data"]["id"])
+    assert report["status"] == "SUCCESS", report
+    assert report["total_requests"] + report["dropped_count"] == 20
+    assert report["config"]["concurrency"] == settings.LOAD_TEST_MAX_CONCURRENCY
+
+    listed = client.get(url, headers=auth_headers).json()["data"]
+    assert len(listed) == 2
+    assert "histogram" not in listed[0]
+
+def test_stop_load_test(client: TestClient, auth_headers: dict, load_project: tuple) -> None:
+    project_id, env_id, case_id, api_id = load_project
+    url = f"{settings.API_V1_STR}/projects/{project_id}/load-tests/"
+    body = {"target_type": "API", "target_id": api_id, "environment_id": env_id, "concurrency": 1, "duration": 60}
+    report_id = client.post(url, headers=auth_headers, json=body).json()["data"]["id"]
+
+    # 同时只允许运行一个压测
+    assert client.post(url, headers=auth_headers, json=body).status_code == 409
+    assert client.delete(f"{url}{report_id}", headers=auth_headers).status_code == 400
+
+    assert client.post(f"{url}{report_id}/stop", headers=auth_headers).status_code == 200
+    report = _wait_for_load_test(client, auth_headers, project_id, report_id)
+    assert report["status"] == "STOPPED"
+    assert report["duration"] < 10
+
+    assert client.delete(f"{url}{report_id}", headers=auth_headers).status_code == 200
+    assert client.get(f"{url}{report_id}", headers=auth_headers).status_code == 404
+
+def test_load_test_validation(client: TestClient, auth_headers: dict, load_project: tuple) -> None:
+    project_id, env_id, case_id, api_id = load_project
+    url = f"{settings.API_V1_STR}/projects/{project_id}/load-tests/"
+    base = {"target_type": "CASE", "target_id": case_id, "environment_id": env_id, "duration": 1}
+
+    assert client.post(url, headers=auth_headers, json={**base, "mode": "closed"}).status_code == 400
+    assert client.post(url, headers=auth_headers, json={**base, "mode": "open"}).status_code == 400
+    assert client.post(url, headers=auth_headers, json={**base, "concurrency": 1, "target_id": 999999}).status_code == 404
+    too_long = {**base, "concurrency": 1, "duration": settings.LOAD_TEST_MAX_DURATION + 1}
+    assert client.post(url, headers=auth_headers, json=too_long).status_code == 400
+
+def test_load_test_reaches_configured_concurrency(
+    client: TestClient, auth_headers: dict, create_project: Callable, slow_upstream_url: str
+) -> None:
+    project_id, env_id = create_project("Slow Load Project", base_url=slow_upstream_url)
+    case_id = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/test-cases/",
+        headers=auth_headers,
+        json={"name": "慢接口", "method": "GET", "url": "/slow"},
+    ).json()["data"]["id"]
+    concurrency = settings.RUNNER_POOL_MAXSIZE * 2
+    res = client.post(f"{settings.API_V1_STR}/projects/{project_id}/load-tests/", headers=auth_headers, json={
+        "target_type": "CASE", "target_id": case_id, "environment_id": env_id,
+        "mode": "closed", "concurrency": concurrency, "duration": 0.6,
+    })
+    report = _wait_for_load_test(client, auth_headers, project_id, res.json()["data"]["id"])
+
+    # 压测使用专用客户端，并发不受全局客户端池的单主机连接数限制，也不因等待连接增加延迟
+    assert report["status"] == "SUCCESS", report
+    assert report["error_count"] == 0
+    assert _SlowHandler.peak == concurrency
+    assert report["latency_p50"] < 0.4
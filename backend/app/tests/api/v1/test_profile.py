@@ -0,0 +1,43 @@
+import json
+
+from fastapi.testclient import TestClient
+from app.core.config import settings
+
+def _login(client: TestClient, username: str, role: str) -> dict:
+    client.post(f"{settings.API_V1_STR}/users/", json={
+        "username": username, "password": "secret", "display_name": username, "role": role,
+    })
+    login_data = {"username": username, "password": "secret"}
+    token = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data).json()["data"]["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+def test_profile_requested_by_admin(client: TestClient) -> None:
+    admin = _login(client, "profile-admin", "ADMIN")
+    tester = _login(client, "profile-tester", "TESTER")
+    url = f"{settings.API_V1_STR}/profiles/"
+
+    # 非管理员的剖析标记被忽略，也不能查看剖析记录
+    assert client.get(f"{settings.API_V1_STR}/users/me", headers={**tester, "X-Profile": "1"}).status_code == 200
+    assert client.get(url, headers=tester).status_code == 403
+    before = len(client.get(url, headers=admin).json()["data"])
+
+    assert client.get(f"{settings.API_V1_STR}/users/me", headers={**admin, "X-Profile": "1"}).status_code == 200
+    assert client.get(f"{settings.API_V1_STR}/projects/?__profile=cprofile", headers=admin).status_code == 200
+    profiles = client.get(url, headers=admin).json()["data"]
+    assert len(profiles) == before + 2
+    cprofiled, sampled = profiles[0], profiles[1]
+
+    assert sampled["route"] == f"{settings.API_V1_STR}/users/me"
+    assert sampled["mode"] == "sampling" and sampled["trigger"] == "REQUESTED"
+    assert sampled["status_code"] == 200 and sampled["duration"] > 0
+    speedscope = json.loads(client.get(f"{url}{sampled['id']}/download", headers=admin).content)
+    assert speedscope["$schema"].startswith("https://www.speedscope.app")
+    assert speedscope["profiles"][0]["type"] == "sampled"
+
+    assert cprofiled["mode"] == "cprofile" and cprofiled["file_format"] == "pstats"
+    summary = client.get(f"{url}{cprofiled['id']}/download?summary=true", headers=admin)
+    assert "function calls" in summary.text
+    assert client.get(f"{url}{sampled['id']}/download?summary=true", headers=admin).status_code == 400
+
+    assert client.delete(f"{url}{sampled['id']}", headers=admin).status_code == 200
+    assert client.get(f"{url}{sampled['id']}/download", headers=admin).status_code == 404
@@ -1,5 +1,12 @@
+import io
+import json
+import zipfile
+
 from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app import models
 from app.core.config import settings
+from app.services.project_archive import import_project_archive
 
 def test_create_project(client: TestClient) -> None:
     # 1. 登录
@@ -34,8 +41,9 @@ def test_read_projects(client: TestClient) -> None:
     assert response.status_code == 200
     content = response.json()
     assert content["code"] == 200
-    assert isinstance(content["data"], list)
-    assert len(content["data"]) >= 1
+    assert isinstance(content["data"]["items"], list)
+    assert len(content["data"]["items"]) >= 1
+    assert content["data"]["total"] >= 1
 
 def test_create_environment(client: TestClient) -> None:
     login_data = {"username": "testuser", "password": "testpassword"}
@@ -45,7 +53,7 @@ def test_create_environment(client: TestClient) -> None:
 
     # 获取项目ID (假设 test_create_project 已执行)
     projects_res = client.get(f"{settings.API_V1_STR}/projects/", headers=headers)
-    project_id = projects_res.json()["data"][0]["id"]
+    project_id = projects_res.json()["data"]["items"][0]["id"]
 
     env_data = {
         "name": "Dev Env",
@@ -62,3 +70,151 @@ def test_create_environment(client: TestClient) -> None:
     assert content["code"] == 200
     assert content["data"]["name"] == env_data["name"]
     assert content["data"]["project_id"] == project_id
+
+def test_read_projects_keyset_pagination(client: TestClient) -> None:
+    login_data = {"username": "testuser", "password": "testpassword"}
+    login_res = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+    token = login_res.json()["data"]["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    for i in range(5):
+        client.post(f"{settings.API_V1_STR}/projects/", headers=headers, json={"name": f"Page Project {i}"})
+    total = client.get(f"{settings.API_V1_STR}/projects/", headers=headers).json()["data"]["total"]
+
+    # 按游标逐页读取，结果不重复、不遗漏
+    for order_by in ("id", "updated_at"):
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 2, "order_by": order_by}
+            if cursor:
+                params["cursor"] = cursor
+            page = client.get(f"{settings.API_V1_STR}/projects/", headers=headers, params=params).json()["data"]
+            assert page["total"] == total
+            assert page["has_prev"] == bool(cursor)
+            seen.extend(item["id"] for item in page["items"])
+            # updated_at 由应用按秒写入，游标中的时间与列精度一致
+            assert all("." not in item["updated_at"] for item in page["items"])
+            cursor = page["next_cursor"]
+            assert page["has_next"] == (cursor is not None)
+            if not cursor:
+                break
+        assert len(seen) == len(set(seen)) == total
+        if order_by == "id":
+            assert seen == sorted(seen)
+
+    # 新建项目后总数立即刷新
+    client.post(f"{settings.API_V1_STR}/projects/", headers=headers, json={"name": "Page Project new"})
+    assert client.get(f"{settings.API_V1_STR}/projects/", headers=headers).json()["data"]["total"] == total + 1
+
+    # 非法游标
+    response = client.get(f"{settings.API_V1_STR}/projects/", headers=headers, params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_export_and_import_project_archive(client: TestClient, db: Session) -> None:
+    login_data = {"username": "testuser", "password": "testpassword"}
+    login_res = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+    token = login_res.json()["data"]["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    project_id = client.post(f"{settings.API_V1_STR}/projects/", headers=headers,
+                             json={"name": "Archive Project", "description": "归档"}).json()["data"]["id"]
+    base = f"{settings.API_V1_STR}/projects/{project_id}"
+    client.post(f"{base}/environments/", headers=headers,
+                json={"name": "Staging", "code": "staging", "base_url": "http://staging", "headers": {"X-Env": "s"}})
+    api_ids = [
+        client.post(f"{base}/apis/", headers=headers, json={
+            "project_id": project_id, "name": f"接口{i}", "method": "POST", "url_path": f"/orders/{i}",
+            "request_template": {"body": {"index": i}, "headers": {"X-Index": str(i)}},
+        }).json()["data"]["id"]
+        for i in range(3)
+    ]
+    creates = [{"name": f"用例{i}", "method": "POST", "url": f"/orders/{i % 3}", "api_id": api_ids[i % 3],
+                "body": {"index": i}, "assertions": [{"source": "status_code", "operator": "eq", "value": 200}]}
+               for i in range(2500)]
+    creates.append({"name": "无接口", "method": "GET", "url": "/ping"})
+    assert client.post(f"{base}/test-cases/bulk", headers=headers, json={"create": creates}).status_code == 200
+
+    # 导出：流式 zip，每个表一个 JSONL 文件
+    with client.stream("GET", f"{base}/export", headers=headers) as res:
+        assert res.status_code == 200
+        assert res.headers["content-type"] == "application/zip"
+        chunks = list(res.iter_bytes())
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    manifest = json.loads(archive.read("manifest.json"))
+    assert manifest["version"] == 1 and manifest["project"]["name"] == "Archive Project"
+    lines = {name: archive.read(f"{name}.jsonl").decode().splitlines() for name in manifest["tables"]}
+    assert [len(lines[name]) for name in ("environment", "api", "api_request_template", "test_case")] == [1, 3, 3, 2501]
+
+    # 导入为新项目：ID 重映射，接口引用指向新项目中的接口
+    res = client.post(f"{settings.API_V1_STR}/projects/import", headers=headers, params={"name": "Archive Clone"},
+                      files={"file": ("project.zip", b"".join(chunks), "application/zip")})
+    assert res.status_code == 200, res.text
+    data = res.json()["data"]
+    clone_id = data["project"]["id"]
+    assert clone_id != project_id
+    assert (data["project"]["name"], data["project"]["description"]) == ("Archive Clone", "归档")
+    assert data["counts"] == {"environment": 1, "api": 3, "api_request_template": 3, "test_case": 2501}
+    assert [(e["code"], e["headers"]) for e in data["project"]["environments"]] == [("staging", {"X-Env": "s"})]
+
+    clone_base = f"{settings.API_V1_STR}/projects/{clone_id}"
+    apis = client.get(f"{clone_base}/apis/", headers=headers).json()["data"]["items"]
+    clone_api_ids = {a["url_path"]: a["id"] for a in apis}
+    assert len(clone_api_ids) == 3 and not set(clone_api_ids.values()) & set(api_ids)
+    assert {a["url_path"]: a["request_template"]["body"] for a in apis} == {f"/orders/{i}": {"index": i} for i in range(3)}
+    page = client.get(f"{clone_base}/test-cases/", headers=headers, params={"limit": 500}).json()["data"]
+    assert page["total"] == 2501
+    for case in page["items"]:
+        assert case["project_id"] == clone_id
+        assert case["api_id"] == (clone_api_ids[case["url"]] if case["url"] != "/ping" else None)
+
+    # 接口分多批插入时，每批的新 ID 按插入顺序查回，与归档中的原 ID 一一对应
+    batched = import_project_archive(db, io.BytesIO(b"".join(chunks)), owner_id=data["project"]["owner_id"],
+                                     name="Archive Batched", batch_size=2)
+    batched_id = batched["project"].id
+    templates = (
+        db.query(models.Api.url_path, models.ApiRequestTemplate.body)
+        .join(models.ApiRequestTemplate, models.ApiRequestTemplate.api_id == models.Api.id)
+        .filter(models.Api.project_id == batched_id)
+    )
+    assert {url_path: body for url_path, body in templates} == {f"/orders/{i}": {"index": i} for i in range(3)}
+    batched_cases = (
+        db.query(models.TestCase.url, models.Api.url_path)
+        .outerjoin(models.Api, models.Api.id == models.TestCase.api_id)
+        .filter(models.TestCase.project_id == batched_id)
+    )
+    assert all(url_path == (url if url != "/ping" else None) for url, url_path in batched_cases)
+
+    # 原项目不受影响
+    assert client.get(f"{base}/test-cases/", headers=headers).json()["data"]["total"] == 2501
+
+def test_import_project_archive_rejects_invalid_files(client: TestClient) -> None:
+    login_data = {"username": "testuser", "password": "testpassword"}
+    login_res = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+    token = login_res.json()["data"]["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    total = client.get(f"{settings.API_V1_STR}/projects/", headers=headers).json()["data"]["total"]
+
+    def _archive(manifest: dict, **tables: str) -> bytes:
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("manifest.json", json.dumps(manifest))
+            for name, content in tables.items():
+                archive.writestr(f"{name}.jsonl", content)
+        return buffer.getvalue()
+
+    manifest = {"version": 1, "project": {"name": "Broken"}}
+    for content in (
+        b"not a zip",
+        _archive({"version": 99, "project": {"name": "Future"}}),
+        _archive(manifest, api='{"id": 1, "name": "a", "method": "GET", "url_path": "/a"}\n{broken'),
+        # 缺少必填字段：已写入的环境与接口随事务回滚
+        _archive(manifest, environment='{"id": 1, "name": "dev", "code": "dev", "base_url": "http://dev"}',
+                 api='{"id": 1, "name": "a", "method": "GET"}'),
+    ):
+        res = client.post(f"{settings.API_V1_STR}/projects/import", headers=headers,
+                          files={"file": ("project.zip", content, "application/zip")})
+        assert res.status_code == 400
+        assert "项目归档格式错误" in res.json()["message"]
+    assert client.get(f"{settings.API_V1_STR}/projects/", headers=headers).json()["data"]["total"] == total
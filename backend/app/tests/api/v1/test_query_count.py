@@ -0,0 +1,45 @@
+from typing import Callable
+
+from fastapi.testclient import TestClient
+from app.core.config import settings
+
+# 列表接口每个请求最多执行的 SQL 语句数（认证 + 总数 + 列表 + 关联的预加载），与返回的行数无关
+LIST_QUERY_CAPS = {
+    "/projects/": 5,
+    "/projects/{project_id}/apis/": 5,
+    "/projects/{project_id}/test-cases/": 5,
+    "/projects/{project_id}/scenes/": 5,
+}
+
+def _query_count(client: TestClient, headers: dict, path: str) -> int:
+    res = client.get(f"{settings.API_V1_STR}{path}", headers=headers, params={"limit": 500})
+    assert res.status_code == 200
+    return int(res.headers["x-query-count"])
+
+def _add_rows(client: TestClient, headers: dict, project_id: int, n: int) -> None:
+    base = f"{settings.API_V1_STR}/projects/{project_id}"
+    for i in range(n):
+        client.post(f"{base}/environments/", headers=headers,
+                    json={"name": f"Env {i}", "code": f"env{i}", "base_url": "http://127.0.0.1"})
+        api_id = client.post(f"{base}/apis/", headers=headers, json={
+            "project_id": project_id, "name": f"接口{i}", "method": "GET", "url_path": f"/items/{i}",
+            "request_template": {"headers": {"X-Index": str(i)}},
+        }).json()["data"]["id"]
+        client.post(f"{base}/test-cases/", headers=headers,
+                    json={"name": f"用例{i}", "method": "GET", "url": f"/items/{i}", "api_id": api_id})
+        client.post(f"{base}/scenes/", headers=headers, json={
+            "name": f"场景{i}", "steps": [{"step_name": "请求", "order_index": 0, "ref_type": "API", "ref_id": api_id}],
+        })
+
+def test_list_endpoints_query_count_is_capped(client: TestClient, auth_headers: dict, create_project: Callable) -> None:
+    project_id, _ = create_project("Query Count Project")
+
+    _add_rows(client, auth_headers, project_id, 2)
+    few = {path: _query_count(client, auth_headers, path.format(project_id=project_id)) for path in LIST_QUERY_CAPS}
+    _add_rows(client, auth_headers, project_id, 8)
+    many = {path: _query_count(client, auth_headers, path.format(project_id=project_id)) for path in LIST_QUERY_CAPS}
+
+    for path, cap in LIST_QUERY_CAPS.items():
+        assert many[path] <= cap, f"{path} executed {many[path]} statements"
+        # 行数增加时语句数不增加（关联已预加载，没有逐行查询；总数与认证可能命中缓存）
+        assert many[path] <= few[path], f"{path}: {few[path]} -> {many[path]} statements"
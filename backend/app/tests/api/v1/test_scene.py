@@ -0,0 +1,164 @@
+from typing import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+from app.core.config import settings
+
+@pytest.fixture
+def scene_project(client: TestClient, auth_headers: dict, create_project: Callable) -> tuple:
+    """项目、环境，以及一个用例与一个接口: (项目ID, 环境ID, 用例ID, 接口ID)"""
+    project_id, env_id = create_project("Scene Project")
+    case_id = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/test-cases/",
+        headers=auth_headers,
+        json={"name": "登录", "method": "POST", "url": "/login", "body": {"user": "{{username}}"}},
+    ).json()["data"]["id"]
+    api_id = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/apis/",
+        headers=auth_headers,
+        json={
+            "project_id": project_id,
+            "name": "用户详情",
+            "method": "GET",
+            "url_path": "/users/{name}",
+            "request_template": {"path_params": {"name": "{{name}}"}, "headers": {"X-Token": "{{token}}"}},
+        },
+    ).json()["data"]["id"]
+    return project_id, env_id, case_id, api_id
+
+def test_scene_crud_and_run(client: TestClient, auth_headers: dict, scene_project: tuple) -> None:
+    project_id, env_id, case_id, api_id = scene_project
+
+    steps = [
+        {
+            "step_name": "登录",
+            "order_index": 1,
+            "ref_type": "CASE",
+            "ref_id": case_id,
+            "extracts": [
+                {"variable_name": "name", "source": "body", "expression": "$.data.items[0].name"},
+                {"variable_name": "token", "source": "header", "expression": "X-Test-Header"},
+            ],
+        },
+        {
+            "step_name": "查询用户",
+            "order_index": 2,
+            "ref_type": "API",
+            "ref_id": api_id,
+            "parallel": True,
+            "assertions": [{"source": "body", "expression": "$.path", "operator": "eq", "value": "/users/first"}],
+        },
+        {
+            "step_name": "查询用户-覆盖",
+            "order_index": 3,
+            "ref_type": "API",
+            "ref_id": api_id,
+            "parallel": True,
+            "request_override": {"url": "/users/{{name}}?page={{page}}"},
+            "assertions": [{"source": "body", "expression": "$.headers.X-Token", "operator": "eq", "value": "slow"}],
+        },
+    ]
+    res = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/scenes/",
+        headers=auth_headers,
+        json={"name": "登录后查询", "variables": {"username": "tom", "page": 1}, "steps": steps},
+    )
+    assert res.status_code == 200
+    scene = res.json()["data"]
+    assert [s["order_index"] for s in scene["steps"]] == [1, 2, 3]
+
+    listed = client.get(f"{settings.API_V1_STR}/projects/{project_id}/scenes/", headers=auth_headers).json()["data"]
+    assert [s["id"] for s in listed] == [scene["id"]]
+
+    run = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/scenes/{scene['id']}/run",
+        headers=auth_headers,
+        json={"environment_id": env_id, "include_body": True},
+    )
+    assert run.status_code == 200
+    outcome = run.json()["data"]
+    assert outcome["passed"] is True, outcome
+    assert outcome["variables"]["name"] == "first"
+    assert outcome["variables"]["token"] == "slow"
+    login, detail, override = outcome["steps"]
+    assert "tom" in login["result"]["body"]["body"]
+    assert detail["request"]["url"].endswith("/users/first")
+    assert override["request"]["url"].endswith("/users/first?page=1")
+
+    # 数据驱动：每行变量覆盖场景初始变量
+    batch = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/scenes/{scene['id']}/run",
+        headers=auth_headers,
+        json={"environment_id": env_id, "rows": [{"page": 2}, {"page": 3}], "concurrency": 2},
+    ).json()["data"]
+    assert batch["total"] == 2
+    assert batch["passed"] == 2
+    assert [row["index"] for row in batch["rows"]] == [0, 1]
+    assert batch["rows"][1]["steps"][2]["request"]["url"].endswith("page=3")
+    assert batch["rows"][0]["steps"][0]["result"]["body"] is None
+
+def test_scene_failure_skips_remaining_steps(client: TestClient, auth_headers: dict, scene_project: tuple) -> None:
+    project_id, env_id, case_id, api_id = scene_project
+    scene_id = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/scenes/",
+        headers=auth_headers,
+        json={
+            "name": "缺少变量",
+            "steps": [
+                {"step_name": "查询用户", "order_index": 1, "ref_type": "API", "ref_id": api_id},
+                {"step_name": "登录", "order_index": 2, "ref_type": "CASE", "ref_id": case_id},
+            ],
+        },
+    ).json()["data"]["id"]
+
+    outcome = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/scenes/{scene_id}/run",
+        headers=auth_headers,
+        json={"environment_id": env_id},
+    ).json()["data"]
+    assert outcome["passed"] is False
+    assert [s["status"] for s in outcome["steps"]] == ["FAILED", "SKIPPED"]
+    assert "未定义的变量" in outcome["steps"][0]["error"]
+
+def test_scene_validation(client: TestClient, auth_headers: dict, scene_project: tuple) -> None:
+    project_id, env_id, case_id, api_id = scene_project
+    url = f"{settings.API_V1_STR}/projects/{project_id}/scenes/"
+
+    bad_extract = client.post(url, headers=auth_headers, json={
+        "name": "非法提取",
+        "steps": [{
+            "step_name": "登录", "order_index": 1, "ref_type": "CASE", "ref_id": case_id,
+            "extracts": [{"variable_name": "x", "source": "body", "expression": "data.x"}],
+        }],
+    })
+    assert bad_extract.status_code == 400
+    assert "登录" in bad_extract.json()["message"]
+
+    missing_ref = client.post(url, headers=auth_headers, json={
+        "name": "引用不存在",
+        "steps": [{"step_name": "x", "order_index": 1, "ref_type": "API", "ref_id": 999999}],
+    })
+    assert missing_ref.status_code == 404
+
+def test_scene_run_with_deleted_ref(client: TestClient, auth_headers: dict, scene_project: tuple) -> None:
+    project_id, env_id, case_id, api_id = scene_project
+    scene_id = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/scenes/",
+        headers=auth_headers,
+        json={
+            "name": "引用已删除",
+            "steps": [
+                {"step_name": "登录", "order_index": 1, "ref_type": "CASE", "ref_id": case_id},
+                {"step_name": "查询用户", "order_index": 2, "ref_type": "API", "ref_id": api_id},
+            ],
+        },
+    ).json()["data"]["id"]
+    assert client.delete(f"{settings.API_V1_STR}/projects/{project_id}/apis/{api_id}", headers=auth_headers).status_code == 200
+
+    res = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/scenes/{scene_id}/run",
+        headers=auth_headers,
+        json={"environment_id": env_id},
+    )
+    assert res.status_code == 404
+    assert "查询用户" in res.json()["message"]
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+from typing import Callable
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.config import settings
+from app import models
+from app.services.scheduler import PlanScheduler
+
+def _create_plans(client: TestClient, headers: dict, create_project: Callable, count: int) -> tuple:
+    project_id, env_id = create_project("Schedule Project", base_url="http://127.0.0.1:9")
+    plan_ids = [
+        client.post(
+            f"{settings.API_V1_STR}/projects/{project_id}/plans/",
+            headers=headers,
+            json={"name": f"定时计划{i}", "environment_id": env_id, "test_case_ids": []},
+        ).json()["data"]["id"]
+        for i in range(count)
+    ]
+    return project_id, env_id, plan_ids
+
+def _create_schedule(client: TestClient, headers: dict, project_id: int, plan_id: int, **fields) -> dict:
+    res = client.post(f"{settings.API_V1_STR}/projects/{project_id}/plans/{plan_id}/schedules/", headers=headers, json=fields)
+    assert res.status_code == 200, res.text
+    return res.json()["data"]
+
+def _at(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+def test_schedule_crud(client: TestClient, auth_headers: dict, create_project: Callable) -> None:
+    project_id, _, (plan_id,) = _create_plans(client, auth_headers, create_project, 1)
+    base = f"{settings.API_V1_STR}/projects/{project_id}/plans/{plan_id}/schedules"
+
+    for body in ({"cron": "0 8 * *"}, {"cron": "0 8 30 2 *"}, {"cron": "0 8 * * *", "timezone": "Mars/Olympus"}):
+        res = client.post(f"{base}/", headers=auth_headers, json=body)
+        assert res.status_code == 400
+        assert "调度配置错误" in res.json()["message"]
+    assert client.post(f"{base}/", headers=auth_headers, json={"cron": "@daily", "environment_id": 999999}).status_code == 404
+
+    before = datetime.now()
+    schedule = _create_schedule(client, auth_headers, project_id, plan_id, name="早间回归", cron="0 8 * * *", jitter_seconds=120)
+    next_run_at, fire_at = _at(schedule["next_run_at"]), _at(schedule["fire_at"])
+    assert (next_run_at.hour, next_run_at.minute) == (8, 0)
+    assert before < next_run_at <= before + timedelta(days=1)
+    assert timedelta(0) <= fire_at - next_run_at <= timedelta(seconds=120)
+    assert schedule["coalesce"] is True and schedule["last_status"] is None
+
+    res = client.put(f"{base}/{schedule['id']}", headers=auth_headers, json={"cron": "30 9 * * *", "jitter_seconds": 0})
+    updated = res.json()["data"]
+    assert (_at(updated["next_run_at"]).hour, _at(updated["next_run_at"]).minute) == (9, 30)
+    assert updated["fire_at"] == updated["next_run_at"]
+    assert client.put(f"{base}/{schedule['id']}", headers=auth_headers, json={"cron": "bad"}).status_code == 400
+    assert client.put(f"{base}/{schedule['id']}", headers=auth_headers, json={"is_active": False}).json()["data"]["fire_at"] is None
+
+    assert [s["id"] for s in client.get(f"{base}/", headers=auth_headers).json()["data"]] == [schedule["id"]]
+    assert client.delete(f"{base}/{schedule['id']}", headers=auth_headers).status_code == 200
+    assert client.get(f"{base}/", headers=auth_headers).json()["data"] == []
+
+def test_scheduler_leader_misfire_and_coalesce(client: TestClient, db: Session, auth_headers: dict, create_project: Callable) -> None:
+    project_id, env_id, plan_ids = _create_plans(client, auth_headers, create_project, 4)
+    daily = _create_schedule(client, auth_headers, project_id, plan_ids[0], cron="0 8 * * *", jitter_seconds=0)
+    # 宽限期足够长：错过的触发不算 misfire，按 coalesce 决定补跑一次还是逐次补跑
+    catch_up = _create_schedule(client, auth_headers, project_id, plan_ids[1], cron="0 8 * * *", jitter_seconds=0,
+                                coalesce=False, misfire_grace_seconds=7 * 86400)
+    coalesced = _create_schedule(client, auth_headers, project_id, plan_ids[2], cron="0 8 * * *", jitter_seconds=0,
+                                 misfire_grace_seconds=7 * 86400)
+    busy = _create_schedule(client, auth_headers, project_id, plan_ids[3], cron="0 8 * * *", jitter_seconds=0)
+    t0 = _at(daily["next_run_at"])
+
+    session_factory = sessionmaker(bind=db.get_bind(), autoflush=False)
+    leader = PlanScheduler(session_factory, lock_ttl=600)
+    follower = PlanScheduler(session_factory, lock_ttl=600)
+    try:
+        # 只有持有租约的调度器触发；未到期时不触发
+        assert leader.tick(now=t0 - timedelta(minutes=1)) == 0
+        assert leader.is_leader
+        assert follower.tick(now=t0 + timedelta(seconds=5)) == 0
+        assert not follower.is_leader
+
+        # 上一次定时执行仍在进行的计划跳过本次触发
+        db.add(models.TestReport(project_id=project_id, plan_id=plan_ids[3], environment_id=env_id,
+                                 trigger_type="SCHEDULE", status="RUNNING", heartbeat_at=datetime.now()))
+        db.commit()
+
+        # 同一时刻到期的调度各触发一次，重复执行同一轮不会重复触发
+        assert leader.tick(now=t0 + timedelta(seconds=5)) == 3
+        assert leader.tick(now=t0 + timedelta(seconds=6)) == 0
+        db.expire_all()
+        state = {s.id: s for s in db.query(models.PlanSchedule).filter(models.PlanSchedule.project_id == project_id)}
+        assert state[daily["id"]].last_status == "DISPATCHED"
+        assert state[daily["id"]].next_run_at == t0 + timedelta(days=1)
+        assert state[busy["id"]].last_status == "SKIPPED"
+        report = db.get(models.TestReport, state[daily["id"]].last_report_id)
+        assert (report.trigger_type, report.plan_id) == ("SCHEDULE", plan_ids[0])
+
+        # 停机三天后恢复：超过宽限期的触发记为 misfire；宽限期内的按 coalesce 补跑
+        for report in db.query(models.TestReport).filter(models.TestReport.project_id == project_id):
+            report.status = "SUCCESS"
+        db.commit()
+        now = t0 + timedelta(days=3, hours=2)
+        assert leader.tick(now=now) == 4
+        db.expire_all()
+        state = {s.id: s for s in db.query(models.PlanSchedule).filter(models.PlanSchedule.project_id == project_id)}
+        assert (state[daily["id"]].last_status, state[daily["id"]].misfire_count) == ("MISFIRED", 3)
+        assert (state[catch_up["id"]].last_status, state[catch_up["id"]].run_count) == ("DISPATCHED", 4)
+        assert (state[coalesced["id"]].last_status, state[coalesced["id"]].run_count) == ("DISPATCHED", 2)
+        assert state[busy["id"]].misfire_count == 3
+        for schedule in state.values():
+            assert schedule.next_run_at == t0 + timedelta(days=4)
+        assert leader.stats()["misfired"] == 6
+
+        # 领导者停止后释放租约，其他调度器立即接管
+        leader.stop()
+        assert not leader.is_leader
+        assert follower.tick(now=now) == 0
+        assert follower.is_leader
+    finally:
+        leader.stop()
+        follower.stop()
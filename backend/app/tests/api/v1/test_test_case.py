@@ -0,0 +1,255 @@
+import json
+from typing import Callable
+
+from fastapi.testclient import TestClient
+from app.core.config import settings
+
+def _create_case(client: TestClient, headers: dict, project_id: int, name: str, assertions: list) -> int:
+    case_data = {
+        "name": name,
+        "method": "GET",
+        "url": "/items",
+        "assertions": assertions,
+    }
+    response = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/test-cases/",
+        headers=headers,
+        json=case_data,
+    )
+    assert response.status_code == 200
+    return response.json()["data"]["id"]
+
+def _read_sse(response) -> list:
+    """将 text/event-stream 响应解析为 [(事件类型, 数据)]"""
+    events = []
+    for block in response.text.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if line and not line.startswith(":"))
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+def test_run_test_case(client: TestClient, auth_headers: dict, create_project: Callable) -> None:
+    project_id, env_id = create_project("Run Project")
+    case_id = _create_case(client, auth_headers, project_id, "单用例执行", [
+        {"source": "status_code", "operator": "eq", "value": 200},
+        {"source": "body", "expression": "$.data.items[0].id", "operator": "eq", "value": 1},
+    ])
+
+    response = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/test-cases/{case_id}/run?environment_id={env_id}",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["code"] == 200
+    assert content["data"]["passed"] is True
+    assert content["data"]["result"]["status_code"] == 200
+
+def test_batch_run_test_cases(client: TestClient, auth_headers: dict, create_project: Callable) -> None:
+    project_id, env_id = create_project("Run Project")
+    passing = [{"source": "status_code", "operator": "eq", "value": 200}]
+    failing = [{"source": "status_code", "operator": "eq", "value": 500}]
+    case_ids = [
+        _create_case(client, auth_headers, project_id, f"批量用例{i}", failing if i == 0 else passing)
+        for i in range(5)
+    ]
+
+    response = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/test-cases/batch-run",
+        headers=auth_headers,
+        json={"environment_id": env_id, "concurrency": 3},
+    )
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["total"] == 5
+    assert data["passed"] == 4
+    assert data["failed"] == 1
+    assert [r["test_case_id"] for r in data["results"]] == case_ids
+    assert data["results"][1]["result"]["body"] is None
+
+    # 指定用例ID执行
+    response = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/test-cases/batch-run",
+        headers=auth_headers,
+        json={"environment_id": env_id, "test_case_ids": case_ids[1:3], "include_body": True},
+    )
+    data = response.json()["data"]
+    assert data["total"] == 2 and data["passed"] == 2
+    assert data["results"][0]["result"]["body"]["path"] == "/items"
+
+    # 不存在的用例ID
+    response = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/test-cases/batch-run",
+        headers=auth_headers,
+        json={"environment_id": env_id, "test_case_ids": [999999]},
+    )
+    assert response.status_code == 404
+
+def test_stream_batch_run(client: TestClient, auth_headers: dict, create_project: Callable) -> None:
+    project_id, env_id = create_project("Run Project")
+    passing = [{"source": "status_code", "operator": "eq", "value": 200}]
+    failing = [{"source": "status_code", "operator": "eq", "value": 500}]
+    case_ids = [
+        _create_case(client, auth_headers, project_id, f"推送用例{i}", failing if i == 0 else passing)
+        for i in range(4)
+    ]
+
+    response = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/test-cases/batch-run/stream",
+        headers=auth_headers,
+        json={"environment_id": env_id, "concurrency": 2},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _read_sse(response)
+    assert [name for name, _ in events] == ["start"] + ["result"] * 4 + ["done"]
+    assert events[0][1] == {"total": 4}
+    results = [data for name, data in events if name == "result"]
+    assert sorted(r["test_case_id"] for r in results) == case_ids
+    assert [r["counters"]["completed"] for r in results] == [1, 2, 3, 4]
+    assert results[-1]["counters"]["passed"] == 3
+    assert all(r["result"]["body"] is None for r in results)
+    assert events[-1][1]["passed"] == 3 and events[-1][1]["failed"] == 1
+
+def test_create_test_case_rejects_invalid_assertions(client: TestClient, auth_headers: dict) -> None:
+    projects_res = client.get(f"{settings.API_V1_STR}/projects/", headers=auth_headers)
+    project_id = projects_res.json()["data"]["items"][0]["id"]
+    case_data = {
+        "name": "非法断言",
+        "method": "GET",
+        "url": "/items",
+        "assertions": [{"source": "status_code", "operator": "equals", "value": 200}],
+    }
+    response = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/test-cases/",
+        headers=auth_headers,
+        json=case_data,
+    )
+    assert response.status_code == 400
+    assert "equals" in response.json()["message"]
+
+def test_dataset_run(client: TestClient, auth_headers: dict, create_project: Callable) -> None:
+    project_id, env_id = create_project("Run Project")
+    case_res = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/test-cases/",
+        headers=auth_headers,
+        json={
+            "name": "数据驱动",
+            "method": "GET",
+            "url": "/items/{{item_id}}",
+            "params": {"q": "{{keyword}}"},
+            "assertions": [{"source": "body", "expression": "$.path", "operator": "eq", "value": "{{expected}}"}],
+        },
+    )
+    case_id = case_res.json()["data"]["id"]
+    base = f"{settings.API_V1_STR}/projects/{project_id}/test-cases/{case_id}/dataset"
+
+    rows = ["item_id,keyword,expected"]
+    rows += [f"{i},k{i},/items/{i}?q=k{i}" for i in range(30)]
+    rows.append("99,k99,/wrong")
+    upload = client.post(base, headers=auth_headers, files={"file": ("rows.csv", "\n".join(rows) + "\n", "text/csv")})
+    assert upload.status_code == 200
+    dataset = upload.json()["data"]
+    assert dataset["row_count"] == 31
+    assert dataset["columns"] == ["item_id", "keyword", "expected"]
+
+    summary = client.post(f"{base}/run", headers=auth_headers, json={"environment_id": env_id, "concurrency": 4}).json()["data"]
+    assert summary["total"] == 31
+    assert summary["passed"] == 30
+    assert summary["errors"] == 0
+    assert [f["index"] for f in summary["failures"]] == [30]
+    assert summary["failures"][0]["row"]["item_id"] == "99"
+
+    # JSONL 保留值类型，重复上传时替换原数据集
+    lines = [json.dumps({"item_id": i, "keyword": "x", "expected": f"/items/{i}?q=x"}) for i in range(3)]
+    lines.append(json.dumps({"item_id": 5}))  # 缺少列：渲染失败
+    upload = client.post(base, headers=auth_headers, files={"file": ("rows.jsonl", "\n".join(lines), "application/json")})
+    assert upload.json()["data"]["file_format"] == "jsonl"
+
+    response = client.post(f"{base}/run/stream", headers=auth_headers, json={"environment_id": env_id})
+    events = _read_sse(response)
+    assert [name for name, _ in events] == ["start"] + ["result"] * 4 + ["done"]
+    assert events[0][1] == {"total": 4}
+    assert events[-1][1]["passed"] == 3
+    assert events[-1][1]["errors"] == 1
+    failed = [data for name, data in events if name == "result" and not data["passed"]]
+    assert "未定义的变量" in failed[0]["error"]
+
+    bad = client.post(base, headers=auth_headers, files={"file": ("rows.jsonl", "[1, 2]\n", "application/json")})
+    assert bad.status_code == 400
+    assert "第 1 行" in bad.json()["message"]
+    assert client.get(base, headers=auth_headers).json()["data"]["row_count"] == 4
+
+    assert client.delete(base, headers=auth_headers).status_code == 200
+    assert client.get(base, headers=auth_headers).status_code == 404
+
+def test_bulk_write_test_cases(client: TestClient, auth_headers: dict, create_project: Callable) -> None:
+    project_id, _ = create_project("Run Project")
+    base = f"{settings.API_V1_STR}/projects/{project_id}/test-cases"
+    kept_id = _create_case(client, auth_headers, project_id, "保留", [])
+    removed_id = _create_case(client, auth_headers, project_id, "删除", [])
+    client.post(f"{base}/{removed_id}/dataset", headers=auth_headers, files={"file": ("rows.csv", b"id\n1\n", "text/csv")})
+
+    creates = [{"name": f"批量{i}", "method": "GET", "url": f"/items/{i}",
+                "assertions": [{"source": "status_code", "operator": "eq", "value": 200}]} for i in range(1500)]
+    res = client.post(f"{base}/bulk", headers=auth_headers, json={
+        "create": creates,
+        "update": [{"id": kept_id, "name": "已更新", "assertions": [{"source": "status_code", "operator": "eq", "value": 201}]}],
+        "delete": [removed_id],
+    })
+    assert res.status_code == 200, res.text
+    data = res.json()["data"]
+    assert data["committed"] is True
+    assert (data["created"], data["updated"], data["deleted"], data["failed"]) == (1500, 1, 1, 0)
+    created_ids = [item["id"] for item in data["items"] if item["op"] == "create"]
+    assert len(set(created_ids)) == 1500
+
+    case = client.get(f"{base}/{created_ids[42]}", headers=auth_headers).json()["data"]
+    assert (case["name"], case["url"]) == ("批量42", "/items/42")
+    assert client.get(f"{base}/{kept_id}", headers=auth_headers).json()["data"]["name"] == "已更新"
+    assert client.get(f"{base}/{removed_id}", headers=auth_headers).status_code == 404
+    assert client.get(f"{base}/", headers=auth_headers).json()["data"]["total"] == 1501
+
+def test_bulk_write_is_all_or_nothing(client: TestClient, auth_headers: dict, create_project: Callable) -> None:
+    project_id, _ = create_project("Run Project")
+    base = f"{settings.API_V1_STR}/projects/{project_id}/test-cases"
+    case_id = _create_case(client, auth_headers, project_id, "原始", [])
+
+    res = client.post(f"{base}/bulk", headers=auth_headers, json={
+        "create": [
+            {"name": "合法", "method": "GET", "url": "/ok"},
+            {"name": "断言非法", "method": "GET", "url": "/bad", "assertions": [{"source": "status_code", "operator": "nope", "value": 1}]},
+            {"name": "接口不存在", "method": "GET", "url": "/bad", "api_id": 999999},
+        ],
+        "update": [{"id": case_id, "name": "不应写入"}, {"id": 999999, "name": "不存在"}],
+        "delete": [case_id],
+    })
+    assert res.status_code == 400
+    data = res.json()["data"]
+    assert data["committed"] is False
+    statuses = [(item["op"], item["index"], item["status"]) for item in data["items"]]
+    assert statuses == [
+        ("create", 0, "not_applied"), ("create", 1, "error"), ("create", 2, "error"),
+        ("update", 0, "not_applied"), ("update", 1, "error"), ("delete", 0, "error"),
+    ]
+    assert "断言配置错误" in data["items"][1]["error"]
+    assert data["items"][5]["error"] == "同一用例在批量操作中重复出现"
+    # 没有写入任何数据
+    assert client.get(f"{base}/{case_id}", headers=auth_headers).json()["data"]["name"] == "原始"
+    assert client.get(f"{base}/", headers=auth_headers).json()["data"]["total"] == 1
+
+def test_bulk_write_rejects_null_required_fields(client: TestClient, auth_headers: dict, create_project: Callable) -> None:
+    project_id, _ = create_project("Run Project")
+    base = f"{settings.API_V1_STR}/projects/{project_id}/test-cases"
+    first_id = _create_case(client, auth_headers, project_id, "第一", [])
+    second_id = _create_case(client, auth_headers, project_id, "第二", [])
+
+    res = client.post(f"{base}/bulk", headers=auth_headers, json={
+        "update": [{"id": first_id, "name": None, "body_type": None}, {"id": second_id, "api_id": None}],
+    })
+    assert res.status_code == 400
+    items = res.json()["data"]["items"]
+    assert items[0]["status"] == "error" and items[0]["error"] == "字段不能为空: name, body_type"
+    # api_id 可为空（取消关联接口），不是错误
+    assert items[1]["status"] == "not_applied"
+    assert client.get(f"{base}/{first_id}", headers=auth_headers).json()["data"]["name"] == "第一"
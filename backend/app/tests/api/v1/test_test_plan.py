@@ -0,0 +1,283 @@
+import time
+from datetime import datetime
+from typing import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import exc
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app import crud, models
+from app.services.plan_runner import _finish, execute_report
+from app.services.result_writer import ReportOwnershipLost, ResultWriter, result_writer_stats
+from app.utils.histogram import LatencyHistogram
+
+def _wait_for_report(client: TestClient, headers: dict, project_id: int, report_id: int, timeout: float = 10.0) -> dict:
+    # 轮询报告直到任务结束
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        report = client.get(f"{settings.API_V1_STR}/projects/{project_id}/reports/{report_id}", headers=headers).json()["data"]
+        if report["status"] not in ("PENDING", "RUNNING"):
+            return report
+        time.sleep(0.1)
+    raise AssertionError(f"report {report_id} did not finish in {timeout}s")
+
+def test_run_test_plan(client: TestClient, auth_headers: dict, create_project: Callable) -> None:
+    project_id, env_id = create_project("Plan Project")
+    for i in range(3):
+        client.post(
+            f"{settings.API_V1_STR}/projects/{project_id}/test-cases/",
+            headers=auth_headers,
+            json={
+                "name": f"计划用例{i}",
+                "method": "GET",
+                "url": f"/plan/{i}",
+                "assertions": [{"source": "status_code", "operator": "eq", "value": 200 if i else 404}],
+            },
+        )
+
+    plan_res = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/plans/",
+        headers=auth_headers,
+        json={"name": "夜间回归", "environment_id": env_id, "concurrency": 2},
+    )
+    assert plan_res.status_code == 200
+    plan_id = plan_res.json()["data"]["id"]
+
+    run_res = client.post(f"{settings.API_V1_STR}/projects/{project_id}/plans/{plan_id}/run", headers=auth_headers)
+    assert run_res.status_code == 200
+    job = run_res.json()["data"]
+    assert job["status"] == "PENDING"
+
+    report = _wait_for_report(client, auth_headers, project_id, job["job_id"])
+    assert report["status"] == "FAILED"
+    assert report["total_count"] == 3
+    assert report["passed_count"] == 2
+    assert report["failed_count"] == 1
+    assert report["finished_at"] is not None
+
+    results = client.get(
+        f"{settings.API_V1_STR}/projects/{project_id}/reports/{job['job_id']}/results?passed=false",
+        headers=auth_headers,
+    ).json()["data"]
+    assert len(results) == 1
+    assert results[0]["status_code"] == 200
+    assert results[0]["request_snapshot"]["url"].endswith("/plan/0")
+
+    # 报告已结束：进度推送先补发全部结果，再发送 done
+    events = client.get(
+        f"{settings.API_V1_STR}/projects/{project_id}/reports/{job['job_id']}/events", headers=auth_headers
+    ).text
+    assert events.count("event: result") == 3
+    assert events.rstrip().split("\n")[-2] == "event: done"
+
+    # 通过 Last-Event-ID 断线续传，只推送之后的结果
+    all_results = client.get(
+        f"{settings.API_V1_STR}/projects/{project_id}/reports/{job['job_id']}/results", headers=auth_headers
+    ).json()["data"]
+    events = client.get(
+        f"{settings.API_V1_STR}/projects/{project_id}/reports/{job['job_id']}/events",
+        headers={**auth_headers, "Last-Event-ID": str(all_results[1]["id"])},
+    ).text
+    assert events.count("event: result") == 1
+    assert f"id: {all_results[2]['id']}" in events
+
+def test_resume_report_skips_finished_cases(client: TestClient, db: Session, auth_headers: dict, create_project: Callable) -> None:
+    project_id, env_id = create_project("Resume Project")
+    case_ids = [
+        client.post(
+            f"{settings.API_V1_STR}/projects/{project_id}/test-cases/",
+            headers=auth_headers,
+            json={"name": f"续跑用例{i}", "method": "GET", "url": f"/resume/{i}"},
+        ).json()["data"]["id"]
+        for i in range(4)
+    ]
+    plan_id = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/plans/",
+        headers=auth_headers,
+        json={"name": "续跑", "environment_id": env_id},
+    ).json()["data"]["id"]
+
+    # 模拟执行中断的任务：已确认写入一条结果，状态仍为 RUNNING（后台队列不会领取）
+    report = models.TestReport(
+        project_id=project_id, plan_id=plan_id, environment_id=env_id,
+        status="RUNNING", started_at=datetime.now(), heartbeat_at=datetime.now(),
+        passed_count=1,
+    )
+    db.add(report)
+    db.flush()
+    db.add(models.TestResult(report_id=report.id, test_case_id=case_ids[0], name="续跑用例0", passed=True, status_code=200))
+    db.commit()
+
+    flushes_before = result_writer_stats.stats()["flushes"]
+    execute_report(db, report.id)
+    db.refresh(report)
+
+    assert report.status == "SUCCESS"
+    assert report.total_count == 4
+    assert report.passed_count == 4
+    results = db.query(models.TestResult).filter(models.TestResult.report_id == report.id).all()
+    assert sorted(r.test_case_id for r in results) == sorted(case_ids)
+    assert result_writer_stats.stats()["flushes"] > flushes_before
+
+def test_writer_stops_after_report_is_claimed_by_another_worker(client: TestClient, db: Session, auth_headers: dict, create_project: Callable) -> None:
+    project_id, env_id = create_project("Ownership Project")
+    case_id = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/test-cases/",
+        headers=auth_headers,
+        json={"name": "领取用例", "method": "GET", "url": "/owned"},
+    ).json()["data"]["id"]
+    plan_id = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/plans/",
+        headers=auth_headers,
+        json={"name": "领取", "environment_id": env_id},
+    ).json()["data"]["id"]
+    report = models.TestReport(
+        project_id=project_id, plan_id=plan_id, environment_id=env_id,
+        status="RUNNING", started_at=datetime.now(), heartbeat_at=datetime.now(), worker_id="old",
+    )
+    db.add(report)
+    db.commit()
+    writer = ResultWriter(db, report, batch_size=10)
+
+    # 任务超时后被重新入队并由另一进程领取
+    db.query(models.TestReport).filter(models.TestReport.id == report.id).update({"worker_id": "new"})
+    db.commit()
+
+    writer.add({
+        "report_id": report.id, "test_case_id": case_id, "name": "领取用例", "passed": True,
+        "status_code": 200, "duration": 0.01, "error": None, "assertions": [],
+    })
+    with pytest.raises(ReportOwnershipLost):
+        writer.flush()
+    assert writer.lost
+    assert db.query(models.TestResult).filter(models.TestResult.report_id == report.id).count() == 0
+    db.refresh(report)
+    assert report.worker_id == "new"
+    assert report.passed_count == 0
+
+    # 原进程也不会写入最终状态
+    _finish(db, report, "SUCCESS", worker_id="old")
+    db.refresh(report)
+    assert report.status == "RUNNING"
+
+def test_finish_retries_rollup_after_deadlock(client: TestClient, db: Session, auth_headers: dict, create_project: Callable, monkeypatch) -> None:
+    project_id, env_id = create_project("Deadlock Project")
+    case_id = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/test-cases/",
+        headers=auth_headers,
+        json={"name": "死锁用例", "method": "GET", "url": "/deadlock"},
+    ).json()["data"]["id"]
+    plan_id = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/plans/",
+        headers=auth_headers,
+        json={"name": "死锁", "environment_id": env_id},
+    ).json()["data"]["id"]
+
+    def running_report() -> models.TestReport:
+        report = models.TestReport(
+            project_id=project_id, plan_id=plan_id, environment_id=env_id,
+            status="RUNNING", started_at=datetime.now(), heartbeat_at=datetime.now(), passed_count=1,
+        )
+        db.add(report)
+        db.flush()
+        db.add(models.TestResult(report_id=report.id, test_case_id=case_id, name="死锁用例", passed=True, status_code=200, duration=0.01))
+        db.commit()
+        return report
+
+    summarize = crud.crud_report_stats.summarize_report
+    calls = []
+
+    def deadlock_once(db_: Session, report_: models.TestReport) -> bool:
+        calls.append(report_.id)
+        if len(calls) == 1:
+            # MySQL 在间隙锁上死锁时以 OperationalError（1213）抛出
+            raise exc.OperationalError("SELECT ... FOR UPDATE", {}, Exception("(1213, 'Deadlock found')"))
+        return summarize(db_, report_)
+
+    monkeypatch.setattr(crud.crud_report_stats, "summarize_report", deadlock_once)
+    report = running_report()
+    _finish(db, report, "SUCCESS")
+    db.refresh(report)
+    assert len(calls) == 2
+    assert report.status == "SUCCESS"
+    assert report.rolled_up_at is not None and report.pass_rate == 1.0
+
+    # 多次重试仍失败：报告状态照常写入，rolled_up_at 保持为空，之后可补合并
+    def always_deadlock(db_: Session, report_: models.TestReport) -> bool:
+        raise exc.OperationalError("SELECT ... FOR UPDATE", {}, Exception("(1213, 'Deadlock found')"))
+
+    monkeypatch.setattr(crud.crud_report_stats, "summarize_report", always_deadlock)
+    report = running_report()
+    _finish(db, report, "SUCCESS")
+    db.refresh(report)
+    assert report.status == "SUCCESS"
+    assert report.rolled_up_at is None
+    assert summarize(db, report) is True
+    db.commit()
+    assert report.rolled_up_at is not None
+
+def test_report_summary_and_trends(client: TestClient, db: Session, auth_headers: dict, create_project: Callable) -> None:
+    project_id, env_id = create_project("Trend Project")
+    api_id = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/apis/",
+        headers=auth_headers,
+        json={"project_id": project_id, "name": "趋势接口", "method": "GET", "url_path": "/trend", "module_name": "订单"},
+    ).json()["data"]["id"]
+    case_ids = [
+        client.post(
+            f"{settings.API_V1_STR}/projects/{project_id}/test-cases/",
+            headers=auth_headers,
+            json={
+                "name": f"趋势用例{i}",
+                "method": "GET",
+                "url": f"/trend/{i}",
+                "api_id": api_id if i < 2 else None,
+                "assertions": [{"source": "status_code", "operator": "eq", "value": 404 if i == 0 else 200}],
+            },
+        ).json()["data"]["id"]
+        for i in range(3)
+    ]
+    plan_id = client.post(
+        f"{settings.API_V1_STR}/projects/{project_id}/plans/",
+        headers=auth_headers,
+        json={"name": "趋势计划", "environment_id": env_id},
+    ).json()["data"]["id"]
+
+    for _ in range(2):
+        job = client.post(f"{settings.API_V1_STR}/projects/{project_id}/plans/{plan_id}/run", headers=auth_headers).json()["data"]
+        report = _wait_for_report(client, auth_headers, project_id, job["job_id"])
+        # 报告结束时物化通过率与耗时分位数
+        assert abs(report["pass_rate"] - 2 / 3) < 1e-9
+        assert 0 < report["p50_duration"] <= report["p95_duration"]
+
+    base = f"{settings.API_V1_STR}/projects/{project_id}/reports/trends"
+    points = client.get(base, headers=auth_headers).json()["data"]
+    assert len(points) == 1
+    today = points[0]
+    assert today["day"] == datetime.now().date().isoformat()
+    assert (today["report_count"], today["runs"], today["passed"], today["failed"]) == (2, 6, 4, 2)
+    assert abs(today["pass_rate"] - 2 / 3) < 1e-9
+    assert today["p50_duration"] <= today["p95_duration"]
+
+    module = client.get(base, headers=auth_headers, params={"scope": "module", "key": "订单"}).json()["data"]
+    assert (module[0]["runs"], module[0]["passed"]) == (4, 2)
+    assert client.get(base, headers=auth_headers, params={"scope": "case"}).status_code == 400
+
+    breakdown = client.get(f"{base}/breakdown", headers=auth_headers, params={"order_by": "failed"}).json()["data"]
+    assert [item["scope_key"] for item in breakdown][0] == str(case_ids[0])
+    assert (breakdown[0]["name"], breakdown[0]["failed"], breakdown[0]["pass_rate"]) == ("趋势用例0", 2, 0.0)
+    assert {item["scope_key"] for item in breakdown} == {str(case_id) for case_id in case_ids}
+
+    # 汇总行保存可合并的耗时直方图，包含两次执行的全部结果
+    daily = db.query(models.TestResultDaily).filter(
+        models.TestResultDaily.project_id == project_id, models.TestResultDaily.scope == "project"
+    ).one()
+    assert LatencyHistogram.from_dict(daily.duration_histogram).count == 6
+
+    # 同一报告不会重复合并
+    report = db.get(models.TestReport, job["job_id"])
+    assert crud.crud_report_stats.summarize_report(db, report) is False
+    db.rollback()
+    points = client.get(base, headers=auth_headers).json()["data"]
+    assert points[0]["runs"] == 6
@@ -1,32 +1,61 @@
-from typing import Generator
+import json
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Generator, Optional, Tuple
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
 from app.main import app
-from app.core.database import Base, get_db
+from app.core.database import Base, async_database_url, get_async_db, get_db
 from app.core.config import settings
+from app.services.job_queue import job_worker
+from app.services.load_test import load_test_manager
+from app.services.request_profiling import profiling_manager
+from app.services.scheduler import plan_scheduler
 
-# 使用 SQLite 内存数据库进行测试
+# 使用 SQLite 临时文件数据库进行测试（计划执行任务在后台线程中使用独立连接访问同一数据库）
 # 注意：生产环境是 MySQL，如果用到 MySQL 特有功能，这里需要改为测试用的 MySQL 数据库
-SQLALCHEMY_DATABASE_URL = "sqlite://"
+TEST_DB_DIR = tempfile.mkdtemp(prefix="slow-platform-test-")
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{os.path.join(TEST_DB_DIR, 'test.db')}"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# async 接口使用的异步引擎（aiosqlite）访问同一个数据库文件
+# 每个测试模块的 TestClient 使用各自的事件循环，不复用连接（NullPool），避免连接跨事件循环
+async_engine = create_async_engine(async_database_url(SQLALCHEMY_DATABASE_URL), poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# 数据集文件写入临时目录，随测试数据库一起清理
+settings.DATASET_DIR = os.path.join(TEST_DB_DIR, "datasets")
+settings.PROFILING_DIR = os.path.join(TEST_DB_DIR, "profiles")
+
+# 计划执行任务队列、定时调度与压测同样使用测试数据库
+job_worker.session_factory = TestingSessionLocal
+job_worker.poll_interval = 0.2
+load_test_manager.session_factory = TestingSessionLocal
+profiling_manager.session_factory = TestingSessionLocal
+plan_scheduler.session_factory = TestingSessionLocal
+
 @pytest.fixture(scope="session")
 def db() -> Generator:
     # 创建表结构
     Base.metadata.create_all(bind=engine)
     yield TestingSessionLocal()
-    # 清理表结构
+    # 清理表结构与临时数据库文件
     Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+    shutil.rmtree(TEST_DB_DIR, ignore_errors=True)
 
 @pytest.fixture(scope="module")
 def client(db) -> Generator:
@@ -39,6 +68,77 @@ def client(db) -> Generator:
         finally:
             db.close()
     
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as c:
         yield c
+
+@pytest.fixture(scope="module")
+def auth_headers(client: TestClient) -> dict:
+    # 接口测试使用的登录用户（不依赖 test_auth 中注册的用户，已存在时创建失败可忽略）
+    client.post(f"{settings.API_V1_STR}/users/", json={
+        "username": "api-tester", "password": "secret", "display_name": "api-tester", "role": "TESTER",
+    })
+    login_data = {"username": "api-tester", "password": "secret"}
+    login_res = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+    token = login_res.json()["data"]["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+@pytest.fixture(scope="module")
+def create_project(client: TestClient, auth_headers: dict, upstream_url: str) -> Callable[..., Tuple[int, int]]:
+    """
+    创建项目及其执行环境，返回 (项目ID, 环境ID)
+    - base_url: 环境地址，默认为测试上游服务
+    """
+    def factory(name: str = "Test Project", base_url: Optional[str] = None) -> Tuple[int, int]:
+        project_id = client.post(
+            f"{settings.API_V1_STR}/projects/", headers=auth_headers, json={"name": name}
+        ).json()["data"]["id"]
+        env_id = client.post(
+            f"{settings.API_V1_STR}/projects/{project_id}/environments/",
+            headers=auth_headers,
+            json={"name": "Local", "code": "local", "base_url": base_url or upstream_url},
+        ).json()["data"]["id"]
+        return project_id, env_id
+
+    return factory
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    """测试用上游服务：返回 JSON，包含请求方法、路径与请求头"""
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        payload = json.dumps({
+            "method": self.command,
+            "path": self.path,
+            "headers": dict(self.headers),
+            "body": raw.decode("utf-8", errors="replace"),
+            "data": {"items": [{"id": 1, "name": "first"}, {"id": 2, "name": "second"}]},
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("X-Test-Header", "slow")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture(scope="session")
+def upstream_url() -> Generator:
+    # 启动本地 HTTP 服务，作为执行引擎的请求目标
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,81 @@
+import pytest
+
+from app.core.assertions import (
+    AssertionCompileError,
+    AssertionPlanCache,
+    check_assertions,
+    compile_assertions,
+)
+
+RESPONSE = {
+    "status_code": 200,
+    "headers": {"Content-Type": "application/json", "X-Count": "42"},
+    "body": {"data": {"items": [{"id": 1, "name": "first"}]}},
+    "duration": 0.25,
+    "timings": {"total": 0.25, "dns": 0.0, "connect": 0.01, "tls": 0.0, "ttfb": 0.2, "download": 0.04},
+}
+
+def test_check_assertions_results() -> None:
+    assertions = [
+        {"source": "status_code", "operator": "eq", "value": 200},
+        {"source": "header", "expression": "x-count", "operator": "eq", "value": 42},
+        {"source": "header", "expression": "content-type", "operator": "contains", "value": "json"},
+        {"source": "body", "expression": "$.data.items[0].name", "operator": "eq", "value": "first"},
+        {"source": "response_time", "operator": "lt", "value": 1},
+        {"source": "response_time", "operator": "gt", "value": "1"},
+    ]
+    results = check_assertions(RESPONSE, assertions)
+    assert [r["passed"] for r in results] == [True, True, True, True, True, False]
+    # 数字字符串按整数比较，实际值以转换后的形式返回
+    assert results[1]["actual_value"] == 42
+    assert results[0]["source"] == "status_code"
+    assert all(r["error"] is None for r in results)
+
+def test_check_assertions_keeps_legacy_runtime_errors() -> None:
+    results = check_assertions(RESPONSE, [
+        {"source": "status_code", "operator": "ne", "value": 200},
+        {"source": "body", "expression": "$.data.missing", "operator": "gt", "value": 1},
+    ])
+    assert results[0]["passed"] is False
+    assert results[0]["actual_value"] == 200
+    assert results[0]["error"] == "Unknown operator: ne"
+    # 实际值为 None 时数值比较失败
+    assert results[1]["passed"] is False and results[1]["error"]
+
+@pytest.mark.parametrize("assertion", [
+    {"source": "status_code", "operator": "ne", "value": 200},
+    {"source": "cookie", "operator": "eq", "value": 1},
+    {"source": "header", "operator": "eq", "value": 1},
+    {"source": "body", "expression": "data.id", "operator": "eq", "value": 1},
+    {"source": "response_time", "operator": "lt", "value": "fast"},
+    {"source": "response_time", "expression": "parse", "operator": "lt", "value": 1},
+])
+def test_compile_assertions_strict_rejects(assertion: dict) -> None:
+    with pytest.raises(AssertionCompileError):
+        compile_assertions([assertion])
+
+def test_response_time_phase_assertions() -> None:
+    plan = compile_assertions([
+        {"source": "response_time", "expression": "ttfb", "operator": "gt", "value": 0.1},
+        {"source": "response_time", "expression": "download", "operator": "lt", "value": 0.1},
+        {"source": "response_time", "expression": "total", "operator": "lt", "value": 0.2},
+    ])
+    assert plan.needs_body is False
+    assert [r["passed"] for r in plan.evaluate(RESPONSE)] == [True, True, False]
+
+    # 解码耗时需要先解码响应体；未解码时取不到值，断言失败
+    decode = compile_assertions([{"source": "response_time", "expression": "json_decode", "operator": "lt", "value": 1}])
+    assert decode.needs_body is True
+    assert decode.evaluate(RESPONSE)[0]["passed"] is False
+
+    # 历史数据中无效的阶段名仍按总耗时断言
+    legacy = check_assertions(RESPONSE, [{"source": "response_time", "expression": "x", "operator": "lt", "value": 1}])
+    assert legacy[0]["passed"] is True and legacy[0]["actual_value"] == 0.25
+
+def test_plan_cache_invalidated_on_updated_at() -> None:
+    cache = AssertionPlanCache(maxsize=2)
+    assertions = [{"source": "status_code", "operator": "eq", "value": 200}]
+    first = cache.get(1, "t1", assertions)
+    assert cache.get(1, "t1", assertions) is first
+    assert cache.get(1, "t2", assertions) is not first
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,66 @@
+import time
+
+from sqlalchemy.orm import Session
+
+from app.core.auth_cache import AuthCache, auth_cache
+from app.models.user import User
+from app.utils.cache import TTLCache
+
+def _user(user_id: int, username: str) -> User:
+    return User(id=user_id, username=username, password_hash="x", display_name=username, role="TESTER", is_active=True)
+
+def test_ttl_cache_expiry_and_lru() -> None:
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # 淘汰最久未使用的 b
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+    cache.set("short", 4, ttl=0.01)
+    time.sleep(0.02)
+    assert "short" not in cache
+    assert cache.get("short") is None
+    stats = cache.stats()
+    assert stats["evictions"] == 2  # 写入 c 与 short 时各淘汰一条
+    assert stats["hits"] == 3
+
+def test_auth_cache_snapshot_and_invalidation() -> None:
+    cache = AuthCache(maxsize=10, ttl=60)
+    cache.put("token-1", _user(1, "alice"))
+    cache.put("token-2", _user(1, "alice"))
+    cache.put("token-3", _user(2, "bob"))
+
+    cached = cache.get("token-1")
+    assert cached.username == "alice" and cached.is_active
+    # 每次命中返回新的快照对象，修改不会影响缓存
+    cached.is_active = False
+    assert cache.get("token-1").is_active
+
+    cache.invalidate_user(1)
+    assert cache.get("token-1") is None and cache.get("token-2") is None
+    assert cache.get("token-3").username == "bob"
+
+def test_auth_cache_respects_token_expiry() -> None:
+    cache = AuthCache(maxsize=10, ttl=60)
+    cache.put("expired", _user(1, "alice"), expires_at=time.time() - 1)
+    assert cache.get("expired") is None
+
+def test_auth_cache_invalidated_again_after_commit(db: Session) -> None:
+    user = User(username="cache-commit", password_hash="x", display_name="cache", role="TESTER", is_active=True)
+    db.add(user)
+    db.commit()
+    auth_cache.put("commit-token", user)
+
+    user.is_active = False
+    db.flush()
+    assert auth_cache.get("commit-token") is None
+    # 提交前并发请求读到旧行并重新写入缓存，提交后再次清除
+    stale = _user(user.id, "cache-commit")
+    auth_cache.put("commit-token", stale)
+    db.commit()
+    assert auth_cache.get("commit-token") is None
+
+    db.delete(user)
+    db.commit()
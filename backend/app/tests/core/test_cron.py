@@ -0,0 +1,50 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.core.cron import CronError, CronExpression, get_timezone, next_fire_time
+
+def _next(expression: str, after: datetime) -> datetime:
+    return CronExpression(expression).next_after(after)
+
+def test_next_after_fields_and_steps() -> None:
+    after = datetime(2026, 3, 14, 9, 59, 30)
+    assert _next("* * * * *", after) == datetime(2026, 3, 14, 10, 0)
+    assert _next("*/15 * * * *", after) == datetime(2026, 3, 14, 10, 0)
+    assert _next("5/20 9-17 * * *", after) == datetime(2026, 3, 14, 10, 5)
+    assert _next("0 8 * * *", after) == datetime(2026, 3, 15, 8, 0)
+    assert _next("0 0 1 jan *", after) == datetime(2027, 1, 1, 0, 0)
+    assert _next("30 8 * * mon-fri", after) == datetime(2026, 3, 16, 8, 30)  # 3 月 14 日为周六
+    assert _next("0 12 29 2 *", after) == datetime(2028, 2, 29, 12, 0)
+    assert _next("@hourly", after) == datetime(2026, 3, 14, 10, 0)
+    # 严格晚于 after
+    assert _next("0 10 * * *", datetime(2026, 3, 14, 10, 0)) == datetime(2026, 3, 15, 10, 0)
+
+def test_day_of_month_or_day_of_week() -> None:
+    # 日与周同时限定时满足其一即可；7 与 0 都表示周日
+    after = datetime(2026, 3, 14, 12, 0)
+    assert _next("0 0 20 * 7", after) == datetime(2026, 3, 15, 0, 0)
+    assert _next("0 0 20 * 0", datetime(2026, 3, 15, 1, 0)) == datetime(2026, 3, 20, 0, 0)
+    assert _next("0 0 */10 * *", after) == datetime(2026, 3, 21, 0, 0)
+
+def test_timezone_is_converted_to_server_local_time() -> None:
+    tz = get_timezone("Asia/Tokyo")
+    after = datetime(2026, 3, 14, 12, 0)
+    fire = next_fire_time(CronExpression("0 8 * * *"), after, tz)
+    tokyo = fire.astimezone(ZoneInfo("Asia/Tokyo"))
+    assert (tokyo.hour, tokyo.minute) == (8, 0)
+    assert fire > after
+    assert next_fire_time(CronExpression("0 8 * * *"), after) == datetime(2026, 3, 15, 8, 0)
+
+@pytest.mark.parametrize("expression", [
+    "* * * *", "60 * * * *", "* 24 * * *", "* * 0 * *", "*/0 * * * *", "5-1 * * * *", "* * * foo *", "0 0 30 2 *",
+])
+def test_invalid_expressions(expression: str) -> None:
+    with pytest.raises(CronError):
+        _next(expression, datetime(2026, 1, 1))
+
+def test_invalid_timezone() -> None:
+    with pytest.raises(CronError):
+        get_timezone("Mars/Olympus")
+    assert get_timezone(None) is None
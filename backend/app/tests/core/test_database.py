@@ -0,0 +1,9 @@
+from app.core.database import async_database_url
+
+def test_async_database_url() -> None:
+    assert async_database_url("mysql+pymysql://root:p%40ss@db:3306/slow?charset=utf8mb4") == (
+        "mysql+aiomysql://root:p%40ss@db:3306/slow?charset=utf8mb4"
+    )
+    assert async_database_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+    # 已是异步驱动或无法识别的驱动原样返回
+    assert async_database_url("mysql+asyncmy://root@db/slow") == "mysql+asyncmy://root@db/slow"
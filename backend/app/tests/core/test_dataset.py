@@ -0,0 +1,55 @@
+import io
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.core.dataset import (
+    DatasetFormatError,
+    dataset_path,
+    detect_format,
+    iter_dataset_rows,
+    read_batch,
+    store_dataset,
+)
+
+@pytest.fixture
+def dataset_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DATASET_DIR", str(tmp_path))
+    return tmp_path
+
+def test_detect_format() -> None:
+    assert detect_format("a.CSV") == "csv"
+    assert detect_format("a.ndjson") == "jsonl"
+    with pytest.raises(DatasetFormatError):
+        detect_format("a.xlsx")
+
+def test_store_and_stream_csv(dataset_dir) -> None:
+    content = "﻿id,name\n" + "".join(f"{i},n{i}\n" for i in range(1200))
+    info = store_dataset(io.BytesIO(content.encode()), "csv", 1, max_bytes=1 << 20)
+    assert info["row_count"] == 1200
+    assert info["columns"] == ["id", "name"]
+
+    rows = iter_dataset_rows(dataset_path(info["storage_path"]), "csv")
+    first = read_batch(rows, 500)
+    assert first[0] == {"id": "0", "name": "n0"}
+    assert len(read_batch(rows, 500)) == 500
+    assert len(read_batch(rows, 500)) == 200
+    assert read_batch(rows, 500) == []
+
+@pytest.mark.parametrize("file_format, content, message", [
+    ("csv", "id\n1,2\n", "列数多于表头"),
+    ("csv", "id\n", "没有数据行"),
+    ("jsonl", '{"a": 1}\nnot json\n', "第 2 行"),
+    ("jsonl", "\xff\xfe", "UTF-8"),
+])
+def test_store_rejects_invalid_files(dataset_dir, file_format, content, message) -> None:
+    raw = content.encode("latin-1") if file_format == "jsonl" and "\xff" in content else content.encode()
+    with pytest.raises(DatasetFormatError, match=message):
+        store_dataset(io.BytesIO(raw), file_format, 1, max_bytes=1 << 20)
+    assert os.listdir(dataset_dir) == []
+
+def test_store_rejects_large_files(dataset_dir) -> None:
+    with pytest.raises(DatasetFormatError, match="上限"):
+        store_dataset(io.BytesIO(b"id\n" + b"1\n" * 100), "csv", 1, max_bytes=50)
+    assert os.listdir(dataset_dir) == []
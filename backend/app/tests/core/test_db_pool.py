@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+from sqlalchemy import exc, text
+
+from app.core.db_pool import create_pooled_engine, pool_report, pool_status
+
+@pytest.fixture
+def db_url():
+    directory = tempfile.mkdtemp(prefix="slow-pool-test-")
+    yield f"sqlite:///{os.path.join(directory, 'pool.db')}"
+    shutil.rmtree(directory, ignore_errors=True)
+
+def test_pool_reports_checkouts_overflow_and_timeouts(db_url: str) -> None:
+    engine = create_pooled_engine(db_url, "test-exhaust", pool_size=1, max_overflow=1, pool_timeout=0.05)
+    try:
+        first = engine.connect()
+        second = engine.connect()
+        status = pool_status(engine)
+        assert status["checked_out"] == 2
+        assert status["overflow"] == 1
+        # 常驻与溢出连接都被占用，等待 pool_timeout 后超时
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        first.close()
+        second.close()
+
+        report = {pool["engine"]: pool for pool in pool_report()}["test-exhaust"]
+        assert report["checked_out"] == 0
+        assert report["checkouts"] == 2
+        assert report["timeouts"] == 1
+        assert report["max_wait"] >= 0
+    finally:
+        engine.dispose()
+
+def _break_pooled_connection(engine) -> None:
+    """关闭连接池中空闲连接的底层连接，模拟服务端断开空闲连接"""
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    engine.pool._pool.queue[0].dbapi_connection.close()
+
+def test_idle_pre_ping_replaces_dead_connection(db_url: str) -> None:
+    engine = create_pooled_engine(db_url, "test-idle", pool_size=1, max_overflow=0, pre_ping="idle", pre_ping_idle=0)
+    try:
+        _break_pooled_connection(engine)
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+    finally:
+        engine.dispose()
+
+def test_never_pre_ping_keeps_dead_connection(db_url: str) -> None:
+    engine = create_pooled_engine(db_url, "test-never", pool_size=1, max_overflow=0, pre_ping="never")
+    try:
+        _break_pooled_connection(engine)
+        with pytest.raises(exc.DBAPIError):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+    finally:
+        engine.dispose()
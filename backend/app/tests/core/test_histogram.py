@@ -0,0 +1,59 @@
+import math
+import random
+
+import pytest
+
+from app.services.load_test import arrival_offset
+from app.utils.histogram import LatencyHistogram
+
+def _exact(values, p):
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(p / 100 * len(ordered))) - 1]
+
+@pytest.mark.parametrize("bits", [5, 7, 10])
+def test_percentiles_within_relative_error(bits) -> None:
+    rng = random.Random(bits)
+    values = [rng.lognormvariate(-4, 1.2) for _ in range(20000)]
+    histogram = LatencyHistogram(bits)
+    for value in values:
+        histogram.record(value)
+    tolerance = 2 ** -(bits - 1)
+    for p in (50, 90, 99, 99.9):
+        exact = _exact(values, p)
+        assert abs(histogram.percentile(p) - exact) <= exact * tolerance + 1e-6
+    assert histogram.count == len(values)
+    assert histogram.percentile(100) == pytest.approx(max(values), rel=tolerance)
+    assert histogram.summary()["max"] == pytest.approx(max(values), abs=1e-6)
+    assert histogram.mean == pytest.approx(sum(values) / len(values), rel=1e-3)
+
+def test_small_values_are_exact() -> None:
+    histogram = LatencyHistogram(7)
+    for us in (1, 2, 3, 100):
+        histogram.record(us / 1_000_000)
+    assert histogram.percentile(50) == pytest.approx(2e-6)
+    assert histogram.summary()["max"] == pytest.approx(100e-6)
+
+def test_merge_and_roundtrip() -> None:
+    a, b = LatencyHistogram(), LatencyHistogram()
+    for i in range(1, 1001):
+        (a if i % 2 else b).record(i / 1000)
+    restored = LatencyHistogram.from_dict(a.to_dict())
+    restored.merge(b)
+    assert restored.count == 1000
+    assert restored.percentile(50) == pytest.approx(0.5, rel=0.02)
+    assert restored.summary()["min"] == pytest.approx(0.001)
+    with pytest.raises(ValueError):
+        restored.merge(LatencyHistogram(5))
+
+def test_empty_histogram() -> None:
+    histogram = LatencyHistogram()
+    assert histogram.percentile(99) == 0.0
+    assert histogram.mean == 0.0
+
+def test_arrival_offset_ramp() -> None:
+    # 2 秒内从 0 线性增长到 100 rps：启动阶段发送 100 个请求，之后每 10ms 一个
+    assert arrival_offset(0, 100, 2) == 0
+    assert arrival_offset(25, 100, 2) == pytest.approx(1.0)
+    assert arrival_offset(100, 100, 2) == pytest.approx(2.0)
+    assert arrival_offset(150, 100, 2) == pytest.approx(2.5)
+    assert arrival_offset(10, 100, 0) == pytest.approx(0.1)
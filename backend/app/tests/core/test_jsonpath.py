@@ -0,0 +1,51 @@
+import pytest
+from jsonpath_ng import parse
+
+from app.core.jsonpath import FastPath, ParsedPath, compile_jsonpath, jsonpath_cache_stats
+
+DATA = {
+    "data": {
+        "items": [{"id": 1, "name": "first"}, {"id": 2, "name": None}],
+        "a-b": 3,
+        "text": "abc",
+        "where": 5,
+    }
+}
+
+EXPRESSIONS = [
+    "$",
+    "$.data.items[0].id",
+    "$.data.items[1].name",
+    "$.data.items[9].id",
+    "$.data.items.id",
+    "$.data.a-b",
+    "$['data']['a-b']",
+    "$.data.text[1]",
+    "$.data.missing",
+    "$[0]",
+    "$.data.items[*].id",
+]
+
+def _reference(expression: str, data):
+    matches = [match.value for match in parse(expression).find(data)]
+    return matches[0] if matches else None
+
+def test_fast_path_matches_jsonpath_ng() -> None:
+    for data in (DATA, None, [1, 2], {"data": []}):
+        for expression in EXPRESSIONS:
+            assert compile_jsonpath(expression).first(data) == _reference(expression, data), expression
+
+def test_compile_dispatch() -> None:
+    assert isinstance(compile_jsonpath("$.data.items[0].id"), FastPath)
+    assert isinstance(compile_jsonpath("$.data.items[*].id"), ParsedPath)
+    # 保留字交给完整解析器，与 jsonpath_ng 一样报错
+    with pytest.raises(Exception):
+        compile_jsonpath("$.data.where")
+
+def test_compile_cache_hits() -> None:
+    compile_jsonpath("$.cache.check")
+    before = jsonpath_cache_stats()
+    compile_jsonpath("$.cache.check")
+    after = jsonpath_cache_stats()
+    assert after["hits"] == before["hits"] + 1
+    assert after["misses"] == before["misses"]
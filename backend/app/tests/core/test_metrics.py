@@ -0,0 +1,54 @@
+from fastapi.testclient import TestClient
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.metrics import Counter, Histogram, MetricsRegistry
+from app.core.runner import make_pool_key
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.register(Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0)))
+    counter = registry.register(Counter("calls_total", "Calls", ("name",)))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "/a")
+    counter.inc('say "hi"')
+
+    lines = registry.render().splitlines()
+    assert "# TYPE latency_seconds histogram" in lines
+    # le 为上界（含），计数逐桶累计
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{route="/a"} 3.65' in lines
+    assert 'latency_seconds_count{route="/a"} 4' in lines
+    assert 'calls_total{name="say \\"hi\\""} 1' in lines
+
+def test_metrics_endpoint(client: TestClient) -> None:
+    login_data = {"username": "metrics-nobody", "password": "wrong"}
+    login = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+    client.get(f"{settings.API_V1_STR}/projects/12/test-cases/5")
+    client.get("/no-such-path")
+
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    text = res.text
+    # 按路由模板统计，未匹配的路径合并为 unmatched
+    route = f"{settings.API_V1_STR}/login/access-token"
+    assert f'slow_http_request_duration_seconds_count{{method="POST",route="{route}",status="{login.status_code}"}}' in text
+    assert f'route="{settings.API_V1_STR}/projects/{{project_id}}/test-cases/{{test_case_id}}"' in text
+    assert 'route="unmatched",status="404"' in text
+    assert 'slow_db_query_duration_seconds_count{operation="SELECT"}' in text
+    assert 'slow_cache_hit_ratio{cache="auth"}' in text
+    assert 'slow_threadpool_tokens{state="in_use"}' in text
+
+def test_outbound_requests_labelled_by_environment() -> None:
+    metrics.observe_outbound("async", make_pool_key("http://random-1.example:8080/a", 42), 0.1, None)
+    metrics.observe_outbound("async", make_pool_key("http://random-2.example/b"), 0.1, "error")
+
+    text = "\n".join(metrics.runner_request_duration.render())
+    # 请求地址不作为标签，避免任意 URL 导致标签数量膨胀
+    assert "random-1.example" not in text and "random-2.example" not in text
+    assert 'slow_runner_request_duration_seconds_count{engine="async",environment="42",outcome="ok"}' in text
+    assert 'slow_runner_request_duration_seconds_count{engine="async",environment="none",outcome="error"}' in text
+
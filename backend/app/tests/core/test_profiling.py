@@ -0,0 +1,38 @@
+import time
+
+from app.core.profiling import SamplingProfiler
+
+def _busy_wait(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+def test_sampling_profiler_records_owner_thread_stacks() -> None:
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    _busy_wait(0.05)
+    profiler.stop()
+
+    data = profiler.to_speedscope("busy")
+    frames = data["shared"]["frames"]
+    profile = data["profiles"][0]
+    assert profile["name"] == "event loop"
+    assert len(profile["samples"]) == len(profile["weights"]) > 0
+    # 样本为从根到叶的栈帧索引，忙等函数出现在样本中
+    busy = [i for i, frame in enumerate(frames) if frame["name"] == "_busy_wait"]
+    assert busy and any(busy[0] in sample for sample in profile["samples"])
+    assert 0 < profile["endValue"] <= profiler.duration + 0.01
+
+def test_sampling_profiler_samples_short_runs_on_stop() -> None:
+    # 短于采样间隔的剖析在 stop() 时补采，仍输出有效的 speedscope 文件
+    profiler = SamplingProfiler(interval=10.0)
+    profiler.start()
+    profiler.stop()
+
+    data = profiler.to_speedscope("short")
+    profile = data["profiles"][data["activeProfileIndex"]]
+    assert profile["name"] == "event loop"
+    assert len(profile["samples"]) == 1
+    assert abs(profile["endValue"] - profiler.duration) < 1e-9
+    frames = data["shared"]["frames"]
+    assert frames[profile["samples"][0][-1]]["name"] == "test_sampling_profiler_samples_short_runs_on_stop"
@@ -0,0 +1,41 @@
+import logging
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from starlette.responses import PlainTextResponse
+
+from app.core.query_stats import QueryStatsMiddleware, instrument_engine, track_queries
+
+def test_track_queries_counts_statements() -> None:
+    instrument_engine()
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        with track_queries() as stats:
+            for i in range(3):
+                conn.execute(text("SELECT :i"), {"i": i})
+            conn.execute(text("SELECT 2"))
+    assert stats.count == 4
+    assert stats.duration > 0
+    # 参数不同、文本相同的语句按同一条统计
+    assert stats.repeated(3) == [("SELECT ?", 3)]
+    assert stats.repeated(4) == []
+
+def test_middleware_reports_repeated_statements(caplog) -> None:
+    instrument_engine()
+    engine = create_engine("sqlite://")
+
+    async def app(scope, receive, send):
+        with engine.connect() as conn:
+            for i in range(5):
+                conn.execute(text("SELECT :i"), {"i": i})
+        await PlainTextResponse("ok")(scope, receive, send)
+
+    client = TestClient(QueryStatsMiddleware(app, repeat_threshold=5, warn_count=4))
+    with caplog.at_level(logging.WARNING, logger="app.core.query_stats"):
+        res = client.get("/items")
+    assert res.headers["x-query-count"] == "5"
+    assert float(res.headers["x-query-time"]) >= 0
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("statement executed 5 times in GET unmatched: SELECT ?" in m for m in messages)
+    assert any("GET unmatched executed 5 SQL statements" in m for m in messages)
@@ -0,0 +1,149 @@
+import asyncio
+import json
+
+from app.core.config import settings
+from app.core.async_runner import AsyncClientPool, client_pool, run_request_async
+from app.core.runner import SessionPool, make_pool_key, run_request, session_pool
+
+def test_make_pool_key_default_port() -> None:
+    assert make_pool_key("https://Example.com/api", 1) == (1, "https", "example.com", 443)
+    assert make_pool_key("http://example.com:8080/api") == (None, "http", "example.com", 8080)
+
+def test_run_request_reuses_pooled_session(upstream_url: str) -> None:
+    before = session_pool.stats()
+    first = run_request("GET", f"{upstream_url}/a", environment_id=9001)
+    second = run_request("GET", f"{upstream_url}/b", environment_id=9001)
+    after = session_pool.stats()
+
+    assert first.status_code == 200 and second.status_code == 200
+    assert second.body["path"] == "/b"
+    # 同一环境同一主机：第一次未命中，第二次命中
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+def test_session_pool_evicts_overflow_and_idle() -> None:
+    pool = SessionPool(max_sessions=1, idle_timeout=0.0)
+    with pool.acquire("http://a.example.com/", 1):
+        pass
+    with pool.acquire("http://b.example.com/", 1):
+        pass
+    stats = pool.stats()
+    assert stats["sessions"] == 1
+    assert stats["evictions"] >= 1
+    pool.close()
+    assert pool.stats()["sessions"] == 0
+
+def test_run_request_async_matches_sync_contract(upstream_url: str) -> None:
+    async def main():
+        first = await run_request_async("POST", f"{upstream_url}/echo", json_body={"a": 1}, environment_id=9002)
+        second = await run_request_async("GET", f"{upstream_url}/echo", params={"q": "1", "skip": None}, environment_id=9002)
+        return first, second
+
+    before = client_pool.stats()
+    first, second = asyncio.run(main())
+    after = client_pool.stats()
+
+    assert first.error is None
+    assert first.status_code == 200
+    assert first.body["method"] == "POST"
+    assert first.body["body"] == '{"a":1}' or json.loads(first.body["body"]) == {"a": 1}
+    # 保留上游响应头的原始大小写
+    assert first.headers["X-Test-Header"] == "slow"
+    assert second.body["path"] == "/echo?q=1"
+    assert after["hits"] - before["hits"] == 1
+
+def test_async_client_pool_keeps_in_flight_clients() -> None:
+    async def main():
+        pool = AsyncClientPool(max_clients=1)
+        async with pool.acquire("http://a.example.com/", 1) as first:
+            # 超出上限时不淘汰仍有进行中请求的客户端
+            async with pool.acquire("http://b.example.com/", 1):
+                pass
+            await asyncio.sleep(0)
+            assert not first.is_closed
+            assert pool.stats()["clients"] == 2
+        async with pool.acquire("http://c.example.com/", 1):
+            pass
+        await asyncio.sleep(0)
+        stats = pool.stats()
+        await pool.aclose()
+        return first, stats
+
+    first, stats = asyncio.run(main())
+    assert first.is_closed
+    assert (stats["clients"], stats["misses"], stats["hits"]) == (1, 3, 0)
+
+def test_async_client_pool_evicts_least_recently_used() -> None:
+    async def main():
+        pool = AsyncClientPool(max_clients=2)
+        async with pool.acquire("http://a.example.com/", 1) as a:
+            pass
+        async with pool.acquire("http://b.example.com/", 1) as b:
+            pass
+        async with pool.acquire("http://a.example.com/", 1):
+            pass
+        # a 最近被使用过，超出上限时淘汰 b
+        async with pool.acquire("http://c.example.com/", 1) as c:
+            pass
+        await asyncio.sleep(0)
+        assert b.is_closed and not a.is_closed
+        return pool, a, c
+
+    # 未调用 aclose()：asyncio.run 关闭循环前在该循环上关闭剩余的客户端
+    pool, a, c = asyncio.run(main())
+    assert a.is_closed and c.is_closed
+    assert pool.stats()["clients"] == 0
+
+def test_run_request_async_connection_error() -> None:
+    result = asyncio.run(run_request_async("GET", "http://127.0.0.1:1/unreachable", timeout=1.0))
+    assert result.status_code == 0
+    assert result.error
+
+def test_request_phase_timings(upstream_url: str) -> None:
+    # 使用域名访问以经过域名解析；新连接计入 dns/connect（异步引擎的域名解析计入 connect），复用连接时均为 0
+    url = upstream_url.replace("127.0.0.1", "localhost")
+
+    async def run_async():
+        first = await run_request_async("GET", f"{url}/a", environment_id=9004)
+        second = await run_request_async("GET", f"{url}/b", environment_id=9004, load_body=False)
+        return first, second
+
+    for engine, (first, second) in (
+        ("sync", (run_request("GET", f"{url}/a", environment_id=9004),
+                  run_request("GET", f"{url}/b", environment_id=9004, load_body=False))),
+        ("async", asyncio.run(run_async())),
+    ):
+        assert first.error is None and second.error is None
+        timings = first.timings
+        assert set(timings) == {"total", "dns", "connect", "tls", "ttfb", "download", "json_decode"}
+        assert timings["total"] == first.duration
+        assert timings["connect"] > 0 and timings["tls"] == 0
+        if engine == "async":
+            assert timings["dns"] == 0
+        assert timings["dns"] + timings["connect"] + timings["ttfb"] + timings["download"] <= timings["total"] + 1e-6
+        assert second.timings["dns"] == second.timings["connect"] == 0
+        # 响应体解码后才记录解码耗时
+        assert "json_decode" not in second.timings
+        second.load_body()
+        assert second.timings["json_decode"] >= 0
+
+def test_run_request_caps_captured_body(upstream_url: str, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "RUNNER_MAX_CAPTURE_BYTES", 50)
+    monkeypatch.setattr(settings, "RUNNER_SPOOL_MEMORY_BYTES", 16)
+    result = run_request("GET", f"{upstream_url}/big", environment_id=9003)
+    assert result.truncated is True
+    assert result.body_size == 50
+    # 截断后无法按 JSON 解析，回退为文本
+    assert isinstance(result.body, str) and len(result.body) == 50
+
+    async_result = asyncio.run(run_request_async("GET", f"{upstream_url}/big", environment_id=9003))
+    assert async_result.truncated is True
+    assert async_result.body_size == 50
+
+def test_run_request_lazy_body(upstream_url: str) -> None:
+    result = run_request("GET", f"{upstream_url}/lazy", load_body=False)
+    assert result.body is None
+    assert result.body_size > 0 and result.truncated is False
+    assert result.load_body()["path"] == "/lazy"
+    # 重复调用不会重复解码
+    assert result.load_body() is result.body
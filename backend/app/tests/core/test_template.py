@@ -0,0 +1,77 @@
+import pytest
+
+from app.core.extractors import ExtractorCompileError, compile_extractors, run_extractors
+from app.core.template import (
+    Constant,
+    TemplateRenderError,
+    Variable,
+    compile_template,
+    compile_value,
+    template_cache_stats,
+)
+
+CONTEXT = {"user_id": 42, "token": "abc", "user": {"name": "tom", "roles": ["admin", "dev"]}}
+
+def test_compile_template_kinds() -> None:
+    assert isinstance(compile_template("/users"), Constant)
+    assert isinstance(compile_template("{{ user_id }}"), Variable)
+    assert compile_template("/users/{{user_id}}/detail").render(CONTEXT) == "/users/42/detail"
+    assert compile_template("Bearer {{ token }}").render(CONTEXT) == "Bearer abc"
+
+def test_variable_keeps_type_and_nested_path() -> None:
+    assert compile_template("{{user_id}}").render(CONTEXT) == 42
+    assert compile_template("{{ user.name }}").render(CONTEXT) == "tom"
+    assert compile_template("{{user.roles.1}}").render(CONTEXT) == "dev"
+    assert compile_template("{{user}}").render(CONTEXT) is CONTEXT["user"]
+
+def test_missing_variable() -> None:
+    with pytest.raises(TemplateRenderError):
+        compile_template("{{missing}}").render(CONTEXT)
+    with pytest.raises(TemplateRenderError):
+        compile_template("/x/{{user.roles.5}}").render(CONTEXT)
+
+def test_compile_value_collapses_static_subtrees() -> None:
+    static = {"a": [1, 2, {"b": "c"}], "d": None}
+    assert isinstance(compile_value(static), Constant)
+
+    renderer = compile_value({
+        "id": "{{user_id}}",
+        "static": {"x": 1},
+        "tags": ["t", "{{user.name}}"],
+        "{{token}}": "key",
+    })
+    assert renderer.render(CONTEXT) == {
+        "id": 42,
+        "static": {"x": 1},
+        "tags": ["t", "tom"],
+        "abc": "key",
+    }
+
+def test_compile_template_is_cached() -> None:
+    compile_template("/cached/{{user_id}}")
+    before = template_cache_stats()["hits"]
+    assert compile_template("/cached/{{user_id}}") is compile_template("/cached/{{user_id}}")
+    assert template_cache_stats()["hits"] == before + 2
+
+def test_extractors() -> None:
+    extractors = compile_extractors([
+        {"variable_name": "status", "source": "status_code"},
+        {"variable_name": "trace", "source": "header", "expression": "X-Trace-Id"},
+        {"variable_name": "first_id", "source": "body", "expression": "$.data.items[0].id"},
+        {"variable_name": "absent", "source": "body", "expression": "$.data.missing"},
+    ])
+    values, missing = run_extractors(
+        extractors, 200, {"X-Trace-Id": "t-1"}, {"data": {"items": [{"id": 7}]}}
+    )
+    assert values == {"status": 200, "trace": "t-1", "first_id": 7}
+    assert missing == ["absent"]
+
+@pytest.mark.parametrize("rule", [
+    {"variable_name": "1bad", "source": "status_code"},
+    {"variable_name": "x", "source": "cookie"},
+    {"variable_name": "x", "source": "body", "expression": "data.id"},
+    {"variable_name": "x", "source": "header"},
+])
+def test_invalid_extractors(rule) -> None:
+    with pytest.raises(ExtractorCompileError, match="第 2 条提取规则"):
+        compile_extractors([{"variable_name": "ok", "source": "status_code"}, rule])
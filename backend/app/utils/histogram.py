@@ -0,0 +1,112 @@
+import math
+from typing import Any, Dict, Optional
+
+class LatencyHistogram:
+    """
+    HDR 风格的延迟直方图（单位：微秒）
+
+    小于 2^bits 微秒的值每微秒一个桶（精确记录）；更大的值按 2 的幂分段，每段等分为 2^(bits-1) 个子桶，
+    因此任意延迟的相对误差不超过 2^-(bits-1)（bits=7 时约 1.6%），桶数只随量级对数增长。
+    记录与合并都是 O(1)，内存与请求数无关，适合压测中每秒数万次的记录。
+
+    桶以稀疏字典保存，to_dict() 可直接写入 JSON 列，from_dict() 还原后可继续合并或计算分位数。
+    """
+    __slots__ = ("bits", "counts", "count", "total", "min", "max")
+
+    def __init__(self, bits: int = 7):
+        self.bits = bits
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0  # 微秒
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def _index(self, value: int) -> int:
+        sub_buckets = 1 << self.bits
+        if value < sub_buckets:
+            return value
+        half = sub_buckets >> 1
+        shift = value.bit_length() - self.bits
+        return sub_buckets + (shift - 1) * half + ((value >> shift) - half)
+
+    def _bucket_value(self, index: int) -> float:
+        """桶的代表值（桶内区间中点，微秒）"""
+        sub_buckets = 1 << self.bits
+        if index < sub_buckets:
+            return float(index)
+        half = sub_buckets >> 1
+        shift, offset = divmod(index - sub_buckets, half)
+        shift += 1
+        low = (half + offset) << shift
+        return low + ((1 << shift) - 1) / 2
+
+    def record(self, seconds: float, count: int = 1) -> None:
+        value = max(0, int(seconds * 1_000_000))
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """合并另一个直方图（两者的 bits 必须相同）"""
+        if other.bits != self.bits:
+            raise ValueError("直方图精度不一致，无法合并")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, p: float) -> float:
+        """第 p 百分位延迟（秒），没有记录时返回 0"""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                value = min(max(self._bucket_value(index), self.min), self.max)
+                return value / 1_000_000
+        return self.max / 1_000_000
+
+    @property
+    def mean(self) -> float:
+        """平均延迟（秒）"""
+        return self.total / self.count / 1_000_000 if self.count else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        """常用统计（秒）：min / mean / p50 / p90 / p99 / max"""
+        return {
+            "min": (self.min or 0) / 1_000_000,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": (self.max or 0) / 1_000_000,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "unit": "us",
+            "bits": self.bits,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "counts": {str(index): count for index, count in sorted(self.counts.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls(bits=data.get("bits", 7))
+        histogram.counts = {int(index): count for index, count in (data.get("counts") or {}).items()}
+        histogram.count = data.get("count", 0)
+        histogram.total = data.get("total", 0)
+        histogram.min = data.get("min")
+        histogram.max = data.get("max")
+        return histogram
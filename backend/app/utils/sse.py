@@ -0,0 +1,26 @@
+import json
+from typing import Any, Optional
+
+# SSE 响应头：禁止缓存，并关闭 Nginx 等反向代理的响应缓冲，保证事件实时送达
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+def format_sse(event: str, data: Any, event_id: Optional[Any] = None) -> str:
+    """
+    按 text/event-stream 格式编码一条事件
+    - event: 事件类型
+    - data: 事件数据，编码为单行 JSON（日期等类型转为字符串）
+    - event_id: 事件ID，客户端断线重连时通过 Last-Event-ID 请求头带回
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+def format_sse_comment(comment: str = "ping") -> str:
+    """编码一条注释行，用于保持连接（客户端会忽略注释）"""
+    return f": {comment}\n\n"
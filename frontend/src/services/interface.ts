@@ -1,8 +1,14 @@
 import api from '../utils/api';
 import type { Api, ApiCreate, ApiUpdate } from '../types/interface';
+import type { Paginated, PageParams } from '../types/pagination';
+import { fetchAllPages } from '../utils/pagination';
+
+export const getApiPage = (projectId: number, params?: PageParams & { module_name?: string }) => {
+  return api.get<any, Paginated<Api>>(`/projects/${projectId}/apis/`, { params });
+};
 
 export const getApis = (projectId: number, params?: { module_name?: string }) => {
-  return api.get<any, Api[]>(`/projects/${projectId}/apis/`, { params });
+  return fetchAllPages((cursor) => getApiPage(projectId, { ...params, cursor }));
 };
 
 export const getApi = (projectId: number, apiId: number) => {
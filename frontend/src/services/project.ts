@@ -1,8 +1,14 @@
 import api from '../utils/api';
 import type { Project, ProjectCreate, ProjectUpdate, Environment, EnvironmentCreate, EnvironmentUpdate } from '../types/project';
+import type { Paginated, PageParams } from '../types/pagination';
+import { fetchAllPages } from '../utils/pagination';
+
+export const getProjectPage = (params?: PageParams) => {
+  return api.get<any, Paginated<Project>>('/projects/', { params });
+};
 
 export const getProjects = () => {
-  return api.get<any, Project[]>('/projects/');
+  return fetchAllPages((cursor) => getProjectPage({ cursor }));
 };
 
 export const getProject = (id: number) => {
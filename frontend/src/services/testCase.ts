@@ -1,8 +1,14 @@
 import api from '../utils/api';
 import type { TestCase, TestCaseCreate, TestCaseUpdate, TestRunResult } from '../types/testCase';
+import type { Paginated, PageParams } from '../types/pagination';
+import { fetchAllPages } from '../utils/pagination';
+
+export const getTestCasePage = (projectId: number, params?: PageParams) => {
+  return api.get<any, Paginated<TestCase>>(`/projects/${projectId}/test-cases/`, { params });
+};
 
 export const getTestCases = (projectId: number) => {
-  return api.get<any, TestCase[]>(`/projects/${projectId}/test-cases/`);
+  return fetchAllPages((cursor) => getTestCasePage(projectId, { cursor }));
 };
 
 export const getTestCase = (projectId: number, testCaseId: number) => {
@@ -0,0 +1,14 @@
+export interface Paginated<T> {
+  items: T[];
+  total: number;
+  page_size: number;
+  has_next: boolean;
+  has_prev: boolean;
+  next_cursor: string | null;
+}
+
+export interface PageParams {
+  cursor?: string;
+  limit?: number;
+  order_by?: 'id' | 'updated_at';
+}
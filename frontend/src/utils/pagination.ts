@@ -0,0 +1,13 @@
+import type { Paginated } from '../types/pagination';
+
+// Follow next_cursor until the last page and return all items
+export const fetchAllPages = async <T>(fetchPage: (cursor?: string) => Promise<Paginated<T>>): Promise<T[]> => {
+  const items: T[] = [];
+  let cursor: string | undefined;
+  do {
+    const page = await fetchPage(cursor);
+    items.push(...page.items);
+    cursor = page.next_cursor ?? undefined;
+  } while (cursor);
+  return items;
+};